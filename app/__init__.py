@@ -135,6 +135,7 @@ def create_app(config_class=Config):
     from app.curriculum import daily_lessons as daily_lessons_models  # noqa: F401
     from app.curriculum import models as curriculum_models  # noqa: F401
     from app.daily_plan import models as daily_plan_models  # noqa: F401
+    from app.daily_plan import route_progress as daily_plan_route_progress  # noqa: F401
     from app.daily_plan.linear import models as daily_plan_linear_models  # noqa: F401
     from app.feedback import models as feedback_models  # noqa: F401
     from app.grammar_lab import models as grammar_models  # noqa: F401
@@ -146,6 +147,12 @@ def create_app(config_class=Config):
     from app.telegram import models as telegram_models  # noqa: F401
     from app.words import models as words_models  # noqa: F401  # Also defines word_book_link table
 
+    from app.utils.activity_rollup import register_activity_rollup_listeners
+    register_activity_rollup_listeners()
+
+    from app.daily_plan.status_projection import register_status_projection_listeners
+    register_status_projection_listeners()
+
     # In production, schema is managed by Alembic (`flask db upgrade head`).
     # In testing, create tables directly so tests don't need migrations.
     if app.config.get('TESTING', False):
@@ -161,6 +168,9 @@ def create_app(config_class=Config):
     from app.middleware.request_id import add_request_id
     add_request_id(app)
 
+    from app.middleware.query_profiler import add_query_profiler
+    add_query_profiler(app, db)
+
     from app.middleware.acquisition import add_acquisition_capture
     add_acquisition_capture(app)
 
@@ -583,8 +593,11 @@ def _start_background_services(app) -> None:
     """
     if app.config.get('TESTING') or app.config.get('IS_MANAGEMENT_COMMAND'):
         return
-    # No serving-process background services at the moment — the Telegram
-    # scheduler runs in the dedicated scheduler container (see above).
+
+    # Keeps the admin dashboard widgets' per-worker cache warm
+    from app.admin.routes.dashboard_routes import dashboard_widgets
+    from app.admin.utils.widgets import start_refresher
+    start_refresher(app, dashboard_widgets, app.config.get('ADMIN_DASHBOARD_REFRESH_SECONDS', 0))
 
 
 def _register_cli_commands(app):
@@ -679,6 +692,22 @@ def _register_cli_commands(app):
             for e in report.errors:
                 click.echo(f'    - {e}')
 
+    @app.cli.command('backfill-activity-rollup')
+    @click.option('--days', type=int, default=None,
+                  help='Only rebuild the last N days (default: all history)')
+    def backfill_activity_rollup_cmd(days):
+        """Rebuild user_daily_activity from the activity tables. Safe to re-run."""
+        from datetime import date, timedelta
+
+        from app.utils.activity_rollup import backfill
+        from app.utils.db import db
+
+        start = date.today() - timedelta(days=days) if days else None
+        click.echo(f'Activity rollup backfill starting ({f"last {days} days" if days else "all history"}) ...')
+        written = backfill(start_date=start)
+        db.session.commit()
+        click.echo(f'Done. {written} user-day rows.')
+
     @app.cli.command('recalc-word-status')
     @click.option('--dry-run', is_flag=True, default=False,
                   help='Show the before/after histogram without committing')
@@ -136,6 +136,11 @@ class UserStatistics(db.Model):
     adaptive_tier_floor = Column(String(16), default='normal', nullable=False, server_default='normal')
     adaptive_tier_floor_date = Column(db.Date, nullable=True)
 
+    # Ring window of the latest graduated-card grades ('1' correct, '0' miss,
+    # newest last), capped at app.srs.review_log.RECENT_OUTCOMES_CAPACITY.
+    # Lets the tier resolver read rolling accuracy without scanning cards.
+    srs_recent_outcomes = Column(String(200), nullable=True)
+
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
                         onupdate=lambda: datetime.now(timezone.utc))
@@ -205,3 +210,23 @@ class StreakEvent(db.Model):
         Index('idx_streak_events_user_date', 'user_id', 'event_date'),
         Index('idx_streak_events_user_type', 'user_id', 'event_type'),
     )
+
+
+class UserDailyActivity(db.Model):
+    """One row per user and user-local day with any learning activity.
+
+    Maintained incrementally by ``app.utils.activity_rollup``; ``sources`` is
+    a bitmask of the ``SOURCE_*`` flags defined there.
+    """
+    __tablename__ = 'user_daily_activity'
+
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    local_date = Column(Date, primary_key=True)
+    sources = Column(Integer, default=0, nullable=False)
+    minutes = Column(Integer, default=0, nullable=False)
+    xp = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        Index('idx_user_daily_activity_date', 'local_date'),
+    )
@@ -2,13 +2,13 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timedelta
 
 from sqlalchemy.exc import IntegrityError
 
 from app.achievements.models import StreakCoins, StreakEvent
 from app.utils.db import db
-from app.utils.time_utils import get_user_local_date
+from app.utils.time_utils import get_user_local_date, get_user_timezone_name
 from config.settings import DEFAULT_TIMEZONE
 
 logger = logging.getLogger(__name__)
@@ -550,13 +550,15 @@ def get_milestone_history(user_id: int) -> list[dict]:
     ]
 
 
-def get_streak_calendar(user_id: int, days: int = 90, tz: str = DEFAULT_TIMEZONE) -> dict:
+def get_streak_calendar(user_id: int, days: int = 90, tz: str | None = None) -> dict:
     """Get streak calendar data for the last N days.
 
-    Uses a single batched UNION query to find all active dates (same 5
-    activity sources as the per-day streak checker), then merges with
-    StreakEvent dates.  Replaces the previous per-day loop that could
-    generate hundreds of queries.
+    Active dates come from the ``user_daily_activity`` rollup (the same 8
+    sources as ``has_learning_activity``, bucketed by the user's local day)
+    in one indexed read, then are merged with StreakEvent dates.
+
+    ``tz`` defaults to the user's timezone, which is also the one the rollup
+    buckets by.
 
     Returns dict with:
       - active_dates: list of date strings (YYYY-MM-DD) where user was active
@@ -565,23 +567,17 @@ def get_streak_calendar(user_id: int, days: int = 90, tz: str = DEFAULT_TIMEZONE
       - current_streak: current consecutive run
     """
     import pytz
-    from sqlalchemy import Date, cast, func
 
-    from app.books.models import UserChapterProgress
-    from app.curriculum.daily_lessons import UserLessonProgress
-    from app.curriculum.models import LessonProgress
-    from app.grammar_lab.models import UserGrammarExercise
-    from app.study.models import UserCardDirection, UserWord
+    from app.utils.activity_rollup import STREAK_SOURCES, active_dates
 
     try:
-        tz_obj = pytz.timezone(tz)
+        tz_obj = pytz.timezone(tz or get_user_timezone_name(user_id))
     except pytz.UnknownTimeZoneError:
         tz_obj = pytz.timezone(DEFAULT_TIMEZONE)
     tz = tz_obj.zone
 
     local_today = datetime.now(tz_obj).date()
     from_date = local_today - timedelta(days=days)
-    start_utc = datetime.now(timezone.utc) - timedelta(days=days + 1)
 
     # --- StreakEvent dates (earned_daily + repairs) ---
     event_dates: set[date] = set()
@@ -592,55 +588,8 @@ def get_streak_calendar(user_id: int, days: int = 90, tz: str = DEFAULT_TIMEZONE
     ):
         event_dates.add(ev.event_date)
 
-    def _local_date(col):
-        return cast(func.timezone(tz, func.timezone('UTC', col)), Date)
-
-    q1 = (
-        db.session.query(_local_date(LessonProgress.last_activity).label('d'))
-        .filter(
-            LessonProgress.user_id == user_id,
-            LessonProgress.last_activity >= start_utc,
-            LessonProgress.last_activity.isnot(None),
-        )
-    )
-    q2 = (
-        db.session.query(_local_date(UserGrammarExercise.last_reviewed).label('d'))
-        .filter(
-            UserGrammarExercise.user_id == user_id,
-            UserGrammarExercise.last_reviewed >= start_utc,
-            UserGrammarExercise.last_reviewed.isnot(None),
-        )
-    )
-    q3 = (
-        db.session.query(_local_date(UserCardDirection.last_reviewed).label('d'))
-        .join(UserWord, UserCardDirection.user_word_id == UserWord.id)
-        .filter(
-            UserWord.user_id == user_id,
-            UserCardDirection.last_reviewed >= start_utc,
-            UserCardDirection.last_reviewed.isnot(None),
-        )
-    )
-    q4 = (
-        db.session.query(_local_date(UserChapterProgress.updated_at).label('d'))
-        .filter(
-            UserChapterProgress.user_id == user_id,
-            UserChapterProgress.updated_at >= start_utc,
-            UserChapterProgress.updated_at.isnot(None),
-        )
-    )
-    q5 = (
-        db.session.query(_local_date(UserLessonProgress.completed_at).label('d'))
-        .filter(
-            UserLessonProgress.user_id == user_id,
-            UserLessonProgress.completed_at >= start_utc,
-            UserLessonProgress.completed_at.isnot(None),
-        )
-    )
-
     try:
-        union = q1.union(q2, q3, q4, q5).subquery()
-        activity_rows = db.session.query(union.c.d).distinct().all()
-        activity_dates: set[date] = {row[0] for row in activity_rows if row[0] is not None}
+        activity_dates = active_dates(user_id, from_date, local_today, STREAK_SOURCES)
     except Exception:
         logger.exception("Failed to check activity for streak calendar user %s", user_id)
         activity_dates = set()
@@ -771,12 +720,15 @@ def earn_daily_coin(user_id: int, for_date: date | None = None,
     return True
 
 
+_REPAIR_EVENT_TYPES = ('free_repair', 'spent_repair', 'plan_pause', 'shield_repair')
+
+
 def has_repair_for_date(user_id: int, target_date: date) -> bool:
     """Check if a repair (free, paid, or shield) exists for a specific date."""
     return StreakEvent.query.filter(
         StreakEvent.user_id == user_id,
         StreakEvent.event_date == target_date,
-        StreakEvent.event_type.in_(['free_repair', 'spent_repair', 'plan_pause', 'shield_repair']),
+        StreakEvent.event_type.in_(_REPAIR_EVENT_TYPES),
     ).first() is not None
 
 
@@ -853,6 +805,30 @@ def apply_paid_repair(user_id: int, missed_date: date) -> dict:
     return {'success': True, 'cost': cost, 'balance': coins.balance, 'error': None}
 
 
+def _repair_types_by_date(user_id: int, start_date: date, end_date: date,
+                          event_types=_REPAIR_EVENT_TYPES) -> dict[date, set[str]]:
+    """Repair events of [start_date, end_date] in one query: {date: {event_type}}."""
+    repairs: dict[date, set[str]] = {}
+    for event_date, event_type in db.session.query(StreakEvent.event_date, StreakEvent.event_type).filter(
+        StreakEvent.user_id == user_id,
+        StreakEvent.event_type.in_(event_types),
+        StreakEvent.event_date >= start_date,
+        StreakEvent.event_date <= end_date,
+    ):
+        repairs.setdefault(event_date, set()).add(event_type)
+    return repairs
+
+
+def _local_today(tz: str) -> tuple[date, str]:
+    import pytz
+
+    try:
+        tz_obj = pytz.timezone(tz)
+    except pytz.UnknownTimeZoneError:
+        tz_obj = pytz.timezone(DEFAULT_TIMEZONE)
+    return datetime.now(tz_obj).date(), tz_obj.zone
+
+
 def find_missed_date(user_id: int, tz: str = DEFAULT_TIMEZONE,
                      max_days: int = 7) -> date | None:
     """Find the most recent missed date that could be repaired.
@@ -863,21 +839,25 @@ def find_missed_date(user_id: int, tz: str = DEFAULT_TIMEZONE,
     meaning the gap is adjacent to a real streak chain. Repairing an
     isolated gap that isn't connected to any streak is pointless (streak
     would remain 1), so we return None in that case.
-    """
-    import pytz
 
-    from app.telegram.queries import _has_activity_in_range, _user_day_boundaries
+    Activity and repairs of the whole window are fetched up front (two
+    queries) instead of per day.
+    """
+    from app.utils.activity_tracker import get_active_local_dates
 
-    local_now = datetime.now(pytz.timezone(tz))
+    local_today, zone = _local_today(tz)
+    window_start = local_today - timedelta(days=max_days + 1)
+    window_end = local_today - timedelta(days=1)
+    active_dates = get_active_local_dates(user_id, window_start, window_end, zone)
+    repairs = _repair_types_by_date(user_id, window_start, window_end)
 
     for offset in range(1, max_days + 1):
-        day_start, day_end = _user_day_boundaries(tz, offset_days=-offset)
-        check_date = local_now.date() - timedelta(days=offset)
+        check_date = local_today - timedelta(days=offset)
 
-        if _has_activity_in_range(user_id, day_start, day_end):
+        if check_date in active_dates:
             # Activity found — any gap must be BEFORE this day
             continue
-        elif has_repair_for_date(user_id, check_date):
+        elif check_date in repairs:
             # Already repaired — keep looking further back
             continue
         else:
@@ -887,19 +867,34 @@ def find_missed_date(user_id: int, tz: str = DEFAULT_TIMEZONE,
             # Without this check, a user inactive for many days would see
             # repair for "yesterday" that only creates an isolated 1-day streak.
             prev_date = check_date - timedelta(days=1)
-            prev_start, prev_end = _user_day_boundaries(tz, offset_days=-(offset + 1))
-            if _has_activity_in_range(user_id, prev_start, prev_end) or has_repair_for_date(user_id, prev_date):
+            if prev_date in active_dates or prev_date in repairs:
                 return check_date
             return None
     return None
 
 
-def _is_spent_repair(user_id: int, target_date: date) -> bool:
-    return StreakEvent.query.filter_by(
-        user_id=user_id,
-        event_date=target_date,
-        event_type='spent_repair',
-    ).first() is not None
+def get_streak_before_date(user_id: int, before_date: date,
+                           tz: str = DEFAULT_TIMEZONE, max_days: int = 365) -> int:
+    """Length of the chain of active or repaired days ending the day before ``before_date``.
+
+    Used to tell a user how long the streak they can still repair was.
+    Only free and paid repairs bridge days here.
+    """
+    from app.utils.activity_tracker import get_active_local_dates
+
+    local_today, zone = _local_today(tz)
+    window_start = local_today - timedelta(days=max_days)
+    window_end = before_date - timedelta(days=1)
+    active_dates = get_active_local_dates(user_id, window_start, window_end, zone)
+    repairs = _repair_types_by_date(user_id, window_start, window_end,
+                                    event_types=('free_repair', 'spent_repair'))
+
+    streak = 0
+    check_date = window_end
+    while check_date >= window_start and (check_date in active_dates or check_date in repairs):
+        streak += 1
+        check_date -= timedelta(days=1)
+    return streak
 
 
 def find_auto_heal_date(
@@ -918,42 +913,33 @@ def find_auto_heal_date(
     Only looks within ``max_days`` from today.  Spent-repair rows are
     treated as gaps so they can be upgraded to free repairs with a refund.
     """
-    import pytz
-
-    from app.telegram.queries import _has_activity_in_range, _user_day_boundaries
-
-    local_now = datetime.now(pytz.timezone(tz))
-    local_today = local_now.date()
+    from app.utils.activity_tracker import get_active_local_dates
 
-    today_start, today_end = _user_day_boundaries(tz, offset_days=0)
-    today_has_activity = _has_activity_in_range(user_id, today_start, today_end)
+    local_today, zone = _local_today(tz)
+    window_start = local_today - timedelta(days=max_days + 1)
+    active_dates = get_active_local_dates(user_id, window_start, local_today, zone)
+    repairs = _repair_types_by_date(user_id, window_start, local_today)
 
     for offset in range(1, max_days + 1):
-        day_start, day_end = _user_day_boundaries(tz, offset_days=-offset)
         check_date = local_today - timedelta(days=offset)
 
-        if _has_activity_in_range(user_id, day_start, day_end):
+        if check_date in active_dates:
             continue
 
         # Free repairs are already done — skip.  Spent repairs count as
         # gaps because they may be refunded and replaced with a free one.
-        if has_repair_for_date(user_id, check_date) and not _is_spent_repair(user_id, check_date):
+        if check_date in repairs and 'spent_repair' not in repairs[check_date]:
             continue
 
         # Future side: activity today (offset=1) or activity/repair on offset-1
+        future_day = check_date + timedelta(days=1)
         if offset == 1:
-            future_ok = today_has_activity
+            future_ok = future_day in active_dates
         else:
-            f_start, f_end = _user_day_boundaries(tz, offset_days=-(offset - 1))
-            future_day = local_today - timedelta(days=offset - 1)
-            future_ok = (
-                _has_activity_in_range(user_id, f_start, f_end)
-                or has_repair_for_date(user_id, future_day)
-            )
+            future_ok = future_day in active_dates or future_day in repairs
 
         # Past side: real activity only (prevent cascading into dead zones)
-        p_start, p_end = _user_day_boundaries(tz, offset_days=-(offset + 1))
-        past_ok = _has_activity_in_range(user_id, p_start, p_end)
+        past_ok = check_date - timedelta(days=1) in active_dates
 
         if future_ok or past_ok:
             return check_date
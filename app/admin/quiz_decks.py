@@ -12,6 +12,7 @@ from app.admin.utils.request_validators import escape_like, get_int_arg
 from app.study.models import QuizDeck, QuizDeckWord, QuizResult
 from app.utils.db import db
 from app.words.models import CollectionWords
+from app.words.search import MIN_TERM_LENGTH, normalize_term, search_words
 
 
 @admin.route('/quiz-decks')
@@ -522,40 +523,12 @@ def api_words_search():
         CollectionWords.russian_word != ''
     )
 
-    # Apply search filter
-    if query and len(query) >= 2:
-        from sqlalchemy import case
-
-        words_query = words_query.filter(
-            db.or_(
-                CollectionWords.english_word.ilike(f'%{escape_like(query)}%', escape='\\'),
-                CollectionWords.russian_word.ilike(f'%{escape_like(query)}%', escape='\\')
-            )
-        )
-
-        # Smart sorting: exact match first, then starts with, then contains
-        query_lower = query.lower()
-        words_query = words_query.order_by(
-            # Priority 1: Exact match (case-insensitive)
-            case(
-                (func.lower(CollectionWords.english_word) == query_lower, 1),
-                (func.lower(CollectionWords.russian_word) == query_lower, 1),
-                else_=10
-            ),
-            # Priority 2: Starts with query
-            case(
-                (func.lower(CollectionWords.english_word).like(f'{query_lower}%'), 2),
-                (func.lower(CollectionWords.russian_word).like(f'{query_lower}%'), 2),
-                else_=10
-            ),
-            # Priority 3: Alphabetically by English word
-            CollectionWords.english_word
-        )
-    else:
+    if len(normalize_term(query)) < MIN_TERM_LENGTH:
         # No search query - return empty for autocomplete
         return jsonify([])
 
-    words = words_query.limit(limit).all()
+    # exact > prefix > substring > fuzzy; 1-2 characters take the prefix index
+    words = search_words(query, limit=limit, query=words_query)
 
     results = [{
         'id': w.id,
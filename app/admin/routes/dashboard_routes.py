@@ -12,13 +12,14 @@ import logging
 import time as _time
 from datetime import datetime, timedelta, timezone
 
-from flask import Blueprint, make_response, render_template
+from flask import Blueprint, current_app, make_response, render_template
 from flask_login import current_user
 from sqlalchemy import case, desc, distinct, func
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.admin.audit import log_admin_action
 from app.admin.utils.decorators import admin_required, cache_result
+from app.admin.utils.widgets import Widget, render_widgets, server_timing
 from app.auth.models import User
 from app.books.models import Book
 from app.curriculum.models import CEFRLevel, LessonAttempt, LessonProgress, Lessons, Module
@@ -33,148 +34,44 @@ _app_start_time = _time.time()
 _error_5xx_count = 0
 
 
-def _activity_date_expr(*columns):
-    """Return the first non-null date column for activity tracking."""
-    return func.date(func.coalesce(*columns))
-
-
 def _active_user_ids_for_date(target_date):
-    """UNION DISTINCT user_id across all 7 activity tables for a single date.
+    """Query of user ids active on ``target_date`` (admin sources only).
 
-    Kept for compatibility with ``get_retention_metrics`` and external callers.
-    DAU/WAU/MAU and the daily activity chart use ``get_active_user_dates``
-    instead so they pay for one materialised UNION rather than 1 per date.
+    Kept for external callers. DAU/WAU/MAU, the activity chart and retention
+    use ``get_active_user_dates`` for a whole window at once.
     """
-    from app.books.models import UserChapterProgress
-    from app.curriculum.book_courses import BookCourseEnrollment
-    from app.curriculum.daily_lessons import UserLessonProgress
-    from app.grammar_lab.models import UserGrammarExercise
-    from app.study.models import StudySession
+    from app.achievements.models import UserDailyActivity
+    from app.utils.activity_rollup import ADMIN_SOURCES
 
-    q1 = db.session.query(LessonProgress.user_id).filter(
-        _activity_date_expr(LessonProgress.last_activity, LessonProgress.completed_at) == target_date,
-    )
-    q2 = db.session.query(StudySession.user_id).filter(
-        func.date(StudySession.start_time) == target_date,
-    )
-    q3 = db.session.query(UserGrammarExercise.user_id).filter(
-        UserGrammarExercise.last_reviewed.isnot(None),
-        func.date(UserGrammarExercise.last_reviewed) == target_date,
-    )
-    q4 = db.session.query(UserChapterProgress.user_id).filter(
-        UserChapterProgress.updated_at.isnot(None),
-        func.date(UserChapterProgress.updated_at) == target_date,
-    )
-    q5 = db.session.query(BookCourseEnrollment.user_id).filter(
-        BookCourseEnrollment.last_activity.isnot(None),
-        func.date(BookCourseEnrollment.last_activity) == target_date,
-    )
-    q6 = db.session.query(LessonAttempt.user_id).filter(
-        func.date(LessonAttempt.started_at) == target_date,
-    )
-    q7 = db.session.query(UserLessonProgress.user_id).filter(
-        UserLessonProgress.completed_at.isnot(None),
-        func.date(UserLessonProgress.completed_at) == target_date,
+    return db.session.query(UserDailyActivity.user_id).filter(
+        UserDailyActivity.local_date == target_date,
+        UserDailyActivity.sources.op('&')(ADMIN_SOURCES) != 0,
     )
-    return q1.union(q2, q3, q4, q5, q6, q7)
-
-
-def _build_active_user_date_pairs_query(start_date, end_date):
-    """UNION of ``(user_id, activity_date)`` pairs across the 7 activity tables.
-
-    Single round trip materialises the full window. Use ``get_active_user_dates``
-    to materialise into a ``{date: set(user_id)}`` dict.
-    """
-    from app.books.models import UserChapterProgress
-    from app.curriculum.book_courses import BookCourseEnrollment
-    from app.curriculum.daily_lessons import UserLessonProgress
-    from app.grammar_lab.models import UserGrammarExercise
-    from app.study.models import StudySession
-
-    date1 = _activity_date_expr(LessonProgress.last_activity, LessonProgress.completed_at)
-    q1 = db.session.query(
-        LessonProgress.user_id.label('user_id'),
-        date1.label('activity_date'),
-    ).filter(date1 >= start_date, date1 <= end_date)
-
-    date2 = func.date(StudySession.start_time)
-    q2 = db.session.query(
-        StudySession.user_id.label('user_id'),
-        date2.label('activity_date'),
-    ).filter(date2 >= start_date, date2 <= end_date)
-
-    date3 = func.date(UserGrammarExercise.last_reviewed)
-    q3 = db.session.query(
-        UserGrammarExercise.user_id.label('user_id'),
-        date3.label('activity_date'),
-    ).filter(
-        UserGrammarExercise.last_reviewed.isnot(None),
-        date3 >= start_date, date3 <= end_date,
-    )
-
-    date4 = func.date(UserChapterProgress.updated_at)
-    q4 = db.session.query(
-        UserChapterProgress.user_id.label('user_id'),
-        date4.label('activity_date'),
-    ).filter(
-        UserChapterProgress.updated_at.isnot(None),
-        date4 >= start_date, date4 <= end_date,
-    )
-
-    date5 = func.date(BookCourseEnrollment.last_activity)
-    q5 = db.session.query(
-        BookCourseEnrollment.user_id.label('user_id'),
-        date5.label('activity_date'),
-    ).filter(
-        BookCourseEnrollment.last_activity.isnot(None),
-        date5 >= start_date, date5 <= end_date,
-    )
-
-    date6 = func.date(LessonAttempt.started_at)
-    q6 = db.session.query(
-        LessonAttempt.user_id.label('user_id'),
-        date6.label('activity_date'),
-    ).filter(date6 >= start_date, date6 <= end_date)
-
-    date7 = func.date(UserLessonProgress.completed_at)
-    q7 = db.session.query(
-        UserLessonProgress.user_id.label('user_id'),
-        date7.label('activity_date'),
-    ).filter(
-        UserLessonProgress.completed_at.isnot(None),
-        date7 >= start_date, date7 <= end_date,
-    )
-
-    return q1.union(q2, q3, q4, q5, q6, q7)
 
 
 def get_active_user_dates(start_date, end_date) -> dict:
     """Materialise ``{date: set(user_id)}`` for the window in a single query.
 
-    Powers DAU/WAU/MAU and the 30-day activity chart without N+1 round trips:
-    one UNION query, in-Python aggregation instead of one query per day or one
-    per metric.
+    Powers DAU/WAU/MAU, the 30-day activity chart and retention. Reads the
+    ``user_daily_activity`` rollup (``app/utils/activity_rollup.py``), one row
+    per active user and day, instead of a UNION over the 7 activity tables,
+    so the cost follows the window rather than the activity history.
 
-    NOTE (audit E-076): buckets are UTC-calendar days (``func.date`` over naive
-    UTC columns), NOT user-local days like the streak/XP "today". This is a
-    deliberate simplification for a single-timezone, <10-user product — it is
-    internally consistent across all activity sources. Do not read these
-    numbers as user-local day counts.
+    Buckets are user-local days, the same days the streak/XP "today" uses.
+    Only the 7 historical admin sources count (``ADMIN_SOURCES``): SRS
+    reviews, linear XP and listening stay streak-only so the charts remain
+    comparable with earlier numbers.
     """
-    rows = _build_active_user_date_pairs_query(start_date, end_date).all()
-    bucket: dict = {}
-    for user_id, activity_date in rows:
-        if user_id is None or activity_date is None:
-            continue
-        bucket.setdefault(activity_date, set()).add(user_id)
-    return bucket
+    from app.utils.activity_rollup import ADMIN_SOURCES, active_user_dates
+
+    return active_user_dates(start_date, end_date, ADMIN_SOURCES)
 
 
 def _count_active_users_in_range(start_date, end_date) -> int:
     """Count distinct active users in ``[start_date, end_date]``.
 
     Thin wrapper over ``get_active_user_dates`` so callers (retention, ad-hoc
-    queries) share the materialised UNION path.
+    queries) share the rollup read.
     """
     bucket = get_active_user_dates(start_date, end_date)
     users: set = set()
@@ -285,13 +182,13 @@ def get_daily_activity_data(days: int = 30) -> dict:
 def get_engagement_metrics() -> dict:
     """DAU/WAU/MAU counts with trend arrows vs previous period.
 
-    Uses _count_active_users_in_range (UNION of 6 activity tables).
+    Counted from the daily-activity rollup (see ``get_active_user_dates``).
     Does NOT use User.last_login — see Key Definitions in plan.
     """
     now = datetime.now(timezone.utc)
     today = now.date()
 
-    # One UNION query covers the entire 60-day window. Previously this helper
+    # One rollup read covers the entire 60-day window. Previously this helper
     # ran six separate UNION counts against the seven activity tables.
     bucket = get_active_user_dates(today - timedelta(days=59), today)
 
@@ -498,7 +395,7 @@ def get_retention_metrics() -> dict:
         if not valid_cohorts:
             return 0.0
 
-        # One UNION query covers all target dates for this day_offset.
+        # One rollup read covers all target dates for this day_offset.
         target_dates = [vc[1] for vc in valid_cohorts]
         activity_bucket = get_active_user_dates(min(target_dates), max(target_dates))
 
@@ -894,6 +791,29 @@ def increment_5xx_counter():
     _error_5xx_count += 1
 
 
+def dashboard_widgets() -> tuple:
+    """Template variable -> loader for every dashboard widget.
+
+    Built per call so the loaders are looked up at render time. ``stats``
+    is spread into the template context.
+    """
+    return (
+        Widget('stats', get_dashboard_statistics),
+        Widget('activity_data', get_daily_activity_data, (30,)),
+        Widget('engagement', get_engagement_metrics),
+        Widget('learning', get_learning_metrics),
+        Widget('content', get_content_metrics),
+        Widget('srs_health', get_srs_health_metrics),
+        Widget('retention', get_retention_metrics),
+        Widget('streaks', get_streak_analytics),
+        Widget('referrals', get_referral_analytics),
+        Widget('coins', get_coin_economy),
+        Widget('content_quality', get_content_quality),
+        Widget('content_alerts', get_content_alerts),
+        Widget('system_health', get_system_health),
+    )
+
+
 @dashboard_bp.route('/')
 @admin_required
 def dashboard():
@@ -901,45 +821,29 @@ def dashboard():
     from app.admin.utils.cache import cleanup_expired
     cleanup_expired(timeout=300)
 
-    stats = get_dashboard_statistics()
-    activity_data = get_daily_activity_data(30)
-    engagement = get_engagement_metrics()
-    learning = get_learning_metrics()
-    content = get_content_metrics()
-    srs_health = get_srs_health_metrics()
-    retention = get_retention_metrics()
-    streaks = get_streak_analytics()
-    referrals = get_referral_analytics()
-    coins = get_coin_economy()
-    linear_plan = {}
-    content_quality = get_content_quality()
-    content_alerts = get_content_alerts()
-    system_health = get_system_health()
+    results = render_widgets(
+        dashboard_widgets(),
+        workers=current_app.config.get('ADMIN_DASHBOARD_WORKERS', 4),
+        timeout=current_app.config.get('ADMIN_WIDGET_TIMEOUT', 3.0),
+    )
+    widgets = {name: result.value for name, result in results.items()}
+    stats = widgets.pop('stats')
 
     recent_users = User.query.order_by(desc(User.created_at)).limit(10).all()
 
     from app.admin.services import UserManagementService
     at_risk_users = UserManagementService.get_at_risk_users()
 
-    return render_template(
+    response = make_response(render_template(
         'admin/dashboard.html',
         recent_users=recent_users,
-        activity_data=activity_data,
-        engagement=engagement,
-        learning=learning,
-        content=content,
-        srs_health=srs_health,
-        retention=retention,
-        streaks=streaks,
-        referrals=referrals,
-        coins=coins,
-        linear_plan=linear_plan,
-        content_quality=content_quality,
-        content_alerts=content_alerts,
-        system_health=system_health,
+        linear_plan={},
         at_risk_users=at_risk_users,
+        **widgets,
         **stats,
-    )
+    ))
+    response.headers['Server-Timing'] = server_timing(results)
+    return response
 
 
 @dashboard_bp.route('/content-quality')
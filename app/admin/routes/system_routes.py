@@ -13,6 +13,7 @@ from app.admin.audit import log_admin_action
 from app.admin.services.system_service import SystemService
 from app.admin.utils.cache import clear_admin_cache, clear_cache_by_prefix, get_cache_stats
 from app.admin.utils.decorators import admin_required
+from app.curriculum import cache as curriculum_cache
 from app.curriculum.rate_limiter import rate_limit
 from app.utils.db import db
 
@@ -64,7 +65,9 @@ def clear_cache():
 @admin_required
 def cache_stats():
     """JSON snapshot of the current worker's in-memory cache."""
-    return jsonify(get_cache_stats())
+    stats = get_cache_stats()
+    stats['curriculum'] = curriculum_cache.cache.stats()
+    return jsonify(stats)
 
 
 @system_bp.route('/system/clear-cache-prefix', methods=['POST'])
@@ -105,6 +108,7 @@ def system():
         app_info=info['app_info'],
         clear_cache_confirm=CLEAR_CACHE_CONFIRM,
         cache_stats=get_cache_stats(),
+        curriculum_cache_stats=curriculum_cache.cache.stats(),
     )
 
 
@@ -228,7 +228,17 @@ def _fetch_sitemap_stats(client) -> dict:
 
         root = ElementTree.fromstring(response.data)
         ns = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        urls = root.findall('sm:url', ns)
+        # /sitemap.xml is an index of per-section shards; collect their <url>s
+        roots = [root]
+        if root.tag == f"{{{ns['sm']}}}sitemapindex":
+            roots = []
+            for shard_loc in root.findall('sm:sitemap/sm:loc', ns):
+                shard = client.get(_path_from_sitemap_loc((shard_loc.text or '').strip()))
+                if shard.status_code != 200:
+                    stats['error'] = f'HTTP {shard.status_code}: {shard_loc.text}'
+                    continue
+                roots.append(ElementTree.fromstring(shard.data))
+        urls = [url_el for shard_root in roots for url_el in shard_root.findall('sm:url', ns)]
         stats['url_count'] = len(urls)
         locs = [
             url_el.findtext('sm:loc', namespaces=ns)
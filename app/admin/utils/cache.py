@@ -6,6 +6,7 @@
 Bounded in-memory cache with LRU eviction and periodic expired-entry cleanup.
 """
 import logging
+import threading
 from collections import OrderedDict
 from datetime import datetime, timezone
 
@@ -16,6 +17,8 @@ _cache_timeout = 300  # 5 минут (по умолчанию)
 
 # OrderedDict for LRU ordering: most-recently-used entries move to the end
 _cache: OrderedDict = OrderedDict()
+# Dashboard widgets and the background refresher touch it from several threads
+_lock = threading.RLock()
 
 
 def get_cache(key, timeout=_cache_timeout):
@@ -29,16 +32,17 @@ def get_cache(key, timeout=_cache_timeout):
     Returns:
         Закэшированные данные или None, если кэш устарел или не существует
     """
-    if key in _cache:
-        cached_data, cached_time = _cache[key]
-        if (datetime.now(timezone.utc) - cached_time).total_seconds() < timeout:
-            # Move to end (most recently used)
-            _cache.move_to_end(key)
-            return cached_data
-        else:
-            # Удаляем устаревший кэш
-            del _cache[key]
-    return None
+    with _lock:
+        if key in _cache:
+            cached_data, cached_time = _cache[key]
+            if (datetime.now(timezone.utc) - cached_time).total_seconds() < timeout:
+                # Move to end (most recently used)
+                _cache.move_to_end(key)
+                return cached_data
+            else:
+                # Удаляем устаревший кэш
+                del _cache[key]
+        return None
 
 
 def set_cache(key, value):
@@ -49,16 +53,17 @@ def set_cache(key, value):
         key: Ключ кэша
         value: Значение для сохранения
     """
-    if key in _cache:
-        # Update existing: move to end
-        _cache[key] = (value, datetime.now(timezone.utc))
-        _cache.move_to_end(key)
-    else:
-        # Evict oldest entries if at capacity
-        while len(_cache) >= MAX_CACHE_SIZE:
-            evicted_key, _ = _cache.popitem(last=False)
-            logger.debug("Cache evicted key: %s (max_size=%d)", evicted_key, MAX_CACHE_SIZE)
-        _cache[key] = (value, datetime.now(timezone.utc))
+    with _lock:
+        if key in _cache:
+            # Update existing: move to end
+            _cache[key] = (value, datetime.now(timezone.utc))
+            _cache.move_to_end(key)
+        else:
+            # Evict oldest entries if at capacity
+            while len(_cache) >= MAX_CACHE_SIZE:
+                evicted_key, _ = _cache.popitem(last=False)
+                logger.debug("Cache evicted key: %s (max_size=%d)", evicted_key, MAX_CACHE_SIZE)
+            _cache[key] = (value, datetime.now(timezone.utc))
 
 
 def cleanup_expired(timeout=_cache_timeout):
@@ -75,12 +80,13 @@ def cleanup_expired(timeout=_cache_timeout):
         Количество удалённых записей
     """
     now = datetime.now(timezone.utc)
-    expired_keys = [
-        key for key, (_, cached_time) in _cache.items()
-        if (now - cached_time).total_seconds() >= timeout
-    ]
-    for key in expired_keys:
-        del _cache[key]
+    with _lock:
+        expired_keys = [
+            key for key, (_, cached_time) in _cache.items()
+            if (now - cached_time).total_seconds() >= timeout
+        ]
+        for key in expired_keys:
+            del _cache[key]
     if expired_keys:
         logger.debug("Cleaned up %d expired cache entries", len(expired_keys))
     return len(expired_keys)
@@ -88,15 +94,17 @@ def cleanup_expired(timeout=_cache_timeout):
 
 def clear_admin_cache():
     """Очищает административный кэш"""
-    _cache.clear()
+    with _lock:
+        _cache.clear()
     logger.info("Admin cache cleared")
 
 
 def clear_cache_by_prefix(prefix: str) -> int:
     """Очищает кэш по префиксу ключа. Возвращает количество удалённых записей."""
-    keys_to_delete = [key for key in _cache.keys() if key.startswith(prefix)]
-    for key in keys_to_delete:
-        del _cache[key]
+    with _lock:
+        keys_to_delete = [key for key in _cache.keys() if key.startswith(prefix)]
+        for key in keys_to_delete:
+            del _cache[key]
     logger.info("Cleared %d cache entries with prefix '%s'", len(keys_to_delete), prefix)
     return len(keys_to_delete)
 
@@ -109,10 +117,11 @@ def get_cache_stats() -> dict:
     the SiteSettings versioning mechanism (see seo_audit_service.py).
     """
     now = datetime.now(timezone.utc)
-    entries = [
-        {'key': k, 'age_seconds': round((now - ts).total_seconds())}
-        for k, (_, ts) in _cache.items()
-    ]
+    with _lock:
+        entries = [
+            {'key': k, 'age_seconds': round((now - ts).total_seconds())}
+            for k, (_, ts) in _cache.items()
+        ]
     return {
         'size': len(_cache),
         'max_size': MAX_CACHE_SIZE,
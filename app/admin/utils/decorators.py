@@ -160,13 +160,19 @@ def cache_result(key: str, timeout: int = 300):
     Args:
         key: Cache-key prefix.
         timeout: TTL in seconds (default 5 minutes).
+
+    The wrapper exposes ``refresh(*args, **kwargs)``, which recomputes and
+    stores the entry regardless of its age.
     """
     from app.admin.utils.cache import get_cache, set_cache
 
     def decorator(func):
+        def _cache_key(args, kwargs):
+            return f"{key}_{hash(str(args) + str(kwargs))}"
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            cache_key = f"{key}_{hash(str(args) + str(kwargs))}"
+            cache_key = _cache_key(args, kwargs)
 
             cached_data = get_cache(cache_key, timeout)
             if cached_data is not None:
@@ -178,6 +184,14 @@ def cache_result(key: str, timeout: int = 300):
             logger.debug(f"Cache miss for {cache_key}, result cached")
             return result
 
+        def refresh(*args, **kwargs):
+            """Recompute and store the entry before it expires (cache warming)."""
+            result = func(*args, **kwargs)
+            set_cache(_cache_key(args, kwargs), result)
+            return result
+
+        wrapper.refresh = refresh
+        wrapper.cache_timeout = timeout
         return wrapper
 
     return decorator
@@ -0,0 +1,164 @@
+# app/admin/utils/widgets.py
+
+"""Concurrent, timed computation of admin dashboard widgets.
+
+The dashboard used to call its widget loaders one after another, so a cold
+cache cost the sum of all of them. ``render_widgets`` runs them on a small
+shared thread pool instead. Each task pushes its own app context, which
+gives it its own Flask-SQLAlchemy session and pooled connection.
+
+- A widget that is not ready ``timeout`` seconds into the request, or that
+  raises, falls back to its last good value in this worker. Without one
+  the request waits for it (or re-raises), as before.
+- A late widget keeps running; when it finishes, its value is cached for
+  the next request.
+- ``server_timing`` turns the results into a ``Server-Timing`` header.
+
+``start_refresher`` (off by default) recomputes every ``cache_result``
+widget on an interval shorter than its TTL, but only while the dashboard
+was rendered in this worker within the last ``active_window`` seconds, so
+idle workers add no DB load.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, NamedTuple
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class Widget(NamedTuple):
+    name: str
+    loader: Callable[..., Any]
+    args: tuple = ()
+
+
+class WidgetResult(NamedTuple):
+    value: Any
+    duration_ms: float
+    status: str  # 'ok', 'stale' (last good value) or 'late' (waited past the timeout)
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# Last value each widget produced in this worker
+_last_good: dict[str, Any] = {}
+# time.monotonic() of the last render_widgets call in this worker
+_last_render: float | None = None
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='admin-widget')
+    return _executor
+
+
+def _compute(app, widget: Widget) -> tuple[Any, float]:
+    started = time.perf_counter()
+    with app.app_context():
+        value = widget.loader(*widget.args)
+    _last_good[widget.name] = value
+    return value, (time.perf_counter() - started) * 1000
+
+
+def render_widgets(widgets, *, workers: int, timeout: float) -> dict[str, WidgetResult]:
+    """Compute ``widgets`` concurrently; ``{name: WidgetResult}``.
+
+    ``workers <= 1`` computes them serially in the current app context.
+    """
+    global _last_render
+    _last_render = time.monotonic()
+    results: dict[str, WidgetResult] = {}
+    if workers <= 1:
+        for widget in widgets:
+            started = time.perf_counter()
+            value = widget.loader(*widget.args)
+            _last_good[widget.name] = value
+            results[widget.name] = WidgetResult(value, (time.perf_counter() - started) * 1000, 'ok')
+        return results
+
+    app = current_app._get_current_object()
+    started = time.perf_counter()
+    futures = {_get_executor(workers).submit(_compute, app, widget): widget for widget in widgets}
+    wait(futures, timeout=timeout)
+
+    for future, widget in futures.items():
+        if future.done() and future.exception() is None:
+            value, duration_ms = future.result()
+            results[widget.name] = WidgetResult(value, duration_ms, 'ok')
+            continue
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if widget.name in _last_good:
+            if future.done():
+                logger.error('Dashboard widget %s failed; serving last good value',
+                             widget.name, exc_info=future.exception())
+            else:
+                logger.warning('Dashboard widget %s exceeded %.1fs; serving last good value',
+                               widget.name, timeout)
+            results[widget.name] = WidgetResult(_last_good[widget.name], elapsed_ms, 'stale')
+        else:
+            # Nothing to fall back to yet: wait (raises if the loader did)
+            value, duration_ms = future.result()
+            results[widget.name] = WidgetResult(value, duration_ms, 'late')
+    return results
+
+
+def server_timing(results: dict[str, WidgetResult]) -> str:
+    """``Server-Timing`` header value, one metric per widget."""
+    return ', '.join(
+        f'w-{name.replace("_", "-")};dur={result.duration_ms:.1f};desc="{result.status}"'
+        for name, result in results.items()
+    )
+
+
+def refresh_widgets(widgets) -> None:
+    """Recompute every cached widget now, skipping those without ``refresh``."""
+    for widget in widgets:
+        refresh = getattr(widget.loader, 'refresh', None)
+        if refresh is None:
+            continue
+        try:
+            _last_good[widget.name] = refresh(*widget.args)
+        except Exception:
+            logger.exception('Dashboard widget refresh failed: %s', widget.name)
+
+
+_refresher: threading.Thread | None = None
+
+
+def _recently_rendered(active_window: float) -> bool:
+    return _last_render is not None and time.monotonic() - _last_render < active_window
+
+
+def start_refresher(app, widgets: Callable[[], Any], interval: float,
+                    active_window: float = 900) -> threading.Thread | None:
+    """Daemon thread keeping the widgets' cache entries warm (one per process).
+
+    ``widgets`` is called each round for the current widget list. A round is
+    skipped unless the dashboard was rendered in the last ``active_window``
+    seconds.
+    """
+    global _refresher
+    if interval <= 0 or _refresher is not None:
+        return _refresher
+
+    def _loop():
+        while True:
+            time.sleep(interval)
+            if not _recently_rendered(active_window):
+                continue
+            try:
+                with app.app_context():
+                    refresh_widgets(widgets())
+            except Exception:
+                logger.exception('Dashboard widget refresh round failed')
+
+    _refresher = threading.Thread(target=_loop, name='admin-widget-refresher', daemon=True)
+    _refresher.start()
+    return _refresher
@@ -1,24 +1,35 @@
 import gzip
+import hashlib
 import json
 import logging
+import re
 from datetime import datetime, timezone
 
 from flask import Blueprint, jsonify, make_response, request, url_for
 from flask_login import current_user
-from sqlalchemy import func
+from sqlalchemy import func, text
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 
 from app.api.decorators import api_auth_required
 from app.api.errors import api_error
 from app.books.access import can_user_access_book
 from app.books.models import Block, Book, Chapter, Task, UserChapterProgress
-from app.curriculum.cache import cached
+from app.curriculum import cache as curriculum_cache
+from app.curriculum.cache import book_tag, cached
 from app.study.models import QuizDeck, QuizDeckWord
-from app.utils.db import db
-from app.words.models import CollectionWords
+from app.utils.db import db, string_to_status
+from app.words.lexicon import candidate_lemmas, lexicon
+
+try:
+    import brotli  # installed with Flask-Compress
+except ImportError:  # pragma: no cover - gzip alone still works
+    brotli = None
 
 logger = logging.getLogger(__name__)
 
+_CHAPTER_PAYLOAD_TIMEOUT = 86400  # content changes drop entries via the book tag
+
 api_books = Blueprint('api_books', __name__)
 
 
@@ -163,9 +174,15 @@ def get_book(book_id):
 # `@cached` на самом роуте без user_specific отдавал первый закэшированный
 # ответ всем подряд — юзер без доступа получал чужой список глав, юзер с
 # доступом — чужой 403. Проверки доступа всегда выполняются до кэша.
-@cached(timeout=3600, key_prefix='book_chapters_data')  # Cache for 1 hour
+@cached(timeout=3600, key_prefix='book_chapters_data', tags=[book_tag])  # Cache for 1 hour
 def _chapter_list_payload(book_id: int) -> list:
-    chapters = Chapter.query.filter_by(book_id=book_id).order_by(Chapter.chap_num).all()
+    chapters = (
+        Chapter.query
+        .options(load_only(Chapter.id, Chapter.chap_num, Chapter.title, Chapter.words, Chapter.audio_url))
+        .filter_by(book_id=book_id)
+        .order_by(Chapter.chap_num)
+        .all()
+    )
     return [{
         'id': ch.id,
         'num': ch.chap_num,
@@ -207,55 +224,95 @@ def get_book_chapters(book_id):
     return jsonify(_chapter_list_payload(book_id))
 
 
+def _chapter_artifact(chapter_id: int, book_id: int, next_num, prev_num) -> dict:
+    """Serialized + precompressed chapter payload, built once per content.
+
+    Stored in the shared cache under the chapter id and tagged with the book,
+    so an edit to any chapter of the book (which may also shift next/prev)
+    drops it. The ETag is the hash of the serialized payload.
+    """
+    key = f'chapter_payload:{chapter_id}'
+    artifact = curriculum_cache.cache.get(key)
+    if artifact is not None:
+        return artifact
+
+    chapter = (
+        Chapter.query
+        .options(load_only(Chapter.id, Chapter.chap_num, Chapter.title, Chapter.text_raw))
+        .filter_by(id=chapter_id)
+        .one()
+    )
+    body = json.dumps({
+        'id': chapter.id,
+        'num': chapter.chap_num,
+        'title': chapter.title,
+        'text': chapter.text_raw,
+        'next': next_num,
+        'prev': prev_num,
+    }, ensure_ascii=False).encode('utf-8')
+    artifact = {
+        'etag': hashlib.sha256(body).hexdigest()[:32],
+        'identity': body,
+        'gzip': gzip.compress(body, compresslevel=9),
+        'br': brotli.compress(body, quality=11) if brotli is not None else None,
+    }
+    curriculum_cache.cache.set(key, artifact, timeout=_CHAPTER_PAYLOAD_TIMEOUT, tags=[book_tag(book_id)])
+    return artifact
+
+
+def _accepted_encoding(artifact: dict) -> str:
+    accepted = request.accept_encodings
+    if artifact['br'] is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return 'identity'
+
+
 @api_books.route('/books/<int:book_id>/chapters/<int:chapter_num>', methods=['GET'])
 @api_auth_required
 def get_chapter_content(book_id, chapter_num):
     """
     Get chapter content with navigation info
     Returns: {"id": 12, "num": 1, "text": "...", "next": 2, "prev": null}
+
+    The body is served precompressed (br / gzip) from the chapter artifact
+    cache with a strong ETag; a matching If-None-Match gets 304.
     """
     book = Book.query.get_or_404(book_id)
     if _draft_hidden(book):
         return api_error('not_found', 'Book not found', 404)
     if not can_user_access_book(current_user, book):
         return api_error('forbidden', 'Access denied', 403)
-    chapter = Chapter.query.filter_by(
-        book_id=book_id,
-        chap_num=chapter_num
-    ).first_or_404()
-
-    # Get next and previous chapter numbers
-    next_chapter = Chapter.query.filter_by(
-        book_id=book_id,
-        chap_num=chapter_num + 1
-    ).first()
-
-    prev_chapter = Chapter.query.filter_by(
-        book_id=book_id,
-        chap_num=chapter_num - 1
-    ).first()
-
-    response_data = {
-        'id': chapter.id,
-        'num': chapter.chap_num,
-        'title': chapter.title,
-        'text': chapter.text_raw,
-        'next': next_chapter.chap_num if next_chapter else None,
-        'prev': prev_chapter.chap_num if prev_chapter else None
-    }
 
-    # Check if client accepts gzip
-    if 'gzip' in request.headers.get('Accept-Encoding', ''):
-        # Compress response
-        json_str = json.dumps(response_data)
-        compressed = gzip.compress(json_str.encode('utf-8'))
+    # Chapter id and next/prev come from the cached chapter index
+    nums = {entry['num']: entry['id'] for entry in _chapter_list_payload(book_id)}
+    chapter_id = nums.get(chapter_num)
+    if chapter_id is None:
+        return api_error('not_found', 'Chapter not found', 404)
+
+    artifact = _chapter_artifact(
+        chapter_id,
+        book_id,
+        chapter_num + 1 if chapter_num + 1 in nums else None,
+        chapter_num - 1 if chapter_num - 1 in nums else None,
+    )
 
-        response = make_response(compressed)
-        response.headers['Content-Encoding'] = 'gzip'
+    # One ETag per encoding (they are different representations); any of
+    # them still proves the client holds the current content.
+    etags = {encoding: f"{artifact['etag']}-{encoding}" for encoding in ('identity', 'gzip', 'br')}
+    encoding = _accepted_encoding(artifact)
+    if any(request.if_none_match.contains_weak(etag) for etag in etags.values()):
+        response = make_response('', 304)
+    else:
+        response = make_response(artifact[encoding])
         response.headers['Content-Type'] = 'application/json'
-        return response
-
-    return jsonify(response_data)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etags[encoding])
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 # CSRF protection REQUIRED
@@ -483,196 +540,234 @@ def get_book_chapter_progress(book_id):
     })
 
 
-@api_books.route('/word-translation/<word>', methods=['GET'])
-@api_auth_required
-def get_word_translation(word):
-    """
-    API для получения перевода слова с определением его формы
-    """
-    logger.info(f"API word-translation called for word: {word}")
+READING_DECK_TITLE = "Слова из чтения"
+
+# Пакетный перевод: потолок уникальных токенов на запрос — глава обычно даёт
+# 1–2 тыс. уникальных слов, больше одной страницы фронт всё равно не рисует.
+MAX_BATCH_TRANSLATION_WORDS = 5000
+
+# Та же разбивка на слова, что и у ридера (makeWordsClickable в reader_simple.html).
+_READER_TOKEN_RE = re.compile(r"[a-zA-Z]+(?:['-][a-zA-Z]+)*")
+
+_FORM_TEXTS = {
+    'past_tense': 'прошедшее время от',
+    'continuous': 'длительная форма от',
+    'plural': 'множественное число от',
+}
+
+
+def _word_audio(word_entry) -> tuple:
+    """Return ``(has_audio, audio_url)``; audio needs both listening and get_download = 1."""
+    if not word_entry.listening or word_entry.get_download != 1:
+        return False, None
+
+    audio_filename = word_entry.listening
+
+    # Обрабатываем формат [sound:filename.mp3]
+    if audio_filename.startswith('[sound:') and audio_filename.endswith(']'):
+        return True, url_for('static', filename=f'audio/{audio_filename[7:-1]}')
+
+    # Обрабатываем формат audio/filename.mp3
+    if audio_filename.startswith('audio/') and audio_filename.endswith('.mp3'):
+        return True, url_for('static', filename=f'audio/{audio_filename[6:-4]}.mp3')
+
+    # Обрабатываем прямой формат filename.mp3
+    if audio_filename.endswith('.mp3'):
+        return True, url_for('static', filename=f'audio/{audio_filename}')
+
+    return False, None
 
-    word = word.lower().strip()
-    original_word = word
 
-    # Expand dialect contractions (e.g., "orf" -> "off", "'arry" -> "harry")
+def _normalize_reader_word(word: str) -> str:
+    """Lowercase a tapped token and expand dialect contractions ("orf" -> "off")."""
     from app.nlp.processor import expand_contractions
+
+    word = word.lower().strip()
     expanded = expand_contractions(word)
     if expanded != word:
         logger.debug(f"Expanded contraction: {word} -> {expanded}")
         word = expanded.strip()
+    return word
 
-    # Dictionary of irregular verbs
-    irregular_verbs = {
-        'was': 'be', 'were': 'be', 'been': 'be',
-        'went': 'go', 'saw': 'see', 'ate': 'eat', 'drank': 'drink',
-        'spoke': 'speak', 'drove': 'drive', 'flew': 'fly', 'grew': 'grow',
-        'knew': 'know', 'ran': 'run', 'came': 'come', 'took': 'take',
-        'gave': 'give', 'found': 'find', 'thought': 'think', 'told': 'tell',
-        'became': 'become', 'felt': 'feel', 'stood': 'stand', 'heard': 'hear',
-        'brought': 'bring', 'bought': 'buy', 'caught': 'catch', 'taught': 'teach',
-        'sold': 'sell', 'built': 'build', 'sent': 'send', 'spent': 'spend',
-        'fell': 'fall', 'met': 'meet', 'paid': 'pay', 'said': 'say',
-        'understood': 'understand', 'kept': 'keep', 'left': 'leave',
-        'gone': 'go', 'seen': 'see', 'eaten': 'eat', 'drunk': 'drink',
-        'spoken': 'speak', 'driven': 'drive', 'flown': 'fly', 'grown': 'grow',
-        'known': 'know', 'taken': 'take', 'given': 'give', 'written': 'write',
-        'done': 'do', 'made': 'make', 'had': 'have', 'got': 'get',
-        'began': 'begin', 'begun': 'begin', 'broke': 'break', 'broken': 'break',
-        'chose': 'choose', 'chosen': 'choose', 'came': 'come', 'did': 'do'
-    }
 
-    # Ищем слово в базе
-    word_entry = CollectionWords.query.filter_by(english_word=word).first()
-
-    # Отслеживаем информацию о форме слова
-    word_form_info = None
-
-    # Если слово не найдено, пробуем найти его базовую форму
-    if not word_entry:
-        logger.debug(f"Слово '{word}' не найдено в базе, пробуем определить форму")
-
-        # Проверяем на неправильные глаголы
-        if word in irregular_verbs:
-            base_form = irregular_verbs[word]
-            logger.debug(f"Найден неправильный глагол: {word} -> {base_form}")
-            word_entry = CollectionWords.query.filter_by(english_word=base_form).first()
-            if word_entry:
-                word_form_info = {'type': 'past_tense', 'base_form': base_form}
-
-        # Если всё ещё не нашли, проверяем другие формы
-        if not word_entry:
-            # Проверка на -ing форму
-            if word.endswith('ing') and len(word) > 4:
-                base_form = word[:-3]
-                word_entry = CollectionWords.query.filter_by(english_word=base_form).first()
-
-                if not word_entry:
-                    base_form_e = base_form + 'e'
-                    word_entry = CollectionWords.query.filter_by(english_word=base_form_e).first()
-                    if word_entry:
-                        base_form = base_form_e
-
-                if not word_entry and len(base_form) >= 2 and base_form[-1] == base_form[-2]:
-                    base_form_single = base_form[:-1]
-                    word_entry = CollectionWords.query.filter_by(english_word=base_form_single).first()
-                    if word_entry:
-                        base_form = base_form_single
-
-                if word_entry:
-                    word_form_info = {'type': 'continuous', 'base_form': base_form}
-
-            # Проверка на -ed форму
-            if not word_entry and word.endswith('ed') and len(word) > 3:
-                base_form = word[:-2]
-                word_entry = CollectionWords.query.filter_by(english_word=base_form).first()
-
-                if not word_entry:
-                    base_form_e = word[:-1]
-                    word_entry = CollectionWords.query.filter_by(english_word=base_form_e).first()
-                    if word_entry:
-                        base_form = base_form_e
-
-                if not word_entry and len(base_form) >= 2 and base_form[-1] == base_form[-2]:
-                    base_form_single = base_form[:-1]
-                    word_entry = CollectionWords.query.filter_by(english_word=base_form_single).first()
-                    if word_entry:
-                        base_form = base_form_single
-
-                if word_entry:
-                    word_form_info = {'type': 'past_tense', 'base_form': base_form}
-
-            # Проверка на множественное число
-            if not word_entry and word.endswith('s') and not word.endswith('ss') and len(word) > 2:
-                base_form = word[:-1]
-                word_entry = CollectionWords.query.filter_by(english_word=base_form).first()
-
-                if not word_entry and word.endswith('es'):
-                    base_form_es = word[:-2]
-                    word_entry = CollectionWords.query.filter_by(english_word=base_form_es).first()
-                    if word_entry:
-                        base_form = base_form_es
-
-                if not word_entry and word.endswith('ies'):
-                    base_form_ies = word[:-3] + 'y'
-                    word_entry = CollectionWords.query.filter_by(english_word=base_form_ies).first()
-                    if word_entry:
-                        base_form = base_form_ies
-
-                if word_entry:
-                    word_form_info = {'type': 'plural', 'base_form': base_form}
-
-    if word_entry:
-        # Получаем статус слова для пользователя
-        status = current_user.get_word_status(word_entry.id)
-
-        # Проверяем наличие аудио - должно быть и listening и get_download = 1
-        has_audio = False
-        audio_url = None
-
-        if word_entry.listening and word_entry.get_download == 1:
-            audio_filename = word_entry.listening
-
-            # Обрабатываем формат [sound:filename.mp3]
-            if audio_filename.startswith('[sound:') and audio_filename.endswith(']'):
-                audio_filename = audio_filename[7:-1]  # Убираем [sound: и ]
-                has_audio = True
-                audio_url = url_for('static', filename=f'audio/{audio_filename}')
-
-            # Обрабатываем формат audio/filename.mp3
-            elif audio_filename.startswith('audio/') and audio_filename.endswith('.mp3'):
-                audio_filename = audio_filename[6:-4]
-                has_audio = True
-                audio_url = url_for('static', filename=f'audio/{audio_filename}.mp3')
-
-            # Обрабатываем прямой формат filename.mp3
-            elif audio_filename.endswith('.mp3'):
-                has_audio = True
-                audio_url = url_for('static', filename=f'audio/{audio_filename}')
-
-        # Определяем текст для отображения информации о форме
-        form_text = None
-        if word_form_info:
-            form_type = word_form_info['type']
-            if form_type == 'past_tense':
-                form_text = 'прошедшее время от'
-            elif form_type == 'continuous':
-                form_text = 'длительная форма от'
-            elif form_type == 'plural':
-                form_text = 'множественное число от'
-
-        # Проверяем, есть ли слово в колоде "Слова из чтения"
-        in_reading_deck = False
-        reading_deck = QuizDeck.query.filter_by(
-            user_id=current_user.id,
-            title="Слова из чтения"
-        ).first()
-        if reading_deck:
-            in_reading_deck = QuizDeckWord.query.filter_by(
-                deck_id=reading_deck.id,
-                word_id=word_entry.id
-            ).first() is not None
-
-        response = {
-            'word': original_word,
-            'translation': word_entry.russian_word,
-            'in_dictionary': True,
-            'id': word_entry.id,
-            'status': status,
-            'has_audio': has_audio,
-            'audio_url': audio_url,
-            'is_form': word_form_info is not None,
-            'form_text': form_text,
-            'base_form': word_form_info['base_form'] if word_form_info else None,
-            'in_reading_deck': in_reading_deck
-        }
-
-        return jsonify(response)
-    else:
-        return jsonify({
+def _translation_payload(original_word, word_entry, word_form_info, status, in_reading_deck) -> dict:
+    if word_entry is None:
+        return {
             'word': original_word,
             'translation': None,
             'in_dictionary': False
-        })
+        }
+
+    has_audio, audio_url = _word_audio(word_entry)
+    return {
+        'word': original_word,
+        'translation': word_entry.russian_word,
+        'in_dictionary': True,
+        'id': word_entry.id,
+        'status': status,
+        'has_audio': has_audio,
+        'audio_url': audio_url,
+        'is_form': word_form_info is not None,
+        'form_text': _FORM_TEXTS.get(word_form_info['type']) if word_form_info else None,
+        'base_form': word_form_info['base_form'] if word_form_info else None,
+        'in_reading_deck': in_reading_deck
+    }
+
+
+@api_books.route('/word-translation/<word>', methods=['GET'])
+@api_auth_required
+def get_word_translation(word):
+    """
+    API для получения перевода слова с определением его формы
+    """
+    logger.info(f"API word-translation called for word: {word}")
+
+    original_word = word.lower().strip()
+    word = _normalize_reader_word(word)
+
+    # Словарная часть целиком из in-memory индекса (0 запросов к БД):
+    # точная форма, затем таблица неправильных глаголов и правила -ing/-ed/-s.
+    word_entry, word_form_info = lexicon.lookup(word)
+    if word_entry is None:
+        logger.debug(f"Слово '{word}' не найдено в словаре")
+        return jsonify(_translation_payload(original_word, None, None, None, None))
+
+    # Получаем статус слова для пользователя
+    status = current_user.get_word_status(word_entry.id)
+
+    # Проверяем, есть ли слово в колоде "Слова из чтения"
+    in_reading_deck = db.session.query(
+        db.session.query(QuizDeckWord.id)
+        .join(QuizDeck, QuizDeck.id == QuizDeckWord.deck_id)
+        .filter(
+            QuizDeck.user_id == current_user.id,
+            QuizDeck.title == READING_DECK_TITLE,
+            QuizDeckWord.word_id == word_entry.id,
+        )
+        .exists()
+    ).scalar()
+
+    return jsonify(_translation_payload(original_word, word_entry, word_form_info, status, in_reading_deck))
+
+
+_BATCH_TRANSLATION_SQL = text("""
+    SELECT cw.id, cw.english_word, cw.russian_word, cw.listening, cw.get_download,
+           uw.status AS user_status,
+           EXISTS (
+               SELECT 1
+               FROM quiz_deck_words qdw
+               JOIN quiz_decks qd ON qd.id = qdw.deck_id
+               WHERE qdw.word_id = cw.id
+                 AND qd.user_id = :user_id
+                 AND qd.title = :deck_title
+           ) AS in_reading_deck
+    FROM collection_words cw
+    LEFT JOIN user_words uw ON uw.word_id = cw.id AND uw.user_id = :user_id
+    WHERE cw.english_word = ANY(:words)
+""")
+
+
+def _batch_translations(tokens: list) -> dict:
+    """Resolve many reader tokens with one set-based round trip.
+
+    Every normalized token and every rule-based lemma candidate goes into a
+    single ``english_word = ANY(...)`` lookup that also carries the user's
+    word status and reading-deck membership; resolution order per token is
+    the same as in ``get_word_translation``.
+    """
+    normalized = {token: _normalize_reader_word(token) for token in tokens}
+
+    lookup_words = set(normalized.values())
+    for word in normalized.values():
+        lookup_words.update(base_form for base_form, _ in candidate_lemmas(word))
+
+    rows = db.session.execute(_BATCH_TRANSLATION_SQL, {
+        'user_id': current_user.id,
+        'deck_title': READING_DECK_TITLE,
+        'words': list(lookup_words),
+    }).fetchall()
+    found = {row.english_word: row for row in rows}
+
+    translations = {}
+    for token, word in normalized.items():
+        word_entry, word_form_info = found.get(word), None
+        if word_entry is None:
+            for base_form, form_type in candidate_lemmas(word):
+                if base_form in found:
+                    word_entry = found[base_form]
+                    word_form_info = {'type': form_type, 'base_form': base_form}
+                    break
+        if word_entry is None:
+            translations[token] = _translation_payload(token, None, None, None, None)
+            continue
+        translations[token] = _translation_payload(
+            token, word_entry, word_form_info,
+            string_to_status(word_entry.user_status) if word_entry.user_status else 0,
+            bool(word_entry.in_reading_deck),
+        )
+    return translations
+
+
+# CSRF protection REQUIRED
+@api_books.route('/word-translations', methods=['POST'])
+@api_auth_required
+def get_word_translations_batch():
+    """
+    Пакетный перевод для предзагрузки страницы/главы ридером.
+    Expects: {"words": ["looked", "said", ...]} или {"chapter_id": 12}
+    Returns: {"translations": {"looked": {...как у /word-translation...}, ...}}
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return api_error('no_data', 'No data provided', 400)
+
+    chapter_id = data.get('chapter_id')
+    words = data.get('words')
+
+    if chapter_id is not None:
+        # bool is an int subclass: `true` must not load chapter 1
+        if not isinstance(chapter_id, int) or isinstance(chapter_id, bool) or chapter_id <= 0:
+            return api_error('invalid_chapter_id', 'chapter_id must be a positive integer', 400)
+        chapter = Chapter.query.options(
+            load_only(Chapter.id, Chapter.book_id, Chapter.text_raw)
+        ).get(chapter_id)
+        denied = _book_gate(chapter.book if chapter else None, 'Chapter not found')
+        if denied is not None:
+            return denied
+        # text_raw хранит переносы как литеральные '\\n' — иначе «\\nThe» даст токен «nThe»
+        words = _READER_TOKEN_RE.findall((chapter.text_raw or '').replace('\\n', ' '))
+    elif not isinstance(words, list) or not all(isinstance(w, str) for w in words):
+        return api_error('missing_fields', 'Provide either words (list of strings) or chapter_id', 400)
+
+    tokens = list(dict.fromkeys(w.lower().strip() for w in words if w and w.strip()))
+    if len(tokens) > MAX_BATCH_TRANSLATION_WORDS:
+        return api_error(
+            'too_many_words',
+            f'At most {MAX_BATCH_TRANSLATION_WORDS} unique words per request',
+            400,
+        )
+
+    return jsonify({'translations': _batch_translations(tokens)})
+
+
+@api_books.route('/books/concordance', methods=['GET'])
+@api_auth_required
+def get_concordance():
+    """
+    In-book usage of a word or phrasal verb across the user's books.
+    Query: ?q=give up&page=1&per_page=10
+    Returns: {"query": "give up", "total": 7, "has_more": false, "items": [
+        {"book_id": 1, "book_title": "...", "chapter_id": 12, "chapter_num": 3,
+         "chapter_title": "...", "segments": [{"text": "...", "match": false}, ...]}, ...]}
+    """
+    from app.books.concordance import normalize_phrase, search_concordance
+
+    phrase = request.args.get('q', '')
+    if not normalize_phrase(phrase):
+        return api_error('missing_fields', 'q is required', 400)
+    page = request.args.get('page', type=int, default=1)
+    per_page = request.args.get('per_page', type=int, default=10)
+    return jsonify(search_concordance(phrase, current_user, page=page, per_page=per_page))
 
 
 @api_books.route('/book/<int:book_id>/content', methods=['GET'])
@@ -3,7 +3,7 @@
 import logging
 from zoneinfo import ZoneInfo
 
-from flask import Blueprint, jsonify, request, session
+from flask import Blueprint, current_app, jsonify, request, session
 from flask_login import current_user
 
 from app import csrf
@@ -270,14 +270,52 @@ def _compute_goal_progress(user, tz: str) -> dict:
 @api_daily_plan.route('/daily-status')
 @api_auth_required
 def daily_status():
-    """Unified daily status: plan + summary + streak + yesterday — one request."""
-    from app.achievements.streak_service import compute_plan_steps, process_streak_on_activity
-    from app.daily_plan.service import get_daily_plan_unified
-    from app.telegram.queries import get_daily_summary, get_yesterday_summary
+    """Unified daily status: plan + summary + streak + yesterday — one request.
 
-    tz = _validate_timezone(request.args.get('tz', current_user.timezone or DEFAULT_TZ))
+    Served from the user's stored snapshot while no activity or settings write
+    has invalidated it (app/daily_plan/status_projection.py), so dashboard
+    polling is a single-row read; rebuilt by ``_build_daily_status`` otherwise.
+    """
+    from datetime import datetime
+
+    from app.daily_plan import status_projection
 
+    tz = _validate_timezone(request.args.get('tz', current_user.timezone or DEFAULT_TZ))
     user_id = current_user.id
+    local_date = datetime.now(ZoneInfo(tz)).date()
+    max_age = current_app.config.get('DAILY_STATUS_MAX_AGE_SECONDS', 300)
+
+    snapshot = status_projection.load(user_id) if max_age > 0 else None
+    if status_projection.is_fresh(snapshot, local_date, tz, max_age):
+        return status_projection.respond(snapshot)
+    built_version = snapshot.version if snapshot is not None else 0
+
+    payload = _build_daily_status(user_id, tz)
+    body = current_app.json.dumps(payload)
+    if max_age <= 0:
+        return current_app.response_class(body, mimetype=current_app.json.mimetype)
+
+    # streak_repaired is a one-shot celebration flag: report it on this
+    # response only, never replay it from the snapshot.
+    stored_body = body
+    if payload.get('streak_repaired'):
+        stored_body = current_app.json.dumps({**payload, 'streak_repaired': False})
+    try:
+        snapshot = status_projection.store(user_id, local_date, tz, stored_body, built_version)
+    except Exception:
+        logger.warning("daily_status snapshot write failed for user %s", user_id, exc_info=True)
+        db.session.rollback()
+        return current_app.response_class(body, mimetype=current_app.json.mimetype)
+    if stored_body is not body:
+        return current_app.response_class(body, mimetype=current_app.json.mimetype)
+    return status_projection.respond(snapshot)
+
+
+def _build_daily_status(user_id: int, tz: str) -> dict:
+    """Compute the full /api/daily-status payload (and its idempotent writes)."""
+    from app.achievements.streak_service import compute_plan_steps, process_streak_on_activity
+    from app.daily_plan.service import get_daily_plan_unified
+    from app.telegram.queries import get_daily_summary, get_yesterday_summary
 
     plan = get_daily_plan_unified(user_id, tz=tz)
     summary = get_daily_summary(user_id, tz=tz)
@@ -441,7 +479,7 @@ def daily_status():
     if plan.get('mode') == 'paused':
         payload['plan_paused'] = True
         payload['paused_until'] = plan.get('paused_until')
-    return jsonify(payload)
+    return payload
 
 
 
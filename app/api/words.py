@@ -8,6 +8,7 @@ from app.api.decorators import api_auth_required
 from app.api.errors import api_error
 from app.utils.db import db
 from app.utils.validators import WordStatus, validate_enum
+from app.words import search as word_search
 from app.words.models import CollectionWords
 
 logger = logging.getLogger(__name__)
@@ -314,18 +315,11 @@ def search_words():
 
     # Отладочная информация
 
-    if not term or len(term) < 2:
+    if len(word_search.normalize_term(term)) < word_search.MIN_TERM_LENGTH:
         return jsonify([])
 
     try:
-        # Поиск слов по частичному совпадению
-        search_term = f"%{term}%"
-        words = CollectionWords.query.filter(
-            or_(
-                CollectionWords.english_word.ilike(search_term),
-                CollectionWords.russian_word.ilike(search_term)
-            )
-        ).order_by(CollectionWords.english_word).limit(50).all()
+        words = word_search.search_words(term, limit=50)
 
         # Форматируем результат
         result = [{
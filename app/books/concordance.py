@@ -0,0 +1,214 @@
+"""In-book usage search (concordance) over the chapter full-text index.
+
+``search_concordance`` returns ranked KWIC snippets for a word or phrasal verb
+across every book the user may read:
+
+- the ranked hit list per phrase comes from ``Chapter.ts_idx`` (GIN index
+  ``idx_chapter_fts``, kept current by a trigger — see migration
+  ``20261017_chapter_fts_trigger``). ``phraseto_tsquery('english', ...)``
+  stems, so "gave up" also finds "giving up". Ranking uses the tsvector
+  alone; chapter text is never read for it;
+- snippets come from ``ts_headline`` and are built only for the page being
+  shown;
+- both are cached in the curriculum cache: hit lists under the
+  ``concordance`` tag, snippets under their book's tag. Chapter writes
+  invalidate both (``app.curriculum.cache._structure_tags``).
+
+Access is applied per request on top of the shared hit list, so the cache
+is per phrase, not per user.
+
+Non-PostgreSQL backends (SQLite in tests) fall back to a ``LIKE`` match and
+build snippets in Python for the page rows only.
+"""
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+
+from app.books.access import accessible_books_filter
+from app.books.models import Book, Chapter
+from app.curriculum import cache as curriculum_cache
+from app.curriculum.cache import CONCORDANCE_TAG, book_tag
+from app.utils.db import db
+
+logger = logging.getLogger(__name__)
+
+MAX_PER_PAGE = 20
+_MAX_HITS = 500  # ranked chapters kept per phrase
+_MAX_PHRASE_LENGTH = 64
+_HITS_TIMEOUT = 6 * 3600
+_SNIPPET_TIMEOUT = 86400
+_FALLBACK_CONTEXT = 80  # characters of context either side (non-PostgreSQL)
+
+# ts_headline selection markers; split out again in _segments
+_START, _STOP = '[[[', ']]]'
+_HEADLINE_OPTIONS = (
+    f'StartSel={_START}, StopSel={_STOP}, MinWords=10, MaxWords=25, '
+    'ShortWord=2, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+# text_raw stores paragraph breaks as the two characters backslash-n
+_LITERAL_NEWLINE = '\\n'
+
+_PHRASE_RE = re.compile(r"[a-z]+(?:['’-][a-z]+)*")
+_WHITESPACE_RE = re.compile(r'(?:\s|\\n)+')
+
+
+def normalize_phrase(value: Optional[str]) -> str:
+    """Lowercase words of ``value`` joined by single spaces ('' if none)."""
+    words = _PHRASE_RE.findall((value or '').lower()[:_MAX_PHRASE_LENGTH])
+    return ' '.join(words)
+
+
+def _is_postgres() -> bool:
+    return db.session.get_bind().dialect.name == 'postgresql'
+
+
+def _chapter_text():
+    """``Chapter.text_raw`` with literal ``\\n`` breaks turned into spaces, as indexed."""
+    return func.replace(Chapter.text_raw, _LITERAL_NEWLINE, ' ')
+
+
+def _phrase_key(phrase: str) -> str:
+    return hashlib.md5(phrase.encode('utf-8')).hexdigest()
+
+
+def _ranked_hits(phrase: str) -> List[Dict[str, Any]]:
+    """Chapters containing ``phrase``, best first, across all books."""
+    key = f'concordance:hits:{_phrase_key(phrase)}'
+    hits = curriculum_cache.cache.get(key)
+    if hits is not None:
+        return hits
+
+    query = db.session.query(Chapter.id, Chapter.book_id, Chapter.chap_num, Chapter.title)
+    if _is_postgres():
+        tsquery = func.phraseto_tsquery('english', phrase)
+        query = query.filter(Chapter.ts_idx.op('@@')(tsquery)).order_by(
+            func.ts_rank_cd(Chapter.ts_idx, tsquery).desc(),
+            Chapter.book_id,
+            Chapter.chap_num,
+        )
+    else:
+        query = query.filter(func.lower(_chapter_text()).contains(phrase, autoescape=True)).order_by(
+            Chapter.book_id,
+            Chapter.chap_num,
+        )
+
+    hits = [
+        {'chapter_id': chapter_id, 'book_id': book_id, 'chapter_num': chap_num, 'chapter_title': title}
+        for chapter_id, book_id, chap_num, title in query.limit(_MAX_HITS)
+    ]
+    curriculum_cache.cache.set(key, hits, timeout=_HITS_TIMEOUT, tags=[CONCORDANCE_TAG])
+    return hits
+
+
+def _segments(headline: str) -> List[Dict[str, Any]]:
+    """Split a marked-up headline into ``{'text', 'match'}`` runs."""
+    segments = []
+    for part in re.split(f'({re.escape(_START)}.*?{re.escape(_STOP)})', headline):
+        match = part.startswith(_START) and part.endswith(_STOP)
+        text = part[len(_START):-len(_STOP)] if match else part
+        text = _WHITESPACE_RE.sub(' ', text)
+        if text:
+            segments.append({'text': text, 'match': match})
+    return segments
+
+
+def _fallback_headline(text: str, phrase: str) -> str:
+    position = text.lower().find(phrase)
+    if position < 0:
+        return ''
+    start = max(0, position - _FALLBACK_CONTEXT)
+    end = min(len(text), position + len(phrase) + _FALLBACK_CONTEXT)
+    return (
+        ('… ' if start else '')
+        + text[start:position]
+        + _START + text[position:position + len(phrase)] + _STOP
+        + text[position + len(phrase):end]
+        + (' …' if end < len(text) else '')
+    )
+
+
+def _snippets(phrase: str, hits: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    """KWIC segments per chapter id, one query for every cache miss."""
+    phrase_key = _phrase_key(phrase)
+    result = {}
+    missing = {}
+    for hit in hits:
+        segments = curriculum_cache.cache.get(f"concordance:snippet:{phrase_key}:{hit['chapter_id']}")
+        if segments is None:
+            missing[hit['chapter_id']] = hit['book_id']
+        else:
+            result[hit['chapter_id']] = segments
+    if not missing:
+        return result
+
+    if _is_postgres():
+        headline = func.ts_headline(
+            'english', _chapter_text(), func.phraseto_tsquery('english', phrase), _HEADLINE_OPTIONS,
+        )
+        rows = db.session.query(Chapter.id, headline).filter(Chapter.id.in_(list(missing))).all()
+    else:
+        rows = [
+            (chapter_id, _fallback_headline(text, phrase))
+            for chapter_id, text in db.session.query(Chapter.id, _chapter_text()).filter(Chapter.id.in_(list(missing)))
+        ]
+
+    for chapter_id, headline in rows:
+        segments = _segments(headline or '')
+        result[chapter_id] = segments
+        curriculum_cache.cache.set(
+            f'concordance:snippet:{phrase_key}:{chapter_id}',
+            segments,
+            timeout=_SNIPPET_TIMEOUT,
+            tags=[book_tag(missing[chapter_id])],
+        )
+    return result
+
+
+def search_concordance(phrase: str, user, page: int = 1, per_page: int = 10) -> Dict[str, Any]:
+    """Ranked in-book usage of ``phrase`` in the books ``user`` can read.
+
+    Returns ``{'query', 'page', 'per_page', 'total', 'has_more', 'items'}``;
+    each item carries the book/chapter it comes from and ``segments`` —
+    the snippet as ``{'text', 'match'}`` runs (``match`` marks the phrase).
+    """
+    phrase = normalize_phrase(phrase)
+    page = max(1, page)
+    per_page = min(max(1, per_page), MAX_PER_PAGE)
+    empty = {'query': phrase, 'page': page, 'per_page': per_page, 'total': 0, 'has_more': False, 'items': []}
+    if not phrase:
+        return empty
+
+    hits = _ranked_hits(phrase)
+    if not hits:
+        return empty
+
+    books_query = db.session.query(Book.id, Book.title).filter(
+        Book.id.in_(list({hit['book_id'] for hit in hits})),
+        accessible_books_filter(user),
+    )
+    if not getattr(user, 'is_admin', False):
+        books_query = books_query.filter(Book.is_published.is_(True))
+    book_titles = dict(books_query.all())
+
+    visible = [hit for hit in hits if hit['book_id'] in book_titles]
+    start = (page - 1) * per_page
+    page_hits = visible[start:start + per_page]
+    snippets = _snippets(phrase, page_hits) if page_hits else {}
+
+    items = []
+    for hit in page_hits:
+        segments = snippets.get(hit['chapter_id'])
+        if not segments:
+            continue
+        items.append({**hit, 'book_title': book_titles[hit['book_id']], 'segments': segments})
+
+    return {
+        **empty,
+        'total': len(visible),
+        'has_more': start + per_page < len(visible),
+        'items': items,
+    }
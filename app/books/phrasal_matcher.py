@@ -0,0 +1,116 @@
+"""Single-pass phrasal verb matcher for book ingestion.
+
+``find_phrasal_verbs_in_text`` used to run one ``re.findall(r'\\bPV\\b')``
+over the whole lowercased book per phrasal verb — thousands of full scans
+of a million-character text. The matcher here compiles every phrasal verb
+into a token trie once and walks the book's tokens a single time.
+
+Tokens are ``\\w+`` runs and single punctuation characters, so a phrase
+matches on the same word boundaries as ``\\b...\\b`` did ("one's" is
+``one ' s`` on both sides). Whitespace between tokens is not significant,
+which additionally catches phrases broken across lines.
+
+The compiled trie is cached per process and rebuilt only when the set of
+phrasal verbs changes (one fingerprint query per book).
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+# Marker key for "a phrase ends here" inside trie nodes; never a real token.
+_END = ''
+
+_FINGERPRINT_SQL = text("""
+    SELECT md5(coalesce(string_agg(id::text || ':' || lower(english_word), ',' ORDER BY id), ''))
+    FROM collection_words
+    WHERE item_type = 'phrasal_verb'
+""")
+
+
+def tokenize(content: str) -> List[str]:
+    return _TOKEN_RE.findall(content.lower())
+
+
+class PhrasalVerbMatcher:
+    """Token trie over phrasal verbs: ``{token: {token: {..., '': [word_id]}}}``."""
+
+    def __init__(self, phrases: Iterable[Tuple[int, str]]):
+        self._root: Dict[str, dict] = {}
+        self.size = 0
+        for word_id, phrase in phrases:
+            tokens = tokenize(phrase or '')
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            # Rows differing only in case share a phrase node; each still gets
+            # credited, as with the per-row regex scan over lowercased text.
+            node.setdefault(_END, []).append(word_id)
+            self.size += 1
+
+    def count(self, content: str) -> Counter:
+        """Return ``Counter({word_id: occurrences})`` in one pass over ``content``."""
+        tokens = tokenize(content)
+        root = self._root
+        counts: Counter = Counter()
+        # Per phrase, the next token index where it may match again: re.findall
+        # counts non-overlapping occurrences of each pattern separately.
+        next_free: Dict[int, int] = {}
+        n = len(tokens)
+        for start in range(n):
+            node = root.get(tokens[start])
+            pos = start + 1
+            while node is not None:
+                word_ids = node.get(_END)
+                if word_ids is not None:
+                    for word_id in word_ids:
+                        if next_free.get(word_id, 0) <= start:
+                            counts[word_id] += 1
+                            next_free[word_id] = pos
+                if pos >= n:
+                    break
+                node = node.get(tokens[pos])
+                pos += 1
+        return counts
+
+
+_lock = threading.Lock()
+_cached: Optional[Tuple[str, PhrasalVerbMatcher]] = None
+
+
+def get_matcher(session) -> PhrasalVerbMatcher:
+    """Return the process-wide matcher, rebuilding it if phrasal verbs changed."""
+    global _cached
+
+    fingerprint = session.execute(_FINGERPRINT_SQL).scalar()
+    cached = _cached
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    with _lock:
+        if _cached is not None and _cached[0] == fingerprint:
+            return _cached[1]
+        rows = session.execute(text("""
+            SELECT id, english_word
+            FROM collection_words
+            WHERE item_type = 'phrasal_verb'
+            ORDER BY id
+        """)).fetchall()
+        matcher = PhrasalVerbMatcher((row.id, row.english_word) for row in rows)
+        _cached = (fingerprint, matcher)
+        logger.info(f"Phrasal verb matcher compiled: {matcher.size} phrases")
+        return matcher
+
+
+def invalidate_matcher() -> None:
+    global _cached
+    _cached = None
@@ -5,22 +5,24 @@ import logging
 import queue
 import threading
 import time
-from typing import Dict, List
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Union
 
+import psycopg2
 from bs4 import BeautifulSoup
 from sqlalchemy import text
 
 from app.books.models import Book
-from app.nlp.processor import prepare_word_data, process_text
+from app.nlp.processor import count_words_parallel, prepare_word_counts, split_into_blocks
 from app.nlp.setup import download_nltk_resources, initialize_nltk
 from app.repository import DatabaseRepository
 from app.utils.db import db
-from app.words.models import CollectionWords
 from config.settings import (
     MAX_CONCURRENT_PROCESSING,
     MAX_PROCESSING_TIME,
     MAX_STATUS_AGE,
     MAX_SYNC_PROCESSING_SIZE,
+    NLP_BLOCK_SIZE,
     STATUS_CLEANUP_INTERVAL,
     SYNC_PROCESSING_TIMEOUT,
 )
@@ -59,83 +61,45 @@ def get_app():
     return flask_app
 
 
-def extract_words_from_html_content(html_content: str) -> List[str]:
+def _html_text_blocks(html_content: str) -> Iterator[str]:
+    """Yields the text of an HTML book in NLP-sized blocks."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    if len(html_content) > NLP_BLOCK_SIZE * 3:
+        logger.info(f"Большой HTML контент ({len(html_content)} байт), обрабатываем по частям")
+        paragraphs = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div'])
+        yield from split_into_blocks(paragraph.get_text() for paragraph in paragraphs)
+    else:
+        yield from split_into_blocks([soup.get_text()])
+
+
+def count_words_in_html_content(html_content: str) -> Counter:
     """
-    Извлекает слова из HTML-контента книги.
-    Оптимизировано для больших книг с контролем памяти.
+    Считает слова HTML-контента книги.
+
+    Текст режется на блоки, которые обрабатываются параллельно в пуле
+    процессов; возвращаются частоты, а не список всех токенов книги.
 
     Args:
         html_content (str): HTML-контент книги
 
     Returns:
-        List[str]: Список обработанных слов
+        Counter: Частоты обработанных слов
     """
     try:
         # Загружаем ресурсы NLTK
         download_nltk_resources()
-        english_vocab, brown_words, stop_words = initialize_nltk()
-
-        # Извлекаем текст порциями, если контент большой
-        chunk_size = 300000  # Примерно 300KB на чанк (увеличено для больших книг)
-        all_words = []
-
-        if len(html_content) > chunk_size * 3:  # Если книга очень большая (>600KB)
-            logger.info(f"Большой HTML контент ({len(html_content)} байт), обрабатываем по частям")
-
-            # Используем BeautifulSoup для разбиения на параграфы
-            soup = BeautifulSoup(html_content, "html.parser")
-            paragraphs = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div'])
-
-            # Обрабатываем параграфы группами
-            current_chunk = ""
-            for paragraph in paragraphs:
-                paragraph_text = paragraph.get_text()
-
-                # Если добавление этого параграфа превысит размер чанка, обрабатываем текущий чанк
-                if len(current_chunk) + len(paragraph_text) > chunk_size:
-                    # Обрабатываем текущий чанк, если он не пустой
-                    if current_chunk.strip():
-                        words = process_text(current_chunk, english_vocab, stop_words, brown_words)
-                        all_words.extend(words)
-
-                    # Начинаем новый чанк с текущего параграфа
-                    current_chunk = paragraph_text
-
-                    # Принудительная сборка мусора для освобождения памяти
-                    import gc
-                    gc.collect()
-                else:
-                    # Добавляем параграф к текущему чанку
-                    if current_chunk:
-                        current_chunk += " " + paragraph_text
-                    else:
-                        current_chunk = paragraph_text
-
-            # Обрабатываем последний чанк, если он не пустой
-            if current_chunk.strip():
-                words = process_text(current_chunk, english_vocab, stop_words, brown_words)
-                all_words.extend(words)
-        else:
-            # Для небольших книг обрабатываем весь текст сразу
-            soup = BeautifulSoup(html_content, "html.parser")
-            text = soup.get_text()
-
-            # Проверяем, что текст не пустой
-            if not text or len(text.strip()) < 10:
-                logger.warning("HTML-контент не содержит текста или слишком короткий для обработки")
-                return []
-
-            # Обрабатываем текст
-            all_words = process_text(text, english_vocab, stop_words, brown_words)
 
-        # Очистка памяти перед возвратом результата
-        import gc
-        gc.collect()
+        blocks = list(_html_text_blocks(html_content))
+        if not blocks or sum(len(block.strip()) for block in blocks) < 10:
+            logger.warning("HTML-контент не содержит текста или слишком короткий для обработки")
+            return Counter()
 
-        return all_words
+        word_counts = count_words_parallel(blocks)
+        logger.info(f"Извлечено {sum(word_counts.values())} слов из {len(blocks)} блоков HTML-контента")
+        return word_counts
     except Exception as e:
         logger.error(f"Ошибка при извлечении слов из HTML-контента: {str(e)}")
-        return []
+        return Counter()
 
 
 def process_book_words(book_id: int, html_content: str) -> Dict:
@@ -202,16 +166,16 @@ def _process_book_words_internal(book_id: int, html_content: str) -> Dict:
             logger.error(f"Ошибка при проверке существования книги {book_id}: {str(db_err)}")
             return {"status": "error", "message": f"Database error: {str(db_err)}"}
 
-        # Извлекаем слова из контента с оптимизированной функцией
-        all_words = extract_words_from_html_content(html_content)
+        # Считаем слова контента параллельно по блокам
+        word_counts = count_words_in_html_content(html_content)
 
-        if not all_words:
+        if not word_counts:
             logger.warning(f"Не удалось извлечь слова из книги ID {book_id}")
             return {"status": "error", "message": "No words extracted"}
 
         # Получаем статистику
-        total_words = len(all_words)
-        unique_words = len(set(all_words))
+        total_words = sum(word_counts.values())
+        unique_words = len(word_counts)
 
         logger.info(f"Извлечено {total_words} слов, {unique_words} уникальных для книги ID {book_id}")
 
@@ -220,46 +184,55 @@ def _process_book_words_internal(book_id: int, html_content: str) -> Dict:
         _, brown_words, _ = initialize_nltk()
 
         # Подготовка данных для вставки с обработкой по частям
-        # Разбиваем слова на группы по 5000 для обработки
+        # Разбиваем уникальные слова на группы по 5000 для обработки
         batch_size = 5000
         total_added = 0
+        # По алфавиту: параллельные импорты блокируют общие строки
+        # collection_words в одном порядке и не взаимоблокируются.
+        counted_words = sorted(word_counts.items())
+        link_data = []
 
-        # Очищаем старые записи для этой книги перед повторной обработкой
-        logger.info(f"Очистка старых записей word_book_link для книги ID {book_id}")
         repo = DatabaseRepository()
-        repo.clear_book_word_links(book_id)
-
-        for i in range(0, len(all_words), batch_size):
-            batch = all_words[i:i + batch_size]
-            word_data_batch = prepare_word_data(batch, brown_words)
-
-            # Создание репозитория для работы с БД
-            repo = DatabaseRepository()
-
-            # Обрабатываем пакет слов
-            batch_added = repo.process_batch_from_original_format(word_data_batch, book_id, batch_size=500)
-            total_added += batch_added
-
-            # Обновляем статус
-            processed_percent = min(100, int((i + len(batch)) / len(all_words) * 100))
-            processing_status[book_id] = {
-                **processing_status.get(book_id, {}),
-                "status": "processing",
-                "progress": processed_percent,
-                "message": f"Processing words: {processed_percent}% complete",
-                "words_processed_so_far": total_added
-            }
+        try:
+            # Каждый пакет collection_words фиксируется отдельно: блокировки
+            # строк словаря держатся один пакет, а не всю книгу.
+            for i in range(0, len(counted_words), batch_size):
+                batch = counted_words[i:i + batch_size]
+                word_data_batch = prepare_word_counts(dict(batch), brown_words)
 
-            # Принудительная сборка мусора
-            import gc
-            gc.collect()
+                with repo.transaction():
+                    link_data += repo.upsert_words_from_original_format(word_data_batch, book_id)
+
+                # Обновляем статус
+                processed_percent = min(100, int((i + len(batch)) / len(counted_words) * 100))
+                processing_status[book_id] = {
+                    **processing_status.get(book_id, {}),
+                    "status": "processing",
+                    "progress": processed_percent,
+                    "message": f"Processing words: {processed_percent}% complete",
+                    "words_processed_so_far": len(link_data)
+                }
+
+                # Принудительная сборка мусора
+                import gc
+                gc.collect()
+
+            # Старые связи книги заменяются новыми в одной транзакции:
+            # при ошибке остаются прежние, а не наполовину очищенные.
+            logger.info(f"Замена записей word_book_link для книги ID {book_id}")
+            with repo.transaction():
+                repo.clear_book_word_links(book_id)
+                repo.bulk_link_words_to_book(link_data)
+            total_added = len(link_data)
+        except psycopg2.Error as db_err:
+            logger.error(f"Ошибка записи слов книги {book_id}: {db_err}")
+            return {"status": "error", "message": f"Database error: {db_err}"}
 
         print(f"[BOOK PROCESSING] Книга {book_id}: слова обработаны, всего {total_words}, уникальных {unique_words}", flush=True)
         logger.warning(f"[BOOK PROCESSING] Книга {book_id}: слова обработаны, всего {total_words}, уникальных {unique_words}")
 
         # Обновляем статистику книги в конце
         print(f"[BOOK PROCESSING] Книга {book_id}: обновляем статистику...", flush=True)
-        repo = DatabaseRepository()
         repo.update_book_stats(book_id, total_words, unique_words)
         print(f"[BOOK PROCESSING] Книга {book_id}: статистика обновлена", flush=True)
         logger.warning(f"[BOOK PROCESSING] Книга {book_id}: статистика обновлена")
@@ -616,26 +589,23 @@ def _process_book_chapters_words_internal(book_id: int) -> Dict:
             logger.warning(f"Нет глав для книги ID {book_id}")
             return {"status": "error", "message": "No chapters found"}
 
-        # Объединяем текст всех глав
-        all_text = ""
-        for chapter in chapters:
-            if chapter.text_raw:
-                all_text += chapter.text_raw + " "
+        # Тексты всех глав
+        chapter_texts = [chapter.text_raw for chapter in chapters if chapter.text_raw and chapter.text_raw.strip()]
 
-        if not all_text.strip():
+        if not chapter_texts:
             logger.warning(f"Нет текста в главах книги ID {book_id}")
             return {"status": "error", "message": "No text in chapters"}
 
-        # Извлекаем слова из объединенного текста (обычный текст, не HTML)
-        all_words = extract_words_from_text_content(all_text)
+        # Считаем слова глав параллельно по блокам (обычный текст, не HTML)
+        word_counts = count_words_in_texts(chapter_texts)
 
-        if not all_words:
+        if not word_counts:
             logger.warning(f"Не удалось извлечь слова из глав книги ID {book_id}")
             return {"status": "error", "message": "No words extracted"}
 
         # Получаем статистику
-        total_words = len(all_words)
-        unique_words = len(set(all_words))
+        total_words = sum(word_counts.values())
+        unique_words = len(word_counts)
 
         logger.info(f"Извлечено {total_words} слов, {unique_words} уникальных из глав книги ID {book_id}")
 
@@ -646,49 +616,58 @@ def _process_book_chapters_words_internal(book_id: int) -> Dict:
         # Подготовка данных для вставки с обработкой по частям
         batch_size = 5000
         total_added = 0
+        # По алфавиту: параллельные импорты блокируют общие строки
+        # collection_words в одном порядке и не взаимоблокируются.
+        counted_words = sorted(word_counts.items())
+        link_data = []
 
-        # Очищаем старые записи для этой книги перед повторной обработкой
-        logger.info(f"Очистка старых записей word_book_link для книги ID {book_id}")
         repo = DatabaseRepository()
-        repo.clear_book_word_links(book_id)
-
-        for i in range(0, len(all_words), batch_size):
-            batch = all_words[i:i + batch_size]
-            word_data_batch = prepare_word_data(batch, brown_words)
-
-            # Создание репозитория для работы с БД
-            repo = DatabaseRepository()
-
-            # Обрабатываем пакет слов
-            batch_added = repo.process_batch_from_original_format(word_data_batch, book_id, batch_size=500)
-            total_added += batch_added
-
-            # Обновляем статус
-            processed_percent = min(100, int((i + len(batch)) / len(all_words) * 100))
-            processing_status[book_id] = {
-                **processing_status.get(book_id, {}),
-                "status": "processing",
-                "progress": processed_percent,
-                "message": f"Processing words from chapters: {processed_percent}% complete",
-                "words_processed_so_far": total_added
-            }
+        try:
+            # Каждый пакет collection_words фиксируется отдельно: блокировки
+            # строк словаря держатся один пакет, а не всю книгу.
+            for i in range(0, len(counted_words), batch_size):
+                batch = counted_words[i:i + batch_size]
+                word_data_batch = prepare_word_counts(dict(batch), brown_words)
 
-            # Принудительная сборка мусора
-            import gc
-            gc.collect()
+                with repo.transaction():
+                    link_data += repo.upsert_words_from_original_format(word_data_batch, book_id)
+
+                # Обновляем статус
+                processed_percent = min(100, int((i + len(batch)) / len(counted_words) * 100))
+                processing_status[book_id] = {
+                    **processing_status.get(book_id, {}),
+                    "status": "processing",
+                    "progress": processed_percent,
+                    "message": f"Processing words from chapters: {processed_percent}% complete",
+                    "words_processed_so_far": len(link_data)
+                }
+
+                # Принудительная сборка мусора
+                import gc
+                gc.collect()
+
+            # Старые связи книги заменяются новыми в одной транзакции:
+            # при ошибке остаются прежние, а не наполовину очищенные.
+            logger.info(f"Замена записей word_book_link для книги ID {book_id}")
+            with repo.transaction():
+                repo.clear_book_word_links(book_id)
+                repo.bulk_link_words_to_book(link_data)
+            total_added = len(link_data)
+        except psycopg2.Error as db_err:
+            logger.error(f"Ошибка записи слов книги {book_id}: {db_err}")
+            return {"status": "error", "message": f"Database error: {db_err}"}
 
         print(f"[BOOK PROCESSING] Книга {book_id}: слова обработаны, всего {total_words}, уникальных {unique_words}", flush=True)
         logger.warning(f"[BOOK PROCESSING] Книга {book_id}: слова обработаны, всего {total_words}, уникальных {unique_words}")
 
         # Поиск фразовых глаголов в тексте
         print(f"[BOOK PROCESSING] Книга {book_id}: поиск фразовых глаголов...", flush=True)
-        phrasal_verbs_found = find_phrasal_verbs_in_text(all_text, book_id)
+        phrasal_verbs_found = find_phrasal_verbs_in_text(chapter_texts, book_id)
         print(f"[BOOK PROCESSING] Книга {book_id}: найдено {phrasal_verbs_found} фразовых глаголов", flush=True)
         logger.warning(f"[BOOK PROCESSING] Книга {book_id}: найдено {phrasal_verbs_found} фразовых глаголов")
 
         # Обновляем статистику книги в конце
         print(f"[BOOK PROCESSING] Книга {book_id}: обновляем статистику...", flush=True)
-        repo = DatabaseRepository()
         repo.update_book_stats(book_id, total_words, unique_words)
         print(f"[BOOK PROCESSING] Книга {book_id}: статистика обновлена", flush=True)
         logger.warning(f"[BOOK PROCESSING] Книга {book_id}: статистика обновлена")
@@ -707,48 +686,48 @@ def _process_book_chapters_words_internal(book_id: int) -> Dict:
         }
 
 
-def extract_words_from_text_content(text_content: str) -> List[str]:
+def count_words_in_texts(texts: List[str]) -> Counter:
     """
-    Извлекает слова из обычного текстового контента (не HTML).
-    Используется для обработки глав книг.
+    Считает слова в обычных текстах (не HTML), например в главах книги.
+
+    Тексты группируются в блоки и обрабатываются параллельно в пуле процессов.
 
     Args:
-        text_content (str): Текстовый контент
+        texts (List[str]): Тексты в порядке чтения
 
     Returns:
-        List[str]: Список обработанных слов
+        Counter: Частоты обработанных слов
     """
     try:
         # Загружаем ресурсы NLTK
         download_nltk_resources()
-        english_vocab, brown_words, stop_words = initialize_nltk()
 
-        # Обрабатываем текст с помощью process_text
-        all_words = process_text(text_content, english_vocab, stop_words, brown_words)
+        blocks = list(split_into_blocks(texts))
+        word_counts = count_words_parallel(blocks)
 
-        logger.info(f"Извлечено {len(all_words)} слов из текстового контента")
-        return all_words
+        logger.info(f"Извлечено {sum(word_counts.values())} слов из {len(blocks)} блоков текста")
+        return word_counts
 
     except Exception as e:
         logger.error(f"Ошибка при извлечении слов из текста: {str(e)}")
-        return []
+        return Counter()
 
 
-def find_phrasal_verbs_in_text(content: str, book_id: int) -> int:
+def find_phrasal_verbs_in_text(content: Union[str, Iterable[str]], book_id: int) -> int:
     """
     Находит фразовые глаголы в тексте и создаёт связи с книгой.
 
+    Один проход по токенам каждого текста через закэшированный trie
+    (app/books/phrasal_matcher.py) и одна bulk-вставка всех связей.
+
     Args:
-        content: Текст для поиска
+        content: Текст для поиска или тексты глав (без склейки в одну строку)
         book_id: ID книги
 
     Returns:
         Количество найденных фразовых глаголов
     """
-    import re
-
-    text_lower = content.lower()
-    found_count = 0
+    from app.books.phrasal_matcher import get_matcher
 
     # Обновляем сессию перед запросом (соединение могло закрыться во время долгой обработки)
     try:
@@ -756,40 +735,36 @@ def find_phrasal_verbs_in_text(content: str, book_id: int) -> int:
     except Exception:
         pass
 
-    # Получаем все фразовые глаголы из CollectionWords
-    phrasal_verbs = CollectionWords.query.filter_by(item_type='phrasal_verb').all()
-
-    if not phrasal_verbs:
+    matcher = get_matcher(db.session)
+    if not matcher.size:
         logger.info("Нет фразовых глаголов в базе данных")
         return 0
 
-    logger.info(f"Поиск {len(phrasal_verbs)} фразовых глаголов в тексте книги {book_id}")
-
-    for pv in phrasal_verbs:
-        pv_text = pv.english_word.lower()
-        # Используем word boundary для точного совпадения
-        pattern = r'\b' + re.escape(pv_text) + r'\b'
-        matches = re.findall(pattern, text_lower)
-
-        if matches:
-            frequency = len(matches)
-            # Создаём связь фразового глагола с книгой
-            try:
-                db.session.execute(
-                    text("""
-                        INSERT INTO word_book_link (word_id, book_id, frequency)
-                        VALUES (:word_id, :book_id, :frequency)
-                        ON CONFLICT (word_id, book_id)
-                        DO UPDATE SET frequency = word_book_link.frequency + EXCLUDED.frequency
-                    """),
-                    {"word_id": pv.id, "book_id": book_id, "frequency": frequency}
-                )
-                found_count += 1
-            except Exception as e:
-                logger.error(f"Ошибка при добавлении связи для '{pv.english_word}': {e}")
+    logger.info(f"Поиск {matcher.size} фразовых глаголов в тексте книги {book_id}")
+    counts: Counter = Counter()
+    for part in ([content] if isinstance(content, str) else content):
+        counts.update(matcher.count(part))
+    if not counts:
+        return 0
 
-    if found_count > 0:
+    word_ids = list(counts)
+    try:
+        db.session.execute(
+            text("""
+                INSERT INTO word_book_link (word_id, book_id, frequency)
+                SELECT word_id, :book_id, frequency
+                FROM unnest(CAST(:word_ids AS integer[]), CAST(:frequencies AS integer[]))
+                     AS found(word_id, frequency)
+                ON CONFLICT (word_id, book_id)
+                DO UPDATE SET frequency = word_book_link.frequency + EXCLUDED.frequency
+            """),
+            {"book_id": book_id, "word_ids": word_ids, "frequencies": [counts[w] for w in word_ids]}
+        )
         db.session.commit()
-        logger.info(f"Найдено {found_count} фразовых глаголов в книге {book_id}")
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Ошибка при добавлении связей фразовых глаголов для книги {book_id}: {e}")
+        return 0
 
-    return found_count
+    logger.info(f"Найдено {len(word_ids)} фразовых глаголов в книге {book_id}")
+    return len(word_ids)
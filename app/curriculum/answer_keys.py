@@ -0,0 +1,127 @@
+# app/curriculum/answer_keys.py
+"""Precompiled answer keys for the per-item check endpoint.
+
+``/api/lesson/<id>/check-item`` runs on every blur/Enter of a gap-fill,
+translation, sentence-correction or collocation lesson. Building the
+candidate list and normalizing every accepted form on each call is wasted
+work: the lesson content only changes when an editor saves it.
+
+``lesson_keys(lesson)`` returns an immutable ``LessonKeys`` for the lesson,
+built once per process and content version. The version is
+``(type, content_version, updated_at)``; ``updated_at`` is bumped by the
+ORM ``onupdate`` on every save (admin editors, imports), so a stale entry is
+never served — not even by another worker that did not see the write — and
+is simply replaced on the next check.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, NamedTuple, Optional
+
+from app.curriculum.grading import _normalize_answer, _typo_tolerant
+from app.curriculum.similarity import matches_any
+
+# Lesson types graded item-by-item through check-item
+CHECKABLE_TYPES = frozenset({
+    'sentence_completion', 'audio_fill_blank', 'translation',
+    'sentence_correction', 'collocation_matching',
+})
+
+_MAX_LESSONS = 1024  # upper bound on lessons kept per process
+
+
+class ItemKey(NamedTuple):
+    canonical: str  # revealed to the learner once solved
+    accepted: frozenset  # normalized accepted forms
+    fuzzy: tuple  # accepted forms that also take one typo
+    explanation: Optional[str]
+
+    def matches(self, user_answer: str) -> bool:
+        """Same verdict as ``_strict_text_match`` over the item's candidates."""
+        normalized = _normalize_answer(user_answer)
+        if not normalized:
+            return False
+        if normalized in self.accepted:
+            return True
+        if ' ' in normalized:
+            return False
+        return matches_any(normalized, self.fuzzy, max_distance=1)
+
+
+class LessonKeys(NamedTuple):
+    lesson_type: str
+    items: tuple
+
+
+def _item_key(item: dict, is_collocation: bool) -> ItemKey:
+    if not isinstance(item, dict):
+        item = {}
+    # collocation_matching grades a (phrase, translation) pair: the canonical
+    # is the phrase's `translation` (sentence_correction items also carry an
+    # unrelated `translation` field, hence the separate branch).
+    if is_collocation:
+        canonical = str(item.get('translation') or '')
+        extra = []
+    else:
+        # sentence_completion / audio_fill_blank use `answer` (+ acceptable_answers);
+        # translation uses `english` (+ alternatives); sentence_correction uses
+        # `correct_sentence`.
+        canonical = str(
+            item.get('answer') or item.get('english')
+            or item.get('correct_sentence') or ''
+        )
+        extra = list(item.get('acceptable_answers') or []) + list(item.get('alternatives') or [])
+
+    forms = [_normalize_answer(c) for c in [canonical] + [str(a) for a in extra if str(a).strip()]]
+    forms = [f for f in dict.fromkeys(forms) if f]
+    # A matching game has a CLOSED answer set: exact normalized equality only,
+    # a 1-edit window could accept a near-duplicate wrong translation.
+    fuzzy = () if is_collocation else tuple(f for f in forms if _typo_tolerant(f))
+    explanation = item.get('explanation')
+    return ItemKey(
+        canonical=canonical,
+        accepted=frozenset(forms),
+        fuzzy=fuzzy,
+        explanation=str(explanation) if explanation else None,
+    )
+
+
+def compile_lesson_keys(lesson_type: str, content: Any) -> LessonKeys:
+    """Parse ``content`` and precompile one ``ItemKey`` per gradable item."""
+    content = content if isinstance(content, dict) else {}
+    is_collocation = lesson_type == 'collocation_matching'
+    # collocation_matching stores its rows under `pairs` (rendered in that
+    # order), the per-item lesson types under `items`.
+    items = content.get('pairs' if is_collocation else 'items') or []
+    if not isinstance(items, list):
+        items = []
+    return LessonKeys(lesson_type, tuple(_item_key(item, is_collocation) for item in items))
+
+
+_lock = threading.Lock()
+_keys: dict = {}  # lesson_id -> (version, LessonKeys)
+
+
+def _version(lesson) -> tuple:
+    return (lesson.type, lesson.content_version, lesson.updated_at)
+
+
+def lesson_keys(lesson) -> LessonKeys:
+    """Precompiled keys for ``lesson``, rebuilt when its content version changes."""
+    version = _version(lesson)
+    entry = _keys.get(lesson.id)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    keys = compile_lesson_keys(lesson.type, lesson.content)
+    with _lock:
+        _keys.pop(lesson.id, None)
+        while len(_keys) >= _MAX_LESSONS:
+            _keys.pop(next(iter(_keys)))
+        _keys[lesson.id] = (version, keys)
+    return keys
+
+
+def clear() -> None:
+    with _lock:
+        _keys.clear()
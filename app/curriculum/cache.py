@@ -3,62 +3,182 @@
 import hashlib
 import json
 import logging
+import pickle
+import time
 from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from flask_login import current_user
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 
 _CACHE_MAX_SIZE = 2000  # hard upper bound to prevent unbounded growth
+_L1_TTL = 5  # seconds a value may live in a worker's local tier over a shared backend
+_TAG_INDEX_TTL = 86400  # minimum lifetime of a Redis tag set; longer than any entry timeout
+_DELETE_BATCH = 500  # keys per Redis DEL when clearing or invalidating
 
 
-class SimpleCache:
+def user_tag(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+def lesson_tag(lesson_id: int) -> str:
+    return f'lesson:{lesson_id}'
+
+
+def module_tag(module_id: int) -> str:
+    return f'module:{module_id}'
+
+
+def level_tag(level_id: int) -> str:
+    return f'level:{level_id}'
+
+
+def book_tag(book_id: int) -> str:
+    return f'book:{book_id}'  # chapter index and chapter payloads of a book
+
+
+LEVELS_TAG = 'levels'  # list of all CEFR levels
+CONCORDANCE_TAG = 'concordance'  # in-book usage hit lists (span every book)
+
+
+class CacheBackend:
+    """
+    Interface shared by the cache implementations below.
+
+    Entries may carry tags (``user:42``, ``lesson:7``...). Each backend keeps
+    a tag -> keys index, so ``invalidate_tags`` touches only the affected
+    keys instead of scanning or clearing the whole cache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+        """Return ``(value, tags)`` or None; backends that keep tags override this."""
+        value = self.get(key)
+        return (value, ()) if value is not None else None
+
+    def set(self, key: str, value: Any, timeout: int = 300, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def delete_by_pattern(self, pattern: str) -> int:
+        raise NotImplementedError
+
+    def invalidate_tags(self, *tags: str) -> int:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+    def _record(self, value: Optional[Any]) -> Optional[Any]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of this worker's cache instance (for the admin dashboard)."""
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self).__name__,
+            'size': self.size(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+class SimpleCache(CacheBackend):
     """Simple in-memory cache implementation"""
 
     def __init__(self):
+        super().__init__()
         self._cache = {}
         self._expiry = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Tuple[str, ...]] = {}
 
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         if key in self._cache:
             # Check if expired
             if key in self._expiry and datetime.now(timezone.utc) > self._expiry[key]:
-                self.delete(key)
-                return None
-            return self._cache[key]
-        return None
+                self._remove(key)
+                self.evictions += 1
+                return self._record(None)
+            return self._record(self._cache[key])
+        return self._record(None)
 
-    def set(self, key: str, value: Any, timeout: int = 300) -> None:
+    def set(self, key: str, value: Any, timeout: int = 300, tags: Iterable[str] = ()) -> None:
         """Set value in cache with timeout in seconds"""
+        if key in self._cache:
+            # Re-insert so dict order stays "oldest write first" for eviction
+            self._remove(key)
         self._cache[key] = value
         if timeout:
             self._expiry[key] = datetime.now(timezone.utc) + timedelta(seconds=timeout)
-        # Prune expired entries when the cache grows too large.
+        tags = tuple(tags)
+        if tags:
+            self._key_tags[key] = tags
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+        # Prune expired entries when the cache grows too large; if that is not
+        # enough, drop the oldest writes to keep the hard bound.
         if len(self._cache) > _CACHE_MAX_SIZE:
             self.prune()
+            while len(self._cache) > _CACHE_MAX_SIZE:
+                self._remove(next(iter(self._cache)))
+                self.evictions += 1
 
     def prune(self) -> int:
         """Remove all expired entries. Returns count of removed keys."""
         now = datetime.now(timezone.utc)
         expired = [k for k, exp in list(self._expiry.items()) if now > exp]
         for key in expired:
-            self._cache.pop(key, None)
-            self._expiry.pop(key, None)
+            self._remove(key)
+        self.evictions += len(expired)
         return len(expired)
 
-    def delete(self, key: str) -> None:
-        """Delete key from cache"""
+    def _remove(self, key: str) -> None:
         self._cache.pop(key, None)
         self._expiry.pop(key, None)
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def delete(self, key: str) -> None:
+        """Delete key from cache"""
+        self._remove(key)
 
     def clear(self) -> None:
         """Clear all cache"""
         self._cache.clear()
         self._expiry.clear()
+        self._tags.clear()
+        self._key_tags.clear()
 
     def delete_by_pattern(self, pattern: str) -> int:
         """Delete all keys containing pattern. Returns count of deleted keys."""
@@ -67,13 +187,192 @@ class SimpleCache:
             self.delete(key)
         return len(keys_to_delete)
 
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying any of ``tags``. Returns count of deleted keys."""
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
     def size(self) -> int:
         """Get cache size"""
         return len(self._cache)
 
 
+class RedisCache(CacheBackend):
+    """
+    Cache shared by all workers, stored in Redis.
+
+    Keys live under ``<namespace>:`` so clear() and delete_by_pattern() never
+    touch other Redis users (rate limiter, Celery). Values are pickled.
+    The tag index is one Redis sorted set per tag under ``<namespace>-tags:``,
+    scored by the member's expiry time: every write prunes the members that
+    already expired, so a hot tag holds only live entries. A value and its tag
+    writes go out in one pipeline; deletions are sent in batches.
+    """
+
+    def __init__(self, client, namespace: str = 'curriculum-cache'):
+        super().__init__()
+        self._client = client
+        self._prefix = f'{namespace}:'
+        self._tag_prefix = f'{namespace}-tags:'
+
+    def _scan(self, pattern: str = '', prefix: Optional[str] = None) -> Iterator[str]:
+        prefix = prefix or self._prefix
+        # Glob-escape the pattern so it matches literally, as in SimpleCache
+        match = f'{prefix}*{_glob_escape(pattern)}*' if pattern else f'{prefix}*'
+        return self._client.scan_iter(match=match, count=_DELETE_BATCH)
+
+    def _delete_keys(self, keys: Iterable[str]) -> int:
+        deleted = 0
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= _DELETE_BATCH:
+                deleted += self._client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += self._client.delete(*batch)
+        return deleted
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+        raw = self._client.get(self._prefix + key)
+        entry = pickle.loads(raw) if raw is not None else None
+        self._record(entry)
+        return entry
+
+    def set(self, key: str, value: Any, timeout: int = 300, tags: Iterable[str] = ()) -> None:
+        full_key = self._prefix + key
+        tags = tuple(tags)
+        now = time.time()
+        expires_at = now + timeout if timeout else float('inf')
+        pipe = self._client.pipeline(transaction=False)
+        # Tags travel with the value so an L1 tier can index entries it reads
+        pipe.set(full_key, pickle.dumps((value, tags)), ex=timeout or None)
+        for tag in tags:
+            tag_key = self._tag_prefix + tag
+            pipe.zadd(tag_key, {full_key: expires_at})
+            pipe.zremrangebyscore(tag_key, '-inf', now)
+            if timeout:
+                pipe.expire(tag_key, max(timeout, _TAG_INDEX_TTL))
+            else:
+                pipe.persist(tag_key)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def clear(self) -> None:
+        self._delete_keys(self._scan())
+        self._delete_keys(self._scan(prefix=self._tag_prefix))
+
+    def delete_by_pattern(self, pattern: str) -> int:
+        return self._delete_keys(self._scan(pattern))
+
+    def invalidate_tags(self, *tags: str) -> int:
+        deleted = 0
+        for tag in tags:
+            tag_key = self._tag_prefix + tag
+            now = time.time()
+            # Members scored in the past point at entries Redis already expired
+            live = (
+                member for member, expires_at in self._client.zscan_iter(tag_key, count=_DELETE_BATCH)
+                if expires_at > now
+            )
+            deleted += self._delete_keys(live)
+            self._client.delete(tag_key)
+        self.invalidations += deleted
+        return deleted
+
+    def size(self) -> int:
+        return sum(1 for _ in self._scan())
+
+
+def _glob_escape(pattern: str) -> str:
+    return ''.join(f'[{ch}]' if ch in '*?[]\\' else ch for ch in pattern)
+
+
+class TieredCache(CacheBackend):
+    """
+    Shared backend with a short-lived in-process L1 tier in front of it.
+
+    L1 entries live at most ``l1_ttl`` seconds, so an invalidation issued
+    by another worker is visible here within that window. Errors from the
+    shared backend are logged and the L1 tier keeps serving, so a Redis
+    outage degrades to per-worker caching instead of failing requests.
+    """
+
+    def __init__(self, shared: CacheBackend, l1_ttl: int = _L1_TTL):
+        super().__init__()
+        self.shared = shared
+        self.local = SimpleCache()
+        self.l1_ttl = l1_ttl
+
+    def _l1_timeout(self, timeout: int) -> int:
+        return min(timeout, self.l1_ttl) if timeout else self.l1_ttl
+
+    def _shared_call(self, method: str, *args, default=None):
+        try:
+            return getattr(self.shared, method)(*args)
+        except Exception as e:
+            logger.warning(f"Shared cache {method} failed: {e}")
+            return default
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            return self._record(value)
+        entry = self._shared_call('get_entry', key)
+        if entry is None:
+            return self._record(None)
+        value, tags = entry
+        if self.l1_ttl > 0:
+            self.local.set(key, value, self.l1_ttl, tags)
+        return self._record(value)
+
+    def set(self, key: str, value: Any, timeout: int = 300, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        if self.l1_ttl > 0:
+            self.local.set(key, value, self._l1_timeout(timeout), tags)
+        self._shared_call('set', key, value, timeout, tags)
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        self._shared_call('delete', key)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self._shared_call('clear')
+
+    def delete_by_pattern(self, pattern: str) -> int:
+        local_deleted = self.local.delete_by_pattern(pattern)
+        return self._shared_call('delete_by_pattern', pattern, default=local_deleted)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        local_deleted = self.local.invalidate_tags(*tags)
+        deleted = self._shared_call('invalidate_tags', *tags, default=local_deleted)
+        self.invalidations += deleted
+        return deleted
+
+    def size(self) -> int:
+        return self._shared_call('size', default=self.local.size())
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats['evictions'] = self.local.evictions
+        stats['l1_size'] = self.local.size()
+        return stats
+
+
 # Global cache instance
-cache = SimpleCache()
+cache: CacheBackend = SimpleCache()
 
 
 def cache_key(*args, **kwargs) -> str:
@@ -87,25 +386,33 @@ def cache_key(*args, **kwargs) -> str:
     return hashlib.md5(key_string.encode()).hexdigest()
 
 
-def cached(timeout: int = 300, key_prefix: str = '', user_specific: bool = False):
+def cached(timeout: int = 300, key_prefix: str = '', user_specific: bool = False,
+           tags: Iterable[Callable[..., Any]] = ()):
     """
     Decorator to cache function results
     
     Args:
         timeout: Cache timeout in seconds
         key_prefix: Prefix for cache key
-        user_specific: Whether to include user ID in cache key
+        user_specific: Whether to include user ID in cache key (also tags the entry ``user:<id>``)
+        tags: Functions called with the decorated function's arguments; each
+            returns a tag, an iterable of tags or None
     """
+    tag_functions = tuple(tags)
 
     def decorator(f):
+        function_tag = f"fn:{key_prefix}:{f.__name__}"
+
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # Build cache key
             cache_key_parts = [key_prefix, f.__name__]
+            entry_tags = [function_tag]
 
             # Add user ID if user-specific caching
             if user_specific and current_user.is_authenticated:
                 cache_key_parts.append(f"user_{current_user.id}")
+                entry_tags.append(user_tag(current_user.id))
 
             # Add function arguments
             cache_key_parts.append(cache_key(*args, **kwargs))
@@ -121,13 +428,20 @@ def cached(timeout: int = 300, key_prefix: str = '', user_specific: bool = False
             # Execute function and cache result
             logger.debug(f"Cache miss for {f.__name__}")
             result = f(*args, **kwargs)
-            cache.set(key, result, timeout)
+
+            for tag_function in tag_functions:
+                tag = tag_function(*args, **kwargs)
+                if isinstance(tag, str):
+                    entry_tags.append(tag)
+                elif tag is not None:
+                    entry_tags.extend(tag)
+            cache.set(key, result, timeout, tags=entry_tags)
 
             return result
 
         # Add cache management methods
-        decorated_function.cache_clear = lambda: cache.clear()
-        decorated_function.cache_info = lambda: {'size': cache.size()}
+        decorated_function.cache_clear = lambda: cache.invalidate_tags(function_tag)
+        decorated_function.cache_info = lambda: {'size': cache.size(), **cache.stats()}
 
         return decorated_function
 
@@ -138,7 +452,8 @@ class CurriculumCache:
     """Specialized cache for curriculum data"""
 
     @staticmethod
-    @cached(timeout=600, key_prefix='curriculum', user_specific=False)
+    @cached(timeout=600, key_prefix='curriculum', user_specific=False,
+            tags=[lambda: LEVELS_TAG])
     def get_all_levels() -> List[Dict]:
         """Cache all CEFR levels"""
         from app.curriculum.models import CEFRLevel
@@ -153,7 +468,8 @@ class CurriculumCache:
         } for level in levels]
 
     @staticmethod
-    @cached(timeout=300, key_prefix='curriculum', user_specific=False)
+    @cached(timeout=300, key_prefix='curriculum', user_specific=False,
+            tags=[lambda level_id: level_tag(level_id)])
     def get_level_modules(level_id: int) -> List[Dict]:
         """Cache modules for a level"""
         from app.curriculum.models import Module
@@ -171,7 +487,8 @@ class CurriculumCache:
         } for module in modules]
 
     @staticmethod
-    @cached(timeout=180, key_prefix='curriculum', user_specific=False)
+    @cached(timeout=180, key_prefix='curriculum', user_specific=False,
+            tags=[lambda module_id: module_tag(module_id)])
     def get_module_lessons(module_id: int) -> List[Dict]:
         """Cache lessons for a module"""
         from app.curriculum.models import Lessons
@@ -191,14 +508,16 @@ class CurriculumCache:
         } for lesson in lessons]
 
     @staticmethod
-    @cached(timeout=60, key_prefix='curriculum', user_specific=True)
+    @cached(timeout=60, key_prefix='curriculum', user_specific=True,
+            tags=[lambda user_id: user_tag(user_id)])
     def get_user_progress(user_id: int) -> Dict:
         """Cache user progress data"""
         from app.curriculum.services.progress_service import ProgressService
         return ProgressService.get_user_level_progress(user_id)
 
     @staticmethod
-    @cached(timeout=120, key_prefix='curriculum', user_specific=True)
+    @cached(timeout=120, key_prefix='curriculum', user_specific=True,
+            tags=[lambda user_id, limit=5: user_tag(user_id)])
     def get_user_active_lessons(user_id: int, limit: int = 5) -> List[Dict]:
         """Cache user active lessons"""
         from app.curriculum.services.progress_service import ProgressService
@@ -217,7 +536,8 @@ class CurriculumCache:
         } for item in active_lessons]
 
     @staticmethod
-    @cached(timeout=300, key_prefix='curriculum', user_specific=True)
+    @cached(timeout=300, key_prefix='curriculum', user_specific=True,
+            tags=[lambda user_id: user_tag(user_id)])
     def get_user_srs_stats(user_id: int) -> Dict:
         """Cache user SRS statistics"""
         from app.curriculum.services.srs_service import SRSService
@@ -226,22 +546,96 @@ class CurriculumCache:
     @staticmethod
     def invalidate_user_cache(user_id: int):
         """Invalidate all cache entries for a user"""
-        deleted = cache.delete_by_pattern(f"user_{user_id}")
-        # Also delete the XP cache stored by template_utils
+        deleted = cache.invalidate_tags(user_tag(user_id))
+        # XP cache stored by template_utils (tagged too; kept for entries of older workers)
         cache.delete(f"user_xp_{user_id}")
-        logger.info(f"Invalidated {deleted + 1} cache entries for user {user_id}")
+        logger.info(f"Invalidated {deleted} cache entries for user {user_id}")
 
     @staticmethod
-    def invalidate_lesson_cache(lesson_id: int):
-        """Invalidate cache entries related to a lesson"""
-        cache.clear()  # For now, clear all cache
-        logger.info(f"Invalidated cache for lesson {lesson_id}")
+    def invalidate_lesson_cache(lesson_id: int, module_id: Optional[int] = None):
+        """Invalidate cache entries related to a lesson (and its module's lesson list)"""
+        tags = [lesson_tag(lesson_id)]
+        if module_id is not None:
+            tags.append(module_tag(module_id))
+        deleted = cache.invalidate_tags(*tags)
+        logger.info(f"Invalidated {deleted} cache entries for lesson {lesson_id}")
 
     @staticmethod
-    def invalidate_module_cache(module_id: int):
-        """Invalidate cache entries related to a module"""
-        cache.clear()  # For now, clear all cache
-        logger.info(f"Invalidated cache for module {module_id}")
+    def invalidate_module_cache(module_id: int, level_id: Optional[int] = None):
+        """Invalidate cache entries related to a module (and its level's module list)"""
+        tags = [module_tag(module_id)]
+        if level_id is not None:
+            tags.append(level_tag(level_id))
+        deleted = cache.invalidate_tags(*tags)
+        logger.info(f"Invalidated {deleted} cache entries for module {module_id}")
+
+
+_SESSION_TAGS_KEY = 'curriculum_cache_tags'
+
+
+def _structure_tags(target) -> Set[str]:
+    """Tags made stale by a write to a level, module, lesson or chapter row."""
+    from app.books.models import Chapter
+    from app.curriculum.models import Lessons, Module
+
+    if isinstance(target, Chapter):
+        tags = {CONCORDANCE_TAG}
+        parent_attr, parent_tag = 'book_id', book_tag
+    elif isinstance(target, Lessons):
+        tags = {lesson_tag(target.id)}
+        parent_attr, parent_tag = 'module_id', module_tag
+    elif isinstance(target, Module):
+        tags = {module_tag(target.id)}
+        parent_attr, parent_tag = 'level_id', level_tag
+    else:
+        return {level_tag(target.id), LEVELS_TAG}
+
+    # Both the old and the new parent list the row when it moves
+    history = inspect(target).attrs[parent_attr].history
+    for parent_id in (*history.unchanged, *history.added, *history.deleted):
+        if parent_id is not None:
+            tags.add(parent_tag(parent_id))
+    return tags
+
+
+def _collect_structure_tags(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_SESSION_TAGS_KEY, set()).update(_structure_tags(target))
+
+
+def _invalidate_after_commit(session):
+    tags = session.info.pop(_SESSION_TAGS_KEY, None)
+    if tags:
+        try:
+            cache.invalidate_tags(*tags)
+        except Exception as e:
+            logger.warning(f"Curriculum cache invalidation failed: {e}")
+
+
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop(_SESSION_TAGS_KEY, None)
+
+
+def register_invalidation_listeners():
+    """
+    Invalidate structure caches when levels, modules, lessons or book
+    chapters change.
+
+    Tags are collected at flush time and invalidated after commit, so every
+    admin edit path (forms, imports, book courses) is covered without each
+    route having to remember a cache call.
+    """
+    from app.books.models import Chapter
+    from app.curriculum.models import CEFRLevel, Lessons, Module
+
+    for model in (CEFRLevel, Module, Lessons, Chapter):
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            if not event.contains(model, name, _collect_structure_tags):
+                event.listen(model, name, _collect_structure_tags)
+    if not event.contains(Session, 'after_commit', _invalidate_after_commit):
+        event.listen(Session, 'after_commit', _invalidate_after_commit)
+        event.listen(Session, 'after_soft_rollback', _discard_after_rollback)
 
 
 def warm_cache():
@@ -273,11 +667,28 @@ def warm_cache():
 
 
 def init_cache(app, redis_client=None):
-    """Initialize cache system"""
+    """
+    Initialize cache system.
+
+    With ``CACHE_REDIS_URL`` configured (or an explicit ``redis_client``),
+    values are shared by all workers through Redis behind a short-lived
+    in-process tier. Otherwise each worker keeps its own SimpleCache.
+    """
     global cache
 
-    cache = SimpleCache()
-    logger.info("Initialized simple cache")
+    register_invalidation_listeners()
+
+    redis_url = app.config.get('CACHE_REDIS_URL')
+    if redis_client is None and redis_url and not app.config.get('TESTING', False):
+        import redis
+        redis_client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    if redis_client is not None:
+        cache = TieredCache(RedisCache(redis_client), l1_ttl=app.config.get('CACHE_L1_TTL', _L1_TTL))
+        logger.info("Initialized Redis-backed curriculum cache")
+    else:
+        cache = SimpleCache()
+        logger.info("Initialized simple cache")
 
     # Warm the per-worker cache on startup — only when serving web traffic.
     # Skip in testing (tests handle their own setup) and in one-off
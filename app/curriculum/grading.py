@@ -8,6 +8,7 @@ from datetime import UTC, datetime, timedelta
 from typing import Optional
 
 from app.curriculum.constants import PASSING_SCORE_DEFAULT, PASSING_SCORE_DICTATION
+from app.curriculum.similarity import edit_distance, matches_any
 from app.utils.normalization import normalize_text
 
 logger = logging.getLogger(__name__)
@@ -91,20 +92,16 @@ def _normalize_answer(s):
 
 def _levenshtein(a, b):
     """Compute Levenshtein edit distance between two strings."""
-    if a == b:
-        return 0
-    if not a:
-        return len(b)
-    if not b:
-        return len(a)
-    prev = list(range(len(b) + 1))
-    for i, ca in enumerate(a, 1):
-        curr = [i] + [0] * len(b)
-        for j, cb in enumerate(b, 1):
-            cost = 0 if ca == cb else 1
-            curr[j] = min(curr[j - 1] + 1, prev[j] + 1, prev[j - 1] + cost)
-        prev = curr
-    return prev[-1]
+    return edit_distance(a, b)
+
+
+def _typo_tolerant(normalized):
+    """True when a normalized answer accepts a one-edit typo.
+
+    Only single words of 4+ characters: on shorter tokens a 1-edit window
+    admits substantively different words (e.g. "is"/"in", "a"/"o").
+    """
+    return ' ' not in normalized and len(normalized) >= 4
 
 
 def _strict_text_match(user_answer, candidates):
@@ -120,25 +117,13 @@ def _strict_text_match(user_answer, candidates):
     user_normalized = _normalize_answer(user_answer)
     if not user_normalized:
         return False
-    for candidate in candidates:
-        if candidate is None:
-            continue
-        correct_normalized = _normalize_answer(candidate)
-        if not correct_normalized:
-            continue
-        if user_normalized == correct_normalized:
-            return True
-        # Typo tolerance only for single-word answers >=4 chars; on shorter
-        # tokens a 1-edit window admits substantively different words
-        # (e.g. "is"/"in", "a"/"o").
-        if (
-            ' ' not in correct_normalized
-            and ' ' not in user_normalized
-            and len(correct_normalized) >= 4
-        ):
-            if _levenshtein(user_normalized, correct_normalized) <= 1:
-                return True
-    return False
+    normalized = [_normalize_answer(c) for c in candidates if c is not None]
+    normalized = [c for c in normalized if c]
+    if user_normalized in normalized:
+        return True
+    if ' ' in user_normalized:
+        return False
+    return matches_any(user_normalized, [c for c in normalized if _typo_tolerant(c)], max_distance=1)
 
 
 def _grade_matching_pairs(user_pairs, correct_pairs):
@@ -469,56 +469,30 @@ def check_sentence_completion_item(lesson_id):
     (``final=true`` after MAX_ATTEMPTS) — a pending item's answer is never leaked.
     Rate-limited to blunt brute-force extraction via crafted requests.
     """
+    from app.curriculum.answer_keys import CHECKABLE_TYPES, lesson_keys
+
+    # Already in the identity map: require_lesson_access loaded it.
     lesson = Lessons.query.get_or_404(lesson_id)
-    if lesson.type not in ('sentence_completion', 'audio_fill_blank',
-                           'translation', 'sentence_correction',
-                           'collocation_matching'):
+    if lesson.type not in CHECKABLE_TYPES:
         return jsonify({'success': False, 'error': 'invalid_lesson_type'}), 400
-    content = lesson.content if isinstance(lesson.content, dict) else {}
-    # collocation_matching stores its rows under `pairs`; the per-item lesson
-    # types use `items`. The phrase column is rendered in `pairs` order, so the
-    # phrase index maps directly onto items[index].
-    items_key = 'pairs' if lesson.type == 'collocation_matching' else 'items'
-    items = content.get(items_key, [])
+    # Parsed once per content version (see app/curriculum/answer_keys.py); the
+    # phrase column of collocation_matching is rendered in `pairs` order, so
+    # the index maps directly onto the keys.
+    keys = lesson_keys(lesson).items
     data = request.get_json(silent=True) or {}
     try:
         idx = int(data.get('index'))
     except (TypeError, ValueError):
         return jsonify({'success': False, 'error': 'bad_index'}), 400
-    if idx < 0 or idx >= len(items):
+    if idx < 0 or idx >= len(keys):
         return jsonify({'success': False, 'error': 'index_out_of_range'}), 400
 
-    from app.curriculum.grading import _strict_text_match, _normalize_answer
-    item = items[idx]
+    key = keys[idx]
     is_collocation = lesson.type == 'collocation_matching'
-    # Canonical answer field varies by lesson type. collocation_matching grades
-    # a (phrase, translation) pair: the canonical is the phrase's `translation`
-    # (kept separate from the chain below because sentence_correction items also
-    # carry an unrelated `translation` field).
-    if is_collocation:
-        canonical = str(item.get('translation') or '')
-        extra = []
-    else:
-        # sentence_completion / audio_fill_blank use `answer` (+ acceptable_answers);
-        # translation uses `english` (+ alternatives); sentence_correction uses
-        # `correct_sentence`. Accept all valid surface forms.
-        canonical = str(
-            item.get('answer') or item.get('english')
-            or item.get('correct_sentence') or ''
-        )
-        extra = list(item.get('acceptable_answers') or []) + list(item.get('alternatives') or [])
-    candidates = [canonical] + [str(a) for a in extra if str(a).strip()]
-    user_answer = str(data.get('answer', ''))
-    if is_collocation:
-        # A matching game has a CLOSED answer set, so grade by exact normalized
-        # equality (matching the authoritative /submit grader). _strict_text_match's
-        # Levenshtein-1 tolerance could mark a near-duplicate wrong translation
-        # "correct", consuming the real one and soft-locking the lesson.
-        is_correct = bool(user_answer.strip()) and (
-            _normalize_answer(user_answer) == _normalize_answer(canonical)
-        )
-    else:
-        is_correct = _strict_text_match(user_answer, candidates)
+    # collocation_matching keys are exact-only: a matching game has a CLOSED
+    # answer set and a typo window could mark a near-duplicate wrong
+    # translation "correct", consuming the real one and soft-locking the lesson.
+    is_correct = key.matches(str(data.get('answer', '')))
     resp = {'success': True, 'correct': is_correct}
     # Reveal the canonical answer when solved, or on a final (give-up) try. The
     # `final` give-up reveal does NOT apply to collocation_matching: that client
@@ -526,12 +500,11 @@ def check_sentence_completion_item(lesson_id):
     # the whole phrase→translation key. Collocation corrections come from /submit.
     reveal = is_correct or (bool(data.get('final')) and not is_collocation)
     if reveal:
-        resp['answer'] = canonical
+        resp['answer'] = key.canonical
         # sentence_correction reveals a per-item explanation alongside the
         # answer; other types have no `explanation` field so this is omitted.
-        explanation = item.get('explanation')
-        if explanation:
-            resp['explanation'] = str(explanation)
+        if key.explanation:
+            resp['explanation'] = key.explanation
     return jsonify(resp)
 
 
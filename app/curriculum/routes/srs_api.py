@@ -73,7 +73,7 @@ def get_srs_session():
 @login_required
 def grade_card():
     """
-    POST /api/v1/srs/grade {card_id, rating, session_key}
+    POST /api/v1/srs/grade {card_id, rating, session_key, elapsed_ms?}
 
     Unified Rating Scale (1-2-3):
         1 - Не знаю (Don't know): Reset, show in 1-2 cards
@@ -120,12 +120,18 @@ def grade_card():
             if not isinstance(rating, int) or rating < 1 or rating > 3:
                 return jsonify({'error': 'rating must be 1, 2, or 3'}), 400
 
+        # Optional answer time for the review log; ignore anything malformed
+        elapsed_ms = data.get('elapsed_ms')
+        if not isinstance(elapsed_ms, int) or isinstance(elapsed_ms, bool) or elapsed_ms < 0:
+            elapsed_ms = None
+
         # Use unified SRS service
         result = unified_srs_service.grade_card(
             card_id=card_id,
             rating=rating,
             user_id=current_user.id,
-            session_key=session_key
+            session_key=session_key,
+            elapsed_ms=elapsed_ms
         )
 
         if not result['success']:
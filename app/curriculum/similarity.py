@@ -0,0 +1,113 @@
+# app/curriculum/similarity.py
+"""Bounded edit distance for answer grading.
+
+Graders never need the exact Levenshtein distance of two long strings, only
+whether it stays within a small bound (``_strict_text_match`` accepts one
+typo). The full O(n·m) matrix is wasted work for that question, so:
+
+- ``edit_distance(a, b, max_distance)`` strips the common prefix/suffix,
+  only fills the diagonal band of width ``2·max_distance + 1`` and stops as
+  soon as a whole row exceeds the bound — O(max_distance·n);
+- ``within_one_edit(a, b)`` answers the ≤1 case in a single linear scan;
+- ``matches_any(answer, candidates, max_distance)`` compares one answer
+  against many candidates, skipping those whose length alone rules them out.
+
+Distances larger than ``max_distance`` are reported as ``max_distance + 1``.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+
+def _trim_common_affixes(a: str, b: str) -> tuple[str, str]:
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    return a[start:end_a], b[start:end_b]
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Levenshtein distance of ``a`` and ``b``, capped at ``max_distance + 1``.
+
+    With ``max_distance=None`` the exact distance is returned.
+    """
+    if a == b:
+        return 0
+    a, b = _trim_common_affixes(a, b)
+    if len(a) > len(b):
+        a, b = b, a
+    n, m = len(a), len(b)
+    if max_distance is None:
+        max_distance = m
+    over = max_distance + 1
+    if m - n > max_distance:
+        return over
+    if n == 0:
+        return m
+
+    # Only cells with |i - j| <= max_distance can hold a value within the
+    # bound, so each row keeps just that band: slot d holds column
+    # j = i + d - max_distance. Everything outside the band counts as `over`.
+    width = 2 * max_distance + 1
+    prev = [d - max_distance if d >= max_distance else over for d in range(width)]
+    for i in range(1, n + 1):
+        ca = a[i - 1]
+        curr = [over] * width
+        row_min = over
+        for d in range(width):
+            j = i + d - max_distance
+            if j < 0 or j > m:
+                continue
+            if j == 0:
+                value = i if i <= max_distance else over
+            else:
+                value = prev[d] + (0 if ca == b[j - 1] else 1)  # substitution / match
+                if d + 1 < width and prev[d + 1] + 1 < value:  # deletion
+                    value = prev[d + 1] + 1
+                if d > 0 and curr[d - 1] + 1 < value:  # insertion
+                    value = curr[d - 1] + 1
+                if value > over:
+                    value = over
+            curr[d] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        prev = curr
+    return min(prev[m - n + max_distance], over)
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """True when ``a`` and ``b`` differ by at most one insertion, deletion or substitution."""
+    if a == b:
+        return True
+    if len(a) > len(b):
+        a, b = b, a
+    n, m = len(a), len(b)
+    if m - n > 1:
+        return False
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    if n == m:
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def matches_any(answer: str, candidates: Iterable[str], max_distance: int = 1) -> bool:
+    """True when some candidate is within ``max_distance`` edits of ``answer``."""
+    length = len(answer)
+    for candidate in candidates:
+        if abs(len(candidate) - length) > max_distance:
+            continue
+        if max_distance == 1:
+            if within_one_edit(answer, candidate):
+                return True
+        elif edit_distance(answer, candidate, max_distance) <= max_distance:
+            return True
+    return False
@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import JSON, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy import JSON, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.utils.db import db
@@ -78,6 +78,23 @@ class DailyPlanEvent(db.Model):
     )
 
 
+class DailyStatusSnapshot(db.Model):
+    """Last /api/daily-status payload per user (see app/daily_plan/status_projection.py).
+
+    ``version`` is bumped by activity and settings writes; the payload is
+    current while ``built_version`` still equals it.
+    """
+    __tablename__ = 'daily_status_snapshots'
+
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    local_date = Column(Date, nullable=False)
+    tz = Column(String(50), nullable=False)
+    version = Column(Integer, nullable=False, default=0, server_default='0')
+    built_version = Column(Integer, nullable=False, default=0, server_default='0')
+    payload = Column(Text, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
+
+
 class MissionType(enum.Enum):
     """progress = advance in primary course, repair = fix weak spots (SRS/grammar), reading = book-first session, listening = dictation/listening_immersion focus."""
     progress = "progress"
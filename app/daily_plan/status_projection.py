@@ -0,0 +1,158 @@
+"""Materialized /api/daily-status payload, one row per user.
+
+The dashboard polls ``/api/daily-status``, and every call used to rebuild the
+unified plan, the daily and yesterday summaries, four skill streaks, goal
+progress and the adaptive tier, plus several idempotent writes. Between two
+polls nothing usually changed.
+
+``DailyStatusSnapshot`` keeps the last serialized payload with two counters:
+
+- ``version`` is bumped in the writing transaction whenever something the
+  payload depends on changes: any activity recorded by the daily-activity
+  rollup (grading, SRS reviews, lesson completion, reading progress, XP —
+  see ``activity_rollup.subscribe``), new or removed ``UserWord`` rows,
+  plan-relevant ``User`` settings, any new ``StreakEvent`` (repairs, shields
+  and milestones carry no XP), streak-coin balance changes and daily
+  challenge completions;
+- ``built_version`` is the ``version`` the payload was built from.
+
+A snapshot is served as-is while the versions match, its local date and
+timezone are the request's, and it is younger than
+DAILY_STATUS_MAX_AGE_SECONDS (time alone moves SRS due counts and races).
+Otherwise the endpoint recomputes and stores a new one. A write landing
+while the payload is being built bumps ``version`` past the stored
+``built_version``, so the next poll recomputes again. ``respond`` sets an
+ETag and answers ``If-None-Match`` with 304.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from flask import current_app, request
+from sqlalchemy import event, insert, inspect, select, update
+
+from app.utils.db import db
+
+logger = logging.getLogger(__name__)
+
+# User columns the payload reads
+_USER_FIELDS = (
+    'timezone', 'daily_goal_minutes', 'listening_goal_minutes', 'daily_word_goal',
+    'weekly_lesson_goal', 'plan_paused_until', 'plan_difficulty', 'streak_shield_active',
+    'onboarding_level', 'default_study_deck_id',
+)
+
+
+def _table():
+    from app.daily_plan.models import DailyStatusSnapshot
+    return DailyStatusSnapshot.__table__
+
+
+def bump_versions(connection, user_ids) -> None:
+    """Mark the users' snapshots stale (runs inside the writing flush)."""
+    if not user_ids:
+        return
+    table = _table()
+    connection.execute(
+        update(table)
+        .where(table.c.user_id.in_(sorted(user_ids)))
+        .values(version=table.c.version + 1)
+    )
+
+
+def _user_settings_changed(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _USER_FIELDS):
+        bump_versions(connection, {target.id})
+
+
+def _user_row_changed(mapper, connection, target):
+    bump_versions(connection, {target.user_id})
+
+
+def _coin_balance_changed(mapper, connection, target):
+    if inspect(target).attrs.balance.history.has_changes():
+        bump_versions(connection, {target.user_id})
+
+
+def register_status_projection_listeners():
+    """Invalidate daily-status snapshots from the write paths they depend on."""
+    from app.achievements.models import StreakCoins, StreakEvent
+    from app.auth.models import User
+    from app.daily_plan.models import DailyChallengeCompletion
+    from app.study.models import UserWord
+    from app.utils import activity_rollup
+
+    activity_rollup.subscribe(bump_versions)
+    if not event.contains(User, 'after_update', _user_settings_changed):
+        event.listen(User, 'after_update', _user_settings_changed)
+    if not event.contains(StreakCoins, 'after_update', _coin_balance_changed):
+        event.listen(StreakCoins, 'after_update', _coin_balance_changed)
+    listeners = [(UserWord, 'after_insert'), (UserWord, 'after_delete'),
+                 (StreakEvent, 'after_insert'), (DailyChallengeCompletion, 'after_insert')]
+    for model, name in listeners:
+        if not event.contains(model, name, _user_row_changed):
+            event.listen(model, name, _user_row_changed)
+
+
+def load(user_id: int) -> Any:
+    """The user's snapshot row, or None (a plain row, not an ORM instance)."""
+    table = _table()
+    return db.session.execute(select(table).where(table.c.user_id == user_id)).first()
+
+
+def is_fresh(row: Any, local_date: date, tz: str, max_age: int) -> bool:
+    if row is None or max_age <= 0:
+        return False
+    age = datetime.now(timezone.utc).replace(tzinfo=None) - row.computed_at
+    return (
+        row.version == row.built_version
+        and row.local_date == local_date
+        and row.tz == tz
+        and age < timedelta(seconds=max_age)
+    )
+
+
+def store(user_id: int, local_date: date, tz: str, payload: str, built_version: int) -> Any:
+    """Upsert the snapshot built from ``built_version`` and commit; returns the row."""
+    table = _table()
+    values = {
+        'local_date': local_date,
+        'tz': tz,
+        'payload': payload,
+        'built_version': built_version,
+        'computed_at': datetime.now(timezone.utc).replace(tzinfo=None),
+    }
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    if dialect_insert is not None:
+        stmt = dialect_insert(table).values(user_id=user_id, version=built_version, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=[table.c.user_id], set_=values)
+        db.session.execute(stmt)
+    else:
+        # No ON CONFLICT: update in place, insert when the user has no row yet
+        updated = db.session.execute(update(table).where(table.c.user_id == user_id).values(**values))
+        if not updated.rowcount:
+            db.session.execute(insert(table).values(user_id=user_id, version=built_version, **values))
+    db.session.commit()
+    return load(user_id)
+
+
+def etag(row: Any) -> str:
+    return f'{row.local_date.isoformat()}.{row.built_version}.{int(row.computed_at.timestamp() * 1000)}'
+
+
+def respond(row: Any):
+    """JSON response for a stored snapshot, honouring ``If-None-Match``."""
+    response = current_app.response_class(row.payload, mimetype=current_app.json.mimetype)
+    response.set_etag(etag(row))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
@@ -25,7 +25,7 @@ _UTM_KEYS = ('utm_source', 'utm_medium', 'utm_campaign', 'utm_content', 'utm_ter
 
 # Path prefixes that should never trigger UTM capture (assets, internal
 # tracking pixels, API endpoints, etc.).
-_SKIP_PREFIXES = ('/static/', '/api/', '/admin/', '/uploads/', '/sitemap.xml', '/robots.txt')
+_SKIP_PREFIXES = ('/static/', '/api/', '/admin/', '/uploads/', '/sitemap.xml', '/sitemap-', '/robots.txt')
 
 # Max length for any single captured value — defends against session bloat
 # and pathological referrer strings.
@@ -0,0 +1,166 @@
+"""
+Per-request SQL profiler.
+
+``configure_slow_query_logging`` only sees single slow statements; a request
+that issues 400 fast queries never shows up there. This middleware records
+every statement executed while a request is being handled into
+``g.sql_profile``:
+
+- query count and total DB time;
+- statements normalized to a signature (literals and IN-lists collapsed),
+  so a loop issuing the same SELECT per row shows up as one signature with
+  a high count — the N+1 pattern.
+
+After the request it adds a ``Server-Timing: db;dur=…`` metric and emits a
+``request_sql`` log record whose ``extra`` fields (request_id, sql_queries,
+sql_ms, sql_repeated, ...) become structured keys under LOG_FORMAT=json. The
+record is DEBUG normally and WARNING once a request goes over
+SQL_PROFILER_MAX_QUERIES / SQL_PROFILER_MAX_MS or repeats a signature
+SQL_PROFILER_REPEAT_THRESHOLD times.
+
+``capture_queries()`` records into a profile outside of requests; the
+``query_budget`` test fixture is built on it.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import sqlalchemy.event
+from flask import Flask, g, has_app_context, request
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+# "IN (%(id_1_1)s, %(id_1_2)s, ...)" -> "(?)" so the list length doesn't split signatures
+_PARAM_LIST_RE = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse literals, numbers and parameter lists into a signature."""
+    signature = _PARAM_LIST_RE.sub('(?)', statement)
+    signature = _LITERAL_RE.sub('?', signature)
+    return _WHITESPACE_RE.sub(' ', signature).strip()
+
+
+class QueryProfile:
+    """Statements recorded for one request (or one ``capture_queries`` block)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.signatures: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.signatures[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Signatures executed at least ``threshold`` times, most frequent first."""
+        return [(sig, n) for sig, n in self.signatures.most_common() if n >= threshold]
+
+    def describe(self, limit: int = 5) -> str:
+        lines = [f"{self.count} queries, {self.total_ms:.1f}ms"]
+        lines += [f"  {n}x {sig[:200]}" for sig, n in self.signatures.most_common(limit)]
+        return '\n'.join(lines)
+
+
+def _profiling_listeners(get_profile, key: str):
+    """(before, after) cursor listeners recording into ``get_profile()``.
+
+    Each listener pair keeps its start times under its own ``conn.info`` key,
+    so the request profiler and a ``capture_queries`` block can be active at
+    the same time without popping each other's timestamps.
+    """
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(key, []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(key)
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        profile = get_profile()
+        if profile is not None:
+            profile.record(statement, elapsed_ms)
+
+    return before_cursor_execute, after_cursor_execute
+
+
+def _request_profile():
+    # Background threads (dashboard widgets, refreshers) push their own app
+    # context without a profile, so only the request's own queries count.
+    if not has_app_context():
+        return None
+    return g.get('sql_profile')
+
+
+@contextmanager
+def capture_queries():
+    """Record every statement on any engine into a fresh ``QueryProfile``."""
+    profile = QueryProfile()
+    before, after = _profiling_listeners(lambda: profile, f'sql_capture_{id(profile)}')
+    sqlalchemy.event.listen(Engine, 'before_cursor_execute', before)
+    sqlalchemy.event.listen(Engine, 'after_cursor_execute', after)
+    try:
+        yield profile
+    finally:
+        sqlalchemy.event.remove(Engine, 'after_cursor_execute', after)
+        sqlalchemy.event.remove(Engine, 'before_cursor_execute', before)
+
+
+def add_query_profiler(app: Flask, db) -> None:
+    """Profile the SQL issued by each request (see module docstring)."""
+    if not app.config.get('SQL_PROFILER_ENABLED', True):
+        return
+
+    max_queries: int = app.config.get('SQL_PROFILER_MAX_QUERIES', 50)
+    max_ms: int = app.config.get('SQL_PROFILER_MAX_MS', 500)
+    repeat_threshold: int = app.config.get('SQL_PROFILER_REPEAT_THRESHOLD', 10)
+
+    before, after = _profiling_listeners(_request_profile, 'sql_profiler_start')
+    with app.app_context():
+        sqlalchemy.event.listen(db.engine, 'before_cursor_execute', before)
+        sqlalchemy.event.listen(db.engine, 'after_cursor_execute', after)
+
+    @app.before_request
+    def start_sql_profile() -> None:
+        g.sql_profile = QueryProfile()
+
+    @app.after_request
+    def report_sql_profile(response):
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return response
+
+        # add(), not assignment: views may already have set their own metrics
+        response.headers.add(
+            'Server-Timing', f'db;dur={profile.total_ms:.1f};desc="{profile.count} queries"'
+        )
+
+        repeated = profile.repeated(repeat_threshold)
+        over_budget = profile.count > max_queries or profile.total_ms > max_ms or bool(repeated)
+        logger.log(
+            logging.WARNING if over_budget else logging.DEBUG,
+            "request_sql endpoint=%s queries=%d db_ms=%.1f repeated=%d",
+            request.endpoint, profile.count, profile.total_ms, len(repeated),
+            extra={
+                'request_id': g.get('request_id', '-'),
+                'http_method': request.method,
+                'http_path': request.path,
+                'http_status': response.status_code,
+                'endpoint': request.endpoint,
+                'sql_queries': profile.count,
+                'sql_ms': round(profile.total_ms, 1),
+                'sql_repeated': [{'statement': sig[:200], 'count': n} for sig, n in repeated[:5]],
+            },
+        )
+        return response
+
+    logger.debug("SQL query profiler configured (max_queries=%d, max_ms=%d, repeat=%d)",
+                 max_queries, max_ms, repeat_threshold)
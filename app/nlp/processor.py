@@ -2,10 +2,16 @@
 Natural language processing module for English texts.
 Includes functions for tokenization, lemmatization, and word processing.
 """
+import atexit
 import concurrent.futures
+import functools
 import logging
+import multiprocessing
 import re
-from typing import List, Set, Tuple
+import threading
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 import nltk
 from bs4 import BeautifulSoup
@@ -13,9 +19,13 @@ from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer
 
 from app.nlp.setup import initialize_nltk
+from config.settings import NLP_BLOCK_SIZE, NLP_MAX_WORKERS, NLP_POOL_IDLE_SECONDS
 
 NLP_TIMEOUT_SECONDS = 30
 
+# (token, WordNet POS) pairs kept by the lemma cache
+LEMMA_CACHE_SIZE = 200_000
+
 logger = logging.getLogger(__name__)
 
 # Harry Potter specific names and made-up words to exclude
@@ -398,79 +408,175 @@ def extract_text_from_html(html_content: str, selector: str = None) -> str:
     return element.text
 
 
+# Contraction/dialect expansions, applied in this order (the order matters:
+# "'d" is matched before "'dere", so "'dere" ends up as " wouldere").
+CONTRACTIONS = {
+    "can't": "can not",
+    "won't": "will not",
+    "n't": " not",  # general: don't, doesn't, didn't, etc.
+    "'ll": " will",
+    "'re": " are",
+    "'ve": " have",
+    "'m": " am",
+    "'d": " would",
+    "let's": "let us",
+    # Informal/dialectal contractions (e.g., "'gree" -> "agree")
+    "'gree": "agree",
+    "'bout": "about",
+    "'cause": "because",
+    "'em": "them",
+    "'til": "until",
+    "'tis": "it is",
+    "'twas": "it was",
+    "'ere": "here",
+    "'dere": "there",
+    "'ouse": "house",
+    "'arry": "harry",
+    # Dropped g in -ing words (savin' -> saving)
+    "in'": "ing",
+    # Cockney/dialect pronunciations (Hagrid, Mundungus)
+    "orf": "off",
+    "nuffink": "nothing",
+    "summat": "something",
+    "wiv": "with",
+    "fer": "for",
+    "ter": "to",
+    "yeh": "you",
+    "yer": "your",
+    "bin": "been",
+    "wuz": "was",
+    "meself": "myself",
+    "yerself": "yourself",
+    # More dialect words
+    "ave": "have",
+    "bes": "best",
+    "kep": "kept",
+    "gon": "going",
+    "myst": "must",
+    "pur": "pure",
+    "roun": "round",
+    "mon": "man",
+    "wha": "what",
+    "tha": "that",
+    "wid": "with",
+    "de": "the",
+    "la": "the",
+    "en": "and",
+    "fraid": "afraid",
+}
+
+
+# Stop words + trash words that appear from hyphenated word splitting in books
+TOKEN_STOP_WORDS = frozenset({
+    "i", "it", "am", "is", "are", "be", "a", "an", "the", "as", "of", "at", "by", "to", "s", "t", "don", "https",
+    # Trash words from book parsing (hyphenated word fragments, OCR errors, dialect spellings)
+    "ame", "barad", "bito", "breek", "buri", "chee", "doke", "forbathe", "ker", "louther",
+    "maney", "mem", "nathe", "pand", "peto", "plunther", "ras", "taur", "thatn", "theer",
+    "thetin", "torified", "unloathed",
+})
+
+# Additional stop words applied after lemmatization
+LEMMA_STOP_WORDS = frozenset({"i", "it", "am", "is", "are", "be", "a", "an", "the", "as", "of", "at", "by", "to", "s", "t", "don"})
+
+# Fix common lemmatization errors (verb forms wrongly lemmatized)
+LEMMA_FIXES = {
+    "plat": "plate",  # plates wrongly lemmatized as verb
+}
+
+
+def _compile_contractions():
+    """
+    Compiles CONTRACTIONS into two single-pass regexes.
+
+    The original loop applied each entry to the whole text in turn:
+    apostrophe forms as case-sensitive str.replace (lower, Capitalized,
+    UPPER), everything else as a case-insensitive word-boundary re.sub.
+    Pass 1 covers every entry containing an apostrophe, pass 2 the bare
+    dialect words (all of which came after the apostrophe forms).
+
+    Alternatives keep the dict order, so at one position the entry that
+    used to run first still wins. The only entry that could overlap an
+    earlier one from a different position is the "in'" suffix ("goin'll"
+    lost its apostrophe to "'ll" first); a lookahead keeps that.
+    """
+    exact = {}
+    folded = {}
+    pass1 = []
+    pass2 = []
+    for contraction, expansion in CONTRACTIONS.items():
+        if contraction.startswith("'") or contraction.endswith("'"):
+            variants = (
+                (contraction, expansion),
+                (contraction.capitalize(), expansion),
+                (contraction.upper(), expansion.upper()),
+            )
+            for variant, replacement in variants:
+                if variant not in exact:
+                    exact[variant] = replacement
+                    pass1.append(variant)
+        else:
+            folded[contraction] = expansion
+            target = pass1 if "'" in contraction else pass2
+            target.append(contraction)
+
+    apostrophe_tails = [variant[1:] for variant in pass1 if variant.startswith("'")]
+    guard = '(?!' + '|'.join(re.escape(tail) for tail in apostrophe_tails) + ')'
+
+    def alternative(key):
+        if key in exact:
+            pattern = re.escape(key)
+            return pattern + guard if key.endswith("'") else pattern
+        return r'\b(?i:' + re.escape(key) + r')\b'
+
+    pass1_re = re.compile('|'.join(alternative(key) for key in pass1))
+    pass2_re = re.compile(r'\b(?:' + '|'.join(re.escape(key) for key in pass2) + r')\b', re.IGNORECASE)
+    return exact, folded, pass1_re, pass2_re
+
+
+_CONTRACTION_EXACT, _CONTRACTION_FOLDED, _CONTRACTION_RE, _DIALECT_RE = _compile_contractions()
+_DASH_RE = re.compile(r'[—–−‐‑‒―]')
+_HYPHEN_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(key) for key in HYPHEN_NORMALIZATIONS) + r')\b',
+    re.IGNORECASE,
+)
+# Every HYPHEN_NORMALIZATIONS key is a hyphenated word, so only maximal
+# hyphen chains ("non-co-operation") need the alternation above; scanning the
+# whole text with it costs far more than finding the chains first.
+_HYPHEN_CHAIN_RE = re.compile(r'\b\w+(?:-\w+)+')
+
+
+def _expand_apostrophe(match) -> str:
+    value = match.group(0)
+    expansion = _CONTRACTION_EXACT.get(value)
+    if expansion is None:
+        expansion = _CONTRACTION_FOLDED[value.lower()]
+    return expansion
+
+
+def _expand_dialect(match) -> str:
+    return _CONTRACTION_FOLDED[match.group(0).lower()]
+
+
+def _normalize_hyphenated(match) -> str:
+    return HYPHEN_NORMALIZATIONS[match.group(0).lower()]
+
+
+def _normalize_hyphen_chain(match) -> str:
+    return _HYPHEN_RE.sub(_normalize_hyphenated, match.group(0))
+
+
+def normalize_hyphenated_words(text: str) -> str:
+    """Replaces HYPHEN_NORMALIZATIONS keys (case-insensitive, whole words)."""
+    return _HYPHEN_CHAIN_RE.sub(_normalize_hyphen_chain, text)
+
+
 def expand_contractions(text: str) -> str:
     """
     Expands common English contractions to full forms.
     This ensures words like can't -> can not are properly tokenized.
     """
-    contractions = {
-        "can't": "can not",
-        "won't": "will not",
-        "n't": " not",  # general: don't, doesn't, didn't, etc.
-        "'ll": " will",
-        "'re": " are",
-        "'ve": " have",
-        "'m": " am",
-        "'d": " would",
-        "let's": "let us",
-        # Informal/dialectal contractions (e.g., "'gree" -> "agree")
-        "'gree": "agree",
-        "'bout": "about",
-        "'cause": "because",
-        "'em": "them",
-        "'til": "until",
-        "'tis": "it is",
-        "'twas": "it was",
-        "'ere": "here",
-        "'dere": "there",
-        "'ouse": "house",
-        "'arry": "harry",
-        # Dropped g in -ing words (savin' -> saving)
-        "in'": "ing",
-        # Cockney/dialect pronunciations (Hagrid, Mundungus)
-        "orf": "off",
-        "nuffink": "nothing",
-        "summat": "something",
-        "wiv": "with",
-        "fer": "for",
-        "ter": "to",
-        "yeh": "you",
-        "yer": "your",
-        "bin": "been",
-        "wuz": "was",
-        "meself": "myself",
-        "yerself": "yourself",
-        # More dialect words
-        "ave": "have",
-        "bes": "best",
-        "kep": "kept",
-        "gon": "going",
-        "myst": "must",
-        "pur": "pure",
-        "roun": "round",
-        "mon": "man",
-        "wha": "what",
-        "tha": "that",
-        "wid": "with",
-        "de": "the",
-        "la": "the",
-        "en": "and",
-        "fraid": "afraid",
-    }
-    text_lower = text
-    for contraction, expansion in contractions.items():
-        # For contractions starting with apostrophe (like 'd, 're), use simple replace
-        # For dialect words (like "roun", "wiv"), only replace whole words
-        if contraction.startswith("'") or contraction.endswith("'"):
-            text_lower = text_lower.replace(contraction, expansion)
-            text_lower = text_lower.replace(contraction.capitalize(), expansion)
-            text_lower = text_lower.replace(contraction.upper(), expansion.upper())
-        else:
-            # Use word boundary matching for dialect words to avoid partial replacements
-            # e.g., don't replace "roun" in "around"
-            pattern = r'\b' + re.escape(contraction) + r'\b'
-            text_lower = re.sub(pattern, expansion, text_lower, flags=re.IGNORECASE)
-    return text_lower
+    text = _CONTRACTION_RE.sub(_expand_apostrophe, text)
+    return _DIALECT_RE.sub(_expand_dialect, text)
 
 
 def tokenize_and_filter(text: str, stop_words: Set[str]) -> List[str]:
@@ -489,51 +595,69 @@ def tokenize_and_filter(text: str, stop_words: Set[str]) -> List[str]:
 
     # Replace em-dashes, en-dashes and other special dashes with spaces
     # so words like "these—ouch—shoes" are properly tokenized
-    text = re.sub(r'[—–−‐‑‒―]', ' ', text)
+    text = _DASH_RE.sub(' ', text)
 
     # Normalize hyphenated words that should be single words
     # e.g., "tri-pod" -> "tripod", "e-mail" -> "email"
-    for hyphenated, normalized in HYPHEN_NORMALIZATIONS.items():
-        text = re.sub(r'\b' + re.escape(hyphenated) + r'\b', normalized, text, flags=re.IGNORECASE)
+    text = normalize_hyphenated_words(text)
 
     # Replace hyphens with spaces to split compound words
     # like "triple-decker" into "triple" and "decker"
     text = text.replace('-', ' ')
 
     words = nltk.word_tokenize(text)
-    # Filter only alphabetic characters and convert to lowercase
-    words = [word.lower() for word in words if word.isalpha()]
-    # Common stop words + trash words that appear from hyphenated word splitting in books
-    stop_words = [
-        "i", "it", "am", "is", "are", "be", "a", "an", "the", "as", "of", "at", "by", "to", "s", "t", "don", "https",
-        # Trash words from book parsing (hyphenated word fragments, OCR errors, dialect spellings)
-        "ame", "barad", "bito", "breek", "buri", "chee", "doke", "forbathe", "ker", "louther",
-        "maney", "mem", "nathe", "pand", "peto", "plunther", "ras", "taur", "thatn", "theer",
-        "thetin", "torified", "unloathed"
+    # Filter only alphabetic characters, convert to lowercase, remove stop words
+    return [
+        word for word in (token.lower() for token in words if token.isalpha())
+        if word not in TOKEN_STOP_WORDS
     ]
-    # Remove stop words
-    words = [word for word in words if word not in stop_words]
 
-    return words
+
+_lemmatizer: Optional[WordNetLemmatizer] = None
+
+
+@functools.lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize_cached(word: str, wordnet_pos: str) -> str:
+    """
+    Lemmatizes one (token, WordNet POS) pair through a process-wide LRU cache.
+
+    The cache is shared by every book processed in the process (or pool
+    worker); ``lemma_cache_stats`` exposes its hit/miss counters.
+    """
+    global _lemmatizer
+    if _lemmatizer is None:
+        _lemmatizer = WordNetLemmatizer()
+    return _lemmatizer.lemmatize(word, wordnet_pos)
+
+
+def lemma_cache_stats() -> dict:
+    """Returns hits, misses, size and maxsize of the lemma cache."""
+    info = lemmatize_cached.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
 
 
 def lemmatize_words(words: List[str]) -> List[str]:
     """
     Lemmatizes a list of words considering part of speech.
 
+    Only unique (token, POS) pairs are looked up; repeats reuse the result.
+
     Args:
         words (List[str]): List of words to lemmatize.
 
     Returns:
         List[str]: List of lemmatized words.
     """
-    lemmatizer = WordNetLemmatizer()
     pos_tags = nltk.pos_tag(words)
 
-    lemmatized_words = [
-        lemmatizer.lemmatize(word, get_wordnet_pos(pos))
-        for word, pos in pos_tags
-    ]
+    lemmas = {}
+    lemmatized_words = []
+    for word, pos in pos_tags:
+        key = (word, get_wordnet_pos(pos))
+        lemma = lemmas.get(key)
+        if lemma is None:
+            lemma = lemmas[key] = lemmatize_cached(*key)
+        lemmatized_words.append(lemma)
 
     return lemmatized_words
 
@@ -579,19 +703,13 @@ def process_text(text: str, english_vocab: Set[str], stop_words: Set[str],
     # Filtering only English words
     english_words = filter_english_words(lemmatized_words, english_vocab)
 
-    # Additional stop words (contractions are now expanded before tokenization)
-    additional_stop_words = {"i", "it", "am", "is", "are", "be", "a", "an", "the", "as", "of", "at", "by", "to", "s", "t", "don"}
-
     # Fix common lemmatization errors (verb forms wrongly lemmatized)
-    lemma_fixes = {
-        "plat": "plate",  # plates wrongly lemmatized as verb
-    }
-    english_words = [lemma_fixes.get(word, word) for word in english_words]
+    english_words = [LEMMA_FIXES.get(word, word) for word in english_words]
 
     # Remove stop words and HP-specific terms
     # For short words (< 3 chars), keep only if they exist in Brown corpus
     def should_keep(word):
-        if word in additional_stop_words:
+        if word in LEMMA_STOP_WORDS:
             return False
         if word in HP_EXCLUSIONS:
             return False
@@ -643,29 +761,213 @@ def process_html_content(html_content: str, selector: str = None,
         executor.shutdown(wait=False)
 
 
-def prepare_word_data(words: List[str], brown_words: Set[str]) -> List[Tuple]:
+def split_into_blocks(texts: Iterable[str], block_size: int = NLP_BLOCK_SIZE) -> Iterator[str]:
     """
-    Prepares word data for insertion into the database.
+    Groups texts (chapters, paragraphs) into blocks of about ``block_size`` chars.
+
+    Texts longer than a block are cut at paragraph or line breaks (or, failing
+    that, at whitespace), so no word and rarely a sentence is split.
 
     Args:
-        words (List[str]): List of words.
+        texts (Iterable[str]): Source texts in reading order.
+        block_size (int): Target block size in characters.
+
+    Yields:
+        str: Text blocks.
+    """
+    current: List[str] = []
+    current_size = 0
+    for text in texts:
+        if not text or not text.strip():
+            continue
+        while len(text) > block_size:
+            cut = -1
+            for separator in ('\n\n', '\n', ' '):
+                cut = text.rfind(separator, 0, block_size)
+                if cut > 0:
+                    break
+            if cut <= 0:
+                cut = block_size
+            head, text = text[:cut], text[cut:]
+            if current:
+                yield ' '.join(current)
+                current, current_size = [], 0
+            yield head
+        if current and current_size + len(text) > block_size:
+            yield ' '.join(current)
+            current, current_size = [], 0
+        current.append(text)
+        current_size += len(text) + 1
+    if current:
+        yield ' '.join(current)
+
+
+# NLTK resources of a pool worker, loaded once by _init_nlp_worker.
+_worker_resources: Optional[Tuple[Set[str], Set[str], Set[str]]] = None
+
+
+def _init_nlp_worker() -> None:
+    global _worker_resources
+    _worker_resources = initialize_nltk()
+
+
+def count_block_words(text: str) -> Counter:
+    """Runs process_text on one block and returns its word frequencies."""
+    english_vocab, brown_words, stop_words = _worker_resources or initialize_nltk()
+    counts = Counter(process_text(text, english_vocab, stop_words, brown_words))
+    logger.debug("Lemma cache after block: %s", lemma_cache_stats())
+    return counts
+
+
+_nlp_pools: dict = {}
+_nlp_pool_users: Counter = Counter()  # count_words_parallel calls using each pool
+_nlp_idle_timers: dict = {}
+_nlp_pools_lock = threading.Lock()
+
+
+def _get_nlp_pool(max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Returns the process-wide NLP worker pool, starting it on first use.
+
+    Workers outlive a single book, so NLTK resources and the lemma cache
+    are loaded once and reused by books processed soon afterwards; a pool
+    left idle for NLP_POOL_IDLE_SECONDS is shut down (see _release_nlp_pool).
+    They are started with ``spawn``: book processing runs in background
+    threads, and forking a threaded process can deadlock.
+    """
+    with _nlp_pools_lock:
+        timer = _nlp_idle_timers.pop(max_workers, None)
+        if timer is not None:
+            timer.cancel()
+        pool = _nlp_pools.get(max_workers)
+        if pool is None:
+            pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_nlp_worker,
+            )
+            _nlp_pools[max_workers] = pool
+        _nlp_pool_users[max_workers] += 1
+        return pool
+
+
+def _release_nlp_pool(max_workers: int) -> None:
+    """Marks one user of the pool done; the last one arms the idle shutdown."""
+    with _nlp_pools_lock:
+        if _nlp_pool_users[max_workers] > 0:
+            _nlp_pool_users[max_workers] -= 1
+        pool = _nlp_pools.get(max_workers)
+        if pool is None or _nlp_pool_users[max_workers]:
+            return
+        if NLP_POOL_IDLE_SECONDS > 0:
+            timer = threading.Timer(NLP_POOL_IDLE_SECONDS, _shutdown_idle_pool, (max_workers, pool))
+            timer.daemon = True
+            _nlp_idle_timers[max_workers] = timer
+            timer.start()
+            return
+    _shutdown_idle_pool(max_workers, pool)
+
+
+def _shutdown_idle_pool(max_workers: int, pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    with _nlp_pools_lock:
+        # Reused (or replaced) since the timer was armed
+        if _nlp_pools.get(max_workers) is not pool or _nlp_pool_users[max_workers]:
+            return
+        del _nlp_pools[max_workers]
+        _nlp_idle_timers.pop(max_workers, None)
+    logger.info("Shutting down idle NLP process pool (%d workers)", max_workers)
+    pool.shutdown(wait=False)
+
+
+def shutdown_nlp_pools() -> None:
+    """Stops the NLP worker processes (interpreter exit, tests)."""
+    with _nlp_pools_lock:
+        pools = list(_nlp_pools.values())
+        _nlp_pools.clear()
+        _nlp_pool_users.clear()
+        for timer in _nlp_idle_timers.values():
+            timer.cancel()
+        _nlp_idle_timers.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_nlp_pools)
+
+
+def count_words_parallel(blocks: Iterable[str], max_workers: int = NLP_MAX_WORKERS,
+                         count_block: Callable[[str], Counter] = count_block_words) -> Counter:
+    """
+    Processes text blocks in the NLP process pool and merges their word counters.
+
+    A single block (or ``max_workers <= 1``) is processed in the calling
+    process. The pool is shut down once no call has used it for
+    NLP_POOL_IDLE_SECONDS. If the pool breaks, it is dropped and the blocks
+    are processed in-process.
+
+    Args:
+        blocks (Iterable[str]): Text blocks, e.g. from split_into_blocks.
+        max_workers (int): Maximum number of worker processes.
+        count_block (Callable): Top-level (picklable) per-block counter.
+
+    Returns:
+        Counter: Word frequencies over all blocks.
+    """
+    blocks = [block for block in blocks if block and block.strip()]
+    counts: Counter = Counter()
+
+    if max_workers > 1 and len(blocks) > 1:
+        try:
+            pool = _get_nlp_pool(max_workers)
+            try:
+                for block_counts in pool.map(count_block, blocks):
+                    counts.update(block_counts)
+                return counts
+            finally:
+                _release_nlp_pool(max_workers)
+        except (BrokenProcessPool, OSError) as e:
+            logger.error("NLP process pool failed (%s), processing blocks in-process", e)
+            with _nlp_pools_lock:
+                broken = _nlp_pools.pop(max_workers, None)
+                timer = _nlp_idle_timers.pop(max_workers, None)
+            if timer is not None:
+                timer.cancel()
+            if broken is not None:
+                broken.shutdown(wait=False, cancel_futures=True)
+            counts = Counter()
+
+    for block in blocks:
+        counts.update(count_block(block))
+    return counts
+
+
+def prepare_word_counts(word_counts: Mapping[str, int], brown_words: Set[str]) -> List[Tuple]:
+    """
+    Prepares counted words for insertion into the database.
+
+    Args:
+        word_counts (Mapping[str, int]): Word frequencies.
         brown_words (Set[str]): Set of words from the Brown corpus.
 
     Returns:
         List[Tuple]: List of tuples (word, listening_link, in_brown, frequency).
     """
-    data = []
-    word_counts = {}
+    from app.utils.audio import get_clean_audio_filename
+    return [
+        (word, get_clean_audio_filename(word), int(word in brown_words), frequency)
+        for word, frequency in word_counts.items()
+    ]
 
-    # Count word frequency
-    for word in words:
-        word_counts[word] = word_counts.get(word, 0) + 1
 
-    # Form data
-    from app.utils.audio import get_clean_audio_filename
-    for word, frequency in word_counts.items():
-        in_brown = word in brown_words
-        listening_link = get_clean_audio_filename(word)
-        data.append((word, listening_link, int(in_brown), frequency))
+def prepare_word_data(words: List[str], brown_words: Set[str]) -> List[Tuple]:
+    """
+    Prepares word data for insertion into the database.
 
-    return data
+    Args:
+        words (List[str]): List of words.
+        brown_words (Set[str]): Set of words from the Brown corpus.
+
+    Returns:
+        List[Tuple]: List of tuples (word, listening_link, in_brown, frequency).
+    """
+    return prepare_word_counts(Counter(words), brown_words)
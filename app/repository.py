@@ -3,10 +3,12 @@ Repository for working with PostgreSQL database.
 """
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 
 from app.books.models import Book
 from app.utils.audio import get_clean_audio_filename
@@ -28,6 +30,95 @@ def _validate_sql_identifier(value: str, allowlist: frozenset) -> str:
     return value
 
 
+# Соединения переиспользуются между экземплярами репозитория: раньше каждый
+# вызов открывал новое TCP/auth-соединение и не закрывал его.
+_POOL_MAX_CONNECTIONS = int(os.environ.get('REPOSITORY_POOL_MAX_CONNECTIONS', 8))
+# Строк на один INSERT ... VALUES в execute_values.
+_VALUES_PAGE_SIZE = 1000
+
+
+class _ConnectionPool:
+    """Lazily filled LIFO pool of psycopg2 connections for one DB config.
+
+    Unlike ``psycopg2.pool`` (which keeps only ``minconn`` idle connections
+    and opens ``minconn`` eagerly), every healthy connection is kept for
+    reuse, up to ``max_size`` checked out at once.
+    """
+
+    def __init__(self, db_config: Dict, max_size: int):
+        self._db_config = db_config
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        self._slots.acquire()
+        try:
+            with self._lock:
+                while self._idle:
+                    conn = self._idle.pop()
+                    if not conn.closed:
+                        return conn
+            return psycopg2.connect(**self._db_config)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn) -> None:
+        try:
+            if conn.closed:
+                return
+            status = conn.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                conn.close()
+                return
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            with self._lock:
+                self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    def closeall(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class _WordRow(NamedTuple):
+    """Column subset accepted by ``bulk_insert_or_update_words``."""
+    english_word: str
+    listening: Optional[str] = None
+    russian_word: Optional[str] = None
+    sentences: Optional[str] = None
+    level: Optional[str] = None
+    brown: Optional[int] = None
+    get_download: Optional[int] = None
+
+
+_pools: Dict[Tuple, _ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(db_config: Dict) -> _ConnectionPool:
+    """Return the process-wide pool for ``db_config``, creating it lazily."""
+    key = tuple(sorted(db_config.items()))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, _ConnectionPool(db_config, _POOL_MAX_CONNECTIONS))
+    return pool
+
+
+def close_pools() -> None:
+    """Close every idle pooled connection (worker shutdown, tests)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
 class DatabaseRepository:
     """Repository for working with the database."""
 
@@ -39,15 +130,53 @@ class DatabaseRepository:
             db_config (Dict, optional): Database configuration.
         """
         self.db_config = db_config or DB_CONFIG
+        self._conn = None
 
+    @contextmanager
     def get_connection(self):
         """
-        Gets a connection to the database.
+        Checks out a pooled connection for the duration of a ``with`` block.
 
-        Returns:
+        The block is committed on success and rolled back on error, then the
+        connection goes back to the pool. Inside ``transaction()`` the shared
+        connection is yielded and committing is left to the transaction.
+
+        Yields:
             Connection: PostgreSQL connection object.
         """
-        return psycopg2.connect(**self.db_config)
+        if self._conn is not None:
+            yield self._conn
+            return
+
+        pool = _get_pool(self.db_config)
+        conn = pool.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            pool.putconn(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs every repository call inside the block on one connection and
+        commits once at the end (or rolls everything back on error).
+
+        Nested ``transaction()`` blocks join the outer one.
+        """
+        if self._conn is not None:
+            yield self
+            return
+
+        pool = _get_pool(self.db_config)
+        conn = pool.getconn()
+        self._conn = conn
+        try:
+            with conn:
+                yield self
+        finally:
+            self._conn = None
+            pool.putconn(conn)
 
     def execute_query(
             self, query: str, parameters: Tuple = (), fetch: bool = False
@@ -115,6 +244,10 @@ class DatabaseRepository:
         """
         Выполняет пакетную вставку или обновление слов.
 
+        Одна команда ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` на
+        каждые ``_VALUES_PAGE_SIZE`` слов вместо SELECT + UPDATE + INSERT на
+        каждое слово.
+
         Args:
             words_batch: Список объектов Word (CollectionWords)
 
@@ -124,72 +257,43 @@ class DatabaseRepository:
         if not words_batch:
             return {}
 
-        word_id_map = {}
+        # Одна строка на слово: ON CONFLICT не может изменить строку дважды
+        # в одной команде. Побеждает последнее вхождение, как и раньше.
+        rows = {}
+        for word in words_batch:
+            rows[word.english_word] = (
+                word.english_word, word.listening, word.russian_word,
+                word.sentences, word.level, word.brown, word.get_download
+            )
+
+        query = """
+            INSERT INTO collection_words
+            (english_word, listening, russian_word, sentences, level, brown, get_download)
+            VALUES %s
+            ON CONFLICT (english_word) DO UPDATE
+            SET listening = COALESCE(collection_words.listening, EXCLUDED.listening),
+                russian_word = COALESCE(EXCLUDED.russian_word, collection_words.russian_word),
+                sentences = COALESCE(EXCLUDED.sentences, collection_words.sentences),
+                level = COALESCE(EXCLUDED.level, collection_words.level),
+                brown = COALESCE(EXCLUDED.brown, collection_words.brown),
+                get_download = COALESCE(EXCLUDED.get_download, collection_words.get_download)
+            RETURNING id, english_word
+        """
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    # Подготовка списка английских слов для проверки существования
-                    english_words = [word.english_word for word in words_batch]
-
-                    # Получение существующих слов одним запросом
-                    placeholders = ','.join(['%s'] * len(english_words))
-                    cursor.execute(
-                        f"SELECT id, english_word FROM collection_words WHERE english_word IN ({placeholders})",
-                        english_words
+                    # По алфавиту: параллельные импорты блокируют общие слова
+                    # («the», «said», …) в одном порядке и не взаимоблокируются.
+                    result = execute_values(
+                        cursor, query, sorted(rows.values(), key=lambda row: row[0]),
+                        page_size=_VALUES_PAGE_SIZE, fetch=True
                     )
-                    existing_words = {row[1]: row[0] for row in cursor.fetchall()}
-
-                    # Разделение на новые и существующие слова
-                    words_to_insert = []
-                    words_to_update = []
-
-                    for word in words_batch:
-                        if word.english_word in existing_words:
-                            # Слово существует, подготовка к обновлению
-                            words_to_update.append((
-                                word.listening, word.russian_word, word.sentences,
-                                word.level, word.brown, word.get_download,
-                                existing_words[word.english_word]
-                            ))
-                            word_id_map[word.english_word] = existing_words[word.english_word]
-                        else:
-                            # Новое слово, подготовка к вставке
-                            words_to_insert.append((
-                                word.english_word, word.listening, word.russian_word,
-                                word.sentences, word.level, word.brown, word.get_download
-                            ))
-
-                    # Пакетное обновление существующих слов
-                    if words_to_update:
-                        update_query = """
-                            UPDATE collection_words
-                            SET listening = COALESCE(listening, %s),
-                                russian_word = COALESCE(%s, russian_word),
-                                sentences = COALESCE(%s, sentences),
-                                level = COALESCE(%s, level),
-                                brown = COALESCE(%s, brown),
-                                get_download = COALESCE(%s, get_download)
-                            WHERE id = %s
-                        """
-                        cursor.executemany(update_query, words_to_update)
-
-                    # Пакетная вставка новых слов
-                    if words_to_insert:
-                        insert_query = """
-                            INSERT INTO collection_words
-                            (english_word, listening, russian_word, sentences, level, brown, get_download)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s)
-                            RETURNING id, english_word
-                        """
-                        for word_data in words_to_insert:
-                            cursor.execute(insert_query, word_data)
-                            id, english_word = cursor.fetchone()
-                            word_id_map[english_word] = id
-
-            return word_id_map
+            return {english_word: word_id for word_id, english_word in result}
         except psycopg2.Error as e:
             logger.error(f"Error bulk inserting/updating words: {e}")
-            return word_id_map
+            if self._conn is not None:
+                raise
+            return {}
 
     def bulk_link_words_to_book(self, link_data):
         """
@@ -201,19 +305,33 @@ class DatabaseRepository:
         if not link_data:
             return
 
+        # Повторы одной пары в пакете суммируются заранее: ON CONFLICT не
+        # может обновить одну строку дважды в одной команде.
+        frequencies = {}
+        for word_id, book_id, frequency in link_data:
+            key = (word_id, book_id)
+            frequencies[key] = frequencies.get(key, 0) + frequency
+
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     query = """
                         INSERT INTO word_book_link
                         (word_id, book_id, frequency)
-                        VALUES (%s, %s, %s)
+                        VALUES %s
                         ON CONFLICT (word_id, book_id) DO UPDATE
                         SET frequency = word_book_link.frequency + EXCLUDED.frequency
                     """
-                    cursor.executemany(query, link_data)
+                    execute_values(
+                        cursor, query,
+                        [(word_id, book_id, frequency)
+                         for (word_id, book_id), frequency in sorted(frequencies.items())],
+                        page_size=_VALUES_PAGE_SIZE
+                    )
         except psycopg2.Error as e:
             logger.error(f"Error bulk linking words to book: {e}")
+            if self._conn is not None:
+                raise
 
     def clear_book_word_links(self, book_id):
         """
@@ -234,12 +352,41 @@ class DatabaseRepository:
                     logger.info(f"Удалено {deleted_count} старых записей word_book_link для книги {book_id}")
         except psycopg2.Error as e:
             logger.error(f"Error clearing word links for book {book_id}: {e}")
+            if self._conn is not None:
+                raise
+
+    def upsert_words_from_original_format(self, word_data, book_id):
+        """
+        Вставляет/обновляет пакет слов в collection_words, не трогая связи с книгой.
+
+        Args:
+            word_data: Список кортежей (english_word, listening, brown, frequency)
+            book_id: ID книги
+
+        Returns:
+            List[Tuple[int, int, int]]: Строки (word_id, book_id, frequency)
+            для bulk_link_words_to_book
+        """
+        words_batch = []
+        frequency_map = {}
+        for english_word, listening, brown, frequency in word_data:
+            words_batch.append(_WordRow(english_word, listening, brown=brown))
+            frequency_map[english_word] = frequency_map.get(english_word, 0) + frequency
+
+        word_id_map = self.bulk_insert_or_update_words(words_batch)
+        return [
+            (word_id, book_id, frequency_map[eng_word])
+            for eng_word, word_id in word_id_map.items()
+            if word_id
+        ]
 
-    # Этот метод может быть использован в вашем коде для замены медленного цикла
     def process_batch_from_original_format(self, word_data, book_id, batch_size=500):
         """
         Обрабатывает пакет данных в оригинальном формате и связывает слова с книгой.
 
+        Все пакеты выполняются в одной транзакции (или в уже открытой
+        ``transaction()``), по две команды на пакет.
+
         Args:
             word_data: Список кортежей (english_word, listening, brown, frequency)
             book_id: ID книги
@@ -249,40 +396,24 @@ class DatabaseRepository:
             int: Количество обработанных слов
         """
         total_processed = 0
-        batch_num = 0
-        words_batch = []
-        frequency_map = {}
+        owns_transaction = self._conn is None
 
-        for idx, (english_word, listening, brown, frequency) in enumerate(word_data):
-            word = Word(
-                english_word=english_word,
-                listening=listening,
-                brown=brown,
-            )
-            words_batch.append(word)
-            frequency_map[english_word] = frequency
-
-            # Когда набрали полный пакет или это последний элемент
-            if len(words_batch) >= batch_size or idx == len(word_data) - 1:
-                batch_num += 1
-                # Вставляем/обновляем слова пакетом
-                word_id_map = self.bulk_insert_or_update_words(words_batch)
-
-                # Подготавливаем данные для связывания
-                link_data = []
-                for eng_word, word_id in word_id_map.items():
-                    if word_id:
-                        link_data.append((word_id, book_id, frequency_map[eng_word]))
-
-                # Связываем с книгой
-                if link_data:
-                    self.bulk_link_words_to_book(link_data)
-                    total_processed += len(link_data)
-
-
-                # Очищаем пакеты для следующей итерации
-                words_batch = []
-                frequency_map = {}
+        try:
+            with self.transaction():
+                for start in range(0, len(word_data), batch_size):
+                    link_data = self.upsert_words_from_original_format(
+                        word_data[start:start + batch_size], book_id
+                    )
+
+                    # Связываем с книгой
+                    if link_data:
+                        self.bulk_link_words_to_book(link_data)
+                        total_processed += len(link_data)
+        except psycopg2.Error as e:
+            if not owns_transaction:
+                raise
+            logger.error(f"Error processing words for book {book_id}: {e}")
+            return 0
 
         return total_processed
 
@@ -1,168 +1,38 @@
-from datetime import date as _date
-from xml.etree.ElementTree import Element, SubElement, tostring
-
-from flask import Response, abort, current_app
+from flask import Response, abort, current_app, request
 from sqlalchemy import func
 
 from . import seo_bp
+from . import sitemap as _sitemap
 
 
-def _site_urls() -> list[str]:
+def _site_url() -> str:
     configured = (current_app.config.get('SITE_URL') or '').rstrip('/')
-    canonical = 'https://llt-english.com'
-    return [configured or canonical]
+    return configured or 'https://llt-english.com'
 
 
-def _add(urlset: Element, loc: str, priority: str = '0.5', changefreq: str = 'weekly',
-         lastmod: str | None = None) -> None:
-    url_el = SubElement(urlset, 'url')
-    SubElement(url_el, 'loc').text = loc
-    SubElement(url_el, 'priority').text = priority
-    SubElement(url_el, 'changefreq').text = changefreq
-    if lastmod:
-        SubElement(url_el, 'lastmod').text = lastmod
+def _sitemap_response(name: str) -> Response:
+    ttl = current_app.config.get('SITEMAP_TTL_SECONDS', 3600)
+    shard = _sitemap.get_shard(name, _site_url(), ttl)
+    response = Response(shard.body, mimetype='application/xml')
+    response.set_etag(shard.etag)
+    response.last_modified = shard.last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max(ttl, 0)
+    return response.make_conditional(request)
 
 
 @seo_bp.route('/sitemap.xml')
 def sitemap() -> Response:
-    """Generate sitemap.xml with all public pages."""
-    from app.grammar_lab.models import GrammarTopic
-
-    site_urls = _site_urls()
-    today = _date.today()
-
-    def _lastmod(dt) -> str | None:
-        return min(dt.date(), today).strftime('%Y-%m-%d') if dt else None
-
-    urlset = Element('urlset')
-    urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-
-    # Static pages
-    static_pages = [
-        ('/', '1.0', 'weekly'),
-        ('/grammar-lab/topics', '0.9', 'weekly'),
-        ('/dictionary', '0.8', 'weekly'),
-        ('/privacy', '0.3', 'yearly'),
-    ]
-    for base_url in site_urls:
-        for path, priority, changefreq in static_pages:
-            url_el = SubElement(urlset, 'url')
-            SubElement(url_el, 'loc').text = base_url + path
-            SubElement(url_el, 'priority').text = priority
-            SubElement(url_el, 'changefreq').text = changefreq
-
-    # Course catalog
-    from app.curriculum.models import CEFRLevel
-    from app.curriculum.routes.public import PUBLIC_CEFR_CODES
-    for base_url in site_urls:
-        _add(urlset, base_url + '/courses/', '0.8', 'weekly')
-        levels = (
-            CEFRLevel.query
-            .filter(CEFRLevel.code.in_(PUBLIC_CEFR_CODES))
-            .order_by(CEFRLevel.order)
-            .all()
-        )
-        for level in levels:
-            _add(urlset, f'{base_url}/courses/{level.code}', '0.7', 'weekly',
-                 lastmod=_lastmod(level.updated_at))
-
-    # Grammar level listing pages — lastmod = newest topic edit at that level.
-    from app.utils.db import db as _db
-    grammar_levels = (
-        _db.session.query(GrammarTopic.level, func.max(GrammarTopic.updated_at))
-        .filter(GrammarTopic.level.in_(PUBLIC_CEFR_CODES))
-        .group_by(GrammarTopic.level)
-        .all()
-    )
-    for base_url in site_urls:
-        for lvl, lvl_updated in grammar_levels:
-            _add(urlset, f'{base_url}/grammar-lab/topics/{lvl.lower()}', '0.7', 'weekly',
-                 lastmod=_lastmod(lvl_updated))
+    """Sitemap index listing the per-section shards (see app/seo/sitemap.py)."""
+    return _sitemap_response(_sitemap.INDEX)
 
-    # Grammar topics
-    topics = (
-        GrammarTopic.query
-        .filter(GrammarTopic.level.in_(PUBLIC_CEFR_CODES))
-        .order_by(GrammarTopic.level, GrammarTopic.order)
-        .all()
-    )
-    for base_url in site_urls:
-        for topic in topics:
-            _add(urlset, f'{base_url}/grammar-lab/topic/{topic.slug}', '0.7', 'monthly',
-                 lastmod=_lastmod(topic.updated_at))
-
-    # Dictionary pages — all public words, capped at Google's per-sitemap limit (50k).
-    # Words ordered by frequency_rank so the most valuable URLs are indexed first
-    # if the cap is ever hit.
-    from app.words.models import CollectionWords
-    top_words = (
-        CollectionWords.query
-        .filter(CollectionWords.item_type == 'word')
-        .filter(CollectionWords.level.in_(PUBLIC_CEFR_CODES))
-        .order_by(
-            CollectionWords.frequency_rank.asc().nullslast(),
-            CollectionWords.id.asc(),
-        )
-        .limit(45000)
-        .all()
-    )
-    letters = (
-        _db.session.query(func.lower(func.substr(CollectionWords.english_word, 1, 1)))
-        .filter(CollectionWords.item_type == 'word')
-        .filter(CollectionWords.level.in_(PUBLIC_CEFR_CODES))
-        .distinct()
-        .all()
-    )
-    dict_levels = (
-        _db.session.query(CollectionWords.level)
-        .filter(CollectionWords.item_type == 'word')
-        .filter(CollectionWords.level.in_(PUBLIC_CEFR_CODES))
-        .distinct()
-        .all()
-    )
-    from app.words.routes import PUBLIC_DICTIONARY_ALPHABET, encode_word_slug
-    for base_url in site_urls:
-        for (letter,) in letters:
-            if letter and len(letter) == 1 and letter in PUBLIC_DICTIONARY_ALPHABET:
-                _add(urlset, f'{base_url}/dictionary/letter/{letter}', '0.5', 'weekly')
-        for (lvl,) in dict_levels:
-            if lvl:
-                _add(urlset, f'{base_url}/dictionary/level/{lvl.lower()}', '0.6', 'weekly')
-        for word in top_words:
-            _add(urlset, f'{base_url}/dictionary/{encode_word_slug(word.english_word)}', '0.6', 'monthly')
 
-    # Word contrast pages — one URL per curated pair. Each one targets a
-    # distinct «X vs Y / разница между X и Y» search intent, so they earn
-    # their own sitemap entries with a slightly higher priority than
-    # individual dictionary pages.
-    from app.words.models import WordContrast
-    from app.words.routes import encode_word_slug
-    contrasts = (
-        WordContrast.query
-        .join(CollectionWords, CollectionWords.id == WordContrast.word_a_id)
-        .filter(CollectionWords.item_type == 'word')
-        .filter(CollectionWords.level.in_(PUBLIC_CEFR_CODES))
-        .all()
-    )
-    public_levels = set(PUBLIC_CEFR_CODES)
-    for base_url in site_urls:
-        for c in contrasts:
-            a, b = c.word_a, c.word_b
-            if not a or not b:
-                continue
-            if (a.level and a.level not in public_levels) or (
-                b.level and b.level not in public_levels
-            ):
-                continue
-            _add(
-                urlset,
-                f'{base_url}/contrast/{encode_word_slug(a.english_word)}/'
-                f'{encode_word_slug(b.english_word)}',
-                '0.7', 'monthly',
-            )
-
-    xml_bytes = b'<?xml version="1.0" encoding="UTF-8"?>\n' + tostring(urlset, encoding='unicode').encode('utf-8')
-    return Response(xml_bytes, mimetype='application/xml')
+@seo_bp.route('/sitemap-<name>.xml')
+def sitemap_shard(name: str) -> Response:
+    """One sitemap shard: pages, grammar, dictionary, contrasts or words-<letter>."""
+    if not _sitemap.is_shard(name):
+        abort(404)
+    return _sitemap_response(name)
 
 
 @seo_bp.route('/llms.txt')
@@ -0,0 +1,286 @@
+"""Sharded sitemap: a ``/sitemap.xml`` index plus one document per section.
+
+Rebuilding one monolithic sitemap per crawler hit loaded every public word
+as an ORM object, lazy-loaded both words of every contrast and serialized a
+50k-node ElementTree. Now:
+
+- each section (static pages and courses, grammar, dictionary listings,
+  contrasts, dictionary words per first letter) is its own shard, built from
+  column-only queries and rendered by a chunk generator;
+- a built shard is kept per process for SITEMAP_TTL_SECONDS; concurrent
+  misses on the same shard wait for a single build instead of each querying
+  (0 disables the cache);
+- responses carry an ETag (body hash) and Last-Modified (when the body last
+  changed), so re-fetches of an unchanged shard get a 304.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import aliased
+
+from app.utils.db import db
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Google accepts up to 50k URLs per sitemap; words are ordered by frequency so
+# the most valuable pages survive the cap.
+MAX_WORDS_PER_SHARD = 45000
+OTHER_LETTER = 'other'  # words starting outside PUBLIC_DICTIONARY_ALPHABET
+
+
+class Entry(NamedTuple):
+    path: str
+    priority: str = '0.5'
+    changefreq: str = 'weekly'
+    lastmod: Optional[str] = None
+
+
+class BuiltShard(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: datetime
+    built_at: float
+
+
+def _lastmod(dt) -> Optional[str]:
+    return min(dt.date(), date.today()).strftime('%Y-%m-%d') if dt else None
+
+
+def _public_codes():
+    from app.curriculum.routes.public import PUBLIC_CEFR_CODES
+    return PUBLIC_CEFR_CODES
+
+
+def _public_words():
+    from app.words.models import CollectionWords
+    return (
+        db.session.query(CollectionWords)
+        .filter(CollectionWords.item_type == 'word')
+        .filter(CollectionWords.level.in_(_public_codes()))
+    )
+
+
+def _alphabet():
+    from app.words.routes import PUBLIC_DICTIONARY_ALPHABET
+    return PUBLIC_DICTIONARY_ALPHABET
+
+
+def _first_letter():
+    from app.words.models import CollectionWords
+    return func.lower(func.substr(CollectionWords.english_word, 1, 1))
+
+
+# ── Sections ────────────────────────────────────────────────────────────
+
+def _pages_entries() -> Iterator[Entry]:
+    from app.curriculum.models import CEFRLevel
+
+    yield Entry('/', '1.0', 'weekly')
+    yield Entry('/grammar-lab/topics', '0.9', 'weekly')
+    yield Entry('/dictionary', '0.8', 'weekly')
+    yield Entry('/privacy', '0.3', 'yearly')
+    yield Entry('/courses/', '0.8', 'weekly')
+    levels = (
+        db.session.query(CEFRLevel.code, CEFRLevel.updated_at)
+        .filter(CEFRLevel.code.in_(_public_codes()))
+        .order_by(CEFRLevel.order)
+        .all()
+    )
+    for code, updated_at in levels:
+        yield Entry(f'/courses/{code}', '0.7', 'weekly', _lastmod(updated_at))
+
+
+def _grammar_entries() -> Iterator[Entry]:
+    from app.grammar_lab.models import GrammarTopic
+
+    # Level listing pages — lastmod = newest topic edit at that level.
+    levels = (
+        db.session.query(GrammarTopic.level, func.max(GrammarTopic.updated_at))
+        .filter(GrammarTopic.level.in_(_public_codes()))
+        .group_by(GrammarTopic.level)
+        .all()
+    )
+    for level, updated_at in levels:
+        yield Entry(f'/grammar-lab/topics/{level.lower()}', '0.7', 'weekly', _lastmod(updated_at))
+
+    topics = (
+        db.session.query(GrammarTopic.slug, GrammarTopic.updated_at)
+        .filter(GrammarTopic.level.in_(_public_codes()))
+        .order_by(GrammarTopic.level, GrammarTopic.order)
+        .all()
+    )
+    for slug, updated_at in topics:
+        yield Entry(f'/grammar-lab/topic/{slug}', '0.7', 'monthly', _lastmod(updated_at))
+
+
+def _word_letters() -> list[str]:
+    """First letters of public words, sorted; OTHER_LETTER last if any fall outside the alphabet."""
+    rows = _public_words().with_entities(_first_letter()).distinct().all()
+    letters = {value for (value,) in rows if value}
+    alphabet = _alphabet()
+    result = sorted(letters.intersection(alphabet))
+    if letters.difference(alphabet):
+        result.append(OTHER_LETTER)
+    return result
+
+
+def _dictionary_entries() -> Iterator[Entry]:
+    from app.words.models import CollectionWords
+
+    for letter in _word_letters():
+        if letter != OTHER_LETTER:
+            yield Entry(f'/dictionary/letter/{letter}', '0.5', 'weekly')
+    rows = _public_words().with_entities(CollectionWords.level).distinct().all()
+    for level in sorted(level for (level,) in rows if level):
+        yield Entry(f'/dictionary/level/{level.lower()}', '0.6', 'weekly')
+
+
+def _word_entries(letter: str) -> Iterator[Entry]:
+    from app.words.models import CollectionWords
+    from app.words.routes import encode_word_slug
+
+    query = _public_words().with_entities(CollectionWords.english_word)
+    if letter == OTHER_LETTER:
+        query = query.filter(_first_letter().notin_(_alphabet()))
+    else:
+        query = query.filter(_first_letter() == letter)
+    rows = (
+        query
+        .order_by(CollectionWords.frequency_rank.asc().nullslast(), CollectionWords.id.asc())
+        .limit(MAX_WORDS_PER_SHARD)
+        .yield_per(5000)
+    )
+    for (english_word,) in rows:
+        yield Entry(f'/dictionary/{encode_word_slug(english_word)}', '0.6', 'monthly')
+
+
+def _contrast_entries() -> Iterator[Entry]:
+    # One URL per curated pair: each targets a distinct «X vs Y / разница
+    # между X и Y» search intent, so it ranks above plain dictionary pages.
+    from app.words.models import CollectionWords, WordContrast
+    from app.words.routes import encode_word_slug
+
+    word_a, word_b = aliased(CollectionWords), aliased(CollectionWords)
+    codes = _public_codes()
+    rows = (
+        db.session.query(word_a.english_word, word_b.english_word)
+        .select_from(WordContrast)
+        .join(word_a, word_a.id == WordContrast.word_a_id)
+        .join(word_b, word_b.id == WordContrast.word_b_id)
+        .filter(word_a.item_type == 'word')
+        .filter(word_a.level.in_(codes))
+        .filter(or_(word_b.level.is_(None), word_b.level.in_(codes)))
+        .order_by(WordContrast.id)
+        .all()
+    )
+    for a, b in rows:
+        yield Entry(f'/contrast/{encode_word_slug(a)}/{encode_word_slug(b)}', '0.7', 'monthly')
+
+
+_SECTIONS: dict[str, Callable[[], Iterable[Entry]]] = {
+    'pages': _pages_entries,
+    'grammar': _grammar_entries,
+    'dictionary': _dictionary_entries,
+    'contrasts': _contrast_entries,
+}
+_WORDS_PREFIX = 'words-'
+
+
+def shard_names() -> list[str]:
+    """Shards listed in the index: the sections plus one per word letter."""
+    return list(_SECTIONS) + [f'{_WORDS_PREFIX}{letter}' for letter in _word_letters()]
+
+
+def _section(name: str) -> Optional[Callable[[], Iterable[Entry]]]:
+    if name in _SECTIONS:
+        return _SECTIONS[name]
+    if name.startswith(_WORDS_PREFIX):
+        letter = name[len(_WORDS_PREFIX):]
+        if letter == OTHER_LETTER or letter in _alphabet():
+            return lambda: _word_entries(letter)
+    return None
+
+
+def is_shard(name: str) -> bool:
+    return _section(name) is not None
+
+
+# ── Rendering ───────────────────────────────────────────────────────────
+
+def render_urlset(base_url: str, entries: Iterable[Entry]) -> Iterator[str]:
+    yield f'{_XML_HEADER}<urlset xmlns="{SITEMAP_NS}">'
+    for entry in entries:
+        lastmod = f'<lastmod>{entry.lastmod}</lastmod>' if entry.lastmod else ''
+        yield (
+            f'<url><loc>{escape(base_url + entry.path)}</loc>'
+            f'<priority>{entry.priority}</priority>'
+            f'<changefreq>{entry.changefreq}</changefreq>{lastmod}</url>'
+        )
+    yield '</urlset>'
+
+
+def render_index(base_url: str, names: Iterable[str]) -> Iterator[str]:
+    yield f'{_XML_HEADER}<sitemapindex xmlns="{SITEMAP_NS}">'
+    for name in names:
+        yield f'<sitemap><loc>{escape(f"{base_url}/sitemap-{name}.xml")}</loc></sitemap>'
+    yield '</sitemapindex>'
+
+
+# ── Per-process store ───────────────────────────────────────────────────
+
+INDEX = 'index'
+
+_store: dict[tuple[str, str], BuiltShard] = {}
+_build_locks: dict[tuple[str, str], threading.Lock] = {}
+_store_lock = threading.Lock()
+
+
+def _render(name: str, base_url: str) -> bytes:
+    if name == INDEX:
+        chunks = render_index(base_url, shard_names())
+    else:
+        chunks = render_urlset(base_url, _section(name)())
+    return ''.join(chunks).encode('utf-8')
+
+
+def _is_fresh(entry: Optional[BuiltShard], ttl: int) -> bool:
+    return entry is not None and ttl > 0 and time.monotonic() - entry.built_at < ttl
+
+
+def get_shard(name: str, base_url: str, ttl: int) -> BuiltShard:
+    """Built shard ``name`` (or ``INDEX``), rebuilt once it is ``ttl`` seconds old."""
+    key = (name, base_url)
+    entry = _store.get(key)
+    if _is_fresh(entry, ttl):
+        return entry
+
+    with _store_lock:
+        lock = _build_locks.setdefault(key, threading.Lock())
+    with lock:
+        entry = _store.get(key)
+        if _is_fresh(entry, ttl):
+            return entry
+        body = _render(name, base_url)
+        etag = hashlib.md5(body, usedforsecurity=False).hexdigest()
+        # Keep Last-Modified stable across rebuilds that produced the same bytes
+        if entry is not None and entry.etag == etag:
+            last_modified = entry.last_modified
+        else:
+            last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        built = BuiltShard(body, etag, last_modified, time.monotonic())
+        if ttl > 0:
+            _store[key] = built
+        return built
+
+
+def clear() -> None:
+    with _store_lock:
+        _store.clear()
@@ -0,0 +1,88 @@
+"""Per-grade SRS review log and the rolling-accuracy ring window.
+
+Every grade appends one compact ``SRSReviewLog`` row (card, user, rating,
+state transition, timestamp, answer time) inside the grading transaction.
+Both grading surfaces call :func:`record_review`:
+- ``UnifiedSRSService.grade_card`` (``app/srs/service.py``)
+- ``UserCardDirection.update_after_review`` (``app/study/models.py``)
+
+The same call keeps ``UserStatistics.srs_recent_outcomes`` current: a string
+ring of the latest graduated-card outcomes (``'1'`` correct, ``'0'`` miss,
+newest last). The adaptive tier resolver reads accuracy from it without
+touching ``user_card_directions`` at all. Only grades on cards that were in
+REVIEW or RELEARNING *before* the grade enter the ring — LEARNING failures
+are part of acquisition, not a retention signal (Anki convention, same rule
+the card-scan approximation in ``SRSService`` applies).
+
+Caller commits.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from app.srs.constants import RATING_DOUBT, CardState
+
+# Largest accuracy window the tier resolver asks for (2 × reviews_per_day,
+# capped). Must fit UserStatistics.srs_recent_outcomes.
+RECENT_OUTCOMES_CAPACITY = 200
+
+# Below this many outcomes the ring is too noisy to drive the tier — one
+# miss on the first review would read as 0% — so callers fall back to the
+# lifetime card-counter approximation.
+RECENT_OUTCOMES_MIN = 20
+
+_GRADUATED_STATES = frozenset((CardState.REVIEW.value, CardState.RELEARNING.value))
+
+
+def push_outcome(ring: Optional[str], correct: bool) -> str:
+    """Append one outcome to ``ring``, dropping the oldest beyond capacity."""
+    ring = (ring or '') + ('1' if correct else '0')
+    return ring[-RECENT_OUTCOMES_CAPACITY:]
+
+
+def ring_accuracy(ring: Optional[str], window: int) -> Optional[float]:
+    """Percent correct over the newest ``window`` outcomes.
+
+    Returns None while the ring holds fewer than ``RECENT_OUTCOMES_MIN``
+    outcomes — the caller decides what to use instead.
+    """
+    if not ring or len(ring) < RECENT_OUTCOMES_MIN:
+        return None
+    recent = ring[-max(window, 1):]
+    return recent.count('1') / len(recent) * 100.0
+
+
+def record_review(
+    card: Any,
+    *,
+    user_id: int,
+    rating: int,
+    previous_state: str,
+    elapsed_ms: Optional[int] = None,
+    stats: Any = None,
+) -> None:
+    """Append the log row for a grade and advance the user's accuracy ring.
+
+    Call after the card carries its post-grade ``state``. ``stats`` may be
+    passed when the caller already holds the user's ``UserStatistics`` row.
+    Adds to the session only — caller commits.
+    """
+    from app.study.models import SRSReviewLog
+    from app.utils.db import db
+
+    state_before = previous_state or CardState.NEW.value
+    db.session.add(SRSReviewLog(
+        user_id=user_id,
+        card_id=card.id,
+        rating=rating,
+        state_before=state_before,
+        state_after=card.state or CardState.NEW.value,
+        elapsed_ms=elapsed_ms,
+    ))
+
+    if state_before not in _GRADUATED_STATES:
+        return
+    if stats is None:
+        from app.achievements.services import StatisticsService
+        stats = StatisticsService.get_or_create_statistics(user_id)
+    stats.srs_recent_outcomes = push_outcome(stats.srs_recent_outcomes, rating >= RATING_DOUBT)
@@ -14,6 +14,9 @@ import random
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import case
+from sqlalchemy.orm import contains_eager
+
 from app.grammar_lab.models import GrammarExercise, UserGrammarExercise
 from app.srs.constants import (
     DEFAULT_EASE_FACTOR,
@@ -47,7 +50,9 @@ from app.srs.constants import (
     REQUEUE_RANGE_STEP_1,
     CardState,
 )
+from app.srs.review_log import record_review
 from app.srs.scheduling import apply_review_schedule
+from app.srs.visibility import srs_servable_filter
 from app.srs.difficulty import miss_penalty, update_recovery_state
 from app.study.models import UserCardDirection, UserWord
 from app.utils.db import db
@@ -452,7 +457,8 @@ class UnifiedSRSService:
         card_id: int,
         rating: int,
         user_id: int,
-        session_key: str = None
+        session_key: str = None,
+        elapsed_ms: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Process card rating and update SM-2 parameters using Anki-like state machine.
@@ -465,6 +471,8 @@ class UnifiedSRSService:
             rating: Rating (1, 2, 3)
             user_id: User ID (for access check)
             session_key: Session key (optional, for logging)
+            elapsed_ms: Answer time reported by the client (optional, stored
+                in the review log)
 
         Returns:
             Dict with result:
@@ -560,6 +568,7 @@ class UnifiedSRSService:
             card.session_attempts = (card.session_attempts or 0) + 1
 
             # Increment total_cards_reviewed in UserStatistics (best-effort)
+            stats = None
             try:
                 from app.achievements.services import StatisticsService
                 stats = StatisticsService.get_or_create_statistics(user_id)
@@ -567,6 +576,17 @@ class UnifiedSRSService:
             except Exception:
                 logger.exception("Failed to increment total_cards_reviewed for user %s", user_id)
 
+            # Review log + rolling-accuracy ring, in this transaction. Runs
+            # before record_tier_state so the tier sees this grade.
+            record_review(
+                card,
+                user_id=user_id,
+                rating=rating,
+                previous_state=current_state,
+                elapsed_ms=elapsed_ms,
+                stats=stats,
+            )
+
             # Update parent UserWord status
             self._update_user_word_status(card)
 
@@ -1052,91 +1072,53 @@ class UnifiedSRSService:
         3. REVIEW cards (due today) - regular spaced repetition
         4. NEW cards - fresh cards (with daily limit)
 
+        Cards come back with ``user_word.word`` already loaded (one round trip
+        for the whole session, no per-card lazy loads when formatting).
+
         Args:
             exclude_card_ids: List of card IDs to exclude (for anti-repeat)
         """
         now = datetime.now(timezone.utc).replace(tzinfo=None)
-        result = []
-
-        # Base query builder with buried filter and anti-repeat
-        def base_query():
-            q = (
-                UserCardDirection.query
-                .join(UserWord)
-                .filter(
-                    UserWord.user_id == user_id,
-                    UserWord.srs_excluded.is_(False),
-                )
-                # Filter out buried cards
-                .filter(
-                    db.or_(
-                        UserCardDirection.buried_until.is_(None),
-                        UserCardDirection.buried_until <= now
-                    )
-                )
-            )
-            if word_ids:
-                q = q.filter(UserWord.word_id.in_(word_ids))
-            if directions:
-                q = q.filter(UserCardDirection.direction.in_(directions))
-            # Anti-repeat: exclude specified card IDs
-            if exclude_card_ids:
-                q = q.filter(~UserCardDirection.id.in_(exclude_card_ids))
-            return q
-
-        remaining = limit
-
-        # PRIORITY 1: RELEARNING cards (due now)
-        if remaining > 0:
-            relearning = base_query().filter(
-                UserCardDirection.state == CardState.RELEARNING.value,
-                UserCardDirection.next_review <= now
-            ).order_by(
-                UserCardDirection.recovery_required.desc(),
-                UserCardDirection.next_review.asc()
-            ).limit(remaining).all()
-            result.extend(relearning)
-            remaining -= len(relearning)
-
-        # PRIORITY 2: LEARNING cards (due now)
-        if remaining > 0:
-            learning = base_query().filter(
-                UserCardDirection.state == CardState.LEARNING.value,
-                UserCardDirection.next_review <= now
-            ).order_by(
-                UserCardDirection.recovery_required.desc(),
-                UserCardDirection.next_review.asc()
-            ).limit(remaining).all()
-            result.extend(learning)
-            remaining -= len(learning)
-
-        # PRIORITY 3: REVIEW cards (due today)
-        if remaining > 0:
-            reviews = base_query().filter(
-                UserCardDirection.state == CardState.REVIEW.value,
-                UserCardDirection.next_review <= now
-            ).order_by(
-                UserCardDirection.recovery_required.desc(),
-                UserCardDirection.next_review.asc()
-            ).limit(remaining).all()
-            result.extend(reviews)
-            remaining -= len(reviews)
 
-        # PRIORITY 4: NEW cards (never reviewed, or legacy cards without state)
-        if remaining > 0:
-            new_cards = base_query().filter(
-                db.or_(
-                    UserCardDirection.state == CardState.NEW.value,
-                    UserCardDirection.state.is_(None),
-                    # (removed dead third branch: and_(repetitions==0, state IS
-                    # NULL) is a strict subset of `state IS NULL` above — audit E-021)
-                )
-            ).order_by(
-                UserCardDirection.id.asc()  # Oldest first for consistency
-            ).limit(remaining).all()
-            result.extend(new_cards)
+        is_new = db.or_(
+            UserCardDirection.state == CardState.NEW.value,
+            UserCardDirection.state.is_(None),
+        )
+        due = UserCardDirection.next_review <= now
+        # One ranked query instead of one query per bucket: the priority column
+        # orders the buckets, LIMIT cuts across them exactly like the old
+        # "fill remaining slots" loop did.
+        priority = case(
+            (db.and_(UserCardDirection.state == CardState.RELEARNING.value, due), 1),
+            (db.and_(UserCardDirection.state == CardState.LEARNING.value, due), 2),
+            (db.and_(UserCardDirection.state == CardState.REVIEW.value, due), 3),
+            (is_new, 4),
+        )
 
-        return result
+        query = (
+            UserCardDirection.query
+            .join(UserWord)
+            .join(CollectionWords, UserWord.word_id == CollectionWords.id)
+            .options(contains_eager(UserCardDirection.user_word).contains_eager(UserWord.word))
+            .filter(srs_servable_filter(user_id, now))
+            .filter(priority.isnot(None))
+        )
+        if word_ids:
+            query = query.filter(UserWord.word_id.in_(word_ids))
+        if directions:
+            query = query.filter(UserCardDirection.direction.in_(directions))
+        # Anti-repeat: exclude specified card IDs
+        if exclude_card_ids:
+            query = query.filter(~UserCardDirection.id.in_(exclude_card_ids))
+
+        return query.order_by(
+            priority,
+            # Due buckets: recovery cards first, then most overdue
+            case((is_new, None), else_=UserCardDirection.recovery_required).desc(),
+            case((is_new, None), else_=UserCardDirection.next_review).asc(),
+            # New cards: oldest first for consistency
+            UserCardDirection.id.asc(),
+        ).limit(limit).all()
 
     def _count_studied_today(
         self,
@@ -644,15 +644,26 @@ class UserCardDirection(SRSFieldsMixin, db.Model):
         self.update_user_word_status()
 
         # Increment total_cards_reviewed in UserStatistics (best-effort)
+        _stats = None
         try:
             from app.achievements.services import StatisticsService
-            _uid = self.user_word.user_id if self.user_word else None
-            if _uid is not None:
-                _stats = StatisticsService.get_or_create_statistics(_uid)
+            if user_id is not None:
+                _stats = StatisticsService.get_or_create_statistics(user_id)
                 _stats.total_cards_reviewed = (_stats.total_cards_reviewed or 0) + 1
         except Exception:
             pass
 
+        # Review log + rolling-accuracy ring (same as grade_card).
+        if user_id is not None:
+            from app.srs.review_log import record_review
+            record_review(
+                self,
+                user_id=user_id,
+                rating=rating,
+                previous_state=previous_state,
+                stats=_stats,
+            )
+
         return self.interval
 
     def update_user_word_status(self):
@@ -700,6 +711,38 @@ class UserCardDirection(SRSFieldsMixin, db.Model):
         return max(0, delta.days)
 
 
+class SRSReviewLog(db.Model):
+    """
+    Append-only log of SRS grades — one row per graded card.
+
+    Written in the grading transaction by ``app.srs.review_log.record_review``
+    from both grading surfaces. Rows are never updated; card state lives on
+    UserCardDirection, this table only answers "what happened when".
+    """
+    __tablename__ = 'srs_review_log'
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    card_id = db.Column(
+        db.Integer, db.ForeignKey('user_card_directions.id', ondelete='CASCADE'), nullable=False,
+    )
+    rating = db.Column(db.SmallInteger, nullable=False)  # 1-2-3 unified scale
+    state_before = db.Column(db.String(15), nullable=False)
+    state_after = db.Column(db.String(15), nullable=False)
+    reviewed_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    elapsed_ms = db.Column(db.Integer, nullable=True)  # answer time reported by the client
+
+    __table_args__ = (
+        Index('idx_srs_review_log_user_reviewed', 'user_id', 'reviewed_at'),
+        Index('idx_srs_review_log_card', 'card_id'),
+    )
+
+    def __repr__(self):
+        return f"<SRSReviewLog card={self.card_id} {self.state_before}→{self.state_after} rating={self.rating}>"
+
+
 class QuizDeck(db.Model):
     """
     Quiz deck - a collection of words for quiz
@@ -419,36 +419,14 @@ class DeckService:
 
     @classmethod
     def search_words(cls, query: str, limit: int = 20) -> List[CollectionWords]:
-        """Search words in collection with smart sorting"""
-        from sqlalchemy import case
+        """Search words that have a translation, best match first"""
+        from app.words.search import MIN_TERM_LENGTH, normalize_term, search_words
 
-        if not query or len(query) < 2:
+        if len(normalize_term(query)) < MIN_TERM_LENGTH:
             return []
 
-        # Search in both english and russian
         words_query = CollectionWords.query.filter(
             CollectionWords.russian_word != None,
             CollectionWords.russian_word != '',
-            db.or_(
-                CollectionWords.english_word.ilike(f'%{query}%'),
-                CollectionWords.russian_word.ilike(f'%{query}%')
-            )
-        )
-
-        # Smart sorting: exact match > starts with > contains
-        query_lower = query.lower()
-        words_query = words_query.order_by(
-            case(
-                (func.lower(CollectionWords.english_word) == query_lower, 1),
-                (func.lower(CollectionWords.russian_word) == query_lower, 1),
-                else_=10
-            ),
-            case(
-                (func.lower(CollectionWords.english_word).like(f'{query_lower}%'), 2),
-                (func.lower(CollectionWords.russian_word).like(f'{query_lower}%'), 2),
-                else_=10
-            ),
-            CollectionWords.english_word
         )
-
-        return words_query.limit(limit).all()
+        return search_words(query, limit=limit, query=words_query)
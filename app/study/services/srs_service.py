@@ -9,16 +9,20 @@ Responsibilities:
 """
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Set, Tuple
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
 
 from sqlalchemy import and_, case, func, or_
 
 from app.srs.constants import CardState
+from app.srs.review_log import RECENT_OUTCOMES_CAPACITY, ring_accuracy
 from app.srs.visibility import not_buried_filter, srs_servable_filter
 from app.study.models import QuizDeckWord, StudySettings, UserCardDirection, UserWord
 from app.utils.db import db
 from app.words.models import CollectionWords
 
+if TYPE_CHECKING:
+    from app.achievements.models import UserStatistics
+
 logger = logging.getLogger(__name__)
 
 
@@ -252,22 +256,46 @@ class SRSService:
         return SRSService.TIER_ORDER[target_idx]
 
     @staticmethod
-    def _accuracy_on_recent_reviews(user_id: int, reviews_per_day: int) -> float:
-        """Percent correct on the last `window` REVIEW/RELEARNING-state cards.
+    def _accuracy_window(reviews_per_day: int) -> int:
+        """min(200, max(20, 2 × reviews_per_day)) — ≈ the last 2 sessions."""
+        return min(RECENT_OUTCOMES_CAPACITY, max(20, 2 * max(reviews_per_day, 0)))
 
-        Window = min(200, max(20, 2 × reviews_per_day)) — scales with the
-        user's own daily target (≈ last 2 sessions). Cards in NEW / LEARNING
-        do not affect the metric (Anki convention: only graduated cards
-        measure true retention; LEARNING failures are part of acquisition).
+    @staticmethod
+    def _accuracy_on_recent_reviews(
+        user_id: int, reviews_per_day: int, stats: 'UserStatistics | None' = None,
+    ) -> float:
+        """Percent correct on the last `window` REVIEW/RELEARNING-state grades.
+
+        Window scales with the user's own daily target (see
+        :meth:`_accuracy_window`). Grades on NEW / LEARNING cards do not
+        affect the metric (Anki convention: only graduated cards measure
+        true retention; LEARNING failures are part of acquisition).
+
+        Read from the ``UserStatistics.srs_recent_outcomes`` ring kept by
+        ``app.srs.review_log`` — no card scan. Until the ring holds enough
+        grades (users who have not reviewed since it was introduced) this
+        falls back to :meth:`_accuracy_from_card_counters`.
+        """
+        if stats is None:
+            from app.achievements.models import UserStatistics
+            stats = UserStatistics.query.filter_by(user_id=user_id).first()
+        window = SRSService._accuracy_window(reviews_per_day)
+        accuracy = ring_accuracy(stats.srs_recent_outcomes if stats else None, window)
+        if accuracy is not None:
+            return accuracy
+        return SRSService._accuracy_from_card_counters(user_id, window)
+
+    @staticmethod
+    def _accuracy_from_card_counters(user_id: int, window: int) -> float:
+        """Bootstrap approximation from the last `window` reviewed cards.
 
         `correct_count` / `incorrect_count` are lifetime aggregates per
         direction, but ordering by `last_reviewed.desc()` and capping to
-        `window` rows approximates recent activity well enough without a
-        per-grade log.
+        `window` rows approximates recent activity well enough while the
+        review-log ring is still filling up.
         """
-        window = min(200, max(20, 2 * max(reviews_per_day, 0)))
         recent = (
-            db.session.query(UserCardDirection)
+            db.session.query(UserCardDirection.correct_count, UserCardDirection.incorrect_count)
             .filter(
                 UserCardDirection.user_word_id.in_(
                     db.session.query(UserWord.id).filter(
@@ -284,8 +312,8 @@ class SRSService:
             .limit(window)
             .all()
         )
-        total_correct = sum(c.correct_count or 0 for c in recent)
-        total_incorrect = sum(c.incorrect_count or 0 for c in recent)
+        total_correct = sum(correct or 0 for correct, _ in recent)
+        total_incorrect = sum(incorrect or 0 for _, incorrect in recent)
         total = total_correct + total_incorrect
         return (total_correct / total * 100.0) if total > 0 else 100.0
 
@@ -348,7 +376,7 @@ class SRSService:
         stored_floor = (stats.adaptive_tier_floor if stats else 'normal') or 'normal'
         stored_floor_date = stats.adaptive_tier_floor_date if stats else None
 
-        accuracy = SRSService._accuracy_on_recent_reviews(user_id, base_reviews)
+        accuracy = SRSService._accuracy_on_recent_reviews(user_id, base_reviews, stats)
         target_tier = SRSService._tier_from_accuracy(accuracy)
         target_idx = SRSService.TIER_ORDER.index(target_tier)
 
@@ -393,7 +421,7 @@ class SRSService:
             # values _resolve_tier just used, but it does not surface them.
             settings = StudySettings.query.filter_by(user_id=user_id).first()
             base_reviews = (settings.reviews_per_day if settings else 0) or 0
-            accuracy = SRSService._accuracy_on_recent_reviews(user_id, base_reviews)
+            accuracy = SRSService._accuracy_on_recent_reviews(user_id, base_reviews, stats)
             overdue = SRSService._overdue_review_count(user_id)
             logger.info(
                 'adaptive_tier: user=%s drop %s → %s on=%s '
@@ -7,6 +7,7 @@ from flask import current_app
 from sqlalchemy.exc import IntegrityError
 
 from app.telegram.models import PendingTelegramLink, TelegramLinkCode, TelegramUser
+from app.telegram.sender import get_sender
 from app.utils.db import db
 
 logger = logging.getLogger(__name__)
@@ -20,26 +21,14 @@ def _progress_bar(pct: int, length: int = 10) -> str:
 
 def _send_message(chat_id: int, text: str, parse_mode: str = 'HTML',
                   reply_markup: dict | None = None) -> None:
-    """Send a message via Telegram Bot API."""
-    token = current_app.config.get('TELEGRAM_BOT_TOKEN')
-    if not token:
+    """Send a message via Telegram Bot API (synchronous, for command replies)."""
+    sender = get_sender(current_app.config)
+    if sender is None:
         logger.error('TELEGRAM_BOT_TOKEN not configured')
         return
 
-    payload: dict[str, Any] = {
-        'chat_id': chat_id,
-        'text': text,
-        'parse_mode': parse_mode,
-    }
-    if reply_markup:
-        payload['reply_markup'] = reply_markup
-
     try:
-        resp = requests.post(
-            f'https://api.telegram.org/bot{token}/sendMessage',
-            json=payload,
-            timeout=10,
-        )
+        resp = sender.call('sendMessage', _message_payload(chat_id, text, parse_mode, reply_markup))
         if not resp.ok:
             logger.warning('Telegram API error: %s', resp.text)
     except requests.RequestException as e:
@@ -48,10 +37,30 @@ def _send_message(chat_id: int, text: str, parse_mode: str = 'HTML',
         logger.error('Failed to send Telegram message: %s', type(e).__name__)
 
 
+def _message_payload(chat_id: int, text: str, parse_mode: str,
+                     reply_markup: dict | None) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        'chat_id': chat_id,
+        'text': text,
+        'parse_mode': parse_mode,
+    }
+    if reply_markup:
+        payload['reply_markup'] = reply_markup
+    return payload
+
+
 def send_message(chat_id: int, text: str, parse_mode: str = 'HTML',
                  reply_markup: dict | None = None) -> None:
-    """Public wrapper — usable from scheduler outside request context."""
-    _send_message(chat_id, text, parse_mode, reply_markup)
+    """Queue a message for delivery — usable from scheduler outside request context.
+
+    Returns immediately; the outbound queue (app/telegram/sender.py) applies
+    Telegram's rate limits and retries 429/5xx.
+    """
+    sender = get_sender(current_app.config)
+    if sender is None:
+        logger.error('TELEGRAM_BOT_TOKEN not configured')
+        return
+    sender.enqueue('sendMessage', _message_payload(chat_id, text, parse_mode, reply_markup))
 
 
 # ── Command handlers ────────────────────────────────────────────────
@@ -270,10 +279,7 @@ def _edit_message(chat_id: int, message_id: int, text: str,
     if reply_markup:
         payload['reply_markup'] = reply_markup
     try:
-        requests.post(
-            f'https://api.telegram.org/bot{token}/editMessageText',
-            json=payload, timeout=10,
-        )
+        get_sender(current_app.config).call('editMessageText', payload)
     except requests.RequestException as e:
         logger.error('Failed to edit message: %s', type(e).__name__)
 
@@ -284,10 +290,8 @@ def _remove_reply_markup(chat_id: int, message_id: int) -> None:
     if not token or not message_id:
         return
     try:
-        requests.post(
-            f'https://api.telegram.org/bot{token}/editMessageReplyMarkup',
-            json={'chat_id': chat_id, 'message_id': message_id},
-            timeout=10,
+        get_sender(current_app.config).call(
+            'editMessageReplyMarkup', {'chat_id': chat_id, 'message_id': message_id},
         )
     except requests.RequestException as e:
         logger.error('Failed to remove reply markup: %s', type(e).__name__)
@@ -299,10 +303,8 @@ def _answer_callback(callback_query_id: str, text: str = 'Сохранено!')
     if not token:
         return
     try:
-        requests.post(
-            f'https://api.telegram.org/bot{token}/answerCallbackQuery',
-            json={'callback_query_id': callback_query_id, 'text': text},
-            timeout=5,
+        get_sender(current_app.config).call(
+            'answerCallbackQuery', {'callback_query_id': callback_query_id, 'text': text}, timeout=5,
         )
     except requests.RequestException:
         pass
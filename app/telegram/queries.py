@@ -3,7 +3,7 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 import pytz
-from sqlalchemy import func
+from sqlalchemy import and_, func, select, union_all
 
 from app.books.models import Book, UserChapterProgress
 from app.curriculum.book_courses import BookCourse, BookCourseEnrollment, BookCourseModule
@@ -44,6 +44,13 @@ def has_activity_today(user_id: int, tz: str = DEFAULT_TZ) -> bool:
     return has_learning_activity(user_id, today_start, today_end)
 
 
+def get_active_today_ids(user_ids, tz: str = DEFAULT_TZ) -> set[int]:
+    """``has_activity_today`` for users sharing a timezone, in one query."""
+    from app.utils.activity_tracker import get_active_user_ids
+    today_start, today_end = _user_day_boundaries(tz)
+    return get_active_user_ids(user_ids, today_start, today_end)
+
+
 def _has_activity_in_range(user_id: int, start_utc: datetime,
                            end_utc: datetime) -> bool:
     """Check if user had any learning activity in [start_utc, end_utc).
@@ -59,43 +66,53 @@ def get_current_streak(user_id: int, tz: str = DEFAULT_TZ) -> int:
     """Calculate current streak based on actual activity.
 
     Uses user's timezone to determine day boundaries.
-    Pre-fetches repair events in one query to avoid N+1 problem.
+    Active dates of the last year come from one UNION query and repair
+    events from one more, so the walk itself issues no queries.
     Repaired days (free_repair, spent_repair) always count toward the streak.
-    Any real activity (checked via _has_activity_in_range) counts as a streak day.
+    Any real activity (see get_active_local_dates) counts as a streak day.
     """
-    from app.achievements.models import StreakEvent
+    return get_current_streaks([user_id], tz=tz).get(user_id, 0)
 
-    streak = 0
 
-    if has_activity_today(user_id, tz=tz):
-        streak = 1
+def get_current_streaks(user_ids, tz: str = DEFAULT_TZ) -> dict[int, int]:
+    """``get_current_streak`` for users sharing a timezone, in two queries total."""
+    from app.achievements.models import StreakEvent
+    from app.utils.activity_tracker import get_active_local_dates_by_user
+
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
 
-    # Pre-fetch repair events for the last year in one query
     try:
         tz_obj = pytz.timezone(tz)
     except pytz.UnknownTimeZoneError:
         tz_obj = pytz.timezone(DEFAULT_TZ)
-    local_now = datetime.now(tz_obj)
-    earliest_date = local_now.date() - timedelta(days=366)
+    local_today = datetime.now(tz_obj).date()
+    earliest_date = local_today - timedelta(days=366)
 
-    repairs_by_date: dict[date, bool] = {}
-    for ev in StreakEvent.query.filter(
-        StreakEvent.user_id == user_id,
+    active_by_user = get_active_local_dates_by_user(user_ids, earliest_date, local_today, tz_obj.zone)
+
+    repairs_by_user: dict[int, set[date]] = {}
+    for uid, event_date in db.session.query(StreakEvent.user_id, StreakEvent.event_date).filter(
+        StreakEvent.user_id.in_(user_ids),
         StreakEvent.event_type.in_(['free_repair', 'spent_repair', 'plan_pause', 'shield_repair']),
         StreakEvent.event_date >= earliest_date,
     ):
-        repairs_by_date[ev.event_date] = True
+        repairs_by_user.setdefault(uid, set()).add(event_date)
 
-    # Walk backwards through dates
-    for offset in range(1, 366):
-        check_date = local_now.date() - timedelta(days=offset)
+    return {
+        uid: _walk_streak(local_today, active_by_user.get(uid, set()), repairs_by_user.get(uid, set()))
+        for uid in user_ids
+    }
 
-        if check_date in repairs_by_date:
-            streak += 1
-            continue
 
-        day_start, day_end = _user_day_boundaries(tz, offset_days=-offset)
-        if _has_activity_in_range(user_id, day_start, day_end):
+def _walk_streak(local_today: date, active_dates: set[date], repaired_dates: set[date]) -> int:
+    streak = 1 if local_today in active_dates else 0
+
+    # Walk backwards through dates
+    for offset in range(1, 366):
+        check_date = local_today - timedelta(days=offset)
+        if check_date in repaired_dates or check_date in active_dates:
             streak += 1
         else:
             break
@@ -1067,153 +1084,184 @@ def get_daily_plan_v2(user_id: int, tz: str = DEFAULT_TZ) -> dict[str, Any]:
 
 def get_daily_summary(user_id: int, tz: str = DEFAULT_TZ) -> dict[str, Any]:
     """Get summary of today's activity in user's timezone."""
-    today_start, today_end = _user_day_boundaries(tz)
+    return get_daily_summaries([user_id], tz=tz)[user_id]
 
-    # Lessons completed today
-    lessons_completed = LessonProgress.query.filter(
-        LessonProgress.user_id == user_id,
-        LessonProgress.status == 'completed',
-        LessonProgress.completed_at >= today_start,
-        LessonProgress.completed_at < today_end,
-    ).all()
 
-    lesson_types: list[str] = []
-    for lp in lessons_completed:
-        lesson = Lessons.query.get(lp.lesson_id)
-        if lesson and lesson.type:
-            lesson_types.append(lesson.type)
+def get_daily_summaries(user_ids, tz: str = DEFAULT_TZ) -> dict[int, dict[str, Any]]:
+    """``get_daily_summary`` for users sharing a timezone, in three queries.
 
-    # Grammar exercises done today
-    grammar_done = UserGrammarExercise.query.filter(
-        UserGrammarExercise.user_id == user_id,
-        UserGrammarExercise.last_reviewed >= today_start,
-        UserGrammarExercise.last_reviewed < today_end,
-    ).count()
+    Per-user counters come from one statement of grouped subqueries (SRS
+    totals split with FILTER) LEFT JOINed onto the users, plus a correlated
+    lookup of the latest grammar topic. Completed lessons with their type and
+    title, and chapter progress with book and chapter titles, are one list
+    query each. Used for one user by the dashboard and for a whole timezone
+    bucket by the Telegram evening summary.
+    """
+    from app.auth.models import User
+    from app.books.models import Chapter
+    from app.daily_plan.linear.models import QuizErrorLog
+    from app.grammar_lab.models import GrammarExercise
+    from app.study.models import StudySession
 
-    grammar_correct = UserGrammarExercise.query.filter(
-        UserGrammarExercise.user_id == user_id,
-        UserGrammarExercise.last_reviewed >= today_start,
-        UserGrammarExercise.last_reviewed < today_end,
-    ).with_entities(
-        func.sum(UserGrammarExercise.correct_count)
-    ).scalar() or 0
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return {}
+    today_start, today_end = _user_day_boundaries(tz)
 
-    # Words reviewed today (all sources: curriculum lessons + SRS cards)
-    words_reviewed = db.session.query(func.count(UserCardDirection.id)).join(UserWord).filter(
-        UserWord.user_id == user_id,
-        UserCardDirection.last_reviewed >= today_start,
-        UserCardDirection.last_reviewed < today_end,
+    def _today(column):
+        return and_(column >= today_start, column < today_end)
+
+    grammar = db.session.query(
+        UserGrammarExercise.user_id.label('user_id'),
+        func.count(UserGrammarExercise.id).label('done'),
+        func.sum(UserGrammarExercise.correct_count).label('correct'),
+    ).filter(
+        UserGrammarExercise.user_id.in_(user_ids),
+        _today(UserGrammarExercise.last_reviewed),
+    ).group_by(UserGrammarExercise.user_id).subquery()
+
+    # Words reviewed today (all sources: curriculum lessons + SRS cards),
+    # and how many of them were first seen today
+    cards = db.session.query(
+        UserWord.user_id.label('user_id'),
+        func.count(UserCardDirection.id).label('reviewed'),
+        func.count(UserCardDirection.id).filter(
+            UserCardDirection.first_reviewed >= today_start
+        ).label('new_reviewed'),
+    ).join(UserCardDirection, UserCardDirection.user_word_id == UserWord.id).filter(
+        UserWord.user_id.in_(user_ids),
         UserCardDirection.direction == 'eng-rus',
-    ).scalar() or 0
+        _today(UserCardDirection.last_reviewed),
+    ).group_by(UserWord.user_id).subquery()
 
     # Words reviewed in dedicated SRS card sessions only (excludes curriculum lessons)
-    from app.study.models import StudySession
-    srs_words_reviewed = db.session.query(
-        func.coalesce(func.sum(StudySession.words_studied), 0)
+    sessions = db.session.query(
+        StudySession.user_id.label('user_id'),
+        func.sum(StudySession.words_studied).label('words'),
     ).filter(
-        StudySession.user_id == user_id,
+        StudySession.user_id.in_(user_ids),
         StudySession.session_type == 'cards',
-        StudySession.start_time >= today_start,
-        StudySession.start_time < today_end,
-    ).scalar() or 0
+        _today(StudySession.start_time),
+    ).group_by(StudySession.user_id).subquery()
 
-    # Books read today
-    from app.books.models import Chapter
-    books_read_today = db.session.query(Book.title).join(
-        Chapter, Chapter.book_id == Book.id
-    ).join(
-        UserChapterProgress, UserChapterProgress.chapter_id == Chapter.id
+    course_lessons = db.session.query(
+        UserLessonProgress.user_id.label('user_id'),
+        func.count(UserLessonProgress.id).label('completed'),
     ).filter(
-        UserChapterProgress.user_id == user_id,
-        UserChapterProgress.updated_at >= today_start,
-        UserChapterProgress.updated_at < today_end,
-    ).distinct().all()
-    book_titles = [r[0] for r in books_read_today]
-
-    # Book course lessons completed today
-    book_course_lessons_today = UserLessonProgress.query.filter(
-        UserLessonProgress.user_id == user_id,
+        UserLessonProgress.user_id.in_(user_ids),
         UserLessonProgress.status == 'completed',
-        UserLessonProgress.completed_at >= today_start,
-        UserLessonProgress.completed_at < today_end,
-    ).count()
-
-    # Extra details for dashboard step results
-    latest_lesson_score = None
-    latest_lesson_title = None
-    if lessons_completed:
-        last_lp = max(lessons_completed, key=lambda lp: lp.completed_at or datetime.min)
-        latest_lesson_score = last_lp.score
-        lesson_obj = Lessons.query.get(last_lp.lesson_id)
-        if lesson_obj:
-            latest_lesson_title = lesson_obj.title or ''
-
-    # Grammar topic title (from today's exercises)
-    grammar_topic_title = None
-    if grammar_done > 0:
-        latest_ge = UserGrammarExercise.query.filter(
-            UserGrammarExercise.user_id == user_id,
-            UserGrammarExercise.last_reviewed >= today_start,
-            UserGrammarExercise.last_reviewed < today_end,
-        ).order_by(UserGrammarExercise.last_reviewed.desc()).first()
-        if latest_ge and latest_ge.exercise:
-            from app.grammar_lab.models import GrammarTopic
-            topic = GrammarTopic.query.get(latest_ge.exercise.topic_id)
-            if topic:
-                grammar_topic_title = topic.title
-
-    # SRS breakdown: new vs review
-    srs_new_reviewed = db.session.query(func.count(UserCardDirection.id)).join(UserWord).filter(
-        UserWord.user_id == user_id,
-        UserCardDirection.last_reviewed >= today_start,
-        UserCardDirection.last_reviewed < today_end,
-        UserCardDirection.direction == 'eng-rus',
-        UserCardDirection.first_reviewed >= today_start,
-    ).scalar() or 0
-    srs_review_reviewed = max(0, words_reviewed - srs_new_reviewed)
+        _today(UserLessonProgress.completed_at),
+    ).group_by(UserLessonProgress.user_id).subquery()
 
     # Error-review resolutions (linear daily plan: the optional 4th slot
     # is satisfied by resolving quiz-error-log rows today).
-    from app.daily_plan.linear.models import QuizErrorLog
-    error_review_resolved_today = db.session.query(
-        func.count(QuizErrorLog.id)
+    errors = db.session.query(
+        QuizErrorLog.user_id.label('user_id'),
+        func.count(QuizErrorLog.id).label('resolved'),
     ).filter(
-        QuizErrorLog.user_id == user_id,
-        QuizErrorLog.resolved_at >= today_start,
-        QuizErrorLog.resolved_at < today_end,
-    ).scalar() or 0
+        QuizErrorLog.user_id.in_(user_ids),
+        _today(QuizErrorLog.resolved_at),
+    ).group_by(QuizErrorLog.user_id).subquery()
 
-    # Latest book chapter
-    book_chapter_title = None
-    if book_titles:
-        latest_chapter = db.session.query(Chapter.title).join(
-            UserChapterProgress, UserChapterProgress.chapter_id == Chapter.id
-        ).filter(
-            UserChapterProgress.user_id == user_id,
-            UserChapterProgress.updated_at >= today_start,
-            UserChapterProgress.updated_at < today_end,
-        ).order_by(UserChapterProgress.updated_at.desc()).first()
-        if latest_chapter:
-            book_chapter_title = latest_chapter[0]
-
-    return {
-        'lessons_count': len(lesson_types),
-        'lesson_types': lesson_types,
-        'grammar_exercises': grammar_done,
-        'grammar_correct': grammar_correct,
-        'words_reviewed': words_reviewed,
-        'srs_words_reviewed': srs_words_reviewed,
-        'srs_new_reviewed': srs_new_reviewed,
-        'srs_review_reviewed': srs_review_reviewed,
-        'books_read': book_titles,
-        'book_course_lessons_today': book_course_lessons_today,
-        'error_review_resolved_today': int(error_review_resolved_today),
-        'lesson_score': latest_lesson_score,
-        'lesson_title': latest_lesson_title,
-        'grammar_topic_title': grammar_topic_title,
-        'book_chapter_title': book_chapter_title,
+    latest_topic = db.session.query(GrammarTopic.title).select_from(UserGrammarExercise).join(
+        GrammarExercise, GrammarExercise.id == UserGrammarExercise.exercise_id
+    ).join(
+        GrammarTopic, GrammarTopic.id == GrammarExercise.topic_id
+    ).filter(
+        UserGrammarExercise.user_id == User.id,
+        _today(UserGrammarExercise.last_reviewed),
+    ).order_by(UserGrammarExercise.last_reviewed.desc()).limit(1).correlate(User).scalar_subquery()
+
+    counters = {
+        row.user_id: row
+        for row in db.session.query(
+            User.id.label('user_id'),
+            func.coalesce(grammar.c.done, 0).label('grammar_done'),
+            func.coalesce(grammar.c.correct, 0).label('grammar_correct'),
+            func.coalesce(cards.c.reviewed, 0).label('words_reviewed'),
+            func.coalesce(cards.c.new_reviewed, 0).label('srs_new_reviewed'),
+            func.coalesce(sessions.c.words, 0).label('srs_words_reviewed'),
+            func.coalesce(course_lessons.c.completed, 0).label('book_course_lessons'),
+            func.coalesce(errors.c.resolved, 0).label('errors_resolved'),
+            latest_topic.label('grammar_topic_title'),
+        )
+        .outerjoin(grammar, grammar.c.user_id == User.id)
+        .outerjoin(cards, cards.c.user_id == User.id)
+        .outerjoin(sessions, sessions.c.user_id == User.id)
+        .outerjoin(course_lessons, course_lessons.c.user_id == User.id)
+        .outerjoin(errors, errors.c.user_id == User.id)
+        .filter(User.id.in_(user_ids))
     }
 
+    # Lessons completed today, with the lesson's type and title
+    lessons_by_user: dict[int, list] = {}
+    for row in db.session.query(
+        LessonProgress.user_id,
+        LessonProgress.score,
+        LessonProgress.completed_at,
+        Lessons.id.label('lesson_id'),
+        Lessons.type.label('lesson_type'),
+        Lessons.title.label('lesson_title'),
+    ).outerjoin(Lessons, Lessons.id == LessonProgress.lesson_id).filter(
+        LessonProgress.user_id.in_(user_ids),
+        LessonProgress.status == 'completed',
+        _today(LessonProgress.completed_at),
+    ).order_by(LessonProgress.completed_at, LessonProgress.id):
+        lessons_by_user.setdefault(row.user_id, []).append(row)
+
+    # Books read today, most recent chapter first
+    reading_by_user: dict[int, list] = {}
+    for row in db.session.query(
+        UserChapterProgress.user_id,
+        Book.title.label('book_title'),
+        Chapter.title.label('chapter_title'),
+    ).join(Chapter, Chapter.id == UserChapterProgress.chapter_id).join(
+        Book, Book.id == Chapter.book_id
+    ).filter(
+        UserChapterProgress.user_id.in_(user_ids),
+        _today(UserChapterProgress.updated_at),
+    ).order_by(UserChapterProgress.updated_at.desc()):
+        reading_by_user.setdefault(row.user_id, []).append(row)
+
+    summaries = {}
+    for user_id in user_ids:
+        row = counters.get(user_id)
+        lessons = lessons_by_user.get(user_id, [])
+        reading = reading_by_user.get(user_id, [])
+
+        lesson_types = [lp.lesson_type for lp in lessons if lp.lesson_type]
+        latest_lesson_score = None
+        latest_lesson_title = None
+        if lessons:
+            last_lp = max(lessons, key=lambda lp: lp.completed_at or datetime.min)
+            latest_lesson_score = last_lp.score
+            if last_lp.lesson_id is not None:
+                latest_lesson_title = last_lp.lesson_title or ''
+
+        book_titles = list(dict.fromkeys(r.book_title for r in reading))
+        words_reviewed = row.words_reviewed if row else 0
+        srs_new_reviewed = row.srs_new_reviewed if row else 0
+        grammar_done = row.grammar_done if row else 0
+
+        summaries[user_id] = {
+            'lessons_count': len(lesson_types),
+            'lesson_types': lesson_types,
+            'grammar_exercises': grammar_done,
+            'grammar_correct': row.grammar_correct if row else 0,
+            'words_reviewed': words_reviewed,
+            'srs_words_reviewed': row.srs_words_reviewed if row else 0,
+            'srs_new_reviewed': srs_new_reviewed,
+            'srs_review_reviewed': max(0, words_reviewed - srs_new_reviewed),
+            'books_read': book_titles,
+            'book_course_lessons_today': row.book_course_lessons if row else 0,
+            'error_review_resolved_today': int(row.errors_resolved) if row else 0,
+            'lesson_score': latest_lesson_score,
+            'lesson_title': latest_lesson_title,
+            'grammar_topic_title': (row.grammar_topic_title if row and grammar_done > 0 else None),
+            'book_chapter_title': reading[0].chapter_title if reading else None,
+        }
+    return summaries
+
 
 def get_yesterday_summary(user_id: int, tz: str = DEFAULT_TZ) -> dict[str, Any]:
     """Get yesterday's activity summary (for dashboard badge)."""
@@ -1281,88 +1329,118 @@ def get_yesterday_summary(user_id: int, tz: str = DEFAULT_TZ) -> dict[str, Any]:
 
 def get_weekly_report(user_id: int, tz: str = DEFAULT_TZ) -> dict[str, Any]:
     """Get weekly statistics for the report."""
+    return get_weekly_reports([user_id], tz=tz)[user_id]
+
+
+def get_weekly_reports(user_ids, tz: str = DEFAULT_TZ,
+                       streaks: dict[int, int] | None = None) -> dict[int, dict[str, Any]]:
+    """``get_weekly_report`` for users sharing a timezone.
+
+    Active days of both weeks are one DISTINCT query over the lesson,
+    grammar and card activity; the lesson/exercise/SRS counters one more,
+    with the two lesson windows split by FILTER. Streaks come from
+    ``get_current_streaks`` unless the caller already has them.
+    """
+    from app.auth.models import User
+
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return {}
     today_start, _ = _user_day_boundaries(tz)
     week_start = today_start - timedelta(days=7)
     prev_week_start = week_start - timedelta(days=7)
     now = today_start  # use start of today as "end of this week"
 
-    def _count_active_days(start: datetime, end: datetime) -> int:
-        """Count days with at least one activity."""
-        active_days = set()
-        # Lesson activity
-        for lp in LessonProgress.query.filter(
-            LessonProgress.user_id == user_id,
-            LessonProgress.last_activity >= start,
-            LessonProgress.last_activity < end,
-        ).all():
-            if lp.last_activity:
-                active_days.add(lp.last_activity.date())
-
-        # Grammar activity
-        for ge in UserGrammarExercise.query.filter(
-            UserGrammarExercise.user_id == user_id,
-            UserGrammarExercise.last_reviewed >= start,
-            UserGrammarExercise.last_reviewed < end,
-        ).all():
-            if ge.last_reviewed:
-                active_days.add(ge.last_reviewed.date())
-
-        # Word reviews
-        for row in db.session.query(UserCardDirection.last_reviewed).join(UserWord).filter(
-            UserWord.user_id == user_id,
-            UserCardDirection.last_reviewed >= start,
-            UserCardDirection.last_reviewed < end,
+    # Days with at least one activity (UTC dates), per week
+    activity = union_all(
+        select(LessonProgress.user_id.label('user_id'), LessonProgress.last_activity.label('ts')).where(
+            LessonProgress.user_id.in_(user_ids),
+            LessonProgress.last_activity >= prev_week_start,
+            LessonProgress.last_activity < now,
+        ),
+        select(UserGrammarExercise.user_id, UserGrammarExercise.last_reviewed).where(
+            UserGrammarExercise.user_id.in_(user_ids),
+            UserGrammarExercise.last_reviewed >= prev_week_start,
+            UserGrammarExercise.last_reviewed < now,
+        ),
+        select(UserWord.user_id, UserCardDirection.last_reviewed).join(
+            UserCardDirection, UserCardDirection.user_word_id == UserWord.id
+        ).where(
+            UserWord.user_id.in_(user_ids),
             UserCardDirection.direction == 'eng-rus',
-        ).all():
-            if row[0]:
-                active_days.add(row[0].date())
-
-        return len(active_days)
-
-    active_days = _count_active_days(week_start, now)
-    prev_active_days = _count_active_days(prev_week_start, week_start)
-
-    # Lessons completed this week
-    lessons_completed = LessonProgress.query.filter(
-        LessonProgress.user_id == user_id,
-        LessonProgress.status == 'completed',
-        LessonProgress.completed_at >= week_start,
-    ).count()
-
-    prev_lessons = LessonProgress.query.filter(
-        LessonProgress.user_id == user_id,
+            UserCardDirection.last_reviewed >= prev_week_start,
+            UserCardDirection.last_reviewed < now,
+        ),
+    ).subquery()
+    this_week = activity.c.ts >= week_start
+    active_days = {user_id: [0, 0] for user_id in user_ids}
+    for user_id, _day, is_this_week in db.session.query(
+        activity.c.user_id, func.date(activity.c.ts), this_week,
+    ).distinct():
+        active_days[user_id][0 if is_this_week else 1] += 1
+
+    lessons = db.session.query(
+        LessonProgress.user_id.label('user_id'),
+        func.count(LessonProgress.id).filter(LessonProgress.completed_at >= week_start).label('this_week'),
+        func.count(LessonProgress.id).filter(LessonProgress.completed_at < week_start).label('prev_week'),
+    ).filter(
+        LessonProgress.user_id.in_(user_ids),
         LessonProgress.status == 'completed',
         LessonProgress.completed_at >= prev_week_start,
-        LessonProgress.completed_at < week_start,
-    ).count()
+    ).group_by(LessonProgress.user_id).subquery()
 
-    # Grammar exercises
-    exercises_done = UserGrammarExercise.query.filter(
-        UserGrammarExercise.user_id == user_id,
+    exercises = db.session.query(
+        UserGrammarExercise.user_id.label('user_id'),
+        func.count(UserGrammarExercise.id).label('done'),
+    ).filter(
+        UserGrammarExercise.user_id.in_(user_ids),
         UserGrammarExercise.last_reviewed >= week_start,
-    ).count()
+    ).group_by(UserGrammarExercise.user_id).subquery()
 
     # Words in SRS
-    words_in_srs = db.session.query(func.count(UserCardDirection.id)).join(UserWord).filter(
-        UserWord.user_id == user_id,
+    srs = db.session.query(
+        UserWord.user_id.label('user_id'),
+        func.count(UserCardDirection.id).label('words'),
+    ).join(UserCardDirection, UserCardDirection.user_word_id == UserWord.id).filter(
+        UserWord.user_id.in_(user_ids),
         UserCardDirection.state != 'new',
         UserCardDirection.direction == 'eng-rus',
-    ).scalar() or 0
-
-    streak = get_current_streak(user_id, tz=tz)
-
-    return {
-        'week_start': week_start.date(),
-        'week_end': now.date(),
-        'active_days': active_days,
-        'prev_active_days': prev_active_days,
-        'lessons_completed': lessons_completed,
-        'prev_lessons': prev_lessons,
-        'exercises_done': exercises_done,
-        'words_in_srs': words_in_srs,
-        'streak': streak,
+    ).group_by(UserWord.user_id).subquery()
+
+    counters = {
+        row.user_id: row
+        for row in db.session.query(
+            User.id.label('user_id'),
+            func.coalesce(lessons.c.this_week, 0).label('lessons_completed'),
+            func.coalesce(lessons.c.prev_week, 0).label('prev_lessons'),
+            func.coalesce(exercises.c.done, 0).label('exercises_done'),
+            func.coalesce(srs.c.words, 0).label('words_in_srs'),
+        )
+        .outerjoin(lessons, lessons.c.user_id == User.id)
+        .outerjoin(exercises, exercises.c.user_id == User.id)
+        .outerjoin(srs, srs.c.user_id == User.id)
+        .filter(User.id.in_(user_ids))
     }
 
+    if streaks is None:
+        streaks = get_current_streaks(user_ids, tz=tz)
+
+    reports = {}
+    for user_id in user_ids:
+        row = counters.get(user_id)
+        reports[user_id] = {
+            'week_start': week_start.date(),
+            'week_end': now.date(),
+            'active_days': active_days[user_id][0],
+            'prev_active_days': active_days[user_id][1],
+            'lessons_completed': row.lessons_completed if row else 0,
+            'prev_lessons': row.prev_lessons if row else 0,
+            'exercises_done': row.exercises_done if row else 0,
+            'words_in_srs': row.words_in_srs if row else 0,
+            'streak': streaks.get(user_id, 0),
+        }
+    return reports
+
 
 def get_quick_stats(user_id: int, tz: str = DEFAULT_TZ) -> dict[str, Any]:
     """Quick stats for /stats command."""
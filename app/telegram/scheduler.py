@@ -1,7 +1,11 @@
 """APScheduler jobs for Telegram notifications."""
 import logging
 import os
-from datetime import datetime, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import NamedTuple
 
 import pytz
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -18,14 +22,11 @@ from app.telegram.notifications import (
     format_word_of_day,
 )
 from app.telegram.queries import (
-    get_cards_url,
-    get_current_streak,
     get_daily_plan_for_telegram,
     get_daily_summary,
     get_quickest_action,
     get_tomorrow_preview,
     get_weekly_report,
-    has_activity_today,
 )
 from config.settings import DEFAULT_TIMEZONE
 
@@ -189,45 +190,229 @@ def _channel_refill_queue(app) -> None:
             logger.exception('Channel publisher queue_upcoming failed')
 
 
+class _LocalClock(NamedTuple):
+    """Local wall clock of one timezone at the moment the hourly job runs."""
+    zone: str
+    hour: int
+    local_date: date
+    is_sunday: bool
+
+
+class _Recipient(NamedTuple):
+    """A linked Telegram user with at least one notification due this hour."""
+    user_id: int
+    chat_id: int
+    clock: _LocalClock
+    kinds: frozenset
+
+
+@dataclass
+class _CohortData:
+    """Per-user data prefetched for the whole hourly cohort in set-based queries."""
+    names: dict[int, str] = field(default_factory=dict)
+    cards_urls: dict[int, str] = field(default_factory=dict)
+    active_today: set[int] = field(default_factory=set)
+    streaks: dict[int, int] = field(default_factory=dict)
+    daily_summaries: dict[int, dict] = field(default_factory=dict)
+    weekly_reports: dict[int, dict] = field(default_factory=dict)
+
+
+# Kinds that need today's activity flag / the current streak up front
+_ACTIVITY_KINDS = frozenset({'tgn_nudge', 'tgn_evening', 'tgn_streak'})
+_STREAK_KINDS = frozenset({'tgn_morning', 'tgn_evening', 'tgn_streak', 'tgn_weekly'})
+
+
+def _timezone_clocks(now_utc: datetime) -> dict[str, _LocalClock]:
+    """Local clock per distinct timezone of active Telegram users.
+
+    One pytz lookup per timezone rather than per user; unknown names get
+    the DEFAULT_TIMEZONE clock, as before.
+    """
+    from app.utils.db import db
+
+    clocks = {}
+    for (tz_name,) in db.session.query(TelegramUser.timezone).filter(
+        TelegramUser.is_active.is_(True),
+    ).distinct():
+        try:
+            tz = pytz.timezone(tz_name)
+        except pytz.UnknownTimeZoneError:
+            tz = pytz.timezone(DEFAULT_TIMEZONE)
+        local_time = now_utc.astimezone(tz)
+        clocks[tz_name] = _LocalClock(tz.zone, local_time.hour, local_time.date(), local_time.weekday() == 6)
+    return clocks
+
+
+def _due_recipients(clocks: dict[str, _LocalClock]) -> list[_Recipient]:
+    """Users with a notification due this hour, with the kinds due, in one query.
+
+    The local hour of every timezone is inlined as a CASE on
+    ``TelegramUser.timezone``, so the hour/preference matching that used to
+    run per user in Python is a WHERE clause.
+    """
+    from sqlalchemy import case, false, literal, or_
+
+    from app.utils.db import db
+
+    if not clocks:
+        return []
+
+    local_hour = case(
+        *[(TelegramUser.timezone == tz_name, literal(clock.hour)) for tz_name, clock in clocks.items()],
+        else_=literal(-1),
+    )
+    sunday_zones = [tz_name for tz_name, clock in clocks.items() if clock.is_sunday]
+    weekly_hour = case((TelegramUser.evening_hour > 0, TelegramUser.evening_hour - 1), else_=0)
+
+    conditions = {
+        'tgn_morning': TelegramUser.morning_reminder.is_(True) & (TelegramUser.morning_hour == local_hour),
+        # Word of the Day: 1 hour after the morning reminder
+        'tgn_wotd': TelegramUser.morning_reminder.is_(True) & (TelegramUser.morning_hour + 1 == local_hour),
+        'tgn_nudge': TelegramUser.nudge_enabled.is_(True) & (TelegramUser.nudge_hour == local_hour),
+        # Sunday weekly report: 1 hour before the evening summary
+        'tgn_weekly': (
+            TelegramUser.evening_summary.is_(True)
+            & (TelegramUser.timezone.in_(sunday_zones) if sunday_zones else false())
+            & (weekly_hour == local_hour)
+        ),
+        'tgn_evening': TelegramUser.evening_summary.is_(True) & (TelegramUser.evening_hour == local_hour),
+        'tgn_streak': TelegramUser.streak_alert.is_(True) & (TelegramUser.streak_hour == local_hour),
+    }
+
+    rows = db.session.query(
+        TelegramUser.user_id,
+        TelegramUser.telegram_id,
+        TelegramUser.timezone,
+        *[condition.label(kind) for kind, condition in conditions.items()],
+    ).filter(
+        TelegramUser.is_active.is_(True),
+        or_(*conditions.values()),
+    ).all()
+
+    return [
+        _Recipient(
+            user_id=row.user_id,
+            chat_id=row.telegram_id,
+            clock=clocks[row.timezone],
+            kinds=frozenset(kind for kind in conditions if getattr(row, kind)),
+        )
+        for row in rows
+    ]
+
+
+def _prefetch_cohort(recipients: list[_Recipient], site_url: str) -> _CohortData:
+    """Names, deck URLs, activity flags, streaks and reports for every recipient.
+
+    One users query, then per timezone bucket one activity UNION, one streak
+    fetch and the set-based evening summaries / weekly reports — the number
+    of queries grows with distinct timezones, not with users.
+    """
+    from app.auth.models import User
+    from app.telegram.queries import (
+        get_active_today_ids,
+        get_current_streaks,
+        get_daily_summaries,
+        get_weekly_reports,
+    )
+    from app.utils.db import db
+
+    data = _CohortData()
+    user_ids = [r.user_id for r in recipients]
+    for chunk_start in range(0, len(user_ids), 1000):
+        chunk = user_ids[chunk_start:chunk_start + 1000]
+        for uid, username, deck_id in db.session.query(
+            User.id, User.username, User.default_study_deck_id,
+        ).filter(User.id.in_(chunk)):
+            data.names[uid] = username
+            if site_url:
+                data.cards_urls[uid] = (
+                    f'{site_url}/study/cards/deck/{deck_id}' if deck_id else f'{site_url}/study/cards'
+                )
+
+    buckets: dict[str, list[_Recipient]] = {}
+    for recipient in recipients:
+        buckets.setdefault(recipient.clock.zone, []).append(recipient)
+
+    for zone, bucket in buckets.items():
+        activity_ids = [r.user_id for r in bucket if r.kinds & _ACTIVITY_KINDS]
+        if activity_ids:
+            data.active_today |= get_active_today_ids(activity_ids, tz=zone)
+        streak_ids = [r.user_id for r in bucket if r.kinds & _STREAK_KINDS]
+        if streak_ids:
+            data.streaks.update(get_current_streaks(streak_ids, tz=zone))
+        # The evening summary only goes to users who were active today
+        evening_ids = [r.user_id for r in bucket
+                       if 'tgn_evening' in r.kinds and r.user_id in data.active_today]
+        if evening_ids:
+            data.daily_summaries.update(get_daily_summaries(evening_ids, tz=zone))
+        weekly_ids = [r.user_id for r in bucket if 'tgn_weekly' in r.kinds]
+        if weekly_ids:
+            data.weekly_reports.update(get_weekly_reports(weekly_ids, tz=zone, streaks=data.streaks))
+    return data
+
+
 def _hourly_check(app) -> None:
-    """Run every hour: send notifications to users whose local time matches."""
+    """Run every hour: send notifications to users whose local time matches.
+
+    Who is due, and for which kinds, is one query; the data every due user
+    needs is prefetched per timezone bucket (``_prefetch_cohort``). What is
+    left per user — building the message, claiming and queueing it — runs on
+    a pool of ``TELEGRAM_SCHEDULER_WORKERS`` threads, each with its own app
+    context and session. Delivery itself happens in the rate-limited
+    outbound queue (app/telegram/sender.py).
+    """
+    started = time.monotonic()
+    site_url = app.config.get('SITE_URL', '')
     with app.app_context():
-        now_utc = datetime.now(timezone.utc)
-        users = TelegramUser.query.filter_by(is_active=True).all()
-        site_url = app.config.get('SITE_URL', '')
+        from app.utils.db import db
 
-        for tg_user in users:
-            try:
-                tz = pytz.timezone(tg_user.timezone)
-            except pytz.UnknownTimeZoneError:
-                tz = pytz.timezone(DEFAULT_TIMEZONE)
+        clocks = _timezone_clocks(datetime.now(timezone.utc))
+        recipients = _due_recipients(clocks)
+        cohort = _prefetch_cohort(recipients, site_url) if recipients else None
+        db.session.rollback()  # end the read transaction before fanning out
 
-            local_time = now_utc.astimezone(tz)
-            local_hour = local_time.hour
-            local_date = local_time.date()
-            is_sunday = local_time.weekday() == 6
+    if not recipients:
+        return
 
-            try:
-                _process_user(tg_user, local_hour, local_date, is_sunday, site_url)
-                # Persist the send claims made in _process_user so concurrent
-                # scheduler processes see them and can't re-send. Per-user commit
-                # keeps the window small and isolates failures.
-                from app.utils.db import db
-                db.session.commit()
-            except Exception:
-                from app.utils.db import db
-                db.session.rollback()
-                logger.exception('Error processing user %s', tg_user.telegram_id)
+    workers = max(1, app.config.get('TELEGRAM_SCHEDULER_WORKERS', 8))
+    if workers == 1:
+        failures = sum(not _run_recipient(app, r, cohort, site_url) for r in recipients)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tg-hourly') as pool:
+            results = pool.map(lambda r: _run_recipient(app, r, cohort, site_url), recipients)
+            failures = sum(not ok for ok in results)
+
+    logger.info(
+        'telegram_hourly recipients=%d failures=%d timezones=%d workers=%d elapsed=%.1fs',
+        len(recipients), failures, len(clocks), workers, time.monotonic() - started,
+    )
 
 
-def _process_user(tg_user: TelegramUser, local_hour: int, local_date,
-                  is_sunday: bool, site_url: str) -> None:
-    """Send appropriate notification based on user's local hour and preferences."""
-    from app.auth.models import User
+def _run_recipient(app, recipient: _Recipient, cohort: _CohortData, site_url: str) -> bool:
+    """Process one recipient in its own app context; False if it failed."""
+    with app.app_context():
+        from app.utils.db import db
+        try:
+            _process_user(recipient, cohort, site_url)
+            # Persist the send claims made in _process_user so concurrent
+            # scheduler processes see them and can't re-send. Per-user commit
+            # keeps the window small and isolates failures.
+            db.session.commit()
+            return True
+        except Exception:
+            db.session.rollback()
+            logger.exception('Error processing user %s', recipient.chat_id)
+            return False
+
+
+def _process_user(recipient: _Recipient, cohort: _CohortData, site_url: str) -> None:
+    """Send the notifications due for ``recipient`` (see ``_due_recipients``)."""
     from app.telegram.bot import send_message
 
-    user_id = tg_user.user_id
-    chat_id = tg_user.telegram_id
+    user_id = recipient.user_id
+    chat_id = recipient.chat_id
+    local_date = recipient.clock.local_date
+    kinds = recipient.kinds
 
     def _guarded_send(kind: str, *args, **kwargs) -> None:
         """Send only if this (user, kind, local_date) hasn't been claimed yet.
@@ -240,14 +425,18 @@ def _process_user(tg_user: TelegramUser, local_hour: int, local_date,
         if TelegramNotificationLog.claim(user_id, kind, local_date):
             send_message(*args, **kwargs)
 
-    user = User.query.get(user_id)
-    name = user.username if user else 'друг'
-    cards_url = get_cards_url(user_id, site_url) if site_url else ''
-    user_tz = tg_user.timezone
+    name = cohort.names.get(user_id) or 'друг'
+    cards_url = cohort.cards_urls.get(user_id, '')
+    user_tz = recipient.clock.zone
+    active_today = user_id in cohort.active_today
+    streak = cohort.streaks.get(user_id, 0)
+
+    # Each kind is an independent `if` (not `elif`) so a notification whose
+    # hour collides with another type isn't silently dropped — each
+    # _guarded_send is claim-idempotent per kind/day (audit E-090).
 
     # Morning reminder (user's custom hour)
-    if local_hour == tg_user.morning_hour and tg_user.morning_reminder:
-        streak = get_current_streak(user_id, tz=user_tz)
+    if 'tgn_morning' in kinds:
         plan = get_daily_plan_for_telegram(user_id, tz=user_tz)
         if plan.get('mission'):
             text, reply_markup = format_mission_morning_reminder(
@@ -257,13 +446,8 @@ def _process_user(tg_user: TelegramUser, local_hour: int, local_date,
                 name, streak, plan, site_url, cards_url=cards_url)
         _guarded_send('tgn_morning', chat_id, text, reply_markup=reply_markup)
 
-    # Word of the Day (1 hour after morning reminder). Independent `if` (not
-    # `elif`) so a notification whose hour collides with another type isn't
-    # silently dropped — each _guarded_send is claim-idempotent per kind/day
-    # (audit E-090). morning_hour is nullable=False default 9; use it directly
-    # (the old `or 8` mistreated a valid 0 and disagreed with the line above).
-    _morning_hour = tg_user.morning_hour if tg_user.morning_hour is not None else 9
-    if local_hour == _morning_hour + 1 and tg_user.morning_reminder:
+    # Word of the Day (1 hour after morning reminder)
+    if 'tgn_wotd' in kinds:
         from app.study.word_of_day import get_word_of_day
         word_data = get_word_of_day(user_id)
         if word_data:
@@ -272,84 +456,57 @@ def _process_user(tg_user: TelegramUser, local_hour: int, local_date,
                 _guarded_send('tgn_wotd', chat_id, text, reply_markup=keyboard)
 
     # Nudge (user's custom hour, only if no activity today and has a quick action)
-    if local_hour == tg_user.nudge_hour and tg_user.nudge_enabled:
-        if not has_activity_today(user_id, tz=user_tz):
-            quick_action = get_quickest_action(user_id, tz=user_tz)
-            if quick_action:
-                text = format_nudge(name, site_url,
-                                    quick_action=quick_action,
-                                    cards_url=cards_url)
-                _guarded_send('tgn_nudge', chat_id, text)
+    if 'tgn_nudge' in kinds and not active_today:
+        quick_action = get_quickest_action(user_id, tz=user_tz)
+        if quick_action:
+            text = format_nudge(name, site_url,
+                                quick_action=quick_action,
+                                cards_url=cards_url)
+            _guarded_send('tgn_nudge', chat_id, text)
 
     # Sunday weekly report (1 hour before evening summary)
-    if local_hour == max(tg_user.evening_hour - 1, 0) and is_sunday and tg_user.evening_summary:
-        report = get_weekly_report(user_id, tz=user_tz)
+    if 'tgn_weekly' in kinds:
+        report = cohort.weekly_reports.get(user_id) or get_weekly_report(user_id, tz=user_tz)
         text = format_weekly_report(report, site_url)
         _guarded_send('tgn_weekly', chat_id, text)
 
     # Evening summary (user's custom hour, only if there was activity)
-    if local_hour == tg_user.evening_hour and tg_user.evening_summary:
-        if has_activity_today(user_id, tz=user_tz):
-            summary = get_daily_summary(user_id, tz=user_tz)
-            streak = get_current_streak(user_id, tz=user_tz)
-            tomorrow = get_tomorrow_preview(user_id)
-            text, reply_markup = format_evening_summary(
-                name, summary, streak, site_url, tomorrow=tomorrow,
-                user_id=user_id,
-            )
-            _guarded_send('tgn_evening', chat_id, text, reply_markup=reply_markup)
+    if 'tgn_evening' in kinds and active_today:
+        summary = cohort.daily_summaries.get(user_id) or get_daily_summary(user_id, tz=user_tz)
+        tomorrow = get_tomorrow_preview(user_id)
+        text, reply_markup = format_evening_summary(
+            name, summary, streak, site_url, tomorrow=tomorrow,
+            user_id=user_id,
+        )
+        _guarded_send('tgn_evening', chat_id, text, reply_markup=reply_markup)
 
     # Streak alert (user's custom hour, only if no activity and streak > 0)
-    if local_hour == tg_user.streak_hour and tg_user.streak_alert:
-        if not has_activity_today(user_id, tz=user_tz):
-            streak = get_current_streak(user_id, tz=user_tz)
-            if streak > 0:
-                quick_action = get_quickest_action(user_id, tz=user_tz)
-                text = format_streak_alert(name, streak, site_url,
-                                           quick_action=quick_action,
-                                           cards_url=cards_url)
-                _guarded_send('tgn_streak', chat_id, text)
-            else:
-                # Streak is 0 — check if there's a repairable missed date
-                from app.achievements.streak_service import (
-                    find_missed_date,
-                    get_or_create_coins,
-                    get_repair_cost,
-                )
-                missed = find_missed_date(user_id, tz=user_tz)
-                if missed:
-                    cost = get_repair_cost(user_id)
-                    coins = get_or_create_coins(user_id)
-                    # Estimate what streak was before the break
-                    prev_streak = get_current_streak(user_id, tz=user_tz)
-                    # Walk back from missed date to count streak before break
-                    from datetime import datetime, timedelta
-                    from datetime import timezone as tz_mod
-
-                    from app.achievements.models import StreakEvent
-                    from app.telegram.queries import _has_activity_in_range, _user_day_boundaries
-                    old_streak = 0
-                    missed_offset = (datetime.now(tz_mod.utc).date() - missed).days
-                    for offset in range(missed_offset + 1, 366):
-                        day_start, day_end = _user_day_boundaries(user_tz, offset_days=-offset)
-                        check_date = (datetime.now(tz_mod.utc) - timedelta(days=offset)).date()
-                        if _has_activity_in_range(user_id, day_start, day_end):
-                            old_streak += 1
-                        else:
-                            repaired = StreakEvent.query.filter(
-                                StreakEvent.user_id == user_id,
-                                StreakEvent.event_date == check_date,
-                                StreakEvent.event_type.in_(['free_repair', 'spent_repair']),
-                            ).first()
-                            if repaired:
-                                old_streak += 1
-                            else:
-                                break
-                    if old_streak > 0:
-                        text, reply_markup = format_streak_repair_alert(
-                            name, old_streak, cost, coins.balance, site_url,
-                        )
-                        _guarded_send('tgn_repair', chat_id, text, reply_markup=reply_markup)
+    if 'tgn_streak' in kinds and not active_today:
+        if streak > 0:
+            quick_action = get_quickest_action(user_id, tz=user_tz)
+            text = format_streak_alert(name, streak, site_url,
+                                       quick_action=quick_action,
+                                       cards_url=cards_url)
+            _guarded_send('tgn_streak', chat_id, text)
+        else:
+            # Streak is 0 — check if there's a repairable missed date
+            from app.achievements.streak_service import (
+                find_missed_date,
+                get_or_create_coins,
+                get_repair_cost,
+                get_streak_before_date,
+            )
+            missed = find_missed_date(user_id, tz=user_tz)
+            if missed:
+                cost = get_repair_cost(user_id)
+                coins = get_or_create_coins(user_id)
+                # Streak length before the break, counted in the user's timezone
+                old_streak = get_streak_before_date(user_id, missed, tz=user_tz)
+                if old_streak > 0:
+                    text, reply_markup = format_streak_repair_alert(
+                        name, old_streak, cost, coins.balance, site_url,
+                    )
+                    _guarded_send('tgn_repair', chat_id, text, reply_markup=reply_markup)
 
 
 def _generate_daily_plans_hourly(app) -> None:
@@ -362,7 +519,7 @@ def _generate_daily_plans_hourly(app) -> None:
     ``daily_plan_log``: if the lazy path already wrote today's snapshot from
     a fresh GET, the resolver returns the existing row without rewriting.
 
-    Per-user commit + rollback isolates failures (matches ``_hourly_check``).
+    Per-user commit + rollback isolates failures (matches ``_run_recipient``).
     Daily-plan snapshots are the only required-plan path, so this job always
     runs for midnight-local active users.
     """
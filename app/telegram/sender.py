@@ -0,0 +1,216 @@
+"""Outbound Telegram Bot API client: one keep-alive session, queued sends.
+
+``_send_message`` used to open a fresh ``requests.post`` per message: a new
+TLS handshake every time, and the scheduler's sends ran strictly one after
+another. This module holds one ``requests.Session`` per process (pooled
+keep-alive connections) and a dispatcher for bulk notifications:
+
+- ``enqueue`` returns immediately; a small pool of daemon threads drains the
+  queue;
+- a limiter keeps under Telegram's limits — about 30 messages/s per bot
+  overall and 1 message/s per chat (``TELEGRAM_GLOBAL_RATE``,
+  ``TELEGRAM_PER_CHAT_INTERVAL``);
+- 429 is retried after the ``retry_after`` Telegram returns, and the whole
+  dispatcher pauses for that long. 5xx and connection errors are retried
+  with exponential backoff, up to ``MAX_ATTEMPTS`` attempts.
+
+``TELEGRAM_API_BASE`` points the client at another Bot API server (a local
+fake in tests, or a self-hosted telegram-bot-api).
+
+Queued messages live in memory: if the process dies they are lost. That
+matches the scheduler's claim-before-send rule, where a claimed notification
+is never re-sent.
+"""
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, NamedTuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE = 'https://api.telegram.org'
+MAX_ATTEMPTS = 5
+_BACKOFF_BASE = 0.5  # seconds, doubled per attempt
+_BACKOFF_MAX = 30.0
+_MAX_RETRY_AFTER = 300.0  # never park a worker longer than this on one 429
+
+
+class _Outbound(NamedTuple):
+    method: str
+    payload: dict
+
+
+class _RateLimiter:
+    """Reserves send slots: ``global_rate`` per second overall, one per chat per interval."""
+
+    def __init__(self, global_rate: float, per_chat_interval: float):
+        self._interval = 1.0 / global_rate if global_rate > 0 else 0.0
+        self._per_chat_interval = per_chat_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._chat_next: dict[Any, float] = {}
+
+    def acquire(self, chat_id) -> None:
+        """Block until this chat may be sent to."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._paused_until, self._chat_next.get(chat_id, 0.0))
+            self._next_slot = slot + self._interval
+            self._chat_next[chat_id] = slot + self._per_chat_interval
+            if len(self._chat_next) > 50_000:
+                self._chat_next = {c: t for c, t in self._chat_next.items() if t > now}
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every send for ``seconds`` (after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class TelegramSender:
+    """Bot API client with a shared keep-alive session and a send queue."""
+
+    def __init__(self, token: str, *, api_base: str = DEFAULT_API_BASE, workers: int = 8,
+                 global_rate: float = 25.0, per_chat_interval: float = 1.0, timeout: float = 10.0):
+        self._base_url = f'{api_base.rstrip("/")}/bot{token}'
+        self._timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 4))
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._limiter = _RateLimiter(global_rate, per_chat_interval)
+        self._queue: queue.Queue = queue.Queue()
+        self._workers = workers
+        self._threads: list[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'sent': 0, 'failed': 0, 'retried': 0}
+
+    # ── synchronous calls ───────────────────────────────────────────
+
+    def call(self, method: str, payload: dict, *, timeout: float | None = None) -> requests.Response:
+        """One Bot API request over the shared session (raises RequestException)."""
+        return self._session.post(f'{self._base_url}/{method}', json=payload, timeout=timeout or self._timeout)
+
+    def deliver(self, method: str, payload: dict) -> bool:
+        """Rate-limited request with retries; True once Telegram accepted it."""
+        chat_id = payload.get('chat_id')
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self._limiter.acquire(chat_id)
+            delay = None
+            try:
+                resp = self.call(method, payload)
+            except requests.RequestException as e:
+                # Type name only — the exception text contains the URL, i.e. the token
+                logger.warning('Telegram %s failed (attempt %d): %s', method, attempt, type(e).__name__)
+                delay = _backoff(attempt)
+            else:
+                if resp.ok:
+                    self._count('sent')
+                    return True
+                if resp.status_code == 429:
+                    delay = min(_retry_after(resp), _MAX_RETRY_AFTER)
+                    self._limiter.pause(delay)
+                elif resp.status_code >= 500:
+                    delay = _backoff(attempt)
+                else:
+                    # 400/403 (blocked bot, bad chat) will not get better
+                    logger.warning('Telegram API error %s: %s', resp.status_code, resp.text[:200])
+                    break
+            if attempt < MAX_ATTEMPTS:
+                self._count('retried')
+                time.sleep(delay)
+        self._count('failed')
+        return False
+
+    # ── queued sends ────────────────────────────────────────────────
+
+    def enqueue(self, method: str, payload: dict) -> None:
+        """Queue a request for the worker threads and return at once."""
+        self._ensure_started()
+        self._queue.put(_Outbound(method, payload))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything queued so far was delivered or given up on."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {**self._stats, 'queued': self._queue.unfinished_tasks}
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self._workers):
+                thread = threading.Thread(target=self._work, name=f'tg-send-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                self.deliver(item.method, item.payload)
+            except Exception:
+                logger.exception('Telegram send worker error')
+            finally:
+                self._queue.task_done()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+
+def _backoff(attempt: int) -> float:
+    delay = min(_BACKOFF_BASE * 2 ** (attempt - 1), _BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _retry_after(resp: requests.Response) -> float:
+    try:
+        return float(resp.json()['parameters']['retry_after'])
+    except (ValueError, KeyError, TypeError):
+        return float(resp.headers.get('Retry-After') or 1)
+
+
+_senders: dict[tuple, TelegramSender] = {}
+_senders_lock = threading.Lock()
+
+
+def get_sender(config) -> TelegramSender | None:
+    """Process-wide sender for the app ``config`` (None without a bot token)."""
+    token = config.get('TELEGRAM_BOT_TOKEN')
+    if not token:
+        return None
+    api_base = config.get('TELEGRAM_API_BASE') or DEFAULT_API_BASE
+    key = (token, api_base)
+    sender = _senders.get(key)
+    if sender is None:
+        with _senders_lock:
+            sender = _senders.get(key)
+            if sender is None:
+                sender = TelegramSender(
+                    token,
+                    api_base=api_base,
+                    workers=config.get('TELEGRAM_SEND_WORKERS', 8),
+                    global_rate=config.get('TELEGRAM_GLOBAL_RATE', 25.0),
+                    per_chat_interval=config.get('TELEGRAM_PER_CHAT_INTERVAL', 1.0),
+                )
+                _senders[key] = sender
+    return sender
@@ -0,0 +1,497 @@
+"""Per-user, per-local-day activity rollup (``user_daily_activity``).
+
+Admin DAU/WAU/MAU, the activity chart, retention and the streak calendar
+used to rebuild "who was active on which day" from a UNION over the raw
+activity tables on every cache miss, with ``func.date(...)`` expressions no
+index can serve. This module keeps one ``UserDailyActivity`` row per user
+and user-local day instead, so those readers scan O(days) rows.
+
+Rows are maintained from the write path: mapper events on the tracked
+models queue ``(user, timestamp, source)`` entries while a flush runs, and
+one ``after_flush`` hook resolves the users' timezones and upserts the
+whole batch in the same transaction. ``sources`` is OR-ed, ``minutes``
+(study-session length) and ``xp`` (``xp_*`` streak events) are added.
+
+Deleting a source row does not clear its bit: the day still had activity.
+Writes that bypass the ORM (``Query.update``, raw SQL) are not seen;
+``backfill`` rebuilds the table from the source tables
+(``flask backfill-activity-rollup``).
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, NamedTuple
+
+from sqlalchemy import Date, Integer, and_, case, cast, event, func, insert, inspect, literal, select, update
+from sqlalchemy.orm import Session
+
+# Source flags stored in ``UserDailyActivity.sources``
+SOURCE_LESSON = 1             # LessonProgress.last_activity / completed_at
+SOURCE_GRAMMAR = 2            # UserGrammarExercise.last_reviewed
+SOURCE_SRS = 4                # UserCardDirection.last_reviewed
+SOURCE_READING = 8            # UserChapterProgress.updated_at
+SOURCE_COURSE_LESSON = 16     # UserLessonProgress.completed_at
+SOURCE_STUDY_SESSION = 32     # StudySession.start_time
+SOURCE_LINEAR_XP = 64         # StreakEvent 'xp_linear%'
+SOURCE_LISTENING = 128        # ListeningAttempt.created_at
+SOURCE_LESSON_ATTEMPT = 256   # LessonAttempt.started_at
+SOURCE_COURSE_ENROLLMENT = 512  # BookCourseEnrollment.last_activity
+
+# The 8 sources ``has_learning_activity`` counts toward streaks
+STREAK_SOURCES = (
+    SOURCE_LESSON | SOURCE_GRAMMAR | SOURCE_SRS | SOURCE_READING | SOURCE_COURSE_LESSON
+    | SOURCE_STUDY_SESSION | SOURCE_LINEAR_XP | SOURCE_LISTENING
+)
+# The 7 tables admin DAU/WAU/MAU has always counted (no SRS, no linear XP,
+# no listening) — kept for historical comparability of the charts
+ADMIN_SOURCES = (
+    SOURCE_LESSON | SOURCE_GRAMMAR | SOURCE_READING | SOURCE_COURSE_LESSON
+    | SOURCE_STUDY_SESSION | SOURCE_LESSON_ATTEMPT | SOURCE_COURSE_ENROLLMENT
+)
+
+_SESSION_KEY = 'activity_rollup_pending'
+# Called as ``callback(connection, user_ids)`` after each flush that recorded activity
+_subscribers: list = []
+
+
+class _Entry(NamedTuple):
+    user_id: int | None
+    user_word_id: int | None   # SRS rows only know their UserWord
+    when: datetime | date      # a date is already user-local
+    source: int
+    minutes: int = 0
+    xp: int = 0
+
+
+def _to_naive_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.replace(tzinfo=None)
+
+
+def _changed(state, attr: str) -> bool:
+    return state.attrs[attr].history.has_changes()
+
+
+def _session_minutes(start, end) -> int:
+    if not isinstance(start, datetime) or not isinstance(end, datetime):
+        return 0
+    seconds = (_to_naive_utc(end) - _to_naive_utc(start)).total_seconds()
+    return max(0, int(seconds // 60))
+
+
+def _entries_for(target, inserted: bool) -> list[_Entry]:
+    """Rollup entries for a row just written by a flush."""
+    from app.achievements.models import StreakEvent
+    from app.books.models import UserChapterProgress
+    from app.curriculum.book_courses import BookCourseEnrollment
+    from app.curriculum.daily_lessons import UserLessonProgress
+    from app.curriculum.models import LessonAttempt, LessonProgress, ListeningAttempt
+    from app.grammar_lab.models import UserGrammarExercise
+    from app.study.models import StudySession, UserCardDirection
+
+    state = inspect(target)
+    values = state.dict
+
+    def _stamp(attr, source, user_word_id=None):
+        when = values.get(attr)
+        if not isinstance(when, datetime) or not (inserted or _changed(state, attr)):
+            return []
+        user_id = values.get('user_id') if user_word_id is None else None
+        return [_Entry(user_id, user_word_id, when, source)]
+
+    if isinstance(target, LessonProgress):
+        attr = 'last_activity' if values.get('last_activity') is not None else 'completed_at'
+        return _stamp(attr, SOURCE_LESSON)
+    if isinstance(target, UserGrammarExercise):
+        return _stamp('last_reviewed', SOURCE_GRAMMAR)
+    if isinstance(target, UserCardDirection):
+        return _stamp('last_reviewed', SOURCE_SRS, user_word_id=values.get('user_word_id'))
+    if isinstance(target, UserChapterProgress):
+        return _stamp('updated_at', SOURCE_READING)
+    if isinstance(target, UserLessonProgress):
+        return _stamp('completed_at', SOURCE_COURSE_LESSON)
+    if isinstance(target, ListeningAttempt):
+        return _stamp('created_at', SOURCE_LISTENING)
+    if isinstance(target, LessonAttempt):
+        return _stamp('started_at', SOURCE_LESSON_ATTEMPT)
+    if isinstance(target, BookCourseEnrollment):
+        return _stamp('last_activity', SOURCE_COURSE_ENROLLMENT)
+    if isinstance(target, StudySession):
+        start = values.get('start_time')
+        if inserted:
+            minutes = _session_minutes(start, values.get('end_time'))
+        else:
+            history = state.attrs.end_time.history
+            old_end = history.deleted[0] if history.deleted else None
+            minutes = (_session_minutes(start, values.get('end_time')) - _session_minutes(start, old_end)
+                       if history.added else 0)
+        if not isinstance(start, datetime) or not (inserted or minutes or _changed(state, 'start_time')):
+            return []
+        return [_Entry(values.get('user_id'), None, start, SOURCE_STUDY_SESSION, minutes)]
+    if isinstance(target, StreakEvent):
+        # Events are append-only; only their insert counts
+        event_type = values.get('event_type') or ''
+        if not inserted or not event_type.startswith('xp_'):
+            return []
+        user_id = values.get('user_id')
+        entries = []
+        xp = (values.get('details') or {}).get('xp')
+        if isinstance(xp, (int, float)) and isinstance(values.get('event_date'), date):
+            # event_date is already the user's study day, as in get_xp_for_date
+            entries.append(_Entry(user_id, None, values['event_date'], 0, xp=int(xp)))
+        if event_type.startswith('xp_linear') and isinstance(values.get('created_at'), datetime):
+            entries.append(_Entry(user_id, None, values['created_at'], SOURCE_LINEAR_XP))
+        return entries
+    return []
+
+
+def _collect(target, inserted: bool) -> None:
+    session = Session.object_session(target)
+    if session is None:
+        return
+    entries = _entries_for(target, inserted)
+    if entries:
+        session.info.setdefault(_SESSION_KEY, []).extend(entries)
+
+
+def _collect_insert(mapper, connection, target):
+    _collect(target, inserted=True)
+
+
+def _collect_update(mapper, connection, target):
+    _collect(target, inserted=False)
+
+
+def _user_zones(connection, user_ids) -> dict[int, Any]:
+    """pytz zone per user; unknown or empty names fall back to DEFAULT_TIMEZONE."""
+    import pytz
+
+    from app.auth.models import User
+    from config.settings import DEFAULT_TIMEZONE
+
+    default = pytz.timezone(DEFAULT_TIMEZONE)
+    zones = {}
+    rows = connection.execute(select(User.id, User.timezone).where(User.id.in_(sorted(user_ids))))
+    for user_id, name in rows:
+        try:
+            zones[user_id] = pytz.timezone(name) if name else default
+        except pytz.UnknownTimeZoneError:
+            zones[user_id] = default
+    return zones
+
+
+def _aggregate(connection, entries: list[_Entry]) -> dict[tuple[int, date], list[int]]:
+    """Resolve users and local dates; ``{(user_id, local_date): [sources, minutes, xp]}``."""
+    import pytz
+
+    from app.study.models import UserWord
+
+    word_ids = {e.user_word_id for e in entries if e.user_word_id is not None}
+    word_owner = {}
+    if word_ids:
+        word_owner = dict(connection.execute(
+            select(UserWord.id, UserWord.user_id).where(UserWord.id.in_(sorted(word_ids)))
+        ).all())
+
+    resolved = []
+    for e in entries:
+        user_id = word_owner.get(e.user_word_id) if e.user_word_id is not None else e.user_id
+        if user_id is not None:
+            resolved.append((user_id, e))
+    if not resolved:
+        return {}
+
+    zones = _user_zones(connection, {user_id for user_id, _ in resolved})
+    totals: dict[tuple[int, date], list[int]] = {}
+    for user_id, e in resolved:
+        if user_id not in zones:
+            continue
+        if isinstance(e.when, datetime):
+            aware = e.when if e.when.tzinfo is not None else pytz.utc.localize(e.when)
+            local_date = aware.astimezone(zones[user_id]).date()
+        else:
+            local_date = e.when
+        row = totals.setdefault((user_id, local_date), [0, 0, 0])
+        row[0] |= e.source
+        row[1] += e.minutes
+        row[2] += e.xp
+    return totals
+
+
+_ROW_COLUMNS = ('user_id', 'local_date', 'sources', 'minutes', 'xp', 'updated_at')
+
+
+def _upsert(connection, values) -> None:
+    """INSERT ... ON CONFLICT merging into existing day rows.
+
+    ``values`` is a list of row dicts or a ``select()`` producing the same
+    columns in table order. Backends without ON CONFLICT support get
+    ``_merge_rows`` instead.
+    """
+    from app.achievements.models import UserDailyActivity
+
+    table = UserDailyActivity.__table__
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        if not isinstance(values, list):
+            values = [dict(zip(_ROW_COLUMNS, row)) for row in connection.execute(values)]
+        _merge_rows(connection, table, values)
+        return
+
+    if isinstance(values, list):
+        stmt = dialect_insert(table).values(values)
+    else:
+        stmt = dialect_insert(table).from_select(list(_ROW_COLUMNS), values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.local_date],
+        set_={
+            'sources': table.c.sources.op('|')(stmt.excluded.sources),
+            'minutes': table.c.minutes + stmt.excluded.minutes,
+            'xp': table.c.xp + stmt.excluded.xp,
+            'updated_at': stmt.excluded.updated_at,
+        },
+    )
+    connection.execute(stmt)
+
+
+def _merge_rows(connection, table, rows) -> None:
+    """Portable update-then-insert with the same merge rules as ``_upsert``."""
+    for row in rows:
+        merged = connection.execute(
+            update(table)
+            .where(and_(table.c.user_id == row['user_id'], table.c.local_date == row['local_date']))
+            .values(
+                sources=table.c.sources.op('|')(row['sources']),
+                minutes=table.c.minutes + row['minutes'],
+                xp=table.c.xp + row['xp'],
+                updated_at=row['updated_at'],
+            )
+        )
+        if not merged.rowcount:
+            connection.execute(insert(table).values(**row))
+
+
+def _apply_pending(session, flush_context):
+    entries = session.info.pop(_SESSION_KEY, None)
+    if not entries:
+        return
+    connection = session.connection()
+    totals = _aggregate(connection, entries)
+    if not totals:
+        return
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    _upsert(connection, [
+        {'user_id': user_id, 'local_date': local_date, 'sources': sources,
+         'minutes': minutes, 'xp': xp, 'updated_at': now}
+        for (user_id, local_date), (sources, minutes, xp) in sorted(totals.items())
+    ])
+    user_ids = {user_id for user_id, _ in totals}
+    for callback in _subscribers:
+        callback(connection, user_ids)
+
+
+def _discard_pending(session, previous_transaction):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def register_activity_rollup_listeners():
+    """Keep ``user_daily_activity`` current on every ORM write to a tracked table."""
+    from app.achievements.models import StreakEvent
+    from app.books.models import UserChapterProgress
+    from app.curriculum.book_courses import BookCourseEnrollment
+    from app.curriculum.daily_lessons import UserLessonProgress
+    from app.curriculum.models import LessonAttempt, LessonProgress, ListeningAttempt
+    from app.grammar_lab.models import UserGrammarExercise
+    from app.study.models import StudySession, UserCardDirection
+
+    for model in (LessonProgress, UserGrammarExercise, UserCardDirection, UserChapterProgress,
+                  UserLessonProgress, StudySession, StreakEvent, ListeningAttempt, LessonAttempt,
+                  BookCourseEnrollment):
+        if not event.contains(model, 'after_insert', _collect_insert):
+            event.listen(model, 'after_insert', _collect_insert)
+            event.listen(model, 'after_update', _collect_update)
+    if not event.contains(Session, 'after_flush', _apply_pending):
+        event.listen(Session, 'after_flush', _apply_pending)
+        event.listen(Session, 'after_soft_rollback', _discard_pending)
+
+
+def subscribe(callback) -> None:
+    """Run ``callback(connection, user_ids)`` in the flush that records new activity.
+
+    Lets projections derived from activity (e.g. the daily-status snapshot)
+    invalidate themselves in the same transaction as the write.
+    """
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+
+
+# ── readers ─────────────────────────────────────────────────────────
+
+
+def active_user_dates(start_date: date, end_date: date, mask: int = ADMIN_SOURCES,
+                      db_session: Any = None) -> dict[date, set[int]]:
+    """``{local_date: {user_id, ...}}`` for days in [start_date, end_date] matching ``mask``."""
+    from app.achievements.models import UserDailyActivity
+    from app.utils.db import db
+
+    session = db_session if db_session is not None else db.session
+    rows = session.query(UserDailyActivity.local_date, UserDailyActivity.user_id).filter(
+        UserDailyActivity.local_date >= start_date,
+        UserDailyActivity.local_date <= end_date,
+        UserDailyActivity.sources.op('&')(mask) != 0,
+    )
+    bucket: dict[date, set[int]] = {}
+    for local_date, user_id in rows:
+        bucket.setdefault(local_date, set()).add(user_id)
+    return bucket
+
+
+def active_dates(user_id: int, start_date: date, end_date: date, mask: int = STREAK_SOURCES,
+                 db_session: Any = None) -> set[date]:
+    """The user's local dates in [start_date, end_date] with a source in ``mask``."""
+    from app.achievements.models import UserDailyActivity
+    from app.utils.db import db
+
+    session = db_session if db_session is not None else db.session
+    rows = session.query(UserDailyActivity.local_date).filter(
+        UserDailyActivity.user_id == user_id,
+        UserDailyActivity.local_date >= start_date,
+        UserDailyActivity.local_date <= end_date,
+        UserDailyActivity.sources.op('&')(mask) != 0,
+    )
+    return {row[0] for row in rows}
+
+
+def sources_between(user_id: int, start_date: date, end_date: date, db_session: Any = None) -> int:
+    """OR of the source flags on the user's days in [start_date, end_date]."""
+    from app.achievements.models import UserDailyActivity
+    from app.utils.db import db
+
+    session = db_session if db_session is not None else db.session
+    flags = 0
+    for (sources,) in session.query(UserDailyActivity.sources).filter(
+        UserDailyActivity.user_id == user_id,
+        UserDailyActivity.local_date >= start_date,
+        UserDailyActivity.local_date <= end_date,
+    ):
+        flags |= sources or 0
+    return flags
+
+
+# ── backfill ────────────────────────────────────────────────────────
+
+
+def _backfill_selects(start_date: date | None, end_date: date | None, zones: list[str]):
+    """One grouped ``select`` per source, shaped like a ``user_daily_activity`` row."""
+    from app.achievements.models import StreakEvent
+    from app.auth.models import User
+    from app.books.models import UserChapterProgress
+    from app.curriculum.book_courses import BookCourseEnrollment
+    from app.curriculum.daily_lessons import UserLessonProgress
+    from app.curriculum.models import LessonAttempt, LessonProgress, ListeningAttempt
+    from app.grammar_lab.models import UserGrammarExercise
+    from app.study.models import StudySession, UserCardDirection, UserWord
+    from config.settings import DEFAULT_TIMEZONE
+
+    zone = case((User.timezone.in_(zones), User.timezone), else_=DEFAULT_TIMEZONE) if zones \
+        else literal(DEFAULT_TIMEZONE)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    # Local dates can sit a day either side of the UTC date
+    lower = datetime.combine(start_date - timedelta(days=1), datetime.min.time()) if start_date else None
+    upper = datetime.combine(end_date + timedelta(days=2), datetime.min.time()) if end_date else None
+
+    def _grouped(uid_col, ts_col, source, *, aware=False, minutes=None, join=None, where=()):
+        local = cast(func.timezone(zone, ts_col if aware else func.timezone('UTC', ts_col)), Date)
+        conditions = [ts_col.isnot(None), *where]
+        if lower is not None:
+            conditions += [ts_col >= (lower.replace(tzinfo=timezone.utc) if aware else lower), local >= start_date]
+        if upper is not None:
+            conditions += [ts_col < (upper.replace(tzinfo=timezone.utc) if aware else upper), local <= end_date]
+        rows = select(
+            uid_col.label('uid'), local.label('d'),
+            (minutes if minutes is not None else literal(0)).label('m'),
+        )
+        if join is not None:
+            rows = rows.select_from(join[0]).join(join[1])
+        # Group outside: the timezone expression carries bind parameters,
+        # which PostgreSQL would not match between SELECT and GROUP BY
+        rows = rows.join(User, User.id == uid_col).where(and_(*conditions)).subquery()
+        return select(
+            rows.c.uid, rows.c.d, literal(source), func.coalesce(func.sum(rows.c.m), 0), literal(0), literal(now),
+        ).group_by(rows.c.uid, rows.c.d)
+
+    session_minutes = func.greatest(
+        cast(func.floor(func.extract('epoch', StudySession.end_time - StudySession.start_time) / 60), Integer), 0,
+    )
+    selects = [
+        _grouped(LessonProgress.user_id, func.coalesce(LessonProgress.last_activity, LessonProgress.completed_at),
+                 SOURCE_LESSON),
+        _grouped(UserGrammarExercise.user_id, UserGrammarExercise.last_reviewed, SOURCE_GRAMMAR),
+        _grouped(UserWord.user_id, UserCardDirection.last_reviewed, SOURCE_SRS,
+                 join=(UserCardDirection, UserWord)),
+        _grouped(UserChapterProgress.user_id, UserChapterProgress.updated_at, SOURCE_READING),
+        _grouped(UserLessonProgress.user_id, UserLessonProgress.completed_at, SOURCE_COURSE_LESSON, aware=True),
+        _grouped(StudySession.user_id, StudySession.start_time, SOURCE_STUDY_SESSION, minutes=session_minutes),
+        _grouped(StreakEvent.user_id, StreakEvent.created_at, SOURCE_LINEAR_XP,
+                 where=[StreakEvent.event_type.like('xp_linear%')]),
+        _grouped(ListeningAttempt.user_id, ListeningAttempt.created_at, SOURCE_LISTENING),
+        _grouped(LessonAttempt.user_id, LessonAttempt.started_at, SOURCE_LESSON_ATTEMPT),
+        _grouped(BookCourseEnrollment.user_id, BookCourseEnrollment.last_activity, SOURCE_COURSE_ENROLLMENT),
+    ]
+
+    # XP is booked on the event's study day, as get_xp_for_date reads it
+    xp_conditions = [StreakEvent.event_type.like('xp\\_%')]
+    if start_date is not None:
+        xp_conditions.append(StreakEvent.event_date >= start_date)
+    if end_date is not None:
+        xp_conditions.append(StreakEvent.event_date <= end_date)
+    selects.append(
+        select(
+            StreakEvent.user_id, StreakEvent.event_date, literal(0), literal(0),
+            func.coalesce(func.sum(StreakEvent.details['xp'].astext.cast(Integer)), 0), literal(now),
+        ).where(and_(*xp_conditions)).group_by(StreakEvent.user_id, StreakEvent.event_date)
+    )
+    return selects
+
+
+def backfill(start_date: date | None = None, end_date: date | None = None,
+             db_session: Any = None) -> int:
+    """Rebuild rollup rows for [start_date, end_date] (everything when unbounded).
+
+    Existing rows in the window are replaced, so reruns do not double-count
+    minutes or XP. Uses PostgreSQL ``timezone()`` like the other local-date
+    queries. The caller commits. Returns the number of rows written.
+    """
+    import pytz
+
+    from app.achievements.models import UserDailyActivity
+    from app.auth.models import User
+    from app.utils.db import db
+
+    session = db_session if db_session is not None else db.session
+
+    names = [name for (name,) in session.query(User.timezone).distinct() if name]
+    zones = [name for name in names if name in pytz.all_timezones_set]
+
+    stale = session.query(UserDailyActivity)
+    if start_date is not None:
+        stale = stale.filter(UserDailyActivity.local_date >= start_date)
+    if end_date is not None:
+        stale = stale.filter(UserDailyActivity.local_date <= end_date)
+    stale.delete(synchronize_session=False)
+
+    connection = session.connection()
+    for stmt in _backfill_selects(start_date, end_date, zones):
+        _upsert(connection, stmt)
+
+    written = session.query(func.count()).select_from(UserDailyActivity)
+    if start_date is not None:
+        written = written.filter(UserDailyActivity.local_date >= start_date)
+    if end_date is not None:
+        written = written.filter(UserDailyActivity.local_date <= end_date)
+    return written.scalar() or 0
@@ -340,7 +340,7 @@ def init_template_utils(app):
 
         from app.achievements.models import UserStatistics
         from app.achievements.xp_service import get_level_info
-        from app.curriculum.cache import cache
+        from app.curriculum.cache import cache, user_tag
 
         if not current_user.is_authenticated:
             return {}
@@ -363,7 +363,7 @@ def init_template_utils(app):
         }
 
         # Cache for 60 seconds
-        cache.set(cache_key, result, timeout=60)
+        cache.set(cache_key, result, timeout=60, tags=(user_tag(current_user.id),))
         return result
 
     # Register custom filters
@@ -669,3 +669,10 @@ def get_related_words(word: CollectionWords, *, limit: int = 6, public_only: boo
     scored.sort(key=lambda item: (-item[0], item[1]))
     strong = [candidate for score, _, candidate in scored if score >= 45]
     return strong[:limit]
+
+
+def get_book_usage_examples(word: CollectionWords, user, *, limit: int = 3) -> list[dict]:
+    """Real in-book sentences for the word from the chapter full-text index."""
+    from app.books.concordance import search_concordance
+
+    return search_concordance(word.english_word, user, per_page=limit)['items']
@@ -0,0 +1,294 @@
+"""Process-wide in-memory index of ``CollectionWords`` for the book reader.
+
+Tap-to-translate in the reader is the hottest endpoint while users read
+books. Resolving a token used to cost up to ~10 sequential
+``CollectionWords.query.filter_by(english_word=...)`` round trips (exact
+form, irregular verb, -ing/-ed/plural and doubled-consonant variants).
+
+The lexicon keeps the few columns the reader needs (id, translation, audio
+fields) keyed by ``english_word``, plus a precomputed inflected-form → lemma
+map built from the same rules and irregular-verb table, so a lookup is two
+dict probes and zero DB round trips.
+
+Freshness:
+- ORM writes to ``CollectionWords`` patch the index at flush time
+  (``after_insert`` / ``after_update`` / ``after_delete``);
+- a rollback of a session that touched the index marks it stale, so the
+  next lookup reloads instead of serving ghost rows;
+- raw-SQL imports (``app/repository.py``) and other gunicorn workers are
+  covered by a periodic full reload every ``_RELOAD_INTERVAL`` seconds.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.words.models import CollectionWords
+
+logger = logging.getLogger(__name__)
+
+_RELOAD_INTERVAL = 900  # seconds between full reloads (cross-worker/raw-SQL writes)
+_SESSION_DIRTY_KEY = 'lexicon_dirty'
+
+IRREGULAR_VERBS = {
+    'was': 'be', 'were': 'be', 'been': 'be',
+    'went': 'go', 'saw': 'see', 'ate': 'eat', 'drank': 'drink',
+    'spoke': 'speak', 'drove': 'drive', 'flew': 'fly', 'grew': 'grow',
+    'knew': 'know', 'ran': 'run', 'came': 'come', 'took': 'take',
+    'gave': 'give', 'found': 'find', 'thought': 'think', 'told': 'tell',
+    'became': 'become', 'felt': 'feel', 'stood': 'stand', 'heard': 'hear',
+    'brought': 'bring', 'bought': 'buy', 'caught': 'catch', 'taught': 'teach',
+    'sold': 'sell', 'built': 'build', 'sent': 'send', 'spent': 'spend',
+    'fell': 'fall', 'met': 'meet', 'paid': 'pay', 'said': 'say',
+    'understood': 'understand', 'kept': 'keep', 'left': 'leave',
+    'gone': 'go', 'seen': 'see', 'eaten': 'eat', 'drunk': 'drink',
+    'spoken': 'speak', 'driven': 'drive', 'flown': 'fly', 'grown': 'grow',
+    'known': 'know', 'taken': 'take', 'given': 'give', 'written': 'write',
+    'done': 'do', 'made': 'make', 'had': 'have', 'got': 'get',
+    'began': 'begin', 'begun': 'begin', 'broke': 'break', 'broken': 'break',
+    'chose': 'choose', 'chosen': 'choose', 'did': 'do',
+}
+
+
+class LexiconEntry(NamedTuple):
+    id: int
+    english_word: str
+    russian_word: Optional[str]
+    listening: Optional[str]
+    get_download: Optional[int]
+
+
+def candidate_lemmas(word: str) -> Iterator[Tuple[str, str]]:
+    """Yield ``(base_form, form_type)`` candidates for ``word`` in priority order.
+
+    The order is the contract: the first candidate present in the dictionary
+    wins, exactly as the sequential lookups in the reader endpoint did.
+    """
+    if word in IRREGULAR_VERBS:
+        yield IRREGULAR_VERBS[word], 'past_tense'
+
+    if word.endswith('ing') and len(word) > 4:
+        base = word[:-3]
+        yield base, 'continuous'
+        yield base + 'e', 'continuous'
+        if len(base) >= 2 and base[-1] == base[-2]:
+            yield base[:-1], 'continuous'
+
+    if word.endswith('ed') and len(word) > 3:
+        base = word[:-2]
+        yield base, 'past_tense'
+        yield word[:-1], 'past_tense'
+        if len(base) >= 2 and base[-1] == base[-2]:
+            yield base[:-1], 'past_tense'
+
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 2:
+        yield word[:-1], 'plural'
+        if word.endswith('es'):
+            yield word[:-2], 'plural'
+        if word.endswith('ies'):
+            yield word[:-3] + 'y', 'plural'
+
+
+def _inflected_forms(lemma: str) -> Iterator[str]:
+    """Every surface form whose ``candidate_lemmas`` can produce ``lemma``.
+
+    Over-generation is harmless: each form is re-resolved through
+    ``candidate_lemmas`` before it lands in the form map.
+    """
+    yield lemma + 'ing'
+    yield lemma + 'ed'
+    yield lemma + 's'
+    yield lemma + 'es'
+    if lemma.endswith('e'):
+        yield lemma[:-1] + 'ing'
+        yield lemma + 'd'
+    if lemma.endswith('y'):
+        yield lemma[:-1] + 'ies'
+    if lemma:
+        yield lemma + lemma[-1] + 'ing'
+        yield lemma + lemma[-1] + 'ed'
+
+
+class Lexicon:
+    """Thread-safe, lazily loaded dictionary index for one worker process."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[str, LexiconEntry] = {}
+        self._forms: Dict[str, Tuple[str, str]] = {}
+        self._loaded_at: Optional[float] = None
+
+    # ── loading ────────────────────────────────────────────────────────
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < _RELOAD_INTERVAL:
+            return
+        with self._lock:
+            loaded_at = self._loaded_at
+            if loaded_at is not None and time.monotonic() - loaded_at < _RELOAD_INTERVAL:
+                return
+            self.reload()
+
+    def reload(self) -> None:
+        """Rebuild the whole index with one column-only query."""
+        from app.utils.db import db
+
+        rows = db.session.query(
+            CollectionWords.id,
+            CollectionWords.english_word,
+            CollectionWords.russian_word,
+            CollectionWords.listening,
+            CollectionWords.get_download,
+        ).all()
+        entries = {row.english_word: LexiconEntry(*row) for row in rows if row.english_word}
+
+        with self._lock:
+            self._entries = entries
+            self._forms = self._build_forms(entries)
+            self._loaded_at = time.monotonic()
+        logger.info("Lexicon loaded: %d words, %d inflected forms", len(entries), len(self._forms))
+
+    def _resolve_by_rules(self, word: str, entries: Dict[str, LexiconEntry]) -> Optional[Tuple[str, str]]:
+        for base_form, form_type in candidate_lemmas(word):
+            if base_form in entries:
+                return base_form, form_type
+        return None
+
+    def _build_forms(self, entries: Dict[str, LexiconEntry]) -> Dict[str, Tuple[str, str]]:
+        forms: Dict[str, Tuple[str, str]] = {}
+        surface = set(IRREGULAR_VERBS)
+        for lemma in entries:
+            surface.update(_inflected_forms(lemma))
+        for form in surface:
+            if form in entries:
+                continue
+            resolved = self._resolve_by_rules(form, entries)
+            if resolved is not None:
+                forms[form] = resolved
+        return forms
+
+    def invalidate(self) -> None:
+        """Force a full reload on the next lookup."""
+        self._loaded_at = None
+
+    # ── incremental maintenance ───────────────────────────────────────
+
+    def _reindex_around(self, lemma: str) -> None:
+        """Recompute form-map entries that may point at (or away from) ``lemma``."""
+        affected = set(_inflected_forms(lemma))
+        affected.update(form for form, base in IRREGULAR_VERBS.items() if base == lemma)
+        # A new/removed lemma can itself be a surface form of another lemma.
+        affected.add(lemma)
+        for form in affected:
+            if form in self._entries:
+                self._forms.pop(form, None)
+                continue
+            resolved = self._resolve_by_rules(form, self._entries)
+            if resolved is None:
+                self._forms.pop(form, None)
+            else:
+                self._forms[form] = resolved
+
+    def upsert(self, entry: LexiconEntry, previous_word: Optional[str] = None) -> None:
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if previous_word and previous_word != entry.english_word:
+                if self._entries.pop(previous_word, None) is not None:
+                    self._reindex_around(previous_word)
+            is_new = entry.english_word not in self._entries
+            self._entries[entry.english_word] = entry
+            if is_new:
+                self._reindex_around(entry.english_word)
+
+    def remove(self, english_word: str) -> None:
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if self._entries.pop(english_word, None) is not None:
+                self._reindex_around(english_word)
+
+    # ── lookups ────────────────────────────────────────────────────────
+
+    def get(self, english_word: str) -> Optional[LexiconEntry]:
+        self._ensure_loaded()
+        return self._entries.get(english_word)
+
+    def lookup(self, word: str) -> Tuple[Optional[LexiconEntry], Optional[Dict[str, str]]]:
+        """Resolve a normalized token to ``(entry, form_info)``.
+
+        ``form_info`` is ``{'type': ..., 'base_form': ...}`` when the token
+        is an inflected form of a dictionary lemma, else ``None``.
+        """
+        self._ensure_loaded()
+        entry = self._entries.get(word)
+        if entry is not None:
+            return entry, None
+        form = self._forms.get(word)
+        if form is None:
+            return None, None
+        base_form, form_type = form
+        entry = self._entries.get(base_form)
+        if entry is None:
+            return None, None
+        return entry, {'type': form_type, 'base_form': base_form}
+
+    def lookup_many(self, words: List[str]) -> Dict[str, Tuple[Optional[LexiconEntry], Optional[Dict[str, str]]]]:
+        return {word: self.lookup(word) for word in words}
+
+    def stats(self) -> Dict[str, int]:
+        return {'words': len(self._entries), 'forms': len(self._forms)}
+
+
+lexicon = Lexicon()
+
+
+def _entry_from_target(target: CollectionWords) -> Optional[LexiconEntry]:
+    if target.id is None or not target.english_word:
+        return None
+    return LexiconEntry(
+        target.id, target.english_word, target.russian_word,
+        target.listening, target.get_download,
+    )
+
+
+def _mark_session_dirty(target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_SESSION_DIRTY_KEY] = True
+
+
+@event.listens_for(CollectionWords, 'after_insert')
+@event.listens_for(CollectionWords, 'after_update')
+def _lexicon_after_write(mapper, connection, target):
+    entry = _entry_from_target(target)
+    if entry is None:
+        return
+    history = inspect(target).attrs.english_word.history
+    previous_word = history.deleted[0] if history.deleted else None
+    lexicon.upsert(entry, previous_word=previous_word)
+    _mark_session_dirty(target)
+
+
+@event.listens_for(CollectionWords, 'after_delete')
+def _lexicon_after_delete(mapper, connection, target):
+    if target.english_word:
+        lexicon.remove(target.english_word)
+    _mark_session_dirty(target)
+
+
+@event.listens_for(Session, 'after_commit')
+def _lexicon_after_commit(session):
+    session.info.pop(_SESSION_DIRTY_KEY, None)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _lexicon_after_rollback(session, previous_transaction):
+    # Flush-time patches of a rolled-back transaction may describe rows that
+    # never became visible; a reload is cheaper than tracking undo records.
+    if session.info.pop(_SESSION_DIRTY_KEY, None):
+        lexicon.invalidate()
@@ -13,9 +13,15 @@ from sqlalchemy.orm import Query
 from app.modules.decorators import module_required
 from app.study.models import GameScore
 from app.utils.db import db
-from app.words.detail_service import build_word_profile, build_word_study_summary, get_related_words
+from app.words.detail_service import (
+    build_word_profile,
+    build_word_study_summary,
+    get_book_usage_examples,
+    get_related_words,
+)
 from app.words.forms import WordFilterForm, WordSearchForm
 from app.words.models import CollectionWords
+from app.words.search import search_query
 from config.settings import DEFAULT_TIMEZONE
 
 logger = logging.getLogger(__name__)
@@ -143,16 +149,14 @@ def public_dictionary(letter: str | None = None, level: str | None = None):
         query = query.filter(CollectionWords.level == selected_level)
 
     if search:
-        search_term = f'%{search}%'
-        query = query.filter(or_(
-            CollectionWords.english_word.ilike(search_term),
-            CollectionWords.russian_word.ilike(search_term),
-        ))
+        query = search_query(search, query)
+    else:
+        query = query.order_by(
+            CollectionWords.frequency_rank.asc().nullslast(),
+            CollectionWords.english_word.asc(),
+        )
 
-    words_page = query.order_by(
-        CollectionWords.frequency_rank.asc().nullslast(),
-        CollectionWords.english_word.asc(),
-    ).paginate(page=page, per_page=48, error_out=False)
+    words_page = query.paginate(page=page, per_page=48, error_out=False)
 
     level_counts = dict(
         db.session.query(CollectionWords.level, func.count(CollectionWords.id))
@@ -1622,6 +1626,11 @@ def word_detail(word_id):
     except Exception:
         logger.exception('get_related_words failed for word_id=%s', word_id)
         related_words = []
+    try:
+        book_examples = get_book_usage_examples(word, current_user, limit=3)
+    except Exception:
+        logger.exception('get_book_usage_examples failed for word_id=%s', word_id)
+        book_examples = []
 
     return render_template(
         'words/details_optimized.html',
@@ -1630,6 +1639,7 @@ def word_detail(word_id):
         word_profile_public=False,
         study_summary=study_summary,
         books=books,
+        book_examples=book_examples,
         related_words=related_words
     )
 
@@ -0,0 +1,116 @@
+"""Ranked dictionary search over ``collection_words``.
+
+One implementation for every word search box: the dictionary API and the
+public dictionary, the deck editor and the admin word picker. Each used to
+run its own ``ILIKE '%term%'`` on both columns, and a leading wildcard cannot
+use a B-tree index. That meant a sequential scan over the dictionary on
+every keystroke.
+
+Index support (migration ``20261017_words_trigram_search``, PostgreSQL):
+- ``gin_trgm_ops`` GIN indexes on ``english_word`` and ``russian_word``
+  serve substring ``ILIKE`` and the trigram ``%`` similarity operator;
+- ``text_pattern_ops`` B-tree indexes on ``lower(...)`` serve the prefix
+  ``LIKE 'term%'`` fast path.
+
+Ranking: exact > prefix > substring > fuzzy (trigram similarity, i.e.
+typo tolerance), then similarity, then frequency. Terms shorter than
+``_TRIGRAM_MIN_LENGTH`` have no trigram to match, so they take the prefix
+fast path — the admin picker's first keystrokes never scan.
+
+Without pg_trgm (SQLite in tests, an unmigrated database) the same ranking
+applies without the fuzzy tier.
+"""
+from typing import List, Optional
+
+from sqlalchemy import case, func, or_, text
+from sqlalchemy.orm import Query
+
+from app.admin.utils.request_validators import escape_like
+from app.utils.db import db
+from app.words.models import CollectionWords
+
+MIN_TERM_LENGTH = 2
+_TRIGRAM_MIN_LENGTH = 3  # pg_trgm needs three characters for a useful trigram
+_MAX_TERM_LENGTH = 100
+
+
+_trigram_available = {}  # engine url -> pg_trgm installed
+
+
+def _has_trigram() -> bool:
+    """True on PostgreSQL with pg_trgm installed (checked once per engine)."""
+    bind = db.session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return False
+    key = str(bind.engine.url)
+    if key not in _trigram_available:
+        _trigram_available[key] = db.session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first() is not None
+    return _trigram_available[key]
+
+
+def normalize_term(term: Optional[str]) -> str:
+    return ' '.join((term or '').split())[:_MAX_TERM_LENGTH].lower()
+
+
+def search_query(term: str, query: Optional[Query] = None) -> Query:
+    """Filter ``query`` (default: all words) to ``term`` and order by relevance.
+
+    An empty ``term`` matches nothing; autocomplete callers also skip terms
+    shorter than ``MIN_TERM_LENGTH``. The result is a plain query, so callers
+    may still paginate it.
+    """
+    term = normalize_term(term)
+    if query is None:
+        query = CollectionWords.query
+    if not term:
+        return query.filter(db.false())
+
+    english = func.lower(CollectionWords.english_word)
+    russian = func.lower(CollectionWords.russian_word)
+    escaped = escape_like(term)
+    prefix = f'{escaped}%'
+    substring = f'%{escaped}%'
+    trigram = _has_trigram()
+
+    if len(term) < _TRIGRAM_MIN_LENGTH:
+        # Prefix fast path (lower(...) text_pattern_ops indexes)
+        query = query.filter(or_(
+            english.like(prefix, escape='\\'),
+            russian.like(prefix, escape='\\'),
+        ))
+    else:
+        matches = [
+            CollectionWords.english_word.ilike(substring, escape='\\'),
+            CollectionWords.russian_word.ilike(substring, escape='\\'),
+        ]
+        if trigram:
+            matches += [
+                CollectionWords.english_word.op('%')(term),
+                CollectionWords.russian_word.op('%')(term),
+            ]
+        query = query.filter(or_(*matches))
+
+    tier = case(
+        (or_(english == term, russian == term), 0),
+        (or_(english.like(prefix, escape='\\'), russian.like(prefix, escape='\\')), 1),
+        (or_(english.like(substring, escape='\\'), russian.like(substring, escape='\\')), 2),
+        else_=3,
+    )
+    order_by = [tier]
+    if trigram:
+        order_by.append(func.greatest(
+            func.similarity(CollectionWords.english_word, term),
+            func.similarity(func.coalesce(CollectionWords.russian_word, ''), term),
+        ).desc())
+    order_by += [
+        CollectionWords.frequency_rank.asc().nullslast(),
+        CollectionWords.english_word.asc(),
+    ]
+    return query.order_by(*order_by)
+
+
+def search_words(term: str, limit: int = 20, query: Optional[Query] = None) -> List[CollectionWords]:
+    """Best ``limit`` matches for ``term`` (see :func:`search_query`)."""
+    return search_query(term, query).limit(limit).all()
@@ -160,6 +160,16 @@ MAX_SYNC_PROCESSING_SIZE = 50000  # ~50 KB
 # Таймаут для блокирующих операций при синхронной обработке (в секундах)
 SYNC_PROCESSING_TIMEOUT = 30
 
+# Процессы для NLP-обработки текста книги (токенизация, POS, лемматизация)
+NLP_MAX_WORKERS = int(os.environ.get("NLP_MAX_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+# Сколько секунд простоя держать пул NLP-процессов (NLTK и кэш лемм загружены)
+# до его остановки; 0 = останавливать сразу после каждой книги
+NLP_POOL_IDLE_SECONDS = int(os.environ.get("NLP_POOL_IDLE_SECONDS", 120))
+
+# Размер блока текста на один NLP-процесс (в символах)
+NLP_BLOCK_SIZE = int(os.environ.get("NLP_BLOCK_SIZE", 200000))
+
 # =============================================================================
 # Timezone defaults
 # =============================================================================
@@ -176,6 +186,14 @@ DEFAULT_TIMEZONE: str = os.getenv('DEFAULT_TIMEZONE', 'Europe/Moscow')
 # Configurable via SLOW_QUERY_MS environment variable.
 SLOW_QUERY_MS: int = int(os.getenv('SLOW_QUERY_MS', 100))
 
+# Per-request SQL profile (app/middleware/query_profiler.py). A request is
+# logged at WARNING when it exceeds either budget or repeats one normalized
+# statement at least SQL_PROFILER_REPEAT_THRESHOLD times (an N+1 signature).
+SQL_PROFILER_ENABLED: bool = os.getenv('SQL_PROFILER_ENABLED', 'true').lower() == 'true'
+SQL_PROFILER_MAX_QUERIES: int = int(os.getenv('SQL_PROFILER_MAX_QUERIES', 50))
+SQL_PROFILER_MAX_MS: int = int(os.getenv('SQL_PROFILER_MAX_MS', 500))
+SQL_PROFILER_REPEAT_THRESHOLD: int = int(os.getenv('SQL_PROFILER_REPEAT_THRESHOLD', 10))
+
 # =============================================================================
 # Domain thresholds — named constants for values used across multiple modules.
 # Import from here instead of hardcoding literals.
@@ -210,6 +228,10 @@ class Config:
         else None
     )
 
+    # Shared curriculum cache (app/curriculum/cache.py); unset = per-worker memory
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+    CACHE_L1_TTL = int(os.environ.get("CACHE_L1_TTL", 5))
+
     SESSION_COOKIE_SECURE = os.environ.get("FLASK_ENV") != "development"
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
@@ -228,7 +250,20 @@ class Config:
     TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
     TELEGRAM_WEBHOOK_SECRET = os.environ.get("TELEGRAM_WEBHOOK_SECRET")
     TELEGRAM_BOT_USERNAME = os.environ.get("TELEGRAM_BOT_USERNAME", "llt_englishbot")
+    # Потоки почасовой рассылки; держать ниже pool_size движка БД.
+    # 1 = последовательно в потоке планировщика.
+    TELEGRAM_SCHEDULER_WORKERS = int(os.environ.get("TELEGRAM_SCHEDULER_WORKERS", "8"))
+    # Исходящая очередь (app/telegram/sender.py). Лимиты Telegram: ~30 сообщений/с
+    # на бота и 1 сообщение/с в один чат. TELEGRAM_API_BASE — для локального
+    # фейкового Bot API в тестах или self-hosted telegram-bot-api.
+    TELEGRAM_API_BASE = os.environ.get("TELEGRAM_API_BASE", "https://api.telegram.org")
+    TELEGRAM_SEND_WORKERS = int(os.environ.get("TELEGRAM_SEND_WORKERS", "8"))
+    TELEGRAM_GLOBAL_RATE = float(os.environ.get("TELEGRAM_GLOBAL_RATE", "25"))
+    TELEGRAM_PER_CHAT_INTERVAL = float(os.environ.get("TELEGRAM_PER_CHAT_INTERVAL", "1"))
     SITE_URL = os.environ.get("SITE_URL", "")
+    # Шарды sitemap (app/seo/sitemap.py) собираются не чаще раза в
+    # SITEMAP_TTL_SECONDS на процесс; 0 = собирать на каждый запрос.
+    SITEMAP_TTL_SECONDS = int(os.environ.get("SITEMAP_TTL_SECONDS", "3600"))
 
     GOOGLE_SITE_VERIFICATION = os.environ.get("GOOGLE_SITE_VERIFICATION", "")
     GOOGLE_ANALYTICS_ID = os.environ.get("GOOGLE_ANALYTICS_ID", "")
@@ -239,8 +274,27 @@ class Config:
     # Пусто → проверка выключена, writing-уроки работают без фидбека.
     LANGUAGETOOL_URL = os.environ.get("LANGUAGETOOL_URL", "")
 
+    # Админ-дашборд: виджеты считаются параллельно (app/admin/utils/widgets.py).
+    # Потоков меньше pool_size движка БД; 1 = последовательно в потоке запроса.
+    # Виджет, не успевший за ADMIN_WIDGET_TIMEOUT секунд, отдаёт последнее
+    # удачное значение. Фоновое обновление кэша виджетов раз в
+    # ADMIN_DASHBOARD_REFRESH_SECONDS (меньше TTL кэша, 0 = выключено) — только
+    # пока дашборд открывали в этом воркере за последние 15 минут.
+    ADMIN_DASHBOARD_WORKERS = int(os.environ.get("ADMIN_DASHBOARD_WORKERS", "4"))
+    ADMIN_WIDGET_TIMEOUT = float(os.environ.get("ADMIN_WIDGET_TIMEOUT", "3"))
+    ADMIN_DASHBOARD_REFRESH_SECONDS = int(os.environ.get("ADMIN_DASHBOARD_REFRESH_SECONDS", "0"))
+
+    # /api/daily-status отдаётся из снапшота (app/daily_plan/status_projection.py),
+    # пока его не инвалидировала активность; не дольше этого срока, т.к. часть
+    # полей (SRS due, гонка) меняется со временем. 0 = всегда пересчитывать.
+    DAILY_STATUS_MAX_AGE_SECONDS = int(os.environ.get("DAILY_STATUS_MAX_AGE_SECONDS", "300"))
+
     SQLALCHEMY_ENGINE_OPTIONS = DEFAULT_SQLALCHEMY_ENGINE_OPTIONS
     SLOW_QUERY_MS: int = SLOW_QUERY_MS
+    SQL_PROFILER_ENABLED: bool = SQL_PROFILER_ENABLED
+    SQL_PROFILER_MAX_QUERIES: int = SQL_PROFILER_MAX_QUERIES
+    SQL_PROFILER_MAX_MS: int = SQL_PROFILER_MAX_MS
+    SQL_PROFILER_REPEAT_THRESHOLD: int = SQL_PROFILER_REPEAT_THRESHOLD
     DEFAULT_TIMEZONE: str = DEFAULT_TIMEZONE
 
 
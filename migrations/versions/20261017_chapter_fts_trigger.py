@@ -0,0 +1,54 @@
+"""Populate chapter.ts_idx and keep it current with a trigger.
+
+`chapter.ts_idx` has a GIN index (`idx_chapter_fts`) but nothing ever wrote
+to it. The in-book usage search (`app/books/concordance.py`) matches against
+it, so existing rows are backfilled and a BEFORE INSERT/UPDATE trigger keeps
+it in step with `text_raw`, whichever path writes the chapter.
+
+`text_raw` stores paragraph breaks as the two characters backslash-n; they
+are replaced by a space first, or the tsvector would index "\\ngave"-style
+tokens and miss the first word of every paragraph.
+
+PostgreSQL only; other backends have no tsvector and are skipped.
+
+Revision ID: 20261017_chapter_fts_trigger
+Revises: 20261017_srs_review_log
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+
+revision = '20261017_chapter_fts_trigger'
+down_revision = '20261017_srs_review_log'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("""
+        CREATE OR REPLACE FUNCTION chapter_ts_idx_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.ts_idx := to_tsvector('english', replace(coalesce(NEW.text_raw, ''), '\\n', ' '));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER chapter_ts_idx_trigger
+        BEFORE INSERT OR UPDATE OF text_raw ON chapter
+        FOR EACH ROW EXECUTE FUNCTION chapter_ts_idx_update()
+    """)
+    op.execute(
+        "UPDATE chapter SET ts_idx = to_tsvector('english', replace(coalesce(text_raw, ''), '\\n', ' '))"
+        " WHERE ts_idx IS NULL"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP TRIGGER IF EXISTS chapter_ts_idx_trigger ON chapter')
+    op.execute('DROP FUNCTION IF EXISTS chapter_ts_idx_update()')
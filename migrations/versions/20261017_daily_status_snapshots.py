@@ -0,0 +1,37 @@
+"""Add daily_status_snapshots.
+
+One row per user holding the last serialized /api/daily-status payload and
+the version counters that invalidate it (`app/daily_plan/status_projection.py`).
+Rows are rebuilt on demand, so nothing is backfilled.
+
+Revision ID: 20261017_daily_status_snapshots
+Revises: 20261017_user_daily_activity
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = '20261017_daily_status_snapshots'
+down_revision = '20261017_user_daily_activity'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'daily_status_snapshots',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('local_date', sa.Date(), nullable=False),
+        sa.Column('tz', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('built_version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('daily_status_snapshots')
@@ -0,0 +1,53 @@
+"""Add the append-only SRS review log and the rolling-accuracy ring.
+
+`srs_review_log` holds one compact row per grade (card, user, rating, state
+transition, timestamp, answer time), written in the grading transaction.
+`user_statistics.srs_recent_outcomes` keeps the latest graduated-card
+outcomes so the adaptive tier resolver no longer scans up to 200 cards on
+every grade. Existing users start with an empty ring; the resolver falls
+back to the card-counter approximation until it fills.
+
+Revision ID: 20261017_srs_review_log
+Revises: 20260815_seed_word_sets
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017_srs_review_log'
+down_revision = '20260815_seed_word_sets'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'srs_review_log',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('card_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.SmallInteger(), nullable=False),
+        sa.Column('state_before', sa.String(length=15), nullable=False),
+        sa.Column('state_after', sa.String(length=15), nullable=False),
+        sa.Column('reviewed_at', sa.DateTime(), nullable=False),
+        sa.Column('elapsed_ms', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['card_id'], ['user_card_directions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_srs_review_log_user_reviewed', 'srs_review_log', ['user_id', 'reviewed_at'])
+    op.create_index('idx_srs_review_log_card', 'srs_review_log', ['card_id'])
+
+    op.add_column(
+        'user_statistics',
+        sa.Column('srs_recent_outcomes', sa.String(200), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column('user_statistics', 'srs_recent_outcomes')
+    op.drop_index('idx_srs_review_log_card', table_name='srs_review_log')
+    op.drop_index('idx_srs_review_log_user_reviewed', table_name='srs_review_log')
+    op.drop_table('srs_review_log')
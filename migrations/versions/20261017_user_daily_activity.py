@@ -0,0 +1,85 @@
+"""Add user_daily_activity rollup and backfill it.
+
+One row per user and user-local day with a bitmask of the activity sources
+seen that day, study minutes and XP (`app/utils/activity_rollup.py`). Admin
+activity metrics, the streak calendar and `has_learning_activity` read it,
+so on PostgreSQL the existing history is backfilled here; the bit values
+must match the `SOURCE_*` constants in that module. Later repairs go
+through `flask backfill-activity-rollup`.
+
+Revision ID: 20261017_user_daily_activity
+Revises: 20261017_words_trigram_search
+Create Date: 2026-10-17
+"""
+
+import os
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = '20261017_user_daily_activity'
+down_revision = '20261017_words_trigram_search'
+branch_labels = None
+depends_on = None
+
+
+_DEFAULT_TIMEZONE = os.getenv('DEFAULT_TIMEZONE', 'Europe/Moscow')
+
+# (user id, naive UTC timestamp, source bit, minutes) per activity table
+_SOURCES = """
+    SELECT user_id AS uid, coalesce(last_activity, completed_at) AS ts, 1 AS bit, 0 AS minutes
+      FROM lesson_progress
+    UNION ALL SELECT user_id, last_reviewed, 2, 0 FROM user_grammar_exercises
+    UNION ALL SELECT uw.user_id, ucd.last_reviewed, 4, 0
+      FROM user_card_directions ucd JOIN user_words uw ON uw.id = ucd.user_word_id
+    UNION ALL SELECT user_id, updated_at, 8, 0 FROM user_chapter_progress
+    UNION ALL SELECT user_id, completed_at AT TIME ZONE 'UTC', 16, 0 FROM user_lesson_progress
+    UNION ALL SELECT user_id, start_time, 32,
+           greatest(floor(extract(epoch FROM end_time - start_time) / 60), 0)::int
+      FROM study_sessions
+    UNION ALL SELECT user_id, created_at, 64, 0 FROM streak_events WHERE event_type LIKE 'xp_linear%'
+    UNION ALL SELECT user_id, created_at, 128, 0 FROM listening_attempts
+    UNION ALL SELECT user_id, started_at, 256, 0 FROM lesson_attempts
+    UNION ALL SELECT user_id, last_activity, 512, 0 FROM book_course_enrollments
+"""
+
+
+def upgrade():
+    op.create_table(
+        'user_daily_activity',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('local_date', sa.Date(), nullable=False),
+        sa.Column('sources', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('minutes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('xp', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('user_id', 'local_date'),
+    )
+    op.create_index('idx_user_daily_activity_date', 'user_daily_activity', ['local_date'])
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(sa.text(f"""
+        INSERT INTO user_daily_activity (user_id, local_date, sources, minutes, xp, updated_at)
+        SELECT uid, d, bit_or(bit), sum(minutes), sum(xp), now() AT TIME ZONE 'UTC'
+        FROM (
+            SELECT a.uid,
+                   (timezone(coalesce(tz.name, :default_tz), timezone('UTC', a.ts)))::date AS d,
+                   a.bit, a.minutes, 0 AS xp
+            FROM ({_SOURCES}) a
+            JOIN users u ON u.id = a.uid
+            LEFT JOIN pg_timezone_names tz ON tz.name = u.timezone
+            WHERE a.ts IS NOT NULL
+            UNION ALL
+            SELECT user_id, event_date, 0, 0, coalesce((details ->> 'xp')::int, 0)
+            FROM streak_events
+            WHERE event_type LIKE 'xp\\_%'
+        ) daily
+        GROUP BY uid, d
+    """).bindparams(default_tz=_DEFAULT_TIMEZONE))
+
+
+def downgrade():
+    op.drop_index('idx_user_daily_activity_date', table_name='user_daily_activity')
+    op.drop_table('user_daily_activity')
@@ -0,0 +1,47 @@
+"""Trigram and prefix indexes for dictionary search.
+
+Every word search box (`app/words/search.py`) matched `ILIKE '%term%'` on
+`english_word` and `russian_word`, which no B-tree can serve. This adds:
+
+- pg_trgm GIN indexes on both columns, for substring `ILIKE` and the `%`
+  similarity operator used for typo-tolerant matches;
+- `lower(...) text_pattern_ops` B-tree indexes, for the prefix `LIKE 'te%'`
+  path that autocomplete takes on one- and two-character terms.
+
+PostgreSQL only; other backends are skipped.
+
+Revision ID: 20261017_words_trigram_search
+Revises: 20261017_chapter_fts_trigger
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+
+revision = '20261017_words_trigram_search'
+down_revision = '20261017_chapter_fts_trigger'
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    'idx_collection_words_english_trgm': 'USING gin (english_word gin_trgm_ops)',
+    'idx_collection_words_russian_trgm': 'USING gin (russian_word gin_trgm_ops)',
+    'idx_collection_words_english_prefix': '(lower(english_word) text_pattern_ops)',
+    'idx_collection_words_russian_prefix': '(lower(russian_word) text_pattern_ops)',
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, definition in _INDEXES.items():
+        op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON collection_words {definition}')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name in _INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
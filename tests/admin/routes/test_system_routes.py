@@ -78,6 +78,7 @@ class TestSystemInfo:
         mock_render.assert_called_once()
         _, kwargs = mock_render.call_args
         assert kwargs.get('clear_cache_confirm') == CLEAR_CACHE_CONFIRM
+        assert {'hits', 'misses', 'evictions'} <= set(kwargs['curriculum_cache_stats'])
 
     @patch('app.admin.routes.system_routes.SystemService.get_system_info')
     def test_system_info_error(self, mock_get_info, admin_client, mock_admin_user):
@@ -1,7 +1,7 @@
 """Task 42 of 2026-05-27 global site audit — admin dashboard N+1 queries.
 
 Verifies:
-- DAU/WAU/MAU uses a single UNION query (not 7 separate queries)
+- DAU/WAU/MAU uses a single rollup query (not 7 separate queries)
 - _count_active_users_in_range does not do N+1 per day
 - Dashboard cache returns cached result on second call (no cache miss per request)
 - Query count on dashboard route is bounded
@@ -44,14 +44,18 @@ def _union_count(counter: _QueryCounter) -> int:
     return sum(1 for s in counter.statements if 'UNION' in s.upper())
 
 
+def _rollup_count(counter: _QueryCounter) -> int:
+    return sum(1 for s in counter.statements if 'user_daily_activity' in s)
+
+
 # ---------------------------------------------------------------------------
-# DAU/WAU/MAU — single UNION
+# DAU/WAU/MAU — single rollup read
 # ---------------------------------------------------------------------------
 
-class TestDauWauMauUnionQuery:
-    """get_engagement_metrics must issue exactly one UNION query."""
+class TestDauWauMauRollupQuery:
+    """get_engagement_metrics must issue exactly one rollup query."""
 
-    def test_single_union_query(self, app, db_session):
+    def test_single_rollup_query(self, app, db_session):
         from app.admin.utils.cache import clear_admin_cache
         from app.admin.routes.dashboard_routes import get_engagement_metrics
 
@@ -59,11 +63,12 @@ class TestDauWauMauUnionQuery:
         with _QueryCounter() as counter:
             get_engagement_metrics()
 
-        n_union = _union_count(counter)
-        assert n_union == 1, (
-            f"Expected 1 UNION query for DAU/WAU/MAU, got {n_union}: "
-            f"{[s[:120] for s in counter.statements if 'UNION' in s.upper()]}"
+        n_rollup = _rollup_count(counter)
+        assert n_rollup == 1, (
+            f"Expected 1 rollup query for DAU/WAU/MAU, got {n_rollup}: "
+            f"{[s[:120] for s in counter.statements]}"
         )
+        assert _union_count(counter) == 0
 
     def test_result_keys_present(self, app, db_session):
         from app.admin.utils.cache import clear_admin_cache
@@ -183,6 +183,7 @@ class TestCacheStatsEndpoint:
         assert 'max_size' in data
         assert 'entries' in data
         assert data['size'] >= 1
+        assert {'hits', 'misses', 'hit_rate', 'evictions', 'invalidations'} <= set(data['curriculum'])
 
     def test_cache_stats_requires_admin(self, app, client):
         resp = client.get('/admin/system/cache-stats')
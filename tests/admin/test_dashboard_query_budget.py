@@ -3,8 +3,9 @@
 Before refactor the dashboard ran 6 UNION counts for DAU/WAU/MAU plus 30 daily
 UNIONs for the activity chart — 36+ round trips just for engagement metrics.
 The materialised ``get_active_user_dates`` helper collapses each of those to a
-single query. This test pins that win so a future regression that re-introduces
-N+1 querying on the dashboard gets caught.
+single read of the ``user_daily_activity`` rollup. This test pins that win so a
+future regression that re-introduces N+1 querying (or the UNION over the raw
+activity tables) on the dashboard gets caught.
 """
 from __future__ import annotations
 
@@ -59,10 +60,14 @@ def _login_admin(client, db_session) -> User:
     return admin
 
 
-def test_engagement_metrics_uses_single_union_query(app, db_session):
-    """``get_engagement_metrics`` must hit the DB at most twice — once for the
-    UNION, plus any incidental savepoint/release statement from the test
-    transaction. Regressing to one-query-per-metric is the failure mode."""
+def _rollup_reads(statements):
+    return [s for s in statements if 'user_daily_activity' in s.lower()]
+
+
+def test_engagement_metrics_uses_single_rollup_query(app, db_session):
+    """``get_engagement_metrics`` reads the daily-activity rollup exactly once
+    and no longer UNIONs the raw activity tables. Regressing to
+    one-query-per-metric is the failure mode."""
     from app.admin.utils.cache import clear_admin_cache
     from app.admin.routes.dashboard_routes import get_engagement_metrics
 
@@ -70,15 +75,16 @@ def test_engagement_metrics_uses_single_union_query(app, db_session):
     with _QueryCounter() as counter:
         get_engagement_metrics()
 
-    union_statements = [s for s in counter.statements if 'UNION' in s.upper()]
-    assert len(union_statements) == 1, (
-        f"Expected 1 UNION query, got {len(union_statements)}: {[s[:200] for s in union_statements]}"
+    rollup_statements = _rollup_reads(counter.statements)
+    assert len(rollup_statements) == 1, (
+        f"Expected 1 rollup query, got {len(rollup_statements)}: {[s[:200] for s in rollup_statements]}"
     )
+    assert not [s for s in counter.statements if 'UNION' in s.upper()]
 
 
-def test_daily_activity_data_uses_single_union_query(app, db_session):
+def test_daily_activity_data_uses_single_rollup_query(app, db_session):
     """The 30-day activity chart used to run 30 UNION queries (one per day).
-    After the refactor it runs exactly one UNION for the whole window."""
+    It now runs exactly one rollup read for the whole window."""
     from app.admin.utils.cache import clear_admin_cache
     from app.admin.routes.dashboard_routes import get_daily_activity_data
 
@@ -86,11 +92,12 @@ def test_daily_activity_data_uses_single_union_query(app, db_session):
     with _QueryCounter() as counter:
         get_daily_activity_data(30)
 
-    union_statements = [s for s in counter.statements if 'UNION' in s.upper()]
-    assert len(union_statements) == 1, (
-        f"Expected 1 UNION query for 30-day chart, got {len(union_statements)}: "
-        f"{union_statements}"
+    rollup_statements = _rollup_reads(counter.statements)
+    assert len(rollup_statements) == 1, (
+        f"Expected 1 rollup query for 30-day chart, got {len(rollup_statements)}: "
+        f"{rollup_statements}"
     )
+    assert not [s for s in counter.statements if 'UNION' in s.upper()]
 
 
 @pytest.mark.smoke
@@ -115,10 +122,10 @@ def test_dashboard_route_query_budget(client, app, db_session):
         f"Dashboard query budget exceeded: {counter.count} statements"
     )
 
-    union_statements = [s for s in counter.statements if 'UNION' in s.upper()]
-    # engagement (1) + daily_activity (1) + retention (a few per cohort date,
-    # capped by 90-day window cardinality). Keep the ceiling well above the
-    # current count so day-to-day churn doesn't make the test flaky.
-    assert len(union_statements) < 30, (
-        f"Too many UNION queries on dashboard: {len(union_statements)}"
+    rollup_statements = _rollup_reads(counter.statements)
+    # engagement (1) + daily_activity (1) + retention (one per day offset).
+    # Keep the ceiling well above the current count so day-to-day churn
+    # doesn't make the test flaky.
+    assert len(rollup_statements) < 30, (
+        f"Too many activity rollup queries on dashboard: {len(rollup_statements)}"
     )
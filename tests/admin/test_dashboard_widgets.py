@@ -0,0 +1,103 @@
+"""Tests for app/admin/utils/widgets.py (concurrent dashboard widgets)."""
+import threading
+
+import pytest
+
+from app.admin.utils import widgets as widgets_module
+from app.admin.utils.cache import clear_admin_cache
+from app.admin.utils.decorators import cache_result
+from app.admin.utils.widgets import Widget, refresh_widgets, render_widgets, server_timing
+
+
+@pytest.fixture(autouse=True)
+def _clean_state():
+    clear_admin_cache()
+    widgets_module._last_good.clear()
+    widgets_module._last_render = None
+    yield
+    clear_admin_cache()
+    widgets_module._last_good.clear()
+    widgets_module._last_render = None
+
+
+def test_serial_render_returns_values_in_order(app):
+    with app.app_context():
+        results = render_widgets(
+            [Widget('a', lambda: 1), Widget('b', lambda x: x * 2, (21,))],
+            workers=1, timeout=1,
+        )
+
+    assert list(results) == ['a', 'b']
+    assert results['b'].value == 42
+    assert {r.status for r in results.values()} == {'ok'}
+
+
+def test_parallel_render_computes_every_widget(app):
+    with app.app_context():
+        results = render_widgets([Widget(f'w{i}', lambda i=i: i) for i in range(5)], workers=3, timeout=5)
+
+    assert {name: r.value for name, r in results.items()} == {f'w{i}': i for i in range(5)}
+
+
+def test_slow_widget_serves_last_good_value(app):
+    release = threading.Event()
+    widgets_module._last_good['slow'] = 'previous'
+
+    def slow():
+        release.wait(5)
+        return 'fresh'
+
+    try:
+        with app.app_context():
+            results = render_widgets([Widget('slow', slow), Widget('fast', lambda: 'ok')],
+                                     workers=2, timeout=0.05)
+    finally:
+        release.set()
+
+    assert results['slow'].value == 'previous'
+    assert results['slow'].status == 'stale'
+    assert results['fast'].status == 'ok'
+
+
+def test_failing_widget_without_fallback_raises(app):
+    def broken():
+        raise RuntimeError('boom')
+
+    with app.app_context(), pytest.raises(RuntimeError):
+        render_widgets([Widget('broken', broken)], workers=2, timeout=1)
+
+
+def test_server_timing_header_format(app):
+    with app.app_context():
+        results = render_widgets([Widget('srs_health', lambda: None)], workers=1, timeout=1)
+
+    header = server_timing(results)
+    assert header.startswith('w-srs-health;dur=')
+    assert header.endswith(';desc="ok"')
+
+
+def test_refresh_widgets_rewrites_cache_entry():
+    calls = []
+
+    @cache_result('widget_refresh_test', timeout=300)
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert loader() == 1
+    assert loader() == 1  # cached
+
+    refresh_widgets([Widget('counter', loader), Widget('plain', lambda: 0)])
+
+    assert loader() == 2
+    assert widgets_module._last_good == {'counter': 2}
+
+
+def test_refresher_only_runs_after_a_recent_render(app):
+    assert not widgets_module._recently_rendered(900)
+
+    with app.app_context():
+        render_widgets([Widget('srs_health', lambda: None)], workers=1, timeout=1)
+
+    assert widgets_module._recently_rendered(900)
+    assert not widgets_module._recently_rendered(0)
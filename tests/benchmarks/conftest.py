@@ -0,0 +1,23 @@
+"""Performance benchmarks are opt-in: they take seconds to minutes each.
+
+Run them with ``RUN_BENCHMARKS=1 pytest tests/benchmarks -s``; timings are
+printed, and every benchmark also asserts the optimized path gives the same
+result as the one it replaces.
+"""
+import os
+
+import pytest
+
+_BENCHMARK_TIMEOUT = 600
+
+
+def pytest_collection_modifyitems(config, items):
+    enabled = bool(os.environ.get('RUN_BENCHMARKS'))
+    here = os.path.dirname(__file__)
+    for item in items:
+        if not str(item.fspath).startswith(here):
+            continue
+        item.add_marker(pytest.mark.slow)
+        item.add_marker(pytest.mark.timeout(_BENCHMARK_TIMEOUT))
+        if not enabled:
+            item.add_marker(pytest.mark.skip(reason='benchmarks run only with RUN_BENCHMARKS=1'))
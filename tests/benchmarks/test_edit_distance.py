@@ -0,0 +1,62 @@
+"""Benchmark: bounded edit distance vs the full DP matrix on answer-sized strings.
+
+Typical inputs: a single gap-fill word, a translation sentence and a
+dictation transcript, each compared against a one-typo and a wrong answer:
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_edit_distance.py -s
+"""
+import time
+
+import pytest
+
+from app.curriculum.similarity import edit_distance, within_one_edit
+from tests.curriculum.test_similarity import full_matrix_levenshtein
+
+_ROUNDS = 500
+
+_CASES = {
+    'word': ('necessary', ['neccessary', 'accessory']),
+    'sentence': (
+        'she has been living in london for ten years',
+        ['she has been living in londn for ten years', 'she lived in london ten years ago'],
+    ),
+    'dictation': (
+        'the museum opens at nine in the morning and closes at six in the evening '
+        'except on mondays when it is closed all day for maintenance and cleaning',
+        ['the museum opens at nine in the morning and closes at six in the evening '
+         'except on mondays when its closed all day for maintenance and cleaning',
+         'the museum is open from nine to six every day apart from monday'],
+    ),
+}
+
+
+def _time(fn):
+    started = time.perf_counter()
+    for _ in range(_ROUNDS):
+        fn()
+    return time.perf_counter() - started
+
+
+@pytest.mark.parametrize('case', list(_CASES))
+def test_bounded_kernel_beats_full_matrix(case):
+    expected, answers = _CASES[case]
+
+    def full():
+        return [full_matrix_levenshtein(a, expected) <= 1 for a in answers]
+
+    def banded():
+        return [edit_distance(a, expected, 1) <= 1 for a in answers]
+
+    def linear():
+        return [within_one_edit(a, expected) for a in answers]
+
+    assert full() == banded() == linear()
+    full_seconds, banded_seconds, linear_seconds = _time(full), _time(banded), _time(linear)
+    print(
+        f"\n[edit distance] {case} ({len(expected)} chars) x{_ROUNDS}: "
+        f"full matrix {full_seconds:.3f}s, banded {banded_seconds:.3f}s "
+        f"({full_seconds / banded_seconds:.1f}x), linear <=1 {linear_seconds:.3f}s "
+        f"({full_seconds / linear_seconds:.1f}x)"
+    )
+    assert banded_seconds < full_seconds
+    assert linear_seconds < full_seconds
@@ -0,0 +1,46 @@
+"""Benchmark: contraction/hyphen normalization of a 1 MB text.
+
+Compares the legacy per-entry ``str.replace``/``re.sub`` loops with the
+compiled single-pass normalizer used by ``tokenize_and_filter``:
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_nlp_normalizer.py -s
+"""
+import time
+
+from app.nlp.processor import expand_contractions, normalize_hyphenated_words
+from tests.test_nlp_processor import GOLDEN_CORPUS, legacy_expand_contractions, legacy_normalize_hyphens
+
+
+def _sample_text(target_bytes=1_000_000):
+    with open(GOLDEN_CORPUS, encoding='utf-8') as f:
+        corpus = f.read()
+    repeats = target_bytes // len(corpus.encode('utf-8')) + 1
+    return corpus * repeats
+
+
+def _legacy(text):
+    return legacy_normalize_hyphens(legacy_expand_contractions(text))
+
+
+def _compiled(text):
+    return normalize_hyphenated_words(expand_contractions(text))
+
+
+def test_compiled_normalizer_beats_per_entry_loops():
+    text = _sample_text()
+
+    started = time.perf_counter()
+    legacy = _legacy(text)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = _compiled(text)
+    compiled_seconds = time.perf_counter() - started
+
+    print(
+        f"\n[normalizer] {len(text.encode('utf-8')):,} bytes: "
+        f"per-entry loops {legacy_seconds:.2f}s, compiled {compiled_seconds:.2f}s "
+        f"({legacy_seconds / compiled_seconds:.1f}x)"
+    )
+    assert compiled == legacy
+    assert compiled_seconds < legacy_seconds
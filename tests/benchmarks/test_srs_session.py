@@ -0,0 +1,144 @@
+"""Benchmark: assembling an SRS session for a user with 12k cards.
+
+Compares the legacy four-bucket fill (one query per priority bucket, then
+two lazy loads per card while formatting) with the single ranked query in
+``UnifiedSRSService._get_due_cards``:
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_srs_session.py -s
+"""
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy.event
+from sqlalchemy.engine import Engine
+
+from app.auth.models import User
+from app.srs.constants import CardState
+from app.srs.service import UnifiedSRSService
+from app.study.models import UserCardDirection, UserWord
+from app.utils.db import db
+from app.words.models import CollectionWords
+
+_WORDS = 6000  # two directions each -> 12k cards
+_LIMIT = 50
+
+
+def _measure(fn):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(Engine, 'before_cursor_execute', _record)
+    try:
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+    finally:
+        sqlalchemy.event.remove(Engine, 'before_cursor_execute', _record)
+    return result, len(statements), elapsed
+
+
+def _legacy_due_cards(user_id, limit):
+    """The bucket-by-bucket fill _get_due_cards used to do."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def base_query():
+        return (
+            UserCardDirection.query
+            .join(UserWord)
+            .filter(UserWord.user_id == user_id, UserWord.srs_excluded.is_(False))
+            .filter(db.or_(UserCardDirection.buried_until.is_(None),
+                           UserCardDirection.buried_until <= now))
+        )
+
+    result = []
+    for state in (CardState.RELEARNING, CardState.LEARNING, CardState.REVIEW):
+        remaining = limit - len(result)
+        if remaining <= 0:
+            return result
+        result.extend(base_query().filter(
+            UserCardDirection.state == state.value,
+            UserCardDirection.next_review <= now,
+        ).order_by(
+            UserCardDirection.recovery_required.desc(),
+            UserCardDirection.next_review.asc(),
+        ).limit(remaining).all())
+    remaining = limit - len(result)
+    if remaining > 0:
+        result.extend(base_query().filter(
+            db.or_(UserCardDirection.state == CardState.NEW.value,
+                   UserCardDirection.state.is_(None)),
+        ).order_by(UserCardDirection.id.asc()).limit(remaining).all())
+    return result
+
+
+def _seed(db_session):
+    suffix = uuid.uuid4().hex[:8]
+    user = User(username=f'bench_{suffix}', email=f'bench_{suffix}@test.com', active=True)
+    user.set_password('x')
+    db_session.add(user)
+    db_session.flush()
+
+    db_session.execute(CollectionWords.__table__.insert(), [
+        {'english_word': f'bench_{suffix}_{i}', 'russian_word': f'слово_{i}', 'level': 'A1'}
+        for i in range(_WORDS)
+    ])
+    word_ids = [row.id for row in db_session.query(CollectionWords.id).filter(
+        CollectionWords.english_word.like(f'bench_{suffix}_%'))]
+    db_session.execute(UserWord.__table__.insert(), [
+        {'user_id': user.id, 'word_id': word_id, 'status': 'review'} for word_id in word_ids
+    ])
+    user_word_ids = [row.id for row in db_session.query(UserWord.id).filter_by(user_id=user.id)]
+
+    # Mostly future reviews; a thin due layer in every bucket so the limit
+    # cuts across them, and a few thousand new cards behind. Due times are
+    # distinct: the legacy queries had no tie-break to compare against.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    states = [CardState.REVIEW.value] * 14 + [CardState.NEW.value] * 4 + [
+        CardState.LEARNING.value, CardState.RELEARNING.value]
+    cards = []
+    for i, user_word_id in enumerate(user_word_ids):
+        for direction in ('eng-rus', 'rus-eng'):
+            state = states[(i + len(cards)) % len(states)]
+            due = (i % 40 == 0) or state == CardState.NEW.value
+            cards.append({
+                'user_word_id': user_word_id,
+                'direction': direction,
+                'state': state,
+                'repetitions': 0 if state == CardState.NEW.value else 3,
+                'interval': 3,
+                'ease_factor': 2.5,
+                'next_review': now - timedelta(seconds=len(cards)) if due else now + timedelta(days=1 + i % 30),
+                'recovery_required': i % 120 == 0,
+            })
+    db_session.execute(UserCardDirection.__table__.insert(), cards)
+    db_session.flush()
+    return user.id
+
+
+def test_srs_session_single_query_12k_cards(db_session):
+    user_id = _seed(db_session)
+    service = UnifiedSRSService()
+
+    def legacy():
+        db_session.expire_all()
+        return service._format_cards_for_session(_legacy_due_cards(user_id, _LIMIT))
+
+    def ranked():
+        db_session.expire_all()
+        return service._format_cards_for_session(service._get_due_cards(user_id, limit=_LIMIT))
+
+    legacy_cards, legacy_queries, legacy_seconds = _measure(legacy)
+    cards, queries, seconds = _measure(ranked)
+
+    print(
+        f"\n[srs session, {_WORDS * 2} cards, limit {_LIMIT}] bucket fill + lazy loads: "
+        f"{legacy_queries} queries, {legacy_seconds * 1000:.0f}ms; "
+        f"ranked query: {queries} queries, {seconds * 1000:.0f}ms"
+    )
+    assert [c['card_id'] for c in cards] == [c['card_id'] for c in legacy_cards]
+    assert len({c['state'] for c in cards}) > 1  # the limit spans several buckets
+    assert queries <= 2
+    assert legacy_queries > 10 * queries
@@ -0,0 +1,98 @@
+"""Benchmark: query count of a 300-day streak.
+
+Compares the legacy day-by-day walk (``has_learning_activity`` per day, up to
+8 queries each) with ``get_current_streak`` on ``get_active_local_dates``:
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_streak_queries.py -s
+"""
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytz
+import sqlalchemy.event
+from sqlalchemy.engine import Engine
+
+from app.achievements.models import StreakEvent
+from app.auth.models import User
+from app.study.models import StudySession
+from app.utils.activity_tracker import has_learning_activity
+
+_STREAK_DAYS = 300
+_TZ = 'Europe/Moscow'
+
+
+def _measure(fn):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(Engine, 'before_cursor_execute', _record)
+    try:
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+    finally:
+        sqlalchemy.event.remove(Engine, 'before_cursor_execute', _record)
+    return result, len(statements), elapsed
+
+
+def _legacy_streak(user_id, tz_name):
+    """The walk get_current_streak used to do: one has_learning_activity per day."""
+    tz_obj = pytz.timezone(tz_name)
+    today = datetime.now(tz_obj).date()
+    repairs = {
+        ev.event_date for ev in StreakEvent.query.filter(
+            StreakEvent.user_id == user_id,
+            StreakEvent.event_type.in_(['free_repair', 'spent_repair', 'plan_pause', 'shield_repair']),
+            StreakEvent.event_date >= today - timedelta(days=366),
+        )
+    }
+
+    def _active(day):
+        start = tz_obj.localize(datetime(day.year, day.month, day.day))
+        return has_learning_activity(user_id, start, start + timedelta(days=1))
+
+    streak = 1 if _active(today) else 0
+    for offset in range(1, 366):
+        day = today - timedelta(days=offset)
+        if day in repairs or _active(day):
+            streak += 1
+        else:
+            break
+    return streak
+
+
+def test_streak_query_count_300_days(db_session):
+    from app.achievements.streak_service import find_missed_date
+    from app.telegram.queries import get_current_streak
+
+    suffix = uuid.uuid4().hex[:8]
+    user = User(username=f'bench_{suffix}', email=f'bench_{suffix}@test.com', active=True)
+    user.set_password('x')
+    db_session.add(user)
+    db_session.flush()
+
+    tz_obj = pytz.timezone(_TZ)
+    today = datetime.now(tz_obj).date()
+    for offset in range(_STREAK_DAYS):
+        day = today - timedelta(days=offset)
+        local_noon = tz_obj.localize(datetime(day.year, day.month, day.day, 12))
+        # Flashcards are source 6: the legacy walk misses sources 1-5 first
+        db_session.add(StudySession(user_id=user.id, session_type='cards',
+                                    start_time=local_noon.astimezone(pytz.utc).replace(tzinfo=None)))
+    db_session.flush()
+
+    legacy, legacy_queries, legacy_seconds = _measure(lambda: _legacy_streak(user.id, _TZ))
+    streak, queries, seconds = _measure(lambda: get_current_streak(user.id, tz=_TZ))
+    _, missed_queries, _ = _measure(lambda: find_missed_date(user.id, tz=_TZ))
+
+    print(
+        f"\n[streak {_STREAK_DAYS}d] day-by-day: {legacy_queries} queries, {legacy_seconds * 1000:.0f}ms; "
+        f"window UNION: {queries} queries, {seconds * 1000:.0f}ms; find_missed_date: {missed_queries} queries"
+    )
+    assert streak == legacy == _STREAK_DAYS
+    assert queries <= 2
+    assert missed_queries <= 2
+    assert legacy_queries > 100 * queries
@@ -0,0 +1,74 @@
+"""Benchmark: dictionary search over 100k+ words.
+
+Compares the legacy ``ILIKE '%term%'`` scan the search endpoints used to run
+with ``app.words.search``. The gap shows on PostgreSQL with the indexes from
+migration ``20261017_words_trigram_search`` in place; on SQLite both scan.
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_word_search.py -s
+"""
+import time
+import uuid
+
+from sqlalchemy import or_
+
+from app.words.models import CollectionWords
+from app.words.search import search_words
+
+_WORDS = 100_000
+_TERMS = ('ab', 'qu', 'tion', 'ment', 'zzk', 'abcdefg')
+_LIMIT = 20
+
+
+def _legacy_search(term, limit):
+    pattern = f'%{term}%'
+    return CollectionWords.query.filter(
+        or_(
+            CollectionWords.english_word.ilike(pattern),
+            CollectionWords.russian_word.ilike(pattern),
+        )
+    ).order_by(CollectionWords.english_word).limit(limit).all()
+
+
+def _timed(fn, repeat=5):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat
+
+
+def test_word_search_at_100k(db_session):
+    marker = uuid.uuid4().hex[:6]
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    rows = []
+    for i in range(_WORDS):
+        stem = ''.join(letters[(i // 26 ** k) % 26] for k in range(4))
+        suffix = ('tion', 'ment', 'ness', 'ing', '')[i % 5]
+        rows.append({
+            'english_word': f'{stem}{suffix}{marker}{i}',
+            'russian_word': f'слово{i}',
+            'frequency_rank': i,
+        })
+    db_session.execute(CollectionWords.__table__.insert(), rows)
+    db_session.commit()
+
+    try:
+        for term in _TERMS:
+            legacy, legacy_time = _timed(lambda: _legacy_search(term, _LIMIT))
+            ranked, ranked_time = _timed(lambda: search_words(term, limit=_LIMIT))
+            print(f'\n{term!r:>10}: legacy {legacy_time * 1000:8.1f} ms, ranked {ranked_time * 1000:8.1f} ms')
+
+            if len(term) < 3:
+                # Prefix fast path: only prefix hits, and the page still fills
+                assert len(ranked) == _LIMIT
+                assert all(w.english_word.startswith(term) for w in ranked)
+            else:
+                # Substring hits are never lost (fuzzy ones may be added)
+                assert len(ranked) >= len(legacy)
+        # Prefix hits come first
+        ranked = search_words('abcd', limit=_LIMIT)
+        assert ranked and ranked[0].english_word.startswith('abcd')
+    finally:
+        CollectionWords.query.filter(CollectionWords.english_word.like(f'%{marker}%')).delete(
+            synchronize_session=False
+        )
+        db_session.commit()
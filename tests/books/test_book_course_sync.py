@@ -106,9 +106,9 @@ class TestWordBookLinkCleanup:
 
         src = inspect.getsource(processors._process_book_words_internal)
         assert 'clear_book_word_links' in src
-        # Ensure cleanup precedes the per-batch insert loop
+        # Ensure cleanup precedes relinking the book's words
         clear_idx = src.index('clear_book_word_links')
-        insert_idx = src.index('process_batch_from_original_format')
+        insert_idx = src.index('bulk_link_words_to_book')
         assert clear_idx < insert_idx
 
     def test_process_book_chapters_words_clears_links_before_insert(self):
@@ -118,5 +118,5 @@ class TestWordBookLinkCleanup:
         src = inspect.getsource(processors._process_book_chapters_words_internal)
         assert 'clear_book_word_links' in src
         clear_idx = src.index('clear_book_word_links')
-        insert_idx = src.index('process_batch_from_original_format')
+        insert_idx = src.index('bulk_link_words_to_book')
         assert clear_idx < insert_idx
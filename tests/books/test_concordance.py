@@ -0,0 +1,139 @@
+"""Tests for app/books/concordance.py — in-book usage search."""
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+
+from app.books.concordance import normalize_phrase, search_concordance
+from app.books.models import Book, Chapter
+
+
+def _make_book(db_session, chapters, *, rights='public_domain', published=True):
+    book = Book(
+        title=f'Concordance {uuid.uuid4().hex[:6]}',
+        author='Test Author',
+        chapters_cnt=len(chapters),
+        words_total=100,
+        unique_words=50,
+        rights_status=rights,
+        is_published=published,
+        created_at=datetime.now(UTC),
+    )
+    db_session.add(book)
+    db_session.flush()
+    for num, body in enumerate(chapters, start=1):
+        db_session.add(Chapter(book_id=book.id, chap_num=num, title=f'Chapter {num}', text_raw=body, words=10))
+    db_session.commit()
+    if db_session.get_bind().dialect.name == 'postgresql':
+        # create_all() does not install the migration's ts_idx trigger
+        db_session.execute(text(
+            "UPDATE chapter SET ts_idx = to_tsvector('english', replace(text_raw, '\\n', ' '))"
+            " WHERE book_id = :book_id"
+        ), {'book_id': book.id})
+        db_session.commit()
+    return book
+
+
+def _unique_word(prefix):
+    """A word no other test's chapter contains (letters only, like the phrase regex)."""
+    return prefix + ''.join(chr(ord('a') + int(c, 16)) for c in uuid.uuid4().hex[:6])
+
+
+def _text(item):
+    return ''.join(segment['text'] for segment in item['segments'])
+
+
+class TestNormalizePhrase:
+    def test_lowercases_and_collapses(self):
+        assert normalize_phrase('  Give   UP! ') == 'give up'
+        assert normalize_phrase("don't") == "don't"
+        assert normalize_phrase('???') == ''
+        assert normalize_phrase(None) == ''
+
+
+class TestSearchConcordance:
+    def test_snippet_marks_the_phrase(self, db_session, test_user):
+        book = _make_book(db_session, [
+            'It was late. She would never give up on the garden, not even in winter.',
+            'Nothing to see here.',
+        ])
+
+        result = search_concordance('give up', test_user)
+
+        items = [item for item in result['items'] if item['book_id'] == book.id]
+        assert len(items) == 1
+        item = items[0]
+        assert item['chapter_num'] == 1
+        assert item['book_title'] == book.title
+        assert [s['text'].lower() for s in item['segments'] if s['match']]
+        assert 'garden' in _text(item)
+
+    def test_phrase_after_literal_paragraph_break(self, db_session, test_user):
+        # text_raw keeps paragraph breaks as the two characters backslash-n
+        word = _unique_word('quill')
+        book = _make_book(db_session, [f'The first paragraph ends here.\\n\\n{word} gave up at once.'])
+
+        result = search_concordance(f'{word} gave up', test_user)
+
+        items = [item for item in result['items'] if item['book_id'] == book.id]
+        assert len(items) == 1
+        assert [s['text'].lower() for s in items[0]['segments'] if s['match']]
+        assert '\\n' not in _text(items[0])
+
+    def test_inaccessible_and_draft_books_are_hidden(self, db_session, test_user):
+        phrase = _unique_word('zebrafinch')
+        visible = _make_book(db_session, [f'A {phrase} sang.'])
+        _make_book(db_session, [f'A {phrase} hid.'], rights='companion_only')
+        _make_book(db_session, [f'A {phrase} slept.'], published=False)
+
+        result = search_concordance(phrase, test_user)
+
+        assert result['total'] == 1
+        assert [item['book_id'] for item in result['items']] == [visible.id]
+
+    def test_pagination(self, db_session, test_user):
+        phrase = _unique_word('quokka')
+        _make_book(db_session, [f'The {phrase} number {n}.' for n in range(5)])
+
+        first = search_concordance(phrase, test_user, page=1, per_page=2)
+        last = search_concordance(phrase, test_user, page=3, per_page=2)
+
+        assert first['total'] == 5
+        assert first['has_more'] is True
+        assert len(first['items']) == 2
+        assert len(last['items']) == 1
+        assert last['has_more'] is False
+
+    def test_chapter_edit_refreshes_cached_hits(self, db_session, test_user):
+        phrase = _unique_word('axolotl')
+        book = _make_book(db_session, ['Nothing yet.'])
+        assert search_concordance(phrase, test_user)['total'] == 0
+
+        chapter = Chapter.query.filter_by(book_id=book.id).one()
+        chapter.text_raw = f'Now an {phrase} appears.'
+        db_session.commit()
+        if db_session.get_bind().dialect.name == 'postgresql':
+            db_session.execute(text(
+                "UPDATE chapter SET ts_idx = to_tsvector('english', text_raw) WHERE id = :id"
+            ), {'id': chapter.id})
+            db_session.commit()
+
+        assert search_concordance(phrase, test_user)['total'] == 1
+
+
+class TestConcordanceApi:
+    def test_requires_query(self, authenticated_client):
+        response = authenticated_client.get('/api/books/concordance?q=%20')
+        assert response.status_code == 400
+
+    def test_returns_items(self, authenticated_client, db_session):
+        phrase = _unique_word('narwhal')
+        _make_book(db_session, [f'A {phrase} surfaced.'])
+
+        response = authenticated_client.get(f'/api/books/concordance?q={phrase}')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['query'] == phrase
+        assert data['total'] == 1
+        assert phrase in _text(data['items'][0])
@@ -0,0 +1,105 @@
+"""Single-pass phrasal verb matcher (app/books/phrasal_matcher.py)."""
+import re
+import uuid
+from collections import Counter
+
+from sqlalchemy import text
+
+from app.books.phrasal_matcher import PhrasalVerbMatcher, get_matcher, invalidate_matcher
+
+
+def _legacy_counts(phrases, content):
+    """The per-phrase ``re.findall(r'\\bPV\\b')`` scan the matcher replaces."""
+    text_lower = content.lower()
+    counts = Counter()
+    for word_id, phrase in phrases:
+        matches = re.findall(r'\b' + re.escape(phrase.lower()) + r'\b', text_lower)
+        if matches:
+            counts[word_id] = len(matches)
+    return counts
+
+
+class TestPhrasalVerbMatcher:
+    PHRASES = [
+        (1, 'give up'), (2, 'give up on'), (3, 'look forward to'), (4, 'put up with'),
+        (5, 'Take off'), (6, 'on and on'), (7, "make one's way"), (8, 'up'),
+    ]
+
+    def test_counts_match_legacy_regex_scan(self):
+        content = (
+            "He would never give up. She gave up on him, then gave up; she'd Give Up on "
+            "everything. We look forward to it. I can't put up with this! The plane took off, "
+            "the plane will take off. It went on and on and on. He made one's way... "
+            "to make one's way home. Giveup is not a phrase, nor is give-upper."
+        )
+        assert PhrasalVerbMatcher(self.PHRASES).count(content) == _legacy_counts(self.PHRASES, content)
+
+    def test_phrase_split_across_lines_still_matches(self):
+        matcher = PhrasalVerbMatcher([(1, 'give up')])
+        assert matcher.count('never give\nup') == Counter({1: 1})
+
+    def test_prefix_of_longer_phrase_does_not_block_it(self):
+        matcher = PhrasalVerbMatcher([(1, 'give up'), (2, 'give up on')])
+        assert matcher.count('give up on it, give up') == Counter({1: 2, 2: 1})
+
+
+class TestFindPhrasalVerbsInText:
+    def _phrasal_verb(self, db_session, phrase):
+        from app.words.models import CollectionWords
+
+        pv = CollectionWords(english_word=phrase, item_type='phrasal_verb')
+        db_session.add(pv)
+        db_session.commit()
+        return pv
+
+    def test_bulk_upserts_links_with_frequencies(self, app, db_session):
+        from app.books.models import Book
+        from app.books.processors import find_phrasal_verbs_in_text
+
+        tag = uuid.uuid4().hex[:8]
+        pv_a = self._phrasal_verb(db_session, f'zq{tag} up')
+        pv_b = self._phrasal_verb(db_session, f'zq{tag} out')
+        book = Book(title=f'PV {tag}', author='Test Author', chapters_cnt=1)
+        db_session.add(book)
+        db_session.commit()
+
+        content = f'zq{tag} up and zq{tag} up again, then zq{tag} out.'
+        found = find_phrasal_verbs_in_text(content, book.id)
+        # A second pass adds to existing frequencies (ON CONFLICT ... +).
+        find_phrasal_verbs_in_text(content, book.id)
+
+        rows = dict(db_session.execute(
+            text("SELECT word_id, frequency FROM word_book_link WHERE book_id = :b"),
+            {'b': book.id},
+        ).fetchall())
+        assert found == 2
+        assert rows == {pv_a.id: 4, pv_b.id: 2}
+
+    def test_chapter_texts_are_counted_without_joining(self, app, db_session):
+        from app.books.models import Book
+        from app.books.processors import find_phrasal_verbs_in_text
+
+        tag = uuid.uuid4().hex[:8]
+        pv = self._phrasal_verb(db_session, f'zq{tag} up')
+        book = Book(title=f'PV {tag}', author='Test Author', chapters_cnt=2)
+        db_session.add(book)
+        db_session.commit()
+
+        found = find_phrasal_verbs_in_text([f'zq{tag} up here.', f'And zq{tag} up there.'], book.id)
+
+        rows = dict(db_session.execute(
+            text("SELECT word_id, frequency FROM word_book_link WHERE book_id = :b"),
+            {'b': book.id},
+        ).fetchall())
+        assert found == 1
+        assert rows == {pv.id: 2}
+
+    def test_matcher_is_cached_until_phrasal_verbs_change(self, app, db_session):
+        invalidate_matcher()
+        first = get_matcher(db_session)
+        assert get_matcher(db_session) is first
+
+        self._phrasal_verb(db_session, f'zq{uuid.uuid4().hex[:8]} in')
+        rebuilt = get_matcher(db_session)
+        assert rebuilt is not first
+        assert rebuilt.size == first.size + 1
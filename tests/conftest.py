@@ -85,6 +85,24 @@ if _user_tz_default is not None and hasattr(_user_tz_default, 'arg'):
     _user_tz_default.arg = 'UTC'
 
 
+def sitemap_shards(client) -> list:
+    """Bodies of every shard listed in the /sitemap.xml index."""
+    import xml.etree.ElementTree as ET
+    from urllib.parse import urlparse
+
+    index = ET.fromstring(client.get('/sitemap.xml').data)
+    ns = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+    return [
+        client.get(urlparse(loc.text).path).data
+        for loc in index.findall('sm:sitemap/sm:loc', ns)
+    ]
+
+
+def sitemap_text(client) -> str:
+    """All sitemap shards decoded and concatenated, for substring checks."""
+    return '\n'.join(body.decode('utf-8') for body in sitemap_shards(client))
+
+
 def _truncate_all_tables(db_instance) -> None:
     """Truncate all tables at the start of the test session to ensure a clean state."""
     from sqlalchemy import text
@@ -163,6 +181,8 @@ def app(worker_id):
         SERVER_NAME = 'localhost'
         SQLALCHEMY_TRACK_MODIFICATIONS = False
         RATELIMIT_ENABLED = False  # Disable rate limiting in tests
+        ADMIN_DASHBOARD_WORKERS = 1  # db_session shares one session across contexts
+        SITEMAP_TTL_SECONDS = 0  # tests add rows and expect them in the next sitemap
 
     test_app = create_app(config_class=TestConfig)
 
@@ -890,6 +910,36 @@ def collection_and_topic(db_session):
     return {'collection': collection, 'topic': topic}
 
 
+@pytest.fixture(scope='function')
+def query_budget():
+    """Opt-in SQL budget for a block of code.
+
+    Usage::
+
+        with query_budget(30, max_repeats=5) as profile:
+            authenticated_client.get('/api/daily-plan')
+
+    Fails if the block runs more than ``max_queries`` statements or, when
+    ``max_repeats`` is given, repeats one normalized statement more often
+    than that (an N+1 loop).
+    """
+    from contextlib import contextmanager
+    from app.middleware.query_profiler import capture_queries
+
+    @contextmanager
+    def _budget(max_queries, max_repeats=None):
+        with capture_queries() as profile:
+            yield profile
+        assert profile.count <= max_queries, (
+            f"Query budget {max_queries} exceeded: {profile.describe()}"
+        )
+        if max_repeats is not None:
+            worst = profile.repeated(max_repeats + 1)
+            assert not worst, f"Repeated statement (N+1?): {profile.describe()}"
+
+    return _budget
+
+
 # ==================== AUTO-FIXTURES FOR TEST ENVIRONMENT ====================
 
 @pytest.fixture
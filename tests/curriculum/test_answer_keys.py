@@ -0,0 +1,68 @@
+"""Tests for the precompiled check-item answer keys (app/curriculum/answer_keys.py)."""
+from __future__ import annotations
+
+import pytest
+
+from app.curriculum import answer_keys
+from app.curriculum.answer_keys import compile_lesson_keys, lesson_keys
+from app.curriculum.grading import _strict_text_match
+
+
+@pytest.fixture(autouse=True)
+def _clear_keys():
+    answer_keys.clear()
+    yield
+    answer_keys.clear()
+
+
+@pytest.mark.parametrize('user_answer', [
+    'mat', 'MAT!', 'books', 'bokos', 'boks', 'bookss', 'book store', 'is', 'in', '', '  ',
+    'the big store', 'the big stor',
+])
+def test_matches_agree_with_strict_text_match(user_answer):
+    items = [
+        {'answer': 'books', 'acceptable_answers': ['mat', 'is']},
+        {'english': 'the big store', 'alternatives': ['  ', None]},
+    ]
+    keys = compile_lesson_keys('translation', {'items': items}).items
+
+    assert keys[0].matches(user_answer) == _strict_text_match(user_answer, ['books', 'mat', 'is'])
+    assert keys[1].matches(user_answer) == _strict_text_match(user_answer, ['the big store'])
+
+
+def test_collocation_keys_are_exact_only():
+    keys = compile_lesson_keys('collocation_matching', {'pairs': [
+        {'phrase': 'make a decision', 'translation': 'принять решение'},
+    ]}).items
+
+    assert keys[0].canonical == 'принять решение'
+    assert keys[0].matches('Принять решение.')
+    assert not keys[0].matches('принять решени')
+
+
+def test_sentence_correction_key_carries_explanation():
+    keys = compile_lesson_keys('sentence_correction', {'items': [
+        {'incorrect_sentence': 'He go home', 'correct_sentence': 'He goes home',
+         'translation': 'Он идёт домой', 'explanation': 'третье лицо'},
+    ]}).items
+
+    assert keys[0].canonical == 'He goes home'
+    assert keys[0].explanation == 'третье лицо'
+    assert not keys[0].matches('Он идёт домой')
+
+
+def test_keys_are_reused_until_the_lesson_is_saved(db_session, test_lesson_vocabulary):
+    lesson = test_lesson_vocabulary
+    lesson.type = 'sentence_completion'
+    lesson.content = {'items': [{'prompt': 'The cat sat on the', 'answer': 'mat'}]}
+    db_session.commit()
+
+    first = lesson_keys(lesson)
+    assert lesson_keys(lesson) is first
+
+    lesson.content = {'items': [{'prompt': 'The cat sat on the', 'answer': 'sofa'}]}
+    db_session.commit()
+
+    second = lesson_keys(lesson)
+    assert second is not first
+    assert second.items[0].canonical == 'sofa'
@@ -7,7 +7,7 @@ import pytest
 import app.curriculum.cache as _cache_module
 
 from app.curriculum.models import CEFRLevel, Module, Lessons, LessonProgress
-from app.curriculum.cache import CurriculumCache, SimpleCache
+from app.curriculum.cache import CurriculumCache, SimpleCache, user_tag
 from tests.conftest import unique_level_code
 
 
@@ -99,11 +99,11 @@ class TestCurriculumCacheInvalidation:
         # Manually seed cache with user-specific keys (simulating cached data)
         user_id = 42
         c = _cache()
-        c.set(f'curriculum:get_user_progress:user_{user_id}:abc', {'progress': 'data'})
-        c.set(f'curriculum:get_user_active_lessons:user_{user_id}:def', ['lesson1'])
+        c.set(f'curriculum:get_user_progress:user_{user_id}:abc', {'progress': 'data'}, tags=[user_tag(user_id)])
+        c.set(f'curriculum:get_user_active_lessons:user_{user_id}:def', ['lesson1'], tags=[user_tag(user_id)])
         c.set(f'user_xp_{user_id}', {'user_xp': 100})
         # Another user's data should NOT be removed
-        c.set(f'curriculum:get_user_progress:user_99:xyz', {'progress': 'other'})
+        c.set(f'curriculum:get_user_progress:user_99:xyz', {'progress': 'other'}, tags=[user_tag(99)])
 
         CurriculumCache.invalidate_user_cache(user_id)
 
@@ -137,7 +137,7 @@ class TestProgressMutationInvalidatesCache:
         user_id = test_user.id
         c = _cache()
         stale_key = f'curriculum:get_user_progress:user_{user_id}:stale'
-        c.set(stale_key, {'stale': True})
+        c.set(stale_key, {'stale': True}, tags=[user_tag(user_id)])
         xp_key = f'user_xp_{user_id}'
         c.set(xp_key, {'user_xp': 0})
 
@@ -162,7 +162,7 @@ class TestProgressMutationInvalidatesCache:
         user_id = test_user.id
         c = _cache()
         stale_key = f'curriculum:get_user_active_lessons:user_{user_id}:stale'
-        c.set(stale_key, ['old_lesson'])
+        c.set(stale_key, ['old_lesson'], tags=[user_tag(user_id)])
 
         ProgressService.update_progress_with_grading(
             user_id=user_id,
@@ -0,0 +1,182 @@
+"""
+Tag-based invalidation for app/curriculum/cache.py: the tag -> keys index,
+tag functions on ``cached``, invalidation on level/module/lesson writes and
+the hit/miss/eviction counters.
+"""
+from datetime import datetime, timedelta, timezone
+
+import app.curriculum.cache as _cache_module
+from app.curriculum.cache import (
+    CurriculumCache,
+    SimpleCache,
+    cached,
+    lesson_tag,
+    level_tag,
+    module_tag,
+    user_tag,
+)
+from app.curriculum.models import Lessons, Module
+from tests.curriculum.test_cache_invalidation import _make_lesson, _make_level, _make_module
+
+
+def _cache():
+    return _cache_module.cache
+
+
+class TestSimpleCacheTags:
+    def test_invalidate_tags_removes_only_tagged_keys(self):
+        c = SimpleCache()
+        c.set('a', 1, tags=['lesson:1', 'module:1'])
+        c.set('b', 2, tags=['module:1'])
+        c.set('c', 3, tags=['module:2'])
+        c.set('d', 4)
+
+        assert c.invalidate_tags('module:1') == 2
+        assert c.get('a') is None and c.get('b') is None
+        assert c.get('c') == 3 and c.get('d') == 4
+        assert c._tags == {'module:2': {'c'}}
+
+    def test_overwrite_replaces_tags(self):
+        c = SimpleCache()
+        c.set('a', 1, tags=['user:1'])
+        c.set('a', 2, tags=['user:2'])
+
+        assert c.invalidate_tags('user:1') == 0
+        assert c.get('a') == 2
+        assert c.invalidate_tags('user:2') == 1
+
+    def test_delete_and_expiry_unlink_index(self):
+        c = SimpleCache()
+        c.set('a', 1, tags=['t'])
+        c.set('b', 2, tags=['t'])
+        c.delete('a')
+        c._expiry['b'] = datetime.now(timezone.utc) - timedelta(seconds=1)
+        assert c.get('b') is None
+        assert c._tags == {} and c._key_tags == {}
+
+    def test_counters(self):
+        c = SimpleCache()
+        c.set('a', 1, tags=['t'])
+        c.get('a')
+        c.get('missing')
+        c.set('old', 1, timeout=1)
+        c._expiry['old'] = datetime.now(timezone.utc) - timedelta(seconds=1)
+        c.get('old')
+        c.invalidate_tags('t')
+
+        stats = c.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+        assert stats['hit_rate'] == 33.3
+        assert stats['evictions'] == 1
+        assert stats['invalidations'] == 1
+        assert stats['backend'] == 'SimpleCache'
+
+    def test_max_size_evicts_oldest_writes(self, monkeypatch):
+        monkeypatch.setattr(_cache_module, '_CACHE_MAX_SIZE', 3)
+        c = SimpleCache()
+        for i in range(5):
+            c.set(f'k{i}', i, tags=['t'])
+        assert c.size() == 3
+        assert c.get('k0') is None and c.get('k4') == 4
+        assert c.evictions == 2
+        assert c._tags['t'] == {'k2', 'k3', 'k4'}
+
+
+class TestCachedTags:
+    def test_tag_functions_receive_call_arguments(self):
+        calls = []
+
+        @cached(timeout=60, key_prefix='tagtest', tags=[lambda lesson_id, module_id=None: lesson_tag(lesson_id),
+                                                       lambda lesson_id, module_id=None: None])
+        def content(lesson_id, module_id=None):
+            calls.append(lesson_id)
+            return {'lesson': lesson_id}
+
+        content(1)
+        content(2, module_id=5)
+        content(1)
+        assert calls == [1, 2]
+
+        CurriculumCache.invalidate_lesson_cache(1)
+        content(1)
+        content(2, module_id=5)
+        assert calls == [1, 2, 1]
+
+    def test_cache_clear_is_scoped_to_the_function(self):
+        @cached(timeout=60, key_prefix='tagtest')
+        def first():
+            return 'first'
+
+        @cached(timeout=60, key_prefix='tagtest')
+        def second():
+            return 'second'
+
+        first()
+        second()
+        size = _cache().size()
+        assert first.cache_clear() == 1
+        assert _cache().size() == size - 1
+
+    def test_structure_methods_are_tagged(self, db_session):
+        level = _make_level(db_session)
+        module = _make_module(db_session, level)
+        _make_lesson(db_session, module)
+
+        assert len(CurriculumCache.get_module_lessons(module.id)) == 1
+        assert len(CurriculumCache.get_level_modules(level.id)) == 1
+        CurriculumCache.get_all_levels()
+
+        assert _cache().invalidate_tags(module_tag(module.id)) == 1
+        assert _cache().invalidate_tags(level_tag(level.id)) == 1
+        assert _cache().invalidate_tags('levels') == 1
+
+
+class TestStructureWritesInvalidate:
+    def test_lesson_edit_invalidates_only_its_module(self, db_session):
+        level = _make_level(db_session)
+        module = _make_module(db_session, level, number=1)
+        other = _make_module(db_session, level, number=2)
+        lesson = _make_lesson(db_session, module)
+        _make_lesson(db_session, other)
+
+        c = _cache()
+        user_key = 'curriculum:get_user_progress:user_1:k'
+        c.set(user_key, {'progress': 1}, tags=[user_tag(1)])
+        assert CurriculumCache.get_module_lessons(module.id)[0]['title'] == 'Lesson 1'
+        CurriculumCache.get_module_lessons(other.id)
+        size = c.size()
+
+        lesson.title = 'Renamed'
+        db_session.commit()
+
+        assert CurriculumCache.get_module_lessons(module.id)[0]['title'] == 'Renamed'
+        assert c.size() == size
+        assert c.get(user_key) == {'progress': 1}
+
+    def test_moving_a_module_invalidates_both_levels(self, db_session):
+        source = _make_level(db_session, order=1)
+        target = _make_level(db_session, order=2)
+        module = _make_module(db_session, source)
+        CurriculumCache.get_level_modules(source.id)
+        CurriculumCache.get_level_modules(target.id)
+
+        module.level_id = target.id
+        db_session.commit()
+
+        assert CurriculumCache.get_level_modules(source.id) == []
+        assert [m['id'] for m in CurriculumCache.get_level_modules(target.id)] == [module.id]
+
+    def test_rollback_does_not_invalidate(self, db_session):
+        level = _make_level(db_session)
+        module = _make_module(db_session, level)
+        CurriculumCache.get_level_modules(level.id)
+        invalidations = _cache().invalidations
+
+        db_session.add(Module(level_id=level.id, number=2, title='Draft', description=''))
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert _cache().invalidations == invalidations
+        assert db_session.query(Lessons).filter_by(module_id=module.id).count() == 0
@@ -258,12 +258,13 @@ class TestLearnByModuleQueryCount:
 # ---------------------------------------------------------------------------
 
 class TestAdminImportCacheInvalidation:
-    """Admin curriculum import must clear the curriculum cache."""
+    """Admin curriculum import must invalidate the imported module's cache entries."""
 
     def test_import_clears_curriculum_cache(self, client, admin_user, db_session):
-        """After a successful curriculum import the curriculum cache must be empty."""
+        """After a successful import the module's entries are gone, unrelated ones stay."""
         import json as _json
-        from app.curriculum.cache import cache as curriculum_cache
+        import app.curriculum.cache as _cache_module
+        curriculum_cache = _cache_module.cache
 
         # Create the A1 level and a module in the DB so the import service finds them
         a1 = CEFRLevel.query.filter_by(code="A1").first()
@@ -280,7 +281,8 @@ class TestAdminImportCacheInvalidation:
             db_session.commit()
 
         # Seed the cache with stale data
-        curriculum_cache.set("curriculum:stale_key", {"stale": True})
+        curriculum_cache.set("curriculum:stale_key", {"stale": True}, tags=[_cache_module.module_tag(mod.id)])
+        curriculum_cache.set("curriculum:unrelated_key", {"fresh": True}, tags=["module:0"])
         assert curriculum_cache.get("curriculum:stale_key") is not None
 
         # Use a high lesson number to avoid unique constraint collisions.
@@ -306,8 +308,9 @@ class TestAdminImportCacheInvalidation:
             follow_redirects=False,
         )
 
-        # On success the route redirects (302) and clears the cache
+        # On success the route redirects (302) and the module's entries are invalidated
         if response.status_code == 302:
             assert curriculum_cache.get("curriculum:stale_key") is None, (
-                "Admin curriculum import did not clear the curriculum cache"
+                "Admin curriculum import did not invalidate the module cache"
             )
+            assert curriculum_cache.get("curriculum:unrelated_key") == {"fresh": True}
@@ -0,0 +1,271 @@
+"""
+Shared (Redis) backend for app/curriculum/cache.py, exercised against an
+in-memory fake Redis: cross-worker visibility, invalidation, L1 tier and
+graceful degradation when Redis is unavailable.
+"""
+import fnmatch
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import app.curriculum.cache as cache_module
+from app.curriculum.cache import RedisCache, SimpleCache, TieredCache, cached, init_cache
+
+
+class FakeRedis:
+    """The subset of redis.Redis used by RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.fail = False
+        self.round_trips = 0  # pipeline executions
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError('redis down')
+
+    def _alive(self, key):
+        expires = self.expires.get(key)
+        if expires is not None and time.monotonic() >= expires:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def get(self, key):
+        self._check()
+        return self.data[key] if self._alive(key) else None
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+        if ex:
+            self.expires[key] = time.monotonic() + ex
+        else:
+            self.expires.pop(key, None)
+
+    def delete(self, *keys):
+        self._check()
+        removed = 0
+        for key in keys:
+            removed += self.data.pop(key, None) is not None
+            self.expires.pop(key, None)
+        return removed
+
+    def zadd(self, key, mapping):
+        self._check()
+        zset = self.data[key] if self._alive(key) else {}
+        zset.update(mapping)
+        self.data[key] = zset
+
+    def zremrangebyscore(self, key, low, high):
+        self._check()
+        if not self._alive(key):
+            return 0
+        zset = self.data[key]
+        stale = [member for member, score in zset.items() if float(low) <= score <= float(high)]
+        for member in stale:
+            del zset[member]
+        return len(stale)
+
+    def zscan_iter(self, key, count=None):
+        self._check()
+        return iter(list(self.data[key].items()) if self._alive(key) else [])
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def expire(self, key, seconds):
+        self.expires[key] = time.monotonic() + seconds
+
+    def persist(self, key):
+        self.expires.pop(key, None)
+
+    def scan_iter(self, match='*', count=None):
+        self._check()
+        return iter([key for key in list(self.data) if self._alive(key) and fnmatch.fnmatchcase(key, match)])
+
+
+class FakePipeline:
+    """Queues FakeRedis calls until execute(), like redis.client.Pipeline."""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        return lambda *args, **kwargs: self.calls.append((method, args, kwargs))
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+class TestRedisCache:
+    def test_roundtrip_and_expiry(self, redis_client):
+        shared = RedisCache(redis_client)
+        shared.set('k', {'a': [1, 2]}, timeout=60)
+        assert shared.get('k') == {'a': [1, 2]}
+        assert redis_client.expires['curriculum-cache:k'] > time.monotonic()
+        assert shared.get('missing') is None
+
+    def test_clear_and_patterns_stay_in_namespace(self, redis_client):
+        redis_client.set('LIMITER/foo', b'1')
+        shared = RedisCache(redis_client)
+        shared.set('curriculum:get_user_progress:user_7:abc', 1)
+        shared.set('curriculum:get_user_progress:user_70:abc', 2)
+        shared.set('user_xp_7', 3)
+
+        assert shared.delete_by_pattern('user_7:') == 1
+        assert shared.get('curriculum:get_user_progress:user_70:abc') == 2
+        assert shared.size() == 2
+
+        shared.clear()
+        assert shared.size() == 0
+        assert redis_client.get('LIMITER/foo') == b'1'
+
+    def test_pattern_is_literal(self, redis_client):
+        shared = RedisCache(redis_client)
+        shared.set('a*b', 1)
+        shared.set('axxb', 2)
+        assert shared.delete_by_pattern('a*b') == 1
+        assert shared.get('axxb') == 2
+
+
+    def test_tag_index(self, redis_client):
+        shared = RedisCache(redis_client)
+        shared.set('a', 1, timeout=60, tags=['lesson:1'])
+        shared.set('b', 2, timeout=0, tags=['lesson:1', 'module:1'])
+        shared.set('c', 3, tags=['module:2'])
+
+        # A tag set outlives its members; an entry without expiry pins it
+        assert redis_client.expires['curriculum-cache-tags:module:2'] >= time.monotonic() + 3600
+        assert 'curriculum-cache-tags:lesson:1' not in redis_client.expires
+        assert shared.size() == 3  # tag sets are not entries
+
+        assert shared.invalidate_tags('lesson:1') == 2
+        assert shared.get('c') == 3
+        assert shared.invalidate_tags('module:1') == 0
+        shared.clear()
+        assert redis_client.data == {}
+
+    def test_set_is_one_round_trip(self, redis_client):
+        shared = RedisCache(redis_client)
+        shared.set('a', 1, timeout=60, tags=['lesson:1', 'module:1', 'concordance'])
+        assert redis_client.round_trips == 1
+
+    def test_hot_tag_prunes_expired_members(self, redis_client, monkeypatch):
+        shared = RedisCache(redis_client)
+        clock = [1000.0]
+        monkeypatch.setattr(cache_module, 'time', SimpleNamespace(time=lambda: clock[0]))
+        for i in range(50):
+            shared.set(f'k{i}', i, timeout=60, tags=['fn:hot'])
+            clock[0] += 61
+
+        assert list(redis_client.data['curriculum-cache-tags:fn:hot']) == ['curriculum-cache:k49']
+
+    def test_invalidation_deletes_in_batches(self, redis_client, monkeypatch):
+        monkeypatch.setattr(cache_module, '_DELETE_BATCH', 3)
+        shared = RedisCache(redis_client)
+        for i in range(7):
+            shared.set(f'k{i}', i, timeout=60, tags=['module:1'])
+        batches = []
+        delete = redis_client.delete
+        monkeypatch.setattr(redis_client, 'delete', lambda *keys: batches.append(len(keys)) or delete(*keys))
+
+        assert shared.invalidate_tags('module:1') == 7
+        assert batches == [3, 3, 1, 1]  # three entry batches, then the tag set
+
+
+class TestTieredCache:
+    def test_value_set_by_one_worker_is_served_to_another(self, redis_client):
+        worker_a = TieredCache(RedisCache(redis_client))
+        worker_b = TieredCache(RedisCache(redis_client))
+
+        worker_a.set('leaderboard_xp_top100', [{'id': 1}], timeout=300)
+        assert worker_b.get('leaderboard_xp_top100') == [{'id': 1}]
+        # Now also in worker B's L1 tier
+        assert worker_b.local.get('leaderboard_xp_top100') == [{'id': 1}]
+
+    def test_l1_entries_are_short_lived(self, redis_client):
+        tiered = TieredCache(RedisCache(redis_client), l1_ttl=5)
+        tiered.set('k', 'v', timeout=600)
+        remaining = (tiered.local._expiry['k'] - cache_module.datetime.now(cache_module.timezone.utc)).total_seconds()
+        assert 0 < remaining <= 5
+
+    def test_invalidation_reaches_other_workers_after_l1_ttl(self, redis_client):
+        worker_a = TieredCache(RedisCache(redis_client))
+        worker_b = TieredCache(RedisCache(redis_client))
+        worker_a.set('curriculum:x:user_5:k', 1)
+        assert worker_b.get('curriculum:x:user_5:k') == 1
+
+        assert worker_a.delete_by_pattern('user_5') == 1
+        worker_b.local.clear()  # L1 TTL elapsed
+        assert worker_b.get('curriculum:x:user_5:k') is None
+
+    def test_tag_invalidation_reaches_entries_read_from_shared(self, redis_client):
+        worker_a = TieredCache(RedisCache(redis_client))
+        worker_b = TieredCache(RedisCache(redis_client))
+        worker_a.set('lessons', [1], tags=['module:3'])
+        assert worker_b.get('lessons') == [1]
+
+        # The L1 copy in worker B was indexed with the tags stored in Redis
+        assert worker_b.invalidate_tags('module:3') == 1
+        assert worker_b.get('lessons') is None
+        assert worker_b.stats()['invalidations'] == 1
+
+    def test_zero_l1_ttl_disables_local_tier(self, redis_client):
+        tiered = TieredCache(RedisCache(redis_client), l1_ttl=0)
+        tiered.set('k', 'v')
+        assert tiered.local.size() == 0
+        assert tiered.get('k') == 'v'
+
+    def test_redis_outage_degrades_to_local_tier(self, redis_client):
+        tiered = TieredCache(RedisCache(redis_client))
+        tiered.set('k', 'v')
+        redis_client.fail = True
+
+        assert tiered.get('k') == 'v'
+        tiered.set('other', 1)
+        assert tiered.get('other') == 1
+        tiered.delete('k')
+        assert tiered.get('k') is None
+        assert tiered.size() == 1
+
+
+class TestInitCache:
+    def test_redis_client_enables_shared_cache(self, app, redis_client):
+        original = cache_module.cache
+        try:
+            init_cache(app, redis_client=redis_client)
+            assert isinstance(cache_module.cache, TieredCache)
+
+            calls = []
+
+            @cached(timeout=60, key_prefix='shared_test')
+            def compute(x):
+                calls.append(x)
+                return x * 2
+
+            assert compute(21) == 42
+            # A second worker sharing the same Redis does not recompute
+            cache_module.cache = TieredCache(RedisCache(redis_client))
+            assert compute(21) == 42
+            assert calls == [21]
+        finally:
+            cache_module.cache = original
+
+    def test_without_redis_keeps_simple_cache(self, app):
+        original = cache_module.cache
+        try:
+            init_cache(app)
+            assert isinstance(cache_module.cache, SimpleCache)
+        finally:
+            cache_module.cache = original
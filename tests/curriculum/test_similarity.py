@@ -0,0 +1,52 @@
+"""Tests for the bounded edit-distance kernel (app/curriculum/similarity.py)."""
+import random
+
+import pytest
+
+from app.curriculum.similarity import edit_distance, matches_any, within_one_edit
+
+
+def full_matrix_levenshtein(a, b):
+    """The unbounded O(n·m) DP the kernel replaced; reference for the tests."""
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        curr = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            curr[j] = min(curr[j - 1] + 1, prev[j] + 1, prev[j - 1] + (ca != cb))
+        prev = curr
+    return prev[-1]
+
+
+def _random_pairs(count, alphabet='abc', max_len=9, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len))),
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len))),
+        )
+
+
+def test_unbounded_distance_matches_full_matrix():
+    for a, b in _random_pairs(2000):
+        assert edit_distance(a, b) == full_matrix_levenshtein(a, b), (a, b)
+
+
+@pytest.mark.parametrize('max_distance', [0, 1, 2, 3])
+def test_bounded_distance_is_capped(max_distance):
+    for a, b in _random_pairs(2000):
+        expected = min(full_matrix_levenshtein(a, b), max_distance + 1)
+        assert edit_distance(a, b, max_distance) == expected, (a, b)
+
+
+def test_within_one_edit_matches_full_matrix():
+    for a, b in _random_pairs(2000):
+        assert within_one_edit(a, b) == (full_matrix_levenshtein(a, b) <= 1), (a, b)
+
+
+def test_matches_any():
+    assert matches_any('receve', ['believe', 'receive'])
+    assert not matches_any('receve', ['believe', 'received'])
+    # a transposition costs two edits
+    assert not matches_any('recieve', ['receive'])
+    assert matches_any('recieve', ['receive'], max_distance=2)
+    assert not matches_any('anything', [])
@@ -0,0 +1,135 @@
+"""Tests for the /api/daily-status snapshot (app/daily_plan/status_projection.py)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.achievements.models import StreakCoins
+from app.daily_plan.models import DailyChallenge, DailyStatusSnapshot
+from app.study.models import StudySession
+from app.utils.time_utils import get_user_local_date
+
+
+def _payload(**extra):
+    return {'success': True, 'steps_done': 1, 'steps_total': 3, 'streak_repaired': False, **extra}
+
+
+@pytest.fixture
+def build():
+    with patch('app.api.daily_plan._build_daily_status', return_value=_payload()) as mock:
+        yield mock
+
+
+def test_second_poll_is_served_from_snapshot(authenticated_client, build):
+    first = authenticated_client.get('/api/daily-status')
+    second = authenticated_client.get('/api/daily-status')
+
+    assert build.call_count == 1
+    assert second.get_json() == first.get_json() == _payload()
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_if_none_match_returns_304(authenticated_client, build):
+    etag = authenticated_client.get('/api/daily-status').headers['ETag']
+
+    response = authenticated_client.get('/api/daily-status', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert build.call_count == 1
+
+
+def test_activity_invalidates_snapshot(authenticated_client, db_session, test_user, build):
+    authenticated_client.get('/api/daily-status')
+
+    db_session.add(StudySession(user_id=test_user.id, session_type='cards',
+                                start_time=datetime.now(timezone.utc).replace(tzinfo=None)))
+    db_session.commit()
+    authenticated_client.get('/api/daily-status')
+
+    assert build.call_count == 2
+
+
+def test_goal_change_invalidates_snapshot(authenticated_client, db_session, test_user, build):
+    authenticated_client.get('/api/daily-status')
+
+    test_user.daily_word_goal = 25
+    db_session.commit()
+    authenticated_client.get('/api/daily-status')
+
+    assert build.call_count == 2
+
+
+def test_paid_repair_invalidates_snapshot(authenticated_client, db_session, test_user, build):
+    db_session.add(StreakCoins(user_id=test_user.id, balance=10, total_earned=10))
+    db_session.commit()
+    authenticated_client.get('/api/daily-status')
+
+    missed = get_user_local_date(test_user.id) - timedelta(days=1)
+    with patch('app.achievements.streak_service.find_missed_date', return_value=missed):
+        response = authenticated_client.post('/api/streak/repair', json={})
+    assert response.get_json()['success'] is True
+    authenticated_client.get('/api/daily-status')
+
+    assert build.call_count == 2
+
+
+def test_coin_balance_change_invalidates_snapshot(authenticated_client, db_session, test_user, build):
+    coins = StreakCoins(user_id=test_user.id, balance=0)
+    db_session.add(coins)
+    db_session.commit()
+    authenticated_client.get('/api/daily-status')
+
+    coins.earn(1)
+    db_session.commit()
+    authenticated_client.get('/api/daily-status')
+
+    assert build.call_count == 2
+
+
+def test_challenge_without_bonus_xp_invalidates_snapshot(authenticated_client, db_session, test_user, build):
+    from app.daily_plan.challenge import complete_challenge
+    from app.utils.db import db
+
+    challenge = DailyChallenge(challenge_date=get_user_local_date(test_user.id),
+                               bonus_xp=0, category='speed_run')
+    db_session.add(challenge)
+    db_session.commit()
+    authenticated_client.get('/api/daily-status')
+
+    complete_challenge(test_user.id, challenge.id, score=90.0, time_spent_seconds=60, db=db)
+    db_session.commit()
+    authenticated_client.get('/api/daily-status')
+
+    assert build.call_count == 2
+
+
+def test_other_timezone_is_recomputed(authenticated_client, build):
+    authenticated_client.get('/api/daily-status?tz=UTC')
+    authenticated_client.get('/api/daily-status?tz=Asia/Tokyo')
+
+    assert build.call_count == 2
+
+
+def test_streak_repaired_is_not_replayed(authenticated_client, db_session, test_user, build):
+    build.return_value = _payload(streak_repaired=True)
+
+    assert authenticated_client.get('/api/daily-status').get_json()['streak_repaired'] is True
+    assert authenticated_client.get('/api/daily-status').get_json()['streak_repaired'] is False
+
+    row = db_session.get(DailyStatusSnapshot, test_user.id)
+    assert row.version == row.built_version
+
+
+def test_store_without_on_conflict_support(app, db_session, test_user):
+    from app.daily_plan import status_projection
+    from app.utils.db import db
+
+    today = datetime.now(timezone.utc).date()
+    with patch.object(db.session.get_bind().dialect, 'name', 'mssql'):
+        status_projection.store(test_user.id, today, 'UTC', '{"a": 1}', 0)
+        row = status_projection.store(test_user.id, today, 'UTC', '{"a": 2}', 3)
+
+    assert row.payload == '{"a": 2}'
+    assert row.built_version == 3
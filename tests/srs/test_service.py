@@ -1151,3 +1151,77 @@ class TestRelearningEaseFactorClamp:
             lapses=3,
         )
         assert result['ease_factor'] <= MAX_EASE_FACTOR
+
+
+class TestReviewLog:
+    """grade_card appends to srs_review_log and feeds the accuracy ring."""
+
+    def test_grade_card_appends_log_row(self, db_session):
+        from app.study.models import SRSReviewLog
+
+        user = _make_user(db_session)
+        card = _make_review_card(db_session, user, lapses=0)
+
+        result = UnifiedSRSService().grade_card(
+            card.id, RATING_DONT_KNOW, user.id, elapsed_ms=1800,
+        )
+        db_session.commit()
+
+        assert result['success'] is True
+        rows = SRSReviewLog.query.filter_by(card_id=card.id).all()
+        assert len(rows) == 1
+        row = rows[0]
+        assert row.user_id == user.id
+        assert row.rating == RATING_DONT_KNOW
+        assert row.state_before == CardState.REVIEW.value
+        assert row.state_after == CardState.RELEARNING.value
+        assert row.elapsed_ms == 1800
+
+    def test_only_graduated_grades_enter_the_ring(self, db_session):
+        from app.achievements.models import UserStatistics
+
+        user = _make_user(db_session)
+        review = _make_review_card(db_session, user, lapses=0)
+        learning = _make_review_card(db_session, user, lapses=0)
+        learning.state = CardState.LEARNING.value
+        db_session.commit()
+
+        service = UnifiedSRSService()
+        service.grade_card(review.id, RATING_KNOW, user.id)
+        service.grade_card(learning.id, RATING_DONT_KNOW, user.id)
+        db_session.commit()
+
+        stats = UserStatistics.query.filter_by(user_id=user.id).one()
+        assert stats.srs_recent_outcomes == '1'
+
+    def test_ring_drives_tier_once_filled(self, db_session):
+        from app.achievements.services import StatisticsService
+
+        user = _make_user(db_session)
+        _make_settings(db_session, user)
+        stats = StatisticsService.get_or_create_statistics(user.id)
+        stats.srs_recent_outcomes = '1' * 180 + '0' * 20  # last 200 grades: 90%
+        db_session.commit()
+        assert SRSService.get_adaptive_limit_reason(user.id) == 'normal'
+
+        stats.srs_recent_outcomes = '1' * 150 + '0' * 50  # last 200 grades: 75%
+        db_session.commit()
+        assert SRSService.get_adaptive_limit_reason(user.id) == 'low'
+
+    def test_ring_capacity_and_minimum_sample(self):
+        from app.srs.review_log import (
+            RECENT_OUTCOMES_CAPACITY,
+            RECENT_OUTCOMES_MIN,
+            push_outcome,
+            ring_accuracy,
+        )
+
+        ring = None
+        for i in range(RECENT_OUTCOMES_CAPACITY + 5):
+            ring = push_outcome(ring, correct=i % 2 == 0)
+        assert len(ring) == RECENT_OUTCOMES_CAPACITY
+        # the five oldest outcomes (i = 0..4) were dropped, newest is last
+        assert ring == '01' * (RECENT_OUTCOMES_CAPACITY // 2)
+
+        assert ring_accuracy('0' * (RECENT_OUTCOMES_MIN - 1), 20) is None
+        assert ring_accuracy('0' * 10 + '1' * 30, 20) == 100.0
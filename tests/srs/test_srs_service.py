@@ -555,3 +555,67 @@ class TestGradeCardCallerCommits:
         db_session.refresh(user)
         assert card.state != CardState.NEW.value
         assert user.about == "xp_awarded"
+
+
+class TestDueCardsSingleQuery:
+    """_get_due_cards ranks every bucket in one query and preloads the words."""
+
+    def _statements(self):
+        import sqlalchemy.event
+        from sqlalchemy.engine import Engine
+
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sqlalchemy.event.listen(Engine, 'before_cursor_execute', _record)
+        return statements, lambda: sqlalchemy.event.remove(Engine, 'before_cursor_execute', _record)
+
+    def test_bucket_priority_and_limit_cut_across_buckets(self, db_session):
+        user = _make_user(db_session)
+        now = _now_naive()
+
+        new_old = _make_new_card(db_session, user)
+        new_young = _make_new_card(db_session, user)
+        review = _make_review_card(db_session, user)
+        review.next_review = now - timedelta(hours=1)
+        overdue_review = _make_review_card(db_session, user)
+        overdue_review.next_review = now - timedelta(days=3)
+        not_due = _make_review_card(db_session, user)
+        not_due.next_review = now + timedelta(days=1)
+        learning = _make_relearning_card(db_session, user)
+        learning.state = CardState.LEARNING.value
+        relearning = _make_relearning_card(db_session, user)
+        recovery = _make_relearning_card(db_session, user)
+        recovery.recovery_required = True
+        db_session.commit()
+
+        cards = UnifiedSRSService()._get_due_cards(user_id=user.id, limit=100)
+        assert [c.id for c in cards] == [
+            recovery.id, relearning.id, learning.id,
+            overdue_review.id, review.id, new_old.id, new_young.id,
+        ]
+
+        cards = UnifiedSRSService()._get_due_cards(user_id=user.id, limit=4)
+        assert [c.id for c in cards] == [recovery.id, relearning.id, learning.id, overdue_review.id]
+
+    def test_session_is_one_query_without_lazy_loads(self, db_session):
+        user = _make_user(db_session)
+        for _ in range(3):
+            _make_review_card(db_session, user)
+            _make_new_card(db_session, user)
+        user_id = user.id
+        db_session.expire_all()
+
+        service = UnifiedSRSService()
+        statements, stop = self._statements()
+        try:
+            cards = service._get_due_cards(user_id=user_id, limit=20)
+            formatted = service._format_cards_for_session(cards)
+        finally:
+            stop()
+
+        assert len(formatted) == 6
+        assert all(item['front'] for item in formatted)
+        assert len([s for s in statements if s.lstrip().upper().startswith('SELECT')]) == 1
@@ -0,0 +1,131 @@
+"""Tests for the hourly Telegram notification job (app/telegram/scheduler.py)."""
+import uuid
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+from app.auth.models import User
+from app.telegram.models import TelegramNotificationLog, TelegramUser
+from app.telegram.scheduler import (
+    _CohortData,
+    _due_recipients,
+    _hourly_check,
+    _LocalClock,
+    _process_user,
+    _Recipient,
+    _timezone_clocks,
+)
+from config.settings import DEFAULT_TIMEZONE
+
+
+def _linked_user(db_session, tz='Europe/Moscow', **prefs):
+    suffix = uuid.uuid4().hex[:8]
+    user = User(username=f'tg_{suffix}', email=f'tg_{suffix}@example.com', active=True)
+    user.set_password('test123')
+    db_session.add(user)
+    db_session.flush()
+    tg_user = TelegramUser(
+        user_id=user.id,
+        telegram_id=int(uuid.uuid4().int % 10**12),
+        timezone=tz,
+        is_active=True,
+        **prefs,
+    )
+    db_session.add(tg_user)
+    db_session.commit()
+    return user, tg_user
+
+
+def _clock(hour, zone='Europe/Moscow', is_sunday=False):
+    return _LocalClock(zone, hour, date(2026, 10, 17), is_sunday)
+
+
+class TestTimezoneClocks:
+    def test_unknown_timezone_uses_default_clock(self, db_session):
+        _linked_user(db_session, tz='Mars/Olympus')
+        now = datetime(2026, 10, 17, 6, 0, tzinfo=timezone.utc)
+
+        clock = _timezone_clocks(now)['Mars/Olympus']
+
+        assert clock.zone == DEFAULT_TIMEZONE
+        assert clock.local_date == now.date()
+
+
+class TestDueRecipients:
+    def test_kinds_follow_user_hours(self, db_session):
+        user, _ = _linked_user(db_session, morning_hour=7, nudge_hour=7, evening_hour=21)
+
+        due = {r.user_id: r for r in _due_recipients({'Europe/Moscow': _clock(7)})}
+
+        assert due[user.id].kinds == frozenset({'tgn_morning', 'tgn_nudge'})
+
+    def test_word_of_day_and_weekly_report_offsets(self, db_session):
+        user, _ = _linked_user(db_session, morning_hour=7, evening_hour=21, nudge_hour=3, streak_hour=3)
+
+        assert {r.user_id: r.kinds for r in _due_recipients({'Europe/Moscow': _clock(8)})}[user.id] == \
+            frozenset({'tgn_wotd'})
+        sunday = {r.user_id: r.kinds for r in _due_recipients({'Europe/Moscow': _clock(20, is_sunday=True)})}
+        assert sunday[user.id] == frozenset({'tgn_weekly'})
+        weekday = {r.user_id for r in _due_recipients({'Europe/Moscow': _clock(20)})}
+        assert user.id not in weekday
+
+    def test_disabled_preferences_are_not_due(self, db_session):
+        user, _ = _linked_user(db_session, morning_hour=7, morning_reminder=False, nudge_hour=3)
+
+        assert user.id not in {r.user_id for r in _due_recipients({'Europe/Moscow': _clock(7)})}
+
+    def test_each_timezone_uses_its_own_hour(self, db_session):
+        tokyo, _ = _linked_user(db_session, tz='Asia/Tokyo', morning_hour=9)
+        moscow, _ = _linked_user(db_session, tz='Europe/Moscow', morning_hour=9)
+
+        due = {r.user_id for r in _due_recipients({
+            'Asia/Tokyo': _clock(9, zone='Asia/Tokyo'),
+            'Europe/Moscow': _clock(3),
+        })}
+
+        assert tokyo.id in due
+        assert moscow.id not in due
+
+
+class TestProcessUser:
+    def test_streak_alert_uses_prefetched_data(self, db_session):
+        user, tg_user = _linked_user(db_session)
+        recipient = _Recipient(user.id, tg_user.telegram_id, _clock(22), frozenset({'tgn_streak'}))
+        cohort = _CohortData(names={user.id: 'Аня'}, streaks={user.id: 5})
+
+        sent = []
+        with patch('app.telegram.bot.send_message', side_effect=lambda chat_id, text, **kw: sent.append(text)), \
+                patch('app.telegram.scheduler.get_quickest_action', return_value=None):
+            _process_user(recipient, cohort, 'https://example.com')
+            _process_user(recipient, cohort, 'https://example.com')  # claimed: no second send
+
+        assert len(sent) == 1
+        assert TelegramNotificationLog.query.filter_by(user_id=user.id, kind='tgn_streak').count() == 1
+
+    def test_active_user_gets_no_nudge(self, db_session):
+        user, tg_user = _linked_user(db_session)
+        recipient = _Recipient(user.id, tg_user.telegram_id, _clock(14), frozenset({'tgn_nudge'}))
+        cohort = _CohortData(active_today={user.id})
+
+        with patch('app.telegram.bot.send_message') as send:
+            _process_user(recipient, cohort, '')
+
+        send.assert_not_called()
+
+
+class TestHourlyCheck:
+    def test_sends_due_notifications_serially_when_one_worker(self, app, db_session):
+        user, tg_user = _linked_user(db_session, tz='UTC', nudge_hour=datetime.now(timezone.utc).hour,
+                                     morning_reminder=False, evening_summary=False, streak_alert=False)
+
+        sent = []
+        workers = app.config.get('TELEGRAM_SCHEDULER_WORKERS')
+        app.config['TELEGRAM_SCHEDULER_WORKERS'] = 1  # db_session shares one session across contexts
+        try:
+            with patch('app.telegram.bot.send_message', side_effect=lambda chat_id, text, **kw: sent.append(chat_id)), \
+                    patch('app.telegram.scheduler.get_quickest_action', return_value={'type': 'cards'}), \
+                    patch('app.telegram.scheduler.format_nudge', return_value='nudge'):
+                _hourly_check(app)
+        finally:
+            app.config['TELEGRAM_SCHEDULER_WORKERS'] = workers
+
+        assert tg_user.telegram_id in sent
@@ -0,0 +1,109 @@
+"""Tests for app/telegram/sender.py against a local fake Bot API server."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.telegram.sender import TelegramSender, _RateLimiter
+
+
+class _FakeBotApi:
+    """Records sendMessage calls; ``script`` holds (status, body) replies to give first."""
+
+    def __init__(self):
+        self.calls = []
+        self.script = []
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with fake.lock:
+                    fake.calls.append((self.path, body, time.monotonic()))
+                    status, reply = fake.script.pop(0) if fake.script else (200, {'ok': True, 'result': {}})
+                data = json.dumps(reply).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_api():
+    api = _FakeBotApi()
+    yield api
+    api.close()
+
+
+def _sender(fake_api, **kwargs):
+    kwargs.setdefault('global_rate', 1000)
+    kwargs.setdefault('per_chat_interval', 0)
+    return TelegramSender('TOKEN', api_base=fake_api.url, workers=4, **kwargs)
+
+
+class TestTelegramSender:
+    def test_enqueue_returns_immediately_and_delivers(self, fake_api):
+        sender = _sender(fake_api)
+
+        for chat_id in range(20):
+            sender.enqueue('sendMessage', {'chat_id': chat_id, 'text': 'hi'})
+
+        assert sender.flush(timeout=10)
+        assert sorted(body['chat_id'] for _, body, _ in fake_api.calls) == list(range(20))
+        assert all(path == '/botTOKEN/sendMessage' for path, _, _ in fake_api.calls)
+        assert sender.stats()['sent'] == 20
+
+    def test_429_is_retried_after_retry_after(self, fake_api):
+        fake_api.script = [(429, {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 1}})]
+        sender = _sender(fake_api)
+
+        assert sender.deliver('sendMessage', {'chat_id': 1, 'text': 'x'})
+
+        (_, _, first), (_, _, second) = fake_api.calls
+        assert second - first >= 0.9
+        assert sender.stats() == {'sent': 1, 'failed': 0, 'retried': 1, 'queued': 0}
+
+    def test_5xx_backs_off_and_4xx_gives_up(self, fake_api):
+        fake_api.script = [(502, {'ok': False}), (403, {'ok': False, 'description': 'bot was blocked'})]
+        sender = _sender(fake_api)
+
+        assert not sender.deliver('sendMessage', {'chat_id': 1, 'text': 'x'})
+
+        assert len(fake_api.calls) == 2
+        assert sender.stats()['failed'] == 1
+
+    def test_same_chat_is_spaced_by_per_chat_interval(self, fake_api):
+        sender = _sender(fake_api, per_chat_interval=0.3)
+
+        for _ in range(3):
+            sender.enqueue('sendMessage', {'chat_id': 7, 'text': 'x'})
+        assert sender.flush(timeout=10)
+
+        times = sorted(t for _, _, t in fake_api.calls)
+        assert times[2] - times[0] >= 0.55
+
+
+class TestRateLimiter:
+    def test_global_rate_spaces_slots(self):
+        limiter = _RateLimiter(global_rate=20, per_chat_interval=0)
+        started = time.monotonic()
+        for chat_id in range(5):
+            limiter.acquire(chat_id)
+        assert time.monotonic() - started >= 0.19
@@ -0,0 +1,112 @@
+"""Tests for the set-based daily summary / weekly report builders."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.auth.models import User
+from app.books.models import UserChapterProgress
+from app.curriculum.models import LessonProgress
+from app.middleware.query_profiler import capture_queries
+from app.study.models import UserCardDirection, UserWord
+from app.telegram.queries import (
+    get_daily_summaries,
+    get_daily_summary,
+    get_weekly_report,
+    get_weekly_reports,
+)
+from app.words.models import CollectionWords
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _second_user(db_session):
+    suffix = uuid.uuid4().hex[:8]
+    user = User(username=f'sum_{suffix}', email=f'sum_{suffix}@example.com', active=True)
+    user.set_password('test123')
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+def _review_card(db_session, user, first_reviewed):
+    word = CollectionWords(english_word=f'sum{uuid.uuid4().hex[:8]}', russian_word='итог', level='A1')
+    db_session.add(word)
+    db_session.flush()
+    user_word = UserWord(user_id=user.id, word_id=word.id)
+    db_session.add(user_word)
+    db_session.flush()
+    card = UserCardDirection(user_word_id=user_word.id, direction='eng-rus')
+    card.last_reviewed = _now()
+    card.first_reviewed = first_reviewed
+    db_session.add(card)
+
+
+def test_summary_collects_todays_activity(db_session, test_user, test_lesson_vocabulary, test_chapter):
+    db_session.add(LessonProgress(user_id=test_user.id, lesson_id=test_lesson_vocabulary.id,
+                                  status='completed', score=90.0, completed_at=_now()))
+    db_session.add(UserChapterProgress(user_id=test_user.id, chapter_id=test_chapter.id,
+                                       offset_pct=0.5, updated_at=_now()))
+    _review_card(db_session, test_user, first_reviewed=_now())
+    _review_card(db_session, test_user, first_reviewed=_now() - timedelta(days=30))
+    db_session.flush()
+
+    summary = get_daily_summary(test_user.id, tz='UTC')
+
+    assert summary['lessons_count'] == 1
+    assert summary['lesson_types'] == ['vocabulary']
+    assert summary['lesson_score'] == 90.0
+    assert summary['lesson_title'] == 'Test Vocabulary'
+    assert summary['words_reviewed'] == 2
+    assert summary['srs_new_reviewed'] == 1
+    assert summary['srs_review_reviewed'] == 1
+    assert summary['books_read'] == ['Test Book']
+    assert summary['book_chapter_title'] == 'Test Chapter'
+    assert summary['grammar_exercises'] == 0
+    assert summary['grammar_topic_title'] is None
+
+
+def test_batch_matches_single_user_results_in_three_queries(db_session, test_user, test_lesson_vocabulary):
+    other = _second_user(db_session)
+    db_session.add(LessonProgress(user_id=test_user.id, lesson_id=test_lesson_vocabulary.id,
+                                  status='completed', score=70.0, completed_at=_now()))
+    _review_card(db_session, other, first_reviewed=_now())
+    db_session.flush()
+
+    with capture_queries() as profile:
+        batch = get_daily_summaries([test_user.id, other.id], tz='UTC')
+
+    assert profile.count <= 3, profile.describe()
+    assert batch[test_user.id] == get_daily_summary(test_user.id, tz='UTC')
+    assert batch[other.id] == get_daily_summary(other.id, tz='UTC')
+    assert batch[other.id]['lessons_count'] == 0
+    assert batch[other.id]['words_reviewed'] == 1
+
+
+def test_user_without_activity_gets_zeroes(db_session, test_user):
+    summary = get_daily_summary(test_user.id, tz='UTC')
+
+    assert summary['lessons_count'] == 0
+    assert summary['books_read'] == []
+    assert summary['error_review_resolved_today'] == 0
+    assert summary['lesson_title'] is None
+
+
+def test_weekly_reports_batch(db_session, test_user, test_lesson_vocabulary):
+    other = _second_user(db_session)
+    three_days_ago = _now() - timedelta(days=3)
+    db_session.add(LessonProgress(user_id=test_user.id, lesson_id=test_lesson_vocabulary.id,
+                                  status='completed', completed_at=three_days_ago,
+                                  last_activity=three_days_ago))
+    db_session.flush()
+
+    reports = get_weekly_reports([test_user.id, other.id], tz='UTC', streaks={test_user.id: 4})
+
+    assert reports[test_user.id]['lessons_completed'] == 1
+    assert reports[test_user.id]['active_days'] == 1
+    assert reports[test_user.id]['streak'] == 4
+    assert reports[other.id]['lessons_completed'] == 0
+    assert reports[other.id]['streak'] == 0
+    single = get_weekly_report(test_user.id, tz='UTC')
+    assert {k: v for k, v in single.items() if k != 'streak'} == \
+        {k: v for k, v in reports[test_user.id].items() if k != 'streak'}
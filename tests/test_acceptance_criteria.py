@@ -3,6 +3,7 @@ import pytest
 import uuid
 from app.auth.models import User
 from app.words.models import CollectionWords
+from tests.conftest import sitemap_text
 
 
 @pytest.fixture
@@ -48,15 +49,15 @@ class TestSitemapContainsAllPages:
     """Verify all new pages appear in sitemap.xml."""
 
     def test_sitemap_has_courses(self, client):
-        xml = client.get('/sitemap.xml').data.decode()
+        xml = sitemap_text(client)
         assert '/courses' in xml
 
     def test_sitemap_has_grammar_lab(self, client):
-        xml = client.get('/sitemap.xml').data.decode()
+        xml = sitemap_text(client)
         assert '/grammar-lab/' in xml
 
     def test_sitemap_has_dictionary(self, client, sample_word):
-        xml = client.get('/sitemap.xml').data.decode()
+        xml = sitemap_text(client)
         assert '/dictionary/' in xml
 
 
@@ -204,7 +204,13 @@ class TestHasLearningActivitySources:
         from app.utils.activity_tracker import has_learning_activity
         from app.curriculum.daily_lessons import UserLessonProgress
 
+        from app.achievements.models import UserDailyActivity
+        from app.utils.activity_rollup import SOURCE_COURSE_LESSON
+
         user = _make_user(db_session)
+        # The rollup row a real completion would have written
+        db_session.add(UserDailyActivity(user_id=user.id, local_date=_NOW.date(), sources=SOURCE_COURSE_LESSON))
+        db_session.flush()
 
         # Patch UserLessonProgress query to return a truthy first() result
         mock_result = MagicMock()
@@ -566,3 +572,218 @@ class TestStreakShieldOrder:
         # the function accepts the post-repair streak value without error.
         # (milestone may or may not fire depending on existing events)
         assert result is None or isinstance(result, dict)
+
+
+# ---------------------------------------------------------------------------
+# get_active_local_dates — one UNION query for a window of local days
+# ---------------------------------------------------------------------------
+
+def _local_noon_utc(tz_name: str, local_day: date, hour: int = 12) -> datetime:
+    import pytz
+    tz_obj = pytz.timezone(tz_name)
+    local = tz_obj.localize(datetime(local_day.year, local_day.month, local_day.day, hour, 0, 0))
+    return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def _add_study_sessions(db_session, user_id: int, when_utc):
+    for start_time in when_utc:
+        ss = StudySession(user_id=user_id, session_type='cards')
+        ss.start_time = start_time
+        db_session.add(ss)
+    db_session.flush()
+
+
+def _count_queries(fn):
+    import sqlalchemy.event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(Engine, 'before_cursor_execute', _record)
+    try:
+        result = fn()
+    finally:
+        sqlalchemy.event.remove(Engine, 'before_cursor_execute', _record)
+    return result, len(statements)
+
+
+class TestActiveLocalDates:
+
+    @pytest.mark.parametrize('tz_name', ['Asia/Tokyo', 'America/New_York', 'UTC'])
+    def test_matches_per_day_has_learning_activity(self, db_session, tz_name):
+        """Per local day, the set agrees with has_learning_activity over that day's bounds."""
+        import pytz
+        from app.curriculum.models import ListeningAttempt
+        from app.utils.activity_tracker import get_active_local_dates, has_learning_activity
+
+        user = _make_user(db_session)
+        tz_obj = pytz.timezone(tz_name)
+        today = datetime.now(tz_obj).date()
+
+        # Around local midnight on both sides, plus sources 7 and 8
+        _add_study_sessions(db_session, user.id, [
+            _local_noon_utc(tz_name, today - timedelta(days=2), hour=0) + timedelta(minutes=1),
+            _local_noon_utc(tz_name, today - timedelta(days=4), hour=23) + timedelta(minutes=59),
+        ])
+        ev = StreakEvent(user_id=user.id, event_type='xp_linear_curriculum', coins_delta=0,
+                         event_date=today - timedelta(days=5))
+        ev.created_at = _local_noon_utc(tz_name, today - timedelta(days=5))
+        lesson = _make_cefr_module_lesson(db_session)
+        attempt = ListeningAttempt(user_id=user.id, lesson_id=lesson.id, score=0.5, replay_count=0)
+        attempt.created_at = _local_noon_utc(tz_name, today - timedelta(days=6))
+        db_session.add_all([ev, attempt])
+        db_session.flush()
+
+        start = today - timedelta(days=8)
+        active = get_active_local_dates(user.id, start, today, tz_name)
+
+        expected = set()
+        for offset in range(9):
+            day = start + timedelta(days=offset)
+            day_start = tz_obj.localize(datetime(day.year, day.month, day.day))
+            day_end = tz_obj.localize(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+            if has_learning_activity(user.id, day_start, day_end, db_session):
+                expected.add(day)
+
+        assert active == expected
+        assert active == {today - timedelta(days=d) for d in (2, 4, 5, 6)}
+
+    def test_aware_column_uses_local_date(self, db_session):
+        """UserLessonProgress.completed_at is timestamptz — converted without the UTC hop."""
+        from app.books.models import Book, Chapter
+        from app.curriculum.book_courses import BookCourse, BookCourseEnrollment, BookCourseModule
+        from app.curriculum.daily_lessons import DailyLesson, UserLessonProgress
+        from app.utils.activity_tracker import get_active_local_dates
+
+        user = _make_user(db_session)
+        book = Book(title=f'Book {uuid.uuid4().hex[:8]}', author='A', chapters_cnt=1)
+        db_session.add(book)
+        db_session.flush()
+        chapter = Chapter(book_id=book.id, chap_num=1, title='C', words=10, text_raw='t')
+        course = BookCourse(book_id=book.id, title='Course', level='B1', slug=f'c-{uuid.uuid4().hex[:8]}')
+        db_session.add_all([chapter, course])
+        db_session.flush()
+        module = BookCourseModule(course_id=course.id, module_number=1, title='M')
+        db_session.add(module)
+        db_session.flush()
+        lesson = DailyLesson(book_course_module_id=module.id, slice_number=1, day_number=1,
+                             lesson_type='reading', chapter_id=chapter.id, word_count=10)
+        enrollment = BookCourseEnrollment(user_id=user.id, course_id=course.id, status='active',
+                                          current_module_id=module.id)
+        db_session.add_all([lesson, enrollment])
+        db_session.flush()
+
+        # 20:00 UTC is already the next day in Tokyo
+        completed_at = datetime(2026, 3, 10, 20, 0, tzinfo=timezone.utc)
+        db_session.add(UserLessonProgress(user_id=user.id, daily_lesson_id=lesson.id,
+                                          enrollment_id=enrollment.id, status='completed',
+                                          completed_at=completed_at))
+        db_session.flush()
+
+        window = (date(2026, 3, 9), date(2026, 3, 12))
+        assert get_active_local_dates(user.id, *window, 'Asia/Tokyo', db_session) == {date(2026, 3, 11)}
+        assert get_active_local_dates(user.id, *window, 'UTC', db_session) == {date(2026, 3, 10)}
+
+    def test_unknown_timezone_falls_back(self, db_session):
+        from app.utils.activity_tracker import get_active_local_dates
+        user = _make_user(db_session)
+        today = date.today()
+        assert get_active_local_dates(user.id, today - timedelta(days=3), today, 'Mars/Olympus') == set()
+
+
+class TestStreakWalksUseOneWindowQuery:
+
+    def test_get_current_streak_query_count_is_constant(self, db_session):
+        import pytz
+        from app.telegram.queries import get_current_streak
+
+        user = _make_user(db_session)
+        tz_name = 'Europe/Moscow'
+        today = datetime.now(pytz.timezone(tz_name)).date()
+        _add_study_sessions(db_session, user.id, [
+            _local_noon_utc(tz_name, today - timedelta(days=d)) for d in range(40) if d != 20
+        ])
+        db_session.add(StreakEvent(user_id=user.id, event_type='free_repair', coins_delta=0,
+                                   event_date=today - timedelta(days=20)))
+        db_session.flush()
+
+        streak, queries = _count_queries(lambda: get_current_streak(user.id, tz=tz_name))
+        assert streak == 40
+        assert queries <= 2
+
+    def test_find_missed_date_and_streak_before(self, db_session):
+        import pytz
+        from app.achievements.streak_service import find_missed_date, get_streak_before_date
+
+        user = _make_user(db_session)
+        tz_name = 'Asia/Tokyo'
+        today = datetime.now(pytz.timezone(tz_name)).date()
+        # Active 3..9 days ago, missed 2 days ago, nothing yesterday/today
+        _add_study_sessions(db_session, user.id, [
+            _local_noon_utc(tz_name, today - timedelta(days=d)) for d in range(3, 10)
+        ])
+        db_session.add(StreakEvent(user_id=user.id, event_type='spent_repair', coins_delta=-3,
+                                   event_date=today - timedelta(days=1)))
+        db_session.flush()
+
+        missed, queries = _count_queries(lambda: find_missed_date(user.id, tz=tz_name))
+        assert missed == today - timedelta(days=2)
+        assert queries <= 2
+        assert get_streak_before_date(user.id, missed, tz=tz_name) == 7
+
+    def test_find_auto_heal_date_treats_spent_repair_as_gap(self, db_session):
+        import pytz
+        from app.achievements.streak_service import find_auto_heal_date
+
+        user = _make_user(db_session)
+        tz_name = 'UTC'
+        today = datetime.now(pytz.timezone(tz_name)).date()
+        _add_study_sessions(db_session, user.id, [_local_noon_utc(tz_name, today),
+                                                  _local_noon_utc(tz_name, today - timedelta(days=3))])
+        db_session.add(StreakEvent(user_id=user.id, event_type='spent_repair', coins_delta=-3,
+                                   event_date=today - timedelta(days=1)))
+        db_session.flush()
+
+        assert find_auto_heal_date(user.id, tz=tz_name) == today - timedelta(days=1)
+
+
+class TestCohortQueries:
+
+    def test_active_user_ids_matches_per_user_check(self, db_session):
+        from app.utils.activity_tracker import get_active_user_ids, has_learning_activity
+
+        active, idle = _make_user(db_session), _make_user(db_session)
+        _add_study_sessions(db_session, active.id, [_NOW])
+
+        result, queries = _count_queries(
+            lambda: get_active_user_ids([active.id, idle.id], _WIN_START, _WIN_END, db_session)
+        )
+
+        assert result == {active.id}
+        assert queries == 1
+        assert has_learning_activity(active.id, _WIN_START, _WIN_END, db_session)
+        assert not has_learning_activity(idle.id, _WIN_START, _WIN_END, db_session)
+
+    def test_current_streaks_match_single_user_walk(self, db_session):
+        import pytz
+        from app.telegram.queries import get_current_streak, get_current_streaks
+
+        tz_name = 'Asia/Tokyo'
+        today = datetime.now(pytz.timezone(tz_name)).date()
+        users = [_make_user(db_session) for _ in range(3)]
+        _add_study_sessions(db_session, users[0].id, [_local_noon_utc(tz_name, today - timedelta(days=d))
+                                                      for d in range(4)])
+        _add_study_sessions(db_session, users[1].id, [_local_noon_utc(tz_name, today - timedelta(days=1))])
+        db_session.add(StreakEvent(user_id=users[1].id, event_type='free_repair', coins_delta=0,
+                                   event_date=today - timedelta(days=2)))
+        db_session.flush()
+
+        streaks, queries = _count_queries(lambda: get_current_streaks([u.id for u in users], tz=tz_name))
+
+        assert streaks == {u.id: get_current_streak(u.id, tz=tz_name) for u in users}
+        assert streaks[users[0].id] == 4
+        assert streaks[users[2].id] == 0
+        assert queries == 2
@@ -202,6 +202,41 @@ class TestFetchSitemapStats:
         assert stats['url_count'] == 1
         assert stats['newest_lastmod'] is None
 
+    def test_follows_sitemap_index(self):
+        from app.admin.services.seo_audit_service import _fetch_sitemap_stats
+        documents = {
+            '/sitemap.xml': (
+                b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                b'<sitemap><loc>https://example.com/sitemap-pages.xml</loc></sitemap>'
+                b'<sitemap><loc>https://example.com/sitemap-grammar.xml</loc></sitemap>'
+                b'</sitemapindex>'
+            ),
+            '/sitemap-pages.xml': (
+                b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                b'<url><loc>https://example.com/</loc></url>'
+                b'</urlset>'
+            ),
+            '/sitemap-grammar.xml': (
+                b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                b'<url><loc>https://example.com/grammar-lab/topic/a</loc><lastmod>2026-05-01</lastmod></url>'
+                b'</urlset>'
+            ),
+        }
+
+        def get(path):
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.data = documents[path]
+            return resp
+
+        client = MagicMock()
+        client.get.side_effect = get
+
+        stats = _fetch_sitemap_stats(client)
+        assert stats['url_count'] == 2
+        assert stats['paths'] == ['/', '/grammar-lab/topic/a']
+        assert stats['newest_lastmod'] == '2026-05-01'
+
 
 class TestRunSeoAudit:
     """Unit tests for run_seo_audit with caching."""
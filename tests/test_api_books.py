@@ -277,6 +277,52 @@ class TestGetChapter:
 
         assert response.status_code == 404
 
+    def test_gzip_payload_and_not_modified(self, authenticated_client, test_book, test_chapter):
+        """Precompressed body with a strong ETag; a revalidation gets 304."""
+        import gzip
+
+        url = f'/api/books/{test_book.id}/chapters/{test_chapter.chap_num}'
+        response = authenticated_client.get(url, headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        etag = response.headers['ETag']
+        assert not etag.startswith('W/')
+        data = json.loads(gzip.decompress(response.get_data()))
+        assert data['text'] == 'Test chapter content'
+        assert data['next'] is None and data['prev'] is None
+
+        again = authenticated_client.get(
+            url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag},
+        )
+        assert again.status_code == 304
+        assert again.get_data() == b''
+        assert again.headers['ETag'] == etag
+
+    def test_chapter_edit_changes_etag_and_navigation(
+        self, authenticated_client, db_session, test_book, test_chapter,
+    ):
+        from app.books.models import Chapter
+
+        url = f'/api/books/{test_book.id}/chapters/{test_chapter.chap_num}'
+        first = authenticated_client.get(url)
+        assert first.get_json()['next'] is None
+
+        db_session.add(Chapter(
+            book_id=test_book.id, chap_num=2, title='Test Chapter 2',
+            text_raw='Second chapter', words=2,
+        ))
+        test_chapter.text_raw = 'Edited chapter content'
+        db_session.commit()
+
+        response = authenticated_client.get(url, headers={'If-None-Match': first.headers['ETag']})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != first.headers['ETag']
+        data = response.get_json()
+        assert data['text'] == 'Edited chapter content'
+        assert data['next'] == 2
+
 
 class TestGetChapterDetails:
     """Test GET /api/chapters/<id> endpoint"""
@@ -577,3 +623,146 @@ class TestWordTranslation:
 
         # Should return empty result or 404
         assert response.status_code in [200, 404]
+
+
+class TestWordTranslationsBatch:
+    """Test POST /api/word-translations endpoint"""
+
+    def _word(self, db_session, **kwargs):
+        from app.words.models import CollectionWords
+
+        # Letters only: the chapter tokenizer splits on digits.
+        letters = uuid.uuid4().hex[:8].translate(str.maketrans('0123456789', 'ghijklmnop'))
+        word = CollectionWords(english_word=f'zq{letters}', **kwargs)
+        db_session.add(word)
+        db_session.commit()
+        return word
+
+    def test_batch_resolves_exact_and_inflected_forms(self, authenticated_client, db_session):
+        word = self._word(db_session, russian_word='тест')
+
+        response = authenticated_client.post(
+            '/api/word-translations',
+            json={'words': [word.english_word, word.english_word + 'ing', 'Nonexistentzz']},
+        )
+
+        assert response.status_code == 200
+        translations = response.get_json()['translations']
+        assert translations[word.english_word]['id'] == word.id
+        assert translations[word.english_word]['is_form'] is False
+        assert translations[word.english_word + 'ing']['base_form'] == word.english_word
+        assert translations[word.english_word + 'ing']['form_text'] == 'длительная форма от'
+        assert translations['nonexistentzz']['in_dictionary'] is False
+
+    def test_batch_matches_single_endpoint(self, authenticated_client, db_session, test_user):
+        from app.study.models import QuizDeck, QuizDeckWord, UserWord
+
+        word = self._word(db_session, russian_word='тест', listening='[sound:x.mp3]', get_download=1)
+        user_word = UserWord(user_id=test_user.id, word_id=word.id)
+        user_word.status = 'learning'
+        db_session.add(user_word)
+        deck = QuizDeck(user_id=test_user.id, title='Слова из чтения')
+        db_session.add(deck)
+        db_session.flush()
+        db_session.add(QuizDeckWord(deck_id=deck.id, word_id=word.id))
+        db_session.commit()
+
+        token = word.english_word + 's'
+        single = authenticated_client.get(f'/api/word-translation/{token}').get_json()
+        batch = authenticated_client.post(
+            '/api/word-translations', json={'words': [token]},
+        ).get_json()['translations'][token]
+
+        assert batch == single
+        assert batch['status'] == 1
+        assert batch['in_reading_deck'] is True
+        assert batch['has_audio'] is True
+
+    def test_batch_uses_one_query_for_many_words(self, authenticated_client, db_session):
+        import sqlalchemy.event
+        from sqlalchemy.engine import Engine
+
+        words = [self._word(db_session, russian_word='тест') for _ in range(5)]
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sqlalchemy.event.listen(Engine, 'before_cursor_execute', _record)
+        try:
+            response = authenticated_client.post(
+                '/api/word-translations',
+                json={'words': [w.english_word + 'ed' for w in words]},
+            )
+        finally:
+            sqlalchemy.event.remove(Engine, 'before_cursor_execute', _record)
+
+        assert response.status_code == 200
+        assert len([s for s in statements if 'FROM collection_words' in s]) == 1
+
+    def test_batch_by_chapter(self, authenticated_client, db_session, test_book):
+        from app.books.models import Chapter
+
+        word = self._word(db_session, russian_word='тест')
+        chapter = Chapter(
+            book_id=test_book.id, chap_num=7, title='Batch',
+            text_raw=f'The {word.english_word.capitalize()} walked. {word.english_word}s!', words=4,
+        )
+        db_session.add(chapter)
+        db_session.commit()
+
+        response = authenticated_client.post('/api/word-translations', json={'chapter_id': chapter.id})
+
+        assert response.status_code == 200
+        translations = response.get_json()['translations']
+        assert translations[word.english_word]['id'] == word.id
+        assert translations[word.english_word + 's']['is_form'] is True
+        assert 'the' in translations
+
+    def test_batch_by_chapter_splits_literal_line_breaks(self, authenticated_client, db_session, test_book):
+        from app.books.models import Chapter
+
+        word = self._word(db_session, russian_word='тест')
+        chapter = Chapter(
+            book_id=test_book.id, chap_num=8, title='Breaks',
+            text_raw=f'It was late.\\n\\n{word.english_word.capitalize()} walked.', words=4,
+        )
+        db_session.add(chapter)
+        db_session.commit()
+
+        response = authenticated_client.post('/api/word-translations', json={'chapter_id': chapter.id})
+
+        assert response.status_code == 200
+        translations = response.get_json()['translations']
+        assert translations[word.english_word]['id'] == word.id
+        assert 'n' + word.english_word not in translations
+        assert 'late' in translations
+
+    @pytest.mark.parametrize('chapter_id', [True, 0, -3, '12', 1.5, [1]])
+    def test_batch_rejects_invalid_chapter_id(self, authenticated_client, chapter_id):
+        response = authenticated_client.post('/api/word-translations', json={'chapter_id': chapter_id})
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'invalid_chapter_id'
+
+    def test_batch_chapter_respects_book_gate(self, authenticated_client, db_session):
+        _book, chapter = _make_restricted_book_with_chapter(db_session, published=False)
+
+        response = authenticated_client.post('/api/word-translations', json={'chapter_id': chapter.id})
+
+        assert response.status_code == 404
+
+    def test_batch_validates_payload(self, authenticated_client):
+        assert authenticated_client.post('/api/word-translations', json={}).status_code == 400
+        assert authenticated_client.post(
+            '/api/word-translations', json={'words': 'not-a-list'},
+        ).status_code == 400
+
+    def test_batch_rejects_oversized_request(self, authenticated_client):
+        from app.api.books import MAX_BATCH_TRANSLATION_WORDS
+
+        words = [f'w{i}' for i in range(MAX_BATCH_TRANSLATION_WORDS + 1)]
+        response = authenticated_client.post('/api/word-translations', json={'words': words})
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'too_many_words'
@@ -352,7 +352,7 @@ class TestCurriculumCacheInvalidateUserCache:
         from app.curriculum.cache import cache
 
         # Добавляем user-specific и unrelated данные в кеш
-        cache.set('curriculum:get_user_progress:user_123:abc', 'progress_value')
+        cache.set('curriculum:get_user_progress:user_123:abc', 'progress_value', tags=['user:123'])
         cache.set('curriculum:get_all_levels:def', 'levels_value')
         assert cache.get('curriculum:get_user_progress:user_123:abc') == 'progress_value'
         assert cache.get('curriculum:get_all_levels:def') == 'levels_value'
@@ -2,6 +2,7 @@
 import pytest
 import uuid
 from app.grammar_lab.models import GrammarTopic
+from tests.conftest import sitemap_text
 
 
 @pytest.fixture
@@ -60,13 +61,11 @@ class TestSitemapGrammarLevels:
     """Test that grammar level pages are in sitemap."""
 
     def test_sitemap_has_grammar_lab(self, client):
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         assert '/grammar-lab/' in xml
 
     def test_sitemap_has_grammar_level_pages(self, client, grammar_topics):
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         assert '/grammar-lab/topics/b1' in xml
 
 
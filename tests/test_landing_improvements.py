@@ -6,6 +6,8 @@ from datetime import date, datetime
 
 import pytest
 
+from tests.conftest import sitemap_shards, sitemap_text
+
 
 class TestLandingPage:
     """Test landing page content and structure."""
@@ -73,7 +75,7 @@ class TestSitemapNoindexExclusion:
     """Sitemap must not include pages marked noindex."""
 
     def _sitemap_text(self, client):
-        return client.get('/sitemap.xml').data.decode('utf-8')
+        return sitemap_text(client)
 
     def test_sitemap_excludes_register(self, client):
         assert '/register' not in self._sitemap_text(client)
@@ -95,7 +97,7 @@ class TestSitemapCanonicalUrl:
         original = app.config.get('SITE_URL', '')
         app.config['SITE_URL'] = 'https://staging.example.com'
         try:
-            text = client.get('/sitemap.xml').data.decode('utf-8')
+            text = client.get('/sitemap.xml').data.decode('utf-8') + sitemap_text(client)
             assert 'https://staging.example.com/' in text
             assert '<loc>https://llt-english.com/' not in text
         finally:
@@ -104,8 +106,9 @@ class TestSitemapCanonicalUrl:
     def test_sitemap_locs_use_consistent_base(self, client, app):
         """All sitemap locs must share the same scheme+host (no mixed domains)."""
         site_url = (app.config.get('SITE_URL') or 'https://llt-english.com').rstrip('/')
-        root = ET.fromstring(client.get('/sitemap.xml').data)
-        locs = [el.text for el in root.findall(f'.//{{{_SITEMAP_NS}}}loc')]
+        roots = [ET.fromstring(client.get('/sitemap.xml').data)]
+        roots += [ET.fromstring(body) for body in sitemap_shards(client)]
+        locs = [el.text for root in roots for el in root.findall(f'.//{{{_SITEMAP_NS}}}loc')]
         assert locs, 'Sitemap has no <loc> entries'
         for loc in locs:
             assert loc.startswith(site_url), f'Loc uses wrong base: {loc}'
@@ -115,10 +118,10 @@ class TestSitemapLastmod:
     """lastmod dates in the sitemap must never exceed today's date."""
 
     def test_lastmod_values_not_in_future(self, client):
-        root = ET.fromstring(client.get('/sitemap.xml').data)
         today_iso = date.today().isoformat()
-        for el in root.findall(f'.//{{{_SITEMAP_NS}}}lastmod'):
-            assert el.text <= today_iso, f'Future lastmod in sitemap: {el.text}'
+        for body in sitemap_shards(client):
+            for el in ET.fromstring(body).findall(f'.//{{{_SITEMAP_NS}}}lastmod'):
+                assert el.text <= today_iso, f'Future lastmod in sitemap: {el.text}'
 
     def test_future_updated_at_capped_at_today(self, client, app):
         """A grammar topic with updated_at in the future must appear with lastmod=today."""
@@ -138,7 +141,7 @@ class TestSitemapLastmod:
         db.session.commit()
         try:
             site_url = app.config.get('SITE_URL', 'https://llt-english.com')
-            root = ET.fromstring(client.get('/sitemap.xml').data)
+            root = ET.fromstring(client.get('/sitemap-grammar.xml').data)
             today_iso = date.today().isoformat()
             for url_el in root.findall(f'{{{_SITEMAP_NS}}}url'):
                 loc = url_el.find(f'{{{_SITEMAP_NS}}}loc')
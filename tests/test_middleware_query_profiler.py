@@ -0,0 +1,81 @@
+"""
+Tests for the per-request SQL profiler middleware.
+"""
+import logging
+
+import pytest
+
+from app.middleware.query_profiler import QueryProfile, capture_queries, normalize_statement
+
+
+@pytest.fixture(autouse=True)
+def _reset_db_session(app):
+    from app.utils.db import db
+    try:
+        db.session.rollback()
+    except Exception:
+        pass
+
+
+class TestNormalizeStatement:
+
+    def test_literals_and_numbers_collapse(self):
+        assert normalize_statement("SELECT * FROM users WHERE id = 5 AND name = 'bob'") == \
+            normalize_statement("SELECT * FROM users WHERE id = 17 AND name = 'alice'")
+
+    def test_in_list_length_does_not_split_signature(self):
+        a = "SELECT id FROM words WHERE id IN (%(id_1_1)s, %(id_1_2)s)"
+        b = "SELECT id FROM words WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)"
+        assert normalize_statement(a) == normalize_statement(b)
+
+    def test_different_tables_stay_distinct(self):
+        assert normalize_statement("SELECT id FROM users WHERE id = ?") != \
+            normalize_statement("SELECT id FROM books WHERE id = ?")
+
+
+class TestQueryProfile:
+
+    def test_repeated_reports_n_plus_one_signature(self):
+        profile = QueryProfile()
+        for word_id in range(12):
+            profile.record(f"SELECT * FROM user_words WHERE word_id = {word_id}", 0.5)
+        profile.record("SELECT * FROM users WHERE id = 1", 0.5)
+
+        assert profile.count == 13
+        assert profile.total_ms == pytest.approx(6.5)
+        [(signature, count)] = profile.repeated(10)
+        assert 'user_words' in signature
+        assert count == 12
+
+    def test_capture_queries_counts_statements(self, app, db_session):
+        from sqlalchemy import text
+
+        # the fixture's SAVEPOINT is emitted lazily on first use
+        db_session.execute(text('SELECT 0'))
+        with capture_queries() as profile:
+            db_session.execute(text('SELECT 1'))
+            db_session.execute(text('SELECT 2'))
+
+        assert profile.count == 2
+        assert profile.repeated(2)  # same signature once literals are stripped
+
+
+class TestRequestReporting:
+
+    def test_response_has_db_server_timing(self, client):
+        response = client.get('/')
+        metrics = response.headers.getlist('Server-Timing')
+        assert any(m.startswith('db;dur=') and 'queries' in m for m in metrics)
+
+    def test_log_record_carries_request_id_and_counts(self, client, caplog):
+        request_id = 'ab' * 16
+        with caplog.at_level(logging.DEBUG, logger='app.middleware.query_profiler'):
+            client.get('/', headers={'X-Request-ID': request_id})
+
+        records = [r for r in caplog.records if r.getMessage().startswith('request_sql')]
+        assert records
+        record = records[-1]
+        assert record.request_id == request_id
+        assert record.http_path == '/'
+        assert isinstance(record.sql_queries, int)
+        assert isinstance(record.sql_repeated, list)
@@ -2,10 +2,18 @@
 Tests for NLP processor module
 Тесты модуля обработки естественного языка
 """
+import os
+import random
+import re
+from collections import Counter
+
 import pytest
 import time
 from unittest.mock import patch, MagicMock
 from app.nlp.processor import (
+    CONTRACTIONS,
+    HYPHEN_NORMALIZATIONS,
+    expand_contractions,
     get_wordnet_pos,
     extract_text_from_html,
     tokenize_and_filter,
@@ -14,8 +22,14 @@ from app.nlp.processor import (
     process_text,
     process_html_content,
     prepare_word_data,
+    prepare_word_counts,
+    split_into_blocks,
+    count_words_parallel,
     NLP_TIMEOUT_SECONDS,
+    TOKEN_STOP_WORDS,
+    normalize_hyphenated_words,
 )
+import nltk
 from nltk.corpus import wordnet
 
 
@@ -188,6 +202,49 @@ class TestLemmatizeWords:
         assert result == []
 
 
+class TestLemmaCache:
+    """Тесты LRU-кэша лемм по паре (токен, POS)"""
+
+    @pytest.fixture(autouse=True)
+    def _fake_lemmatizer(self):
+        from app.nlp import processor
+
+        lemmatizer = MagicMock()
+        lemmatizer.lemmatize.side_effect = lambda word, pos: f'{word}:{pos}'
+        processor.lemmatize_cached.cache_clear()
+        # wordnet.* POS constants need the WordNet corpus; use its letters directly
+        def wordnet_pos(tag):
+            return {'V': 'v', 'J': 'a', 'R': 'r'}.get(tag[:1], 'n')
+
+        with patch.object(processor, '_lemmatizer', lemmatizer), \
+                patch.object(processor, 'get_wordnet_pos', side_effect=wordnet_pos):
+            yield lemmatizer
+        processor.lemmatize_cached.cache_clear()
+
+    def test_only_unique_pairs_are_lemmatized(self, _fake_lemmatizer):
+        tags = [('said', 'VBD'), ('he', 'PRP'), ('said', 'VBD'), ('said', 'VBN'), ('said', 'VBD')]
+        with patch('app.nlp.processor.nltk.pos_tag', return_value=tags):
+            result = lemmatize_words([word for word, _ in tags])
+
+        assert result == ['said:v', 'he:n', 'said:v', 'said:v', 'said:v']
+        # VBD and VBN map to the same WordNet POS -> 2 unique pairs
+        assert _fake_lemmatizer.lemmatize.call_count == 2
+
+    def test_cache_is_shared_across_calls_and_counts_hits(self, _fake_lemmatizer):
+        from app.nlp.processor import lemma_cache_stats
+
+        tags = [('looked', 'VBD'), ('door', 'NN')]
+        with patch('app.nlp.processor.nltk.pos_tag', return_value=tags):
+            lemmatize_words(['looked', 'door'])
+            lemmatize_words(['looked', 'door'])
+
+        assert _fake_lemmatizer.lemmatize.call_count == 2
+        stats = lemma_cache_stats()
+        assert stats['misses'] == 2
+        assert stats['hits'] == 2
+        assert stats['size'] == 2
+
+
 class TestFilterEnglishWords:
     """Тесты функции filter_english_words"""
 
@@ -526,3 +583,140 @@ class TestNlpTimeout:
             )
 
         assert result == ['some', 'text']
+
+
+GOLDEN_CORPUS = os.path.join(os.path.dirname(__file__), 'fixtures', 'nlp', 'normalizer_corpus.txt')
+
+
+def legacy_expand_contractions(text):
+    """Reference: the per-entry replace/re.sub loop the compiled normalizer replaced."""
+    for contraction, expansion in CONTRACTIONS.items():
+        if contraction.startswith("'") or contraction.endswith("'"):
+            text = text.replace(contraction, expansion)
+            text = text.replace(contraction.capitalize(), expansion)
+            text = text.replace(contraction.upper(), expansion.upper())
+        else:
+            text = re.sub(r'\b' + re.escape(contraction) + r'\b', expansion, text, flags=re.IGNORECASE)
+    return text
+
+
+def legacy_normalize_hyphens(text):
+    for hyphenated, normalized in HYPHEN_NORMALIZATIONS.items():
+        text = re.sub(r'\b' + re.escape(hyphenated) + r'\b', normalized, text, flags=re.IGNORECASE)
+    return text
+
+
+class TestCompiledNormalizer:
+    """Однопроходный нормализатор даёт тот же результат, что и старый цикл по словарям"""
+
+    def _corpus(self):
+        with open(GOLDEN_CORPUS, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_golden_corpus_contractions(self):
+        for line in self._corpus():
+            assert expand_contractions(line) == legacy_expand_contractions(line), line
+
+    def test_golden_corpus_tokens(self):
+        stop_words = {'https', 'i', 'it'}
+        for line in self._corpus():
+            text = legacy_normalize_hyphens(re.sub(r'[—–−‐‑‒―]', ' ', legacy_expand_contractions(line)))
+            expected = [
+                w for w in (t.lower() for t in nltk.word_tokenize(text.replace('-', ' ')) if t.isalpha())
+                if w not in TOKEN_STOP_WORDS
+            ]
+            assert tokenize_and_filter(line, stop_words) == expected, line
+
+    def test_known_expansions(self):
+        assert expand_contractions("I can't, 'arry") == "I can not, harry"
+        assert expand_contractions("savin' it fer 'em") == "saving it for them"
+        # "'d" runs before "'dere" — preserved quirk of the original order
+        assert expand_contractions("'dere") == " wouldere"
+        # "'ll" consumes the apostrophe before "in'" gets a chance
+        assert expand_contractions("goin'll") == "goin will"
+
+    def test_randomized_overlaps_match_legacy(self):
+        pieces = []
+        for key in list(CONTRACTIONS) + list(HYPHEN_NORMALIZATIONS):
+            pieces += [key, key.upper(), key.capitalize(), key.title()]
+        pieces += ["'", 'in', 'IN', 'go', 'd', 's', 't', ' ', ' ', '.', '-', '-', 'll', 'n', 'can', 'let', 'non']
+        rng = random.Random(42)
+        for _ in range(3000):
+            text = ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 8)))
+            assert expand_contractions(text) == legacy_expand_contractions(text), text
+            assert normalize_hyphenated_words(text) == legacy_normalize_hyphens(text), text
+
+
+def _split_count_block(text):
+    """Picklable stand-in for count_block_words (no NLTK data needed)."""
+    return Counter(text.split())
+
+
+class TestSplitIntoBlocks:
+    """Тесты разбиения текста на блоки для параллельной обработки"""
+
+    def test_small_texts_are_grouped(self):
+        blocks = list(split_into_blocks(['one two', 'three', 'four five'], block_size=100))
+        assert blocks == ['one two three four five']
+
+    def test_blocks_respect_size_and_keep_words_whole(self):
+        text = '\n\n'.join(f'paragraph {i} ' + 'word ' * 20 for i in range(50))
+        blocks = list(split_into_blocks([text], block_size=300))
+        assert len(blocks) > 1
+        assert all(len(block) <= 300 for block in blocks)
+        assert Counter(' '.join(blocks).split()) == Counter(text.split())
+
+    def test_empty_texts_are_skipped(self):
+        assert list(split_into_blocks(['', '   ', None])) == []
+
+
+class TestCountWordsParallel:
+    """Тесты параллельного подсчёта слов по блокам"""
+
+    def test_merges_counters_from_worker_processes(self):
+        from app.nlp.processor import _nlp_pools, shutdown_nlp_pools
+
+        blocks = ['a b a', 'b c', 'a', 'd d d']
+        try:
+            counts = count_words_parallel(blocks, max_workers=2, count_block=_split_count_block)
+            assert counts == Counter({'a': 3, 'b': 2, 'c': 1, 'd': 3})
+            # The pool (and its warm caches) is kept for the next book
+            pool = _nlp_pools[2]
+            count_words_parallel(['x', 'y'], max_workers=2, count_block=_split_count_block)
+            assert _nlp_pools[2] is pool
+        finally:
+            shutdown_nlp_pools()
+
+    def test_idle_pool_is_shut_down(self):
+        from app.nlp.processor import _nlp_idle_timers, _nlp_pools, shutdown_nlp_pools
+
+        try:
+            with patch('app.nlp.processor.NLP_POOL_IDLE_SECONDS', 0):
+                count_words_parallel(['a', 'b'], max_workers=2, count_block=_split_count_block)
+            assert 2 not in _nlp_pools
+
+            with patch('app.nlp.processor.NLP_POOL_IDLE_SECONDS', 60):
+                count_words_parallel(['a', 'b'], max_workers=2, count_block=_split_count_block)
+            assert 2 in _nlp_pools
+            assert _nlp_idle_timers[2].interval == 60
+        finally:
+            shutdown_nlp_pools()
+        assert not _nlp_idle_timers
+
+    def test_single_block_runs_in_process(self):
+        with patch('app.nlp.processor._get_nlp_pool') as pool:
+            counts = count_words_parallel(['x y x'], max_workers=4, count_block=_split_count_block)
+        pool.assert_not_called()
+        assert counts == Counter({'x': 2, 'y': 1})
+
+    def test_broken_pool_falls_back_to_in_process(self):
+        from concurrent.futures.process import BrokenProcessPool
+
+        with patch('app.nlp.processor._get_nlp_pool', side_effect=BrokenProcessPool('boom')):
+            counts = count_words_parallel(['a', 'a b'], max_workers=2, count_block=_split_count_block)
+        assert counts == Counter({'a': 2, 'b': 1})
+
+    def test_prepare_word_counts_matches_prepare_word_data(self):
+        words = ['cat', 'dog', 'cat', 'bird']
+        brown = {'cat'}
+        assert prepare_word_counts(Counter(words), brown) == prepare_word_data(words, brown)
@@ -2,6 +2,7 @@
 import pytest
 import uuid
 from app.curriculum.models import CEFRLevel, Module, Lessons
+from tests.conftest import sitemap_text
 
 
 @pytest.fixture
@@ -124,8 +125,7 @@ class TestSitemapCourses:
     """Test that course pages appear in sitemap."""
 
     def test_sitemap_has_courses(self, client):
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         assert '/courses' in xml
 
 
@@ -7,6 +7,7 @@ from urllib.parse import quote
 import pytest
 
 from app.words.models import CollectionWords, Topic
+from tests.conftest import sitemap_shards, sitemap_text
 
 
 @pytest.fixture
@@ -360,28 +361,28 @@ class TestSitemap:
         assert 'application/xml' in response.content_type
 
     def test_sitemap_contains_root(self, app, client):
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         site_url = (app.config.get('SITE_URL') or 'https://llt-english.com').rstrip('/')
         assert f'<loc>{site_url}/</loc>' in xml
 
     def test_sitemap_contains_dictionary_words(self, client, sample_word):
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         slug = sample_word.english_word.lower().replace(' ', '-')
         assert f'/dictionary/{slug}' in xml
 
     def test_sitemap_contains_dictionary_index(self, client):
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         assert '/dictionary' in xml
 
     def test_sitemap_valid_xml_structure(self, client):
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
-        assert '<?xml version="1.0"' in xml
-        assert '<urlset' in xml
-        assert '</urlset>' in xml
+        index = client.get('/sitemap.xml').data.decode()
+        assert '<?xml version="1.0"' in index
+        assert '<sitemapindex' in index
+        for body in sitemap_shards(client):
+            xml = body.decode()
+            assert '<?xml version="1.0"' in xml
+            assert '<urlset' in xml
+            assert '</urlset>' in xml
 
 
 class TestRobotsTxt:
@@ -0,0 +1,51 @@
+"""
+SQL query budgets on hot endpoints (``query_budget`` fixture in conftest).
+
+Ceilings sit about 10% above the counts measured on the fixture data, and
+``max_repeats`` at the most any one statement repeats there, so a regression
+to per-row querying (one statement repeated per item) fails. Raise one only
+together with the change that justifies it.
+"""
+import uuid
+
+import pytest
+
+from app.words.models import CollectionWords
+
+
+@pytest.fixture(autouse=True)
+def _clear_admin_cache():
+    from app.admin.utils.cache import clear_admin_cache
+    clear_admin_cache()
+    yield
+    clear_admin_cache()
+
+
+def test_admin_dashboard_budget(admin_client, query_budget):
+    # 54 statements; the streak-distribution widget counts 5 fixed buckets
+    with query_budget(60, max_repeats=5):
+        response = admin_client.get('/admin/')
+    assert response.status_code == 200
+
+
+def test_daily_plan_budget(authenticated_client, query_budget):
+    # 63 statements; settings, statistics and due counts are read up to 4 times
+    with query_budget(70, max_repeats=4):
+        response = authenticated_client.get('/api/daily-plan')
+    assert response.status_code == 200
+
+
+def test_srs_session_budget(authenticated_client, query_budget):
+    with query_budget(60, max_repeats=10):
+        response = authenticated_client.get('/study/api/get-study-items')
+    assert response.status_code == 200
+
+
+def test_word_translation_budget(authenticated_client, db_session, query_budget):
+    word = CollectionWords(english_word=f'budget{uuid.uuid4().hex[:8]}', russian_word='бюджет')
+    db_session.add(word)
+    db_session.commit()
+
+    with query_budget(20, max_repeats=3):
+        response = authenticated_client.get(f'/api/word-translation/{word.english_word}')
+    assert response.status_code == 200
@@ -19,6 +19,15 @@ class MockWord:
         self.get_download = get_download
 
 
+def _mock_connection(mock_cursor):
+    mock_conn = MagicMock()
+    mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+    mock_conn.__exit__ = MagicMock(return_value=None)
+    mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+    mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=None)
+    return mock_conn
+
+
 class MockBook:
     """Mock Book object for testing"""
     def __init__(self, title, id=None):
@@ -59,10 +68,68 @@ class TestDatabaseRepositoryGetConnection:
         mock_connect.return_value = mock_conn
 
         repo = DatabaseRepository({'host': 'test'})
-        conn = repo.get_connection()
+        with repo.get_connection() as conn:
+            assert conn == mock_conn
 
         mock_connect.assert_called_once_with(host='test')
-        assert conn == mock_conn
+
+    @patch('app.repository.psycopg2.connect')
+    def test_connection_is_returned_to_pool_and_reused(self, mock_connect):
+        """Idle connections go back to the pool instead of leaking"""
+        from app.repository import DatabaseRepository, close_pools
+
+        mock_conn = _mock_connection(MagicMock())
+        mock_conn.closed = 0
+        mock_conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        mock_connect.return_value = mock_conn
+
+        close_pools()
+        try:
+            for _ in range(3):
+                with DatabaseRepository({'host': 'pooled'}).get_connection() as conn:
+                    assert conn is mock_conn
+        finally:
+            close_pools()
+
+        mock_connect.assert_called_once_with(host='pooled')
+        assert mock_conn.__exit__.call_count == 3
+
+    @patch('app.repository.psycopg2.connect')
+    def test_transaction_shares_one_connection(self, mock_connect):
+        """Calls inside transaction() reuse its connection and commit once"""
+        from app.repository import DatabaseRepository
+
+        mock_conn = _mock_connection(MagicMock())
+        mock_connect.return_value = mock_conn
+
+        repo = DatabaseRepository({'host': 'test'})
+        with repo.transaction():
+            with repo.transaction():
+                repo.execute_query("SELECT 1")
+            repo.execute_query("SELECT 2")
+
+        mock_connect.assert_called_once_with(host='test')
+        mock_conn.__exit__.assert_called_once()
+        assert repo._conn is None
+
+    @patch('app.repository.psycopg2.connect')
+    def test_transaction_propagates_errors(self, mock_connect):
+        """Errors inside transaction() roll back and re-raise"""
+        from app.repository import DatabaseRepository
+
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = psycopg2.Error("boom")
+        mock_conn = _mock_connection(mock_cursor)
+        mock_connect.return_value = mock_conn
+
+        repo = DatabaseRepository({'host': 'test'})
+        with pytest.raises(psycopg2.Error):
+            with repo.transaction():
+                repo.clear_book_word_links(1)
+
+        exc_type = mock_conn.__exit__.call_args[0][0]
+        assert exc_type is psycopg2.Error
+        assert repo._conn is None
 
 
 class TestDatabaseRepositoryExecuteQuery:
@@ -192,23 +259,14 @@ class TestDatabaseRepositoryBulkInsertOrUpdateWords:
 
         assert result == {}
 
+    @patch('app.repository.execute_values')
     @patch('app.repository.psycopg2.connect')
-    def test_bulk_insert_new_words(self, mock_connect):
+    def test_bulk_insert_new_words(self, mock_connect, mock_execute_values):
         """Test bulk inserting new words"""
         from app.repository import DatabaseRepository
 
-        mock_cursor = MagicMock()
-        # First query: check existing words - returns empty
-        mock_cursor.fetchall.return_value = []
-        # For each insert, return ID and english_word
-        mock_cursor.fetchone.side_effect = [(1, 'hello'), (2, 'world')]
-
-        mock_conn = MagicMock()
-        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
-        mock_conn.__exit__ = MagicMock(return_value=None)
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=None)
-        mock_connect.return_value = mock_conn
+        mock_connect.return_value = _mock_connection(MagicMock())
+        mock_execute_values.return_value = [(1, 'hello'), (2, 'world')]
 
         repo = DatabaseRepository({'host': 'test'})
         words = [
@@ -217,37 +275,45 @@ class TestDatabaseRepositoryBulkInsertOrUpdateWords:
         ]
         result = repo.bulk_insert_or_update_words(words)
 
-        assert 'hello' in result
-        assert 'world' in result
-        assert result['hello'] == 1
-        assert result['world'] == 2
+        assert result == {'hello': 1, 'world': 2}
+        mock_execute_values.assert_called_once()
+        query = mock_execute_values.call_args[0][1]
+        assert 'ON CONFLICT (english_word) DO UPDATE' in query
+        assert 'RETURNING id, english_word' in query
+        assert mock_execute_values.call_args[1]['fetch'] is True
 
+    @patch('app.repository.execute_values')
     @patch('app.repository.psycopg2.connect')
-    def test_bulk_insert_existing_words(self, mock_connect):
-        """Test bulk updating existing words"""
+    def test_bulk_insert_deduplicates_words(self, mock_connect, mock_execute_values):
+        """A word repeated in the batch is sent once (ON CONFLICT can't touch a row twice)"""
         from app.repository import DatabaseRepository
 
-        mock_cursor = MagicMock()
-        # First query: check existing words - returns existing IDs
-        mock_cursor.fetchall.return_value = [(10, 'hello'), (20, 'world')]
-
-        mock_conn = MagicMock()
-        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
-        mock_conn.__exit__ = MagicMock(return_value=None)
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=None)
-        mock_connect.return_value = mock_conn
+        mock_connect.return_value = _mock_connection(MagicMock())
+        mock_execute_values.return_value = [(10, 'hello')]
 
         repo = DatabaseRepository({'host': 'test'})
-        words = [
-            MockWord('hello', russian_word='привет'),
-            MockWord('world', russian_word='мир')
-        ]
+        words = [MockWord('hello'), MockWord('hello', russian_word='привет')]
         result = repo.bulk_insert_or_update_words(words)
 
-        assert result == {'hello': 10, 'world': 20}
-        # Verify update was called
-        mock_cursor.executemany.assert_called_once()
+        assert result == {'hello': 10}
+        rows = mock_execute_values.call_args[0][2]
+        assert len(rows) == 1
+        assert rows[0][:3] == ('hello', None, 'привет')
+
+    @patch('app.repository.execute_values')
+    @patch('app.repository.psycopg2.connect')
+    def test_bulk_insert_locks_rows_in_word_order(self, mock_connect, mock_execute_values):
+        """Rows go out sorted so concurrent imports lock shared words in one order"""
+        from app.repository import DatabaseRepository
+
+        mock_connect.return_value = _mock_connection(MagicMock())
+        mock_execute_values.return_value = []
+
+        repo = DatabaseRepository({'host': 'test'})
+        repo.bulk_insert_or_update_words([MockWord('said'), MockWord('the'), MockWord('and')])
+
+        rows = mock_execute_values.call_args[0][2]
+        assert [row[0] for row in rows] == ['and', 'said', 'the']
 
     @patch('app.repository.psycopg2.connect')
     def test_bulk_insert_error(self, mock_connect):
@@ -275,24 +341,20 @@ class TestDatabaseRepositoryBulkLinkWordsToBook:
         # Should not raise
         repo.bulk_link_words_to_book([])
 
+    @patch('app.repository.execute_values')
     @patch('app.repository.psycopg2.connect')
-    def test_bulk_link_success(self, mock_connect):
+    def test_bulk_link_success(self, mock_connect, mock_execute_values):
         """Test successful bulk linking"""
         from app.repository import DatabaseRepository
 
-        mock_cursor = MagicMock()
-        mock_conn = MagicMock()
-        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
-        mock_conn.__exit__ = MagicMock(return_value=None)
-        mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=None)
-        mock_connect.return_value = mock_conn
+        mock_connect.return_value = _mock_connection(MagicMock())
 
         repo = DatabaseRepository({'host': 'test'})
-        link_data = [(1, 10, 5), (2, 10, 3)]  # (word_id, book_id, frequency)
+        link_data = [(1, 10, 5), (2, 10, 3), (1, 10, 2)]  # (word_id, book_id, frequency)
         repo.bulk_link_words_to_book(link_data)
 
-        mock_cursor.executemany.assert_called_once()
+        mock_execute_values.assert_called_once()
+        assert sorted(mock_execute_values.call_args[0][2]) == [(1, 10, 7), (2, 10, 3)]
 
 
 class TestDatabaseRepositoryClearBookWordLinks:
@@ -981,7 +1043,8 @@ class TestDatabaseRepositoryProcessBatchFromOriginalFormat:
 
     @patch.object(__import__('app.repository', fromlist=['DatabaseRepository']).DatabaseRepository, 'bulk_insert_or_update_words')
     @patch.object(__import__('app.repository', fromlist=['DatabaseRepository']).DatabaseRepository, 'bulk_link_words_to_book')
-    def test_process_batch_success(self, mock_bulk_link, mock_bulk_insert):
+    @patch('app.repository.psycopg2.connect')
+    def test_process_batch_success(self, mock_connect, mock_bulk_link, mock_bulk_insert):
         """Test processing batch of word data"""
         from app.repository import DatabaseRepository
 
@@ -1000,7 +1063,8 @@ class TestDatabaseRepositoryProcessBatchFromOriginalFormat:
 
     @patch.object(__import__('app.repository', fromlist=['DatabaseRepository']).DatabaseRepository, 'bulk_insert_or_update_words')
     @patch.object(__import__('app.repository', fromlist=['DatabaseRepository']).DatabaseRepository, 'bulk_link_words_to_book')
-    def test_process_batch_with_batching(self, mock_bulk_link, mock_bulk_insert):
+    @patch('app.repository.psycopg2.connect')
+    def test_process_batch_with_batching(self, mock_connect, mock_bulk_link, mock_bulk_insert):
         """Test processing large batch that requires multiple batches"""
         from app.repository import DatabaseRepository
 
@@ -1020,3 +1084,65 @@ class TestDatabaseRepositoryProcessBatchFromOriginalFormat:
         # Should have processed 3 words
         assert mock_bulk_insert.call_count == 2
         assert mock_bulk_link.call_count == 2
+        assert result == 3
+        # One transaction for every chunk
+        mock_connect.assert_called_once()
+
+    @patch.object(__import__('app.repository', fromlist=['DatabaseRepository']).DatabaseRepository, 'bulk_insert_or_update_words')
+    @patch('app.repository.psycopg2.connect')
+    def test_process_batch_rolls_back_on_error(self, mock_connect, mock_bulk_insert):
+        """A failed chunk rolls the whole call back and reports nothing processed"""
+        from app.repository import DatabaseRepository
+
+        mock_conn = _mock_connection(MagicMock())
+        mock_connect.return_value = mock_conn
+        mock_bulk_insert.side_effect = psycopg2.Error("boom")
+
+        repo = DatabaseRepository({'host': 'test'})
+        result = repo.process_batch_from_original_format([('hello', None, 1, 2)], 1)
+
+        assert result == 0
+        assert mock_conn.__exit__.call_args[0][0] is psycopg2.Error
+
+
+class TestDatabaseRepositoryBulkSql:
+    """Set-based upserts against the real test database"""
+
+    def test_upsert_and_link_accumulate(self, app):
+        import uuid
+        from app.repository import DatabaseRepository, close_pools
+
+        repo = DatabaseRepository({'dsn': app.config['SQLALCHEMY_DATABASE_URI']})
+        prefix = 'zq' + uuid.uuid4().hex[:8].translate(str.maketrans('0123456789', 'ghijklmnop'))
+        words = [prefix + 'a', prefix + 'b']
+
+        book_id = repo.execute_query(
+            "INSERT INTO book (title, author, chapters_cnt, create_course) VALUES (%s, %s, 0, false) RETURNING id",
+            (prefix, 'Test Author'), fetch=True
+        )[0][0]
+        try:
+            repo.execute_query(
+                "INSERT INTO collection_words (english_word, russian_word, listening) VALUES (%s, %s, %s)",
+                (words[0], 'старое', 'keep.mp3')
+            )
+            data = [(words[0], 'new.mp3', 1, 3), (words[1], None, 0, 2)]
+            assert repo.process_batch_from_original_format(data, book_id) == 2
+            assert repo.process_batch_from_original_format(data, book_id, batch_size=1) == 2
+
+            rows = repo.execute_query(
+                """
+                SELECT cw.english_word, cw.russian_word, cw.listening, cw.brown, wbl.frequency
+                FROM collection_words cw JOIN word_book_link wbl ON wbl.word_id = cw.id
+                WHERE wbl.book_id = %s ORDER BY cw.english_word
+                """,
+                (book_id,), fetch=True
+            )
+            assert rows == [
+                (words[0], 'старое', 'keep.mp3', 1, 6),
+                (words[1], None, None, 0, 4),
+            ]
+        finally:
+            repo.execute_query("DELETE FROM word_book_link WHERE book_id = %s", (book_id,))
+            repo.execute_query("DELETE FROM collection_words WHERE english_word = ANY(%s)", (words,))
+            repo.execute_query("DELETE FROM book WHERE id = %s", (book_id,))
+            close_pools()
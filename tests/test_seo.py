@@ -6,6 +6,7 @@ import pytest
 
 from app.grammar_lab.models import GrammarTopic
 from app.utils.db import db
+from tests.conftest import sitemap_shards, sitemap_text
 
 
 @pytest.fixture
@@ -35,11 +36,12 @@ class TestSitemap:
     def test_sitemap_valid_xml(self, client):
         response = client.get('/sitemap.xml')
         root = ET.fromstring(response.data)
-        assert root.tag == '{http://www.sitemaps.org/schemas/sitemap/0.9}urlset'
+        assert root.tag == '{http://www.sitemaps.org/schemas/sitemap/0.9}sitemapindex'
+        for body in sitemap_shards(client):
+            assert ET.fromstring(body).tag == '{http://www.sitemaps.org/schemas/sitemap/0.9}urlset'
 
     def test_sitemap_contains_static_pages(self, client, app):
-        response = client.get('/sitemap.xml')
-        xml_text = response.data.decode('utf-8')
+        xml_text = sitemap_text(client)
         site_url = app.config.get('SITE_URL', 'https://llt-english.com')
         assert f'{site_url}/' in xml_text
         assert f'{site_url}/grammar-lab/topics' in xml_text
@@ -48,8 +50,7 @@ class TestSitemap:
         assert f'{site_url}/register' not in xml_text
 
     def test_sitemap_contains_grammar_topics(self, client, app, grammar_topic):
-        response = client.get('/sitemap.xml')
-        xml_text = response.data.decode('utf-8')
+        xml_text = sitemap_text(client)
         site_url = app.config.get('SITE_URL', 'https://llt-english.com')
         assert f'{site_url}/grammar-lab/topic/{grammar_topic.slug}' in xml_text
 
@@ -57,8 +58,7 @@ class TestSitemap:
         original_site_url = app.config.get('SITE_URL', '')
         app.config['SITE_URL'] = 'https://staging.llt-english.com'
         try:
-            response = client.get('/sitemap.xml')
-            xml_text = response.data.decode('utf-8')
+            xml_text = client.get('/sitemap.xml').data.decode('utf-8') + sitemap_text(client)
 
             assert '<loc>https://staging.llt-english.com/' in xml_text
             assert '<loc>https://llt-english.com/' not in xml_text
@@ -2,6 +2,7 @@
 import pytest
 import uuid
 from app.utils.db import db as _db
+from tests.conftest import sitemap_text
 
 
 class TestMetaTags:
@@ -34,8 +35,7 @@ class TestSitemapLastmod:
 
     def test_sitemap_has_lastmod(self, client):
         """Sitemap should contain lastmod for grammar topics that have updated_at."""
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         assert '<urlset' in xml
         assert '</urlset>' in xml
 
@@ -53,6 +53,5 @@ class TestSitemapLastmod:
         db_session.add(topic)
         db_session.commit()
 
-        response = client.get('/sitemap.xml')
-        xml = response.data.decode()
+        xml = sitemap_text(client)
         assert '2026-03-15' in xml
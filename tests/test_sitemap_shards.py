@@ -0,0 +1,94 @@
+"""Tests for the sharded sitemap (app/seo/sitemap.py)."""
+import uuid
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+import pytest
+
+from app.seo import sitemap
+from app.words.models import CollectionWords
+
+_NS = {'sm': sitemap.SITEMAP_NS}
+
+
+@pytest.fixture(autouse=True)
+def _clear_store():
+    sitemap.clear()
+    yield
+    sitemap.clear()
+
+
+@pytest.fixture
+def cached_sitemap(app):
+    original = app.config['SITEMAP_TTL_SECONDS']
+    app.config['SITEMAP_TTL_SECONDS'] = 3600
+    yield
+    app.config['SITEMAP_TTL_SECONDS'] = original
+
+
+def _word(db_session, english_word, level='A1'):
+    word = CollectionWords(english_word=english_word, russian_word='слово', level=level, item_type='word')
+    db_session.add(word)
+    db_session.commit()
+    return word
+
+
+def _index_locs(client):
+    root = ET.fromstring(client.get('/sitemap.xml').data)
+    return [loc.text for loc in root.findall('sm:sitemap/sm:loc', _NS)]
+
+
+def test_index_lists_sections_and_word_letters(client, db_session):
+    _word(db_session, f'zz{uuid.uuid4().hex[:8]}')
+    _word(db_session, f'4x4 {uuid.uuid4().hex[:8]}')
+
+    paths = [loc.rsplit('/', 1)[1] for loc in _index_locs(client)]
+
+    for name in ('pages', 'grammar', 'dictionary', 'contrasts', 'words-z', 'words-other'):
+        assert f'sitemap-{name}.xml' in paths
+
+
+def test_word_shard_holds_only_its_letter(client, db_session):
+    zebra = _word(db_session, f'zebra{uuid.uuid4().hex[:8]}')
+    apple = _word(db_session, f'apple{uuid.uuid4().hex[:8]}')
+    hidden = _word(db_session, f'zeal{uuid.uuid4().hex[:8]}', level='C2')
+
+    xml = client.get('/sitemap-words-z.xml').data.decode()
+
+    assert f'/dictionary/{zebra.english_word}<' in xml
+    assert apple.english_word not in xml
+    assert hidden.english_word not in xml
+
+
+def test_unknown_shard_is_404(client):
+    assert client.get('/sitemap-nope.xml').status_code == 404
+    assert client.get('/sitemap-words-zz.xml').status_code == 404
+
+
+def test_conditional_get_returns_304(client):
+    first = client.get('/sitemap-pages.xml')
+    assert first.headers['ETag']
+    assert first.headers['Last-Modified']
+
+    again = client.get('/sitemap-pages.xml', headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 304
+
+
+def test_cached_shard_is_built_once(client, cached_sitemap):
+    with patch.object(sitemap, '_render', wraps=sitemap._render) as render:
+        first = client.get('/sitemap-grammar.xml')
+        second = client.get('/sitemap-grammar.xml')
+
+    assert render.call_count == 1
+    assert second.data == first.data
+    assert 'max-age=3600' in second.headers['Cache-Control']
+
+
+def test_shard_queries_are_column_only(client, db_session, query_budget):
+    _word(db_session, f'yak{uuid.uuid4().hex[:8]}')
+    _word(db_session, f'yam{uuid.uuid4().hex[:8]}')
+
+    with query_budget(10, max_repeats=2):
+        client.get('/sitemap-words-y.xml')
+        client.get('/sitemap-contrasts.xml')
@@ -339,7 +339,7 @@ class TestLinkingHijackPrevention:
         try:
             with app.app_context():
                 from app.telegram.bot import _send_message
-                with patch('requests.post', side_effect=_requests.ConnectionError(
+                with patch('requests.Session.post', side_effect=_requests.ConnectionError(
                     'HTTPSConnectionPool: Max retries exceeded with url: /botSECRET_BOT_TOKEN_12345/sendMessage'
                 )):
                     _send_message(chat_id=1, text='test')
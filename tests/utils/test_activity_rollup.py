@@ -0,0 +1,106 @@
+"""Tests for app.utils.activity_rollup (the user_daily_activity table)."""
+import uuid
+from datetime import date, datetime, timedelta
+
+from app.achievements.models import StreakEvent, UserDailyActivity
+from app.study.models import StudySession, UserCardDirection, UserWord
+from app.utils import activity_rollup as rollup
+from app.words.models import CollectionWords
+
+
+def _day(user_id, local_date):
+    return UserDailyActivity.query.filter_by(user_id=user_id, local_date=local_date).first()
+
+
+def test_study_session_sets_bit_and_minutes(db_session, test_user):
+    start = datetime(2026, 10, 16, 9, 0)
+    session = StudySession(user_id=test_user.id, session_type='cards', start_time=start)
+    db_session.add(session)
+    db_session.flush()
+
+    row = _day(test_user.id, start.date())
+    assert row.sources == rollup.SOURCE_STUDY_SESSION
+    assert row.minutes == 0
+
+    session.end_time = start + timedelta(minutes=25)
+    db_session.flush()
+    db_session.refresh(row)
+    assert row.minutes == 25
+
+
+def test_srs_review_is_booked_to_word_owner(db_session, test_user):
+    word = CollectionWords(english_word=f'rollup_{uuid.uuid4().hex[:8]}', russian_word='слово', level='A1')
+    db_session.add(word)
+    db_session.flush()
+    user_word = UserWord(user_id=test_user.id, word_id=word.id)
+    db_session.add(user_word)
+    db_session.flush()
+    card = UserCardDirection(user_word_id=user_word.id, direction='eng-rus')
+    card.last_reviewed = datetime(2026, 10, 15, 12, 0)
+    db_session.add(card)
+    db_session.flush()
+
+    assert _day(test_user.id, date(2026, 10, 15)).sources == rollup.SOURCE_SRS
+
+
+def test_local_date_follows_user_timezone(db_session, test_user):
+    test_user.timezone = 'Asia/Tokyo'
+    db_session.flush()
+    # 20:00 UTC is already the next day in Tokyo
+    db_session.add(StudySession(user_id=test_user.id, session_type='cards', start_time=datetime(2026, 3, 10, 20, 0)))
+    db_session.flush()
+
+    assert _day(test_user.id, date(2026, 3, 11)) is not None
+    assert _day(test_user.id, date(2026, 3, 10)) is None
+
+
+def test_xp_events_add_up_on_event_date(db_session, test_user):
+    for xp in (10, 5):
+        db_session.add(StreakEvent(user_id=test_user.id, event_type='xp_linear', coins_delta=0,
+                                   event_date=date(2026, 10, 14), details={'xp': xp},
+                                   created_at=datetime(2026, 10, 14, 10, 0)))
+    db_session.flush()
+
+    row = _day(test_user.id, date(2026, 10, 14))
+    assert row.xp == 15
+    assert row.sources == rollup.SOURCE_LINEAR_XP
+
+
+def test_admin_and_streak_masks(db_session, test_user):
+    day = date(2026, 10, 13)
+    db_session.add(UserDailyActivity(user_id=test_user.id, local_date=day, sources=rollup.SOURCE_SRS))
+    db_session.flush()
+
+    assert test_user.id in rollup.active_user_dates(day, day, rollup.STREAK_SOURCES).get(day, set())
+    assert test_user.id not in rollup.active_user_dates(day, day).get(day, set())
+    assert rollup.active_dates(test_user.id, day, day) == {day}
+
+
+def test_backfill_rebuilds_without_double_counting(db_session, test_user):
+    start = datetime(2026, 10, 12, 8, 0)
+    db_session.add(StudySession(user_id=test_user.id, session_type='cards', start_time=start,
+                                end_time=start + timedelta(minutes=30)))
+    db_session.flush()
+    UserDailyActivity.query.filter_by(user_id=test_user.id).delete()
+
+    for _ in range(2):
+        rollup.backfill(start.date(), start.date())
+        db_session.expire_all()
+        row = _day(test_user.id, start.date())
+        assert row.sources == rollup.SOURCE_STUDY_SESSION
+        assert row.minutes == 30
+
+
+def test_portable_merge_matches_upsert_rules(db_session, test_user):
+    table = UserDailyActivity.__table__
+    connection = db_session.connection()
+    day = date(2026, 10, 10)
+    row = {'user_id': test_user.id, 'local_date': day, 'sources': rollup.SOURCE_LESSON,
+           'minutes': 5, 'xp': 10, 'updated_at': datetime(2026, 10, 10, 9, 0)}
+
+    rollup._merge_rows(connection, table, [row])
+    rollup._merge_rows(connection, table, [{**row, 'sources': rollup.SOURCE_SRS, 'minutes': 3, 'xp': 0}])
+
+    merged = _day(test_user.id, day)
+    assert merged.sources == rollup.SOURCE_LESSON | rollup.SOURCE_SRS
+    assert (merged.minutes, merged.xp) == (8, 10)
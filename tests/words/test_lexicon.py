@@ -0,0 +1,133 @@
+"""In-memory reader lexicon (app/words/lexicon.py).
+
+Pins rule parity with the old sequential lookups, incremental maintenance on
+ORM writes, and the zero-round-trip guarantee for the dictionary part of
+``/api/word-translation/<word>``.
+"""
+import time
+import uuid
+
+import sqlalchemy.event
+from sqlalchemy.engine import Engine
+
+from app.words.lexicon import Lexicon, LexiconEntry, candidate_lemmas, lexicon
+from app.words.models import CollectionWords
+
+
+def _static_lexicon(*words):
+    lex = Lexicon()
+    entries = {w: LexiconEntry(i, w, f'ru_{w}', None, 0) for i, w in enumerate(words, start=1)}
+    lex._entries = entries
+    lex._forms = lex._build_forms(entries)
+    lex._loaded_at = time.monotonic()
+    return lex
+
+
+def _sequential_lookup(word, dictionary):
+    """Reference implementation: the per-candidate lookups the endpoint used to run."""
+    if word in dictionary:
+        return word, None
+    for base_form, form_type in candidate_lemmas(word):
+        if base_form in dictionary:
+            return base_form, {'type': form_type, 'base_form': base_form}
+    return None, None
+
+
+class TestRuleParity:
+    WORDS = ('make', 'run', 'stop', 'city', 'box', 'go', 'say', 'be', 'bus', 'hope', 'hop', 'fly')
+
+    def test_precomputed_forms_match_sequential_rules(self):
+        lex = _static_lexicon(*self.WORDS)
+        dictionary = set(self.WORDS)
+        probes = [
+            'making', 'makes', 'made', 'maked', 'running', 'runs', 'ran', 'stopped',
+            'stopping', 'cities', 'boxes', 'went', 'gone', 'said', 'was', 'buses',
+            'hoping', 'hopping', 'hoped', 'hopped', 'flies', 'flew', 'glass', 'xyz',
+        ]
+        for probe in probes:
+            entry, form_info = lex.lookup(probe)
+            expected_word, expected_info = _sequential_lookup(probe, dictionary)
+            assert (entry.english_word if entry else None) == expected_word, probe
+            assert form_info == expected_info, probe
+
+    def test_exact_match_beats_form(self):
+        lex = _static_lexicon('hop', 'hope', 'hoping')
+        entry, form_info = lex.lookup('hoping')
+        assert entry.english_word == 'hoping'
+        assert form_info is None
+
+    def test_incremental_upsert_and_remove(self):
+        lex = _static_lexicon('walk')
+        assert lex.lookup('talked') == (None, None)
+
+        lex.upsert(LexiconEntry(10, 'talk', 'говорить', None, 0))
+        entry, form_info = lex.lookup('talked')
+        assert entry.id == 10
+        assert form_info == {'type': 'past_tense', 'base_form': 'talk'}
+
+        lex.remove('talk')
+        assert lex.lookup('talked') == (None, None)
+
+    def test_rename_moves_forms(self):
+        lex = _static_lexicon('colour')
+        lex.upsert(LexiconEntry(1, 'color', 'цвет', None, 0), previous_word='colour')
+        assert lex.lookup('colours') == (None, None)
+        assert lex.lookup('colors')[0].english_word == 'color'
+
+
+class TestOrmMaintenance:
+    def test_insert_and_update_are_visible_without_reload(self, app, db_session):
+        lexicon.reload()
+        loaded_at = lexicon._loaded_at
+        lemma = f'zq{uuid.uuid4().hex[:8]}'
+
+        word = CollectionWords(english_word=lemma, russian_word='первый')
+        db_session.add(word)
+        db_session.flush()
+        entry, form_info = lexicon.lookup(lemma + 's')
+        assert entry.id == word.id
+        assert form_info['type'] == 'plural'
+
+        word.russian_word = 'второй'
+        db_session.flush()
+        assert lexicon.get(lemma).russian_word == 'второй'
+        assert lexicon._loaded_at == loaded_at
+
+        db_session.delete(word)
+        db_session.flush()
+        assert lexicon.get(lemma) is None
+
+    def test_rollback_marks_lexicon_stale(self, app, db_session):
+        lexicon.reload()
+        db_session.add(CollectionWords(english_word=f'zq{uuid.uuid4().hex[:8]}'))
+        db_session.flush()
+        db_session.rollback()
+        assert lexicon._loaded_at is None
+
+
+class TestWordTranslationEndpoint:
+    def test_inflected_form_resolves_without_dictionary_queries(self, authenticated_client, db_session):
+        lemma = f'zq{uuid.uuid4().hex[:8]}'
+        word = CollectionWords(english_word=lemma, russian_word='тест')
+        db_session.add(word)
+        db_session.commit()
+        lexicon.lookup(lemma)  # make sure the index is warm
+
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sqlalchemy.event.listen(Engine, 'before_cursor_execute', _record)
+        try:
+            response = authenticated_client.get(f'/api/word-translation/{lemma}ing')
+        finally:
+            sqlalchemy.event.remove(Engine, 'before_cursor_execute', _record)
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['id'] == word.id
+        assert data['is_form'] is True
+        assert data['base_form'] == lemma
+        assert data['in_reading_deck'] is False
+        assert not [s for s in statements if 'FROM collection_words' in s]
@@ -89,10 +89,10 @@ def test_public_contrast_canonical_meta(client, contrast_pair):
 
 
 def test_contrast_appears_in_sitemap(client, contrast_pair):
-    resp = client.get('/sitemap.xml')
+    assert client.get('/sitemap.xml').status_code == 200
+    resp = client.get('/sitemap-contrasts.xml')
     assert resp.status_code == 200
-    xml = resp.data.decode()
-    assert _canonical_url(contrast_pair) in xml
+    assert _canonical_url(contrast_pair) in resp.data.decode()
 
 
 def test_word_page_links_to_contrast_detail(client, contrast_pair):
@@ -0,0 +1,96 @@
+"""Tests for app/words/search.py — ranked dictionary search."""
+import uuid
+
+from app.words.models import CollectionWords
+from app.words.search import normalize_term, search_query, search_words
+
+
+def _tag():
+    """Letters-only marker so terms never collide with other tests' words."""
+    return ''.join(chr(ord('a') + int(c, 16)) for c in uuid.uuid4().hex[:6])
+
+
+def _add_words(db_session, *pairs, frequency_rank=None):
+    words = [
+        CollectionWords(english_word=english, russian_word=russian, frequency_rank=frequency_rank)
+        for english, russian in pairs
+    ]
+    db_session.add_all(words)
+    db_session.commit()
+    return words
+
+
+class TestNormalizeTerm:
+    def test_lowercases_and_collapses(self):
+        assert normalize_term('  Give   UP ') == 'give up'
+        assert normalize_term(None) == ''
+
+
+class TestSearchWords:
+    def test_exact_before_prefix_before_substring(self, db_session):
+        tag = _tag()
+        _add_words(
+            db_session,
+            (f'un{tag}', 'содержит'),
+            (f'{tag}ing', 'начинается'),
+            (tag, 'точно'),
+        )
+
+        results = search_words(tag.upper())
+
+        assert [w.english_word for w in results] == [tag, f'{tag}ing', f'un{tag}']
+
+    def test_frequency_breaks_ties_within_a_tier(self, db_session):
+        tag = _tag()
+        rare, common = _add_words(db_session, (f'{tag}aa', 'редкое'), (f'{tag}bb', 'частое'))
+        rare.frequency_rank = 900
+        common.frequency_rank = 10
+        db_session.commit()
+
+        assert [w.id for w in search_words(tag)] == [common.id, rare.id]
+
+    def test_short_term_matches_prefix_only(self, db_session):
+        tag = _tag()
+        _add_words(db_session, (f'q{tag}', 'префикс'), (f'{tag}q', 'подстрока'))
+
+        results = search_query('q').filter(CollectionWords.english_word.contains(tag)).all()
+
+        assert [w.english_word for w in results] == [f'q{tag}']
+
+    def test_like_wildcards_are_literal(self, db_session):
+        tag = _tag()
+        _add_words(db_session, (f'{tag}_x', 'подчёркивание'), (f'{tag}zx', 'буква'))
+
+        assert [w.english_word for w in search_words(f'{tag}_x')] == [f'{tag}_x']
+
+    def test_base_query_is_respected(self, db_session):
+        tag = _tag()
+        _add_words(db_session, (f'{tag}one', 'перевод'), (f'{tag}two', ''))
+
+        base = CollectionWords.query.filter(CollectionWords.russian_word != '')
+
+        assert [w.english_word for w in search_words(tag, query=base)] == [f'{tag}one']
+
+    def test_typo_matches_on_trigram_backends(self, db_session):
+        tag = _tag()
+        _add_words(db_session, (f'{tag}ification', 'опечатка'))
+        if db_session.get_bind().dialect.name != 'postgresql':
+            return
+        from app.words import search as word_search
+        if not word_search._has_trigram():
+            return
+
+        results = search_words(f'{tag}ificatoin')
+
+        assert f'{tag}ification' in [w.english_word for w in results]
+
+
+class TestSearchApi:
+    def test_api_returns_ranked_matches(self, authenticated_client, db_session):
+        tag = _tag()
+        _add_words(db_session, (f'x{tag}', 'второе'), (tag, 'первое'))
+
+        response = authenticated_client.get(f'/api/search?term={tag}')
+
+        assert response.status_code == 200
+        assert [item['english_word'] for item in response.get_json()][:2] == [tag, f'x{tag}']